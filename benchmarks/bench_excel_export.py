@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Excel 저장 벤치마크 (rows/sec, 최대 메모리)
+
+각 방식을 별도 프로세스에서 실행하여 최대 RSS(ru_maxrss)를 독립적으로 측정합니다.
+
+사용법:
+    python benchmarks/bench_excel_export.py --rows 200000
+"""
+
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.generators.testcase_generator import TestCaseGenerator
+
+
+def iter_synthetic_testcases(count):
+    """실제 케이스와 비슷한 길이의 합성 테스트케이스"""
+    for i in range(count):
+        yield {
+            "domain": f"domain{i % 7}",
+            "section": "Section",
+            "component": "Component",
+            "feature": f"Feature {i % 50}",
+            "title": f"합성 테스트케이스 {i} - 주문 입력 후 확인 버튼 클릭 시 결과 검증",
+            "precondition": "로그인 상태, 잔고 보유",
+            "test_step": "\n".join(f"{s}. 단계 {s} 화면에서 값 입력 후 다음 버튼 클릭" for s in range(1, 6)),
+            "expected_results": "\n".join(f"{s}. 단계 {s} 결과가 정상 표시됨" for s in range(1, 6)),
+            "priority": f"P{i % 4 + 1}",
+            "type": "Functional",
+            "comment": "",
+            "web_result": "",
+            "app_result": "",
+        }
+
+
+def _dataframe_baseline(rows, filename, generator):
+    """변경 전 폴백 경로: DataFrame 생성 후 openpyxl 일반 모드로 저장"""
+    import pandas as pd
+
+    df = pd.DataFrame(list(rows))[generator.rules.output_columns]
+    with pd.ExcelWriter(filename, engine="openpyxl") as writer:
+        df.to_excel(writer, sheet_name="TestCases", index=False)
+
+
+def run(mode, count):
+    generator = TestCaseGenerator()
+    fd, filename = tempfile.mkstemp(suffix=".xlsx")
+    os.close(fd)
+    try:
+        started = time.perf_counter()
+        if mode == "dataframe":
+            _dataframe_baseline(iter_synthetic_testcases(count), filename, generator)
+        elif mode == "template":
+            generator.save_to_excel(iter_synthetic_testcases(count), filename)
+        else:
+            generator.save_to_excel(iter_synthetic_testcases(count), filename, use_template=False)
+        elapsed = time.perf_counter() - started
+        peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        return mode, elapsed, peak_mb
+    finally:
+        os.remove(filename)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Excel 저장 벤치마크")
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--modes", nargs="+", default=["dataframe", "template", "streaming"],
+                        choices=["dataframe", "template", "streaming"])
+    args = parser.parse_args()
+
+    print(f"{'mode':<12}{'rows/sec':>12}{'elapsed(s)':>12}{'peak RSS(MB)':>14}")
+    for mode in args.modes:
+        # max_tasks_per_child 대신 방식마다 새 풀을 사용해 RSS를 분리
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            mode, elapsed, peak_mb = pool.submit(run, mode, args.rows).result()
+        print(f"{mode:<12}{args.rows / elapsed:>12,.0f}{elapsed:>12.2f}{peak_mb:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+MCP 도구 동시 호출 부하 테스트 (로컬 Figma 스텁 사용, 실제 API 호출 없음)
+
+- clients개의 클라이언트가 동시에 각각 calls번 도구를 호출
+- blocking: 변경 전처럼 이벤트 루프에서 도구를 직접 실행
+- pooled: call_tool()로 도구 실행기(스레드/프로세스 풀)를 거쳐 실행
+- 무거운 호출이 진행되는 동안 이벤트 루프 지연(50ms 타이머가 늦게 깨어나는 시간)과 parse_figma_url 응답 시간도 함께 측정
+- 스텁이 받은 Figma 요청 수 (같은 파일 동시 요청은 병합, 이후 요청은 캐시 사용)
+
+사용법:
+    python benchmarks/bench_mcp_concurrency.py --clients 10 --calls 3 --latency 0.2
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+# 프로젝트 루트를 Python 경로에 추가
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from figma_stub import FigmaStub
+
+FIGMA_URL = "https://www.figma.com/file/STUBFILE/stub"
+
+_ARGUMENTS = {
+    "process_figma_link": {"figma_url": FIGMA_URL},
+    "enhanced_figma_analysis": {"figma_url": FIGMA_URL, "include_screenshot": False},
+    "fetch_figma_data": {"file_id": "STUBFILE"},
+}
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+async def _run(mode, tool, clients, calls, figma_server, executor, call_tool):
+    latencies, lags, probes = [], [], []
+    done = asyncio.Event()
+
+    async def invoke(name, arguments):
+        if mode == "blocking":
+            # 변경 전 handle_call_tool: 도구 메소드를 이벤트 루프에서 직접 호출
+            method = {"process_figma_link": "process_figma_link",
+                      "enhanced_figma_analysis": "enhanced_figma_analysis",
+                      "fetch_figma_data": "fetch_figma_data",
+                      "parse_figma_url": "parse_figma_url"}[name]
+            await asyncio.sleep(0)
+            return getattr(figma_server, method)(*arguments.values())
+        return await call_tool(figma_server, executor, name, arguments)
+
+    async def client():
+        for _ in range(calls):
+            started = time.perf_counter()
+            result = await invoke(tool, _ARGUMENTS[tool])
+            assert result.get("success"), result
+            latencies.append(time.perf_counter() - started)
+
+    async def probe():
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(0.05)
+            lags.append(time.perf_counter() - started - 0.05)
+            started = time.perf_counter()
+            await invoke("parse_figma_url", {"figma_url": FIGMA_URL})
+            probes.append(time.perf_counter() - started)
+
+    probe_task = asyncio.create_task(probe())
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await probe_task
+    return elapsed, latencies, lags, probes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MCP 도구 동시 호출 부하 테스트")
+    parser.add_argument("--clients", type=int, default=10)
+    parser.add_argument("--calls", type=int, default=3, help="클라이언트당 호출 수")
+    parser.add_argument("--tool", default="process_figma_link", choices=sorted(_ARGUMENTS))
+    parser.add_argument("--latency", type=float, default=0.2, help="스텁 응답 지연(초)")
+    parser.add_argument("--frames", type=int, default=50, help="스텁 문서 프레임 수 (프레임당 텍스트 20개)")
+    parser.add_argument("--modes", nargs="+", default=["blocking", "pooled"], choices=["blocking", "pooled"])
+    args = parser.parse_args()
+
+    with FigmaStub(latency=args.latency, frames=args.frames) as stub:
+        os.environ.setdefault("FIGMA_TOKEN", "stub-token")
+        os.environ["FIGMA_API_BASE"] = stub.api_base
+        os.environ.setdefault("FIGMA_RATE_PER_MINUTE", "0")  # 스텁은 실제 Figma 할당량과 무관 (요청 예산 끔)
+        from mcp_figma_server import FigmaMCPServer, call_tool, create_tool_executor
+
+        workdir = tempfile.mkdtemp(prefix="bench_mcp_")
+        os.chdir(workdir)  # process_figma_link가 기록하는 Excel 파일 위치
+
+        total = args.clients * args.calls
+        print(f"tool={args.tool} clients={args.clients} calls={total} stub latency={args.latency}s")
+        print(f"{'mode':<10}{'calls/s':>10}{'p50(s)':>10}{'p95(s)':>10}{'loop lag p95(ms)':>18}"
+              f"{'loop lag max(ms)':>18}{'parse p95(ms)':>15}{'figma reqs':>12}")
+        for mode in args.modes:
+            figma_server = FigmaMCPServer()  # 모드마다 빈 캐시로 시작
+            executor = create_tool_executor(figma_server)
+            stub.requests.clear()
+            try:
+                elapsed, latencies, lags, probes = asyncio.run(
+                    _run(mode, args.tool, args.clients, args.calls, figma_server, executor, call_tool)
+                )
+            finally:
+                executor.shutdown()
+            print(f"{mode:<10}{total / elapsed:>10.2f}{statistics.median(latencies):>10.2f}"
+                  f"{_percentile(latencies, 0.95):>10.2f}{_percentile(lags, 0.95) * 1000:>18.1f}"
+                  f"{max(lags) * 1000:>18.1f}{_percentile(probes, 0.95) * 1000:>15.1f}{stub.total_requests:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Figma 요청 예산 부하 테스트 (실제 API 호출 없음, 예산 대기만 측정)
+
+- batch개의 프로세스가 같은 토큰/상태 파일로 쉬지 않고 요청 예산을 가져감 (야간 배치 작업 흉내)
+- 그동안 주 프로세스가 interval초마다 interactive 요청 예산을 받는 데 걸린 시간을 측정
+- priority: batch 프로세스가 batch 우선순위 사용 / flat: 모두 interactive (우선순위 없음)
+
+사용법:
+    python benchmarks/bench_rate_budget.py --batch 4 --rpm 600 --seconds 10
+"""
+
+import argparse
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+# 프로젝트 루트를 Python 경로에 추가
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.utils.rate_budget import RateBudget
+
+TOKEN = "bench-token"
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def _batch_worker(budget_kwargs, priority, stop_at, counter):
+    budget = RateBudget(**budget_kwargs)
+    while time.time() < stop_at:
+        budget.acquire(TOKEN, priority)
+        with counter.get_lock():
+            counter.value += 1
+
+
+def _run(mode, args):
+    budget_kwargs = {
+        "requests_per_minute": args.rpm,
+        "burst": args.burst,
+        "batch_reserve": args.reserve,
+        "state_file": os.path.join(tempfile.mkdtemp(prefix="bench_rate_"), "budget.json"),
+    }
+    priority = "batch" if mode == "priority" else "interactive"
+    stop_at = time.time() + args.seconds
+    counter = multiprocessing.Value("i", 0)
+    workers = [multiprocessing.Process(target=_batch_worker, args=(budget_kwargs, priority, stop_at, counter))
+               for _ in range(args.batch)]
+    for worker in workers:
+        worker.start()
+
+    budget = RateBudget(**budget_kwargs)
+    time.sleep(1.0)  # batch 작업이 버킷을 비울 때까지
+    waits = []
+    while time.time() < stop_at - args.interval:
+        waits.append(budget.acquire(TOKEN, "interactive"))
+        time.sleep(args.interval)
+    for worker in workers:
+        worker.join()
+    return waits, counter.value / args.seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Figma 요청 예산 부하 테스트")
+    parser.add_argument("--batch", type=int, default=4, help="batch 프로세스 수")
+    parser.add_argument("--rpm", type=float, default=600, help="토큰당 분당 요청 수")
+    parser.add_argument("--burst", type=float, default=10)
+    parser.add_argument("--reserve", type=float, default=3, help="batch가 남겨 두는 예산")
+    parser.add_argument("--interval", type=float, default=0.5, help="interactive 요청 간격(초)")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--modes", nargs="+", default=["flat", "priority"], choices=["flat", "priority"])
+    args = parser.parse_args()
+
+    print(f"batch processes={args.batch} rpm={args.rpm:g} burst={args.burst:g} reserve={args.reserve:g}")
+    print(f"{'mode':<10}{'interactive':>12}{'p50(ms)':>10}{'p95(ms)':>10}{'max(ms)':>10}{'batch req/s':>13}")
+    for mode in args.modes:
+        waits, batch_rate = _run(mode, args)
+        print(f"{mode:<10}{len(waits):>12}{statistics.median(waits) * 1000:>10.1f}"
+              f"{_percentile(waits, 0.95) * 1000:>10.1f}{max(waits) * 1000:>10.1f}{batch_rate:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+로컬 Figma API 스텁 (부하 테스트용)
+
+- GET /v1/files/{file_id}, /v1/files/{file_id}/nodes?ids=..., /v1/images/{file_id}
+- 응답마다 latency초 대기하여 실제 API 왕복 시간을 흉내냄
+- 요청 수를 경로별로 집계 (요청 병합/캐시 효과 확인용)
+
+사용법:
+    with FigmaStub(latency=0.2, frames=50) as stub:
+        os.environ["FIGMA_API_BASE"] = stub.api_base
+"""
+
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+_TEXTS = ["로그인 버튼 클릭", "회원가입 입력 폼", "랭킹 목록 표시", "VIP 등급 혜택 안내",
+          "출금 한도 설정", "알림 설정 화면", "검색 필터 선택", "주문 내역 리스트"]
+
+
+def synthetic_document(frames: int = 50, texts_per_frame: int = 20) -> dict:
+    """요구사항 키워드가 들어간 프레임/텍스트 노드로 구성된 Figma 문서"""
+    children = []
+    for f in range(frames):
+        children.append({
+            "id": f"{f}:0",
+            "type": "FRAME",
+            "name": f"Screen {f} - 화면",
+            "children": [
+                {"id": f"{f}:{t + 1}", "type": "TEXT", "name": f"Text {t}",
+                 "characters": f"{_TEXTS[(f + t) % len(_TEXTS)]} {f}-{t}"}
+                for t in range(texts_per_frame)
+            ],
+        })
+    return {"name": "Stub", "document": {"id": "0:0", "type": "DOCUMENT",
+                                         "children": [{"id": "0:1", "type": "CANVAS", "children": children}]}}
+
+
+class FigmaStub:
+    """백그라운드 스레드에서 동작하는 Figma API 스텁 서버"""
+
+    def __init__(self, latency: float = 0.2, frames: int = 50, texts_per_frame: int = 20):
+        self.latency = latency
+        self.requests = Counter()
+        self._lock = threading.Lock()
+        document = synthetic_document(frames, texts_per_frame)
+        self._file_body = json.dumps(document).encode("utf-8")
+        self._document = document
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                parts = parsed.path.strip("/").split("/")
+                with stub._lock:
+                    stub.requests[parsed.path] += 1
+                time.sleep(stub.latency)
+                if parts[:2] == ["v1", "files"] and len(parts) == 3:
+                    body = stub._file_body
+                elif parts[:2] == ["v1", "files"] and parts[3:] == ["nodes"]:
+                    ids = parse_qs(parsed.query).get("ids", [""])[0].split(",")
+                    canvas = stub._document["document"]["children"][0]
+                    nodes = {node["id"]: {"document": node} for node in canvas["children"] if node["id"] in ids}
+                    body = json.dumps({"nodes": nodes}).encode("utf-8")
+                elif parts[:2] == ["v1", "images"]:
+                    body = json.dumps({"images": {}}).encode("utf-8")
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def api_base(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    @property
+    def total_requests(self) -> int:
+        return sum(self.requests.values())
+
+    def __enter__(self) -> "FigmaStub":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
@@ -16,6 +16,7 @@ sys.path.insert(0, project_root)
 
 from src.analyzers.figma_analyzer import FigmaAnalyzer
 from src.generators.testcase_generator import TestCaseGenerator
+from src.utils.dedupe import deduplicate_testcases
 
 class NotionRequirementsExtractor:
     """Notion PRD에서 요구사항 추출"""
@@ -681,18 +682,13 @@ class IntegratedTestCaseGenerator:
         return scenarios
     
     def _deduplicate_testcases(self, testcases):
-        """중복 테스트케이스 제거"""
-        seen = set()
-        unique_testcases = []
+        """중복 테스트케이스 제거 (정규화된 제목/절차/기대 결과 기준 + 근사 중복)"""
+        result = deduplicate_testcases(testcases)
         
-        for tc in testcases:
-            # title을 기준으로 중복 체크
-            title = tc.get("title", "")
-            if title not in seen:
-                seen.add(title)
-                unique_testcases.append(tc)
+        for merge in result.merged:
+            print(f"   ♻️ 중복 병합({merge['reason']}): '{merge['dropped_title']}' → '{merge['kept_title']}'")
         
-        return unique_testcases
+        return result.testcases
     
     def save_results(self, testcases, output_dir):
         """결과 저장"""
@@ -700,20 +696,17 @@ class IntegratedTestCaseGenerator:
         
         os.makedirs(output_dir, exist_ok=True)
         
-        # Excel 저장
+        # Excel / TestRail CSV / JSON 동시 저장 (정규화 1회, 파일별 원자적 교체)
         excel_file = f"{output_dir}/FixedMultiplier_Integrated_TestCases.xlsx"
-        self.testcase_generator.save_to_excel(testcases, excel_file)
-        print(f"   ✅ Excel: {excel_file}")
-        
-        # TestRail CSV 저장
         testrail_file = f"{output_dir}/FixedMultiplier_Integrated_TestRail.csv"
-        self.testcase_generator.save_to_testrail_csv(testcases, testrail_file)
-        print(f"   ✅ TestRail: {testrail_file}")
-        
-        # JSON 저장
         json_file = f"{output_dir}/FixedMultiplier_Integrated_TestCases.json"
-        self.testcase_generator.save_to_json(testcases, json_file)
-        print(f"   ✅ JSON: {json_file}")
+        exported = self.testcase_generator.save_all(testcases, {
+            "excel": excel_file,
+            "testrail": testrail_file,
+            "json": json_file,
+        })
+        for label, fmt in (("Excel", "excel"), ("TestRail", "testrail"), ("JSON", "json")):
+            print(f"   ✅ {label}: {exported[fmt]['path']} ({exported[fmt]['elapsed_sec']}s)")
         
         # 분석 요약 저장
         summary_file = f"{output_dir}/analysis_summary.json"
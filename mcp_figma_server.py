@@ -13,18 +13,27 @@
 - save_to_excel: Excel 저장
 - process_figma_link: 전체 프로세스 실행
 - enhanced_figma_analysis: 향상된 분석 (랭킹 + VIP 티어 시스템 패턴 포함)
+- release_handle: 서버에 보관한 데이터 핸들 해제
+- prefetch_figma_file: Figma 파일을 미리 가져와 캐시 (rules_config.json의 mcp_prefetch.watch_list는 기동 시 가져오고 만료 전에 다시 가져옴)
+
+큰 데이터(Figma 문서, 요구사항/테스트케이스 목록, 분석 결과)는 서버에 보관하고 핸들만 주고받음
+(각 도구는 인라인 데이터 또는 핸들을 입력으로 받음)
 """
 
 import json
 import asyncio
 import sys
+import time
+from collections import Counter
 from typing import Any, Sequence
 import requests
 import pandas as pd
+from dataclasses import replace
 from datetime import datetime
 from urllib.parse import urlparse, parse_qs
 import os
 from dotenv import load_dotenv
+from openpyxl.styles import Font, NamedStyle
 
 # MCP 관련 import
 try:
@@ -46,14 +55,166 @@ except ImportError:
     print("설치: pip install mcp")
     MCP_AVAILABLE = False
 
+from src.analyzers.analysis_engine import shared_engine
+from src.utils.cancellation import (
+    CancelToken, DeadlineExceeded, ToolCancelled, ToolInterrupted, checked, checkpoint, remaining_time, reset_token,
+    set_token,
+)
+from src.utils.data_store import DataStore, HandleError
+from src.utils.dedupe import deduplicate_testcases
+from src.utils.keyword_classifier import KeywordClassifier
+from src.utils.metrics import MetricsRegistry
+from src.utils.rate_budget import PriorityCell, budgeted_get, current_priority, default_budget, rate_priority
+from src.utils.pagination import DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT, decode_cursor, get_path, page, page_limit, paginate, top_values
+from src.utils.single_flight import SingleFlight
+from src.utils.excel_writer import load_template_layout, write_xlsx
+from src.utils.export import atomic_output
+from src.utils.rules_config import load_rules_config, normalize_testcase_fields
+from src.utils.tool_executor import ToolExecutor
+from src.utils.ttl_cache import TTLCache
+
 # 환경변수 로드
 load_dotenv()
 
+# 요구사항 우선순위/카테고리 분류기 (서버 기동 시 한 번만 컴파일)
+# - 카테고리는 rules_config.json의 category_rules를 공유
+# - 우선순위는 랭킹/VIP 티어 시스템을 반영한 MCP 전용 키워드 (매칭 없으면 P3)
+_rules = load_rules_config()
+REQUIREMENT_CLASSIFIER = KeywordClassifier(
+    priority_keywords={
+        "P1": ['로그인', '회원가입', '결제', '보안', '랭킹', 'ranking', '순위', 'rank', '대회', 'competition',
+               'vip', 'svip', '티어', 'tier', '멤버십', 'membership'],
+        "P2": ['설정', '프로필', '알림', '리더보드', 'leaderboard', '마일스톤', 'milestone', '등급', 'grade',
+               '혜택', 'benefit'],
+    },
+    priority_order=("P1", "P2"),
+    default_priority="P3",
+    category_keywords=_rules.category_keywords,
+    default_category=_rules.category_default,
+)
+
+# 요구사항 판별 / UI 패턴 / UI 구조 / 유저플로우 분석 엔진 (키워드·패턴·규칙을 서버 기동 시 한 번만 컴파일,
+# 모든 도구 호출과 FigmaAnalyzer가 공유, cpu 워커는 모듈을 불러올 때 워커당 한 번 컴파일)
+ANALYSIS_ENGINE = shared_engine()
+
+# 템플릿 데이터 셀 스타일 (셀마다 Font 객체를 만들지 않고 NamedStyle 하나를 등록해 공유)
+TEMPLATE_DATA_STYLE = NamedStyle(name="qa_testcase_data", font=Font(name='맑은 고딕'))
+
+# 정규화된 템플릿 헤더 -> 테스트케이스 키 (android/ios 결과 열은 빈 칸으로 기록)
+_TEMPLATE_HEADER_KEYS = {
+    "domain": "domain",
+    "section": "section",
+    "component": "component",
+    "feature": "feature",
+    "title": "title",
+    "precondition": "precondition",
+    "teststep": "test_step",
+    "expectedresults": "expected_results",
+    "priority": "priority",
+    "type": "type",
+    "comment": "comment",
+    "webresult": "web_result",
+    "appresult": "app_result",
+}
+
+# fallback: 기존 X Oauth.xlsx 템플릿 컬럼 위치 (헤더로 찾지 못한 키에 사용)
+_TEMPLATE_FALLBACK_COLUMNS = {
+    "domain": 1,
+    "section": 2,
+    "component": 3,
+    "feature": 4,
+    "title": 5,
+    "precondition": 6,
+    "test_step": 7,
+    "expected_results": 8,
+    "priority": 9,
+    "type": 10,
+    "comment": 11,
+}
+
+_template_layouts = {}
+TEMPLATE_PATH = os.path.join("templates", "QA_Testcase_Template_WebApp.xlsx")
+
+
+def _mcp_template_layout(template_path: str):
+    """템플릿 헤더(1행) 기반 컬럼 매핑 + 데이터 NamedStyle을 적용한 레이아웃 (템플릿별 1회 계산)"""
+    key = (os.path.abspath(template_path), os.stat(template_path).st_mtime_ns)
+    cached = _template_layouts.get(key)
+    if cached is not None:
+        return cached
+    
+    base, sheet_name = load_template_layout(template_path, ())
+    
+    def _norm_header(s) -> str:
+        return "".join(ch for ch in str(s or "").strip().lower() if ch.isalnum())
+    
+    columns = [(_TEMPLATE_HEADER_KEYS.get(_norm_header(header)), header) for _, header in base.columns]
+    mapped = {k for k, _ in columns if k}
+    for field_key, col_idx in _TEMPLATE_FALLBACK_COLUMNS.items():
+        if field_key in mapped:
+            continue
+        while len(columns) < col_idx:
+            columns.append((None, None))
+        if columns[col_idx - 1][0] is None:
+            columns[col_idx - 1] = (field_key, columns[col_idx - 1][1])
+    
+    data_style = {"style": TEMPLATE_DATA_STYLE.name}
+    layout = replace(
+        base,
+        columns=columns,
+        header_styles=base.header_styles + [None] * (len(columns) - len(base.header_styles)),
+        data_styles=[data_style] * len(columns),
+        named_styles=[TEMPLATE_DATA_STYLE],
+    )
+    _template_layouts[key] = (layout, sheet_name)
+    return layout, sheet_name
+
+FIGMA_API_BASE = "https://api.figma.com/v1"
+REQUEST_TIMEOUT = float(os.getenv("REQUEST_TIMEOUT", 30))  # Figma API 요청 타임아웃(초), 마감이 더 가까우면 남은 시간
+_FETCH_CHUNK_SIZE = 64 * 1024  # 응답 본문을 이 크기씩 읽으며 취소/마감 확인
+
+# 도구 호출 기본 마감 시간 (ms, 비우면 마감 없음). 호출별 deadline_ms 인자가 우선.
+DEFAULT_DEADLINE_MS = float(os.getenv("MCP_DEFAULT_DEADLINE_MS") or 0) or None
+
+# process_figma_link 진행 단계 (진행률 = 완료한 단계 수, 생성 단계는 요구사항 처리 비율만큼 소수로 증가)
+PROCESS_PHASES = ("parse", "fetch", "extract", "generate", "save")
+PARTIAL_BATCH_SIZE = 100  # 생성 단계에서 한 번에 보고하는 테스트케이스 수
+
+# 같은 파일/노드를 동시에 요청하면 한 번만 가져와 결과를 공유 (기다리는 호출도 자신의 취소/마감을 확인,
+# interactive 호출이 batch 요청에 합류하면 그 요청의 예산 우선순위를 interactive로 올림)
+FETCH_FLIGHTS = SingleFlight(wait_check=checkpoint, on_join=lambda cell: cell.promote(current_priority()))
+
+# 서버 계측 (server_stats 도구, MCP_METRICS_FILE로 Prometheus 텍스트 파일 기록)
+METRICS = MetricsRegistry()
+METRICS.describe("mcp_tool_seconds", "도구 호출 소요 시간(초)")
+METRICS.describe("mcp_tool_calls_total", "도구 호출 수 (outcome: ok/partial/error/cancelled/deadline)")
+METRICS.describe("mcp_tool_in_flight", "실행 중인 도구 호출 수")
+METRICS.describe("mcp_phase_seconds", "처리 단계별 소요 시간(초) (fetch/parse/traverse/generate/save)")
+METRICS.describe("mcp_figma_bytes_fetched_total", "Figma API 응답 바이트 수")
+SERVER_STARTED = time.monotonic()
+
+# 파일별로 캐시하는 분석 결과 -> 계산 메소드
+_ANALYSIS_PARTS = {
+    "requirements": "extract_requirements",
+    "keywords": "_analyze_enhanced_keywords",
+    "ui_structure": "_analyze_ui_structure",
+}
+
+
 class FigmaMCPServer:
-    def __init__(self):
+    def __init__(self, api_base: str = None):
         self.figma_token = os.getenv("FIGMA_TOKEN")
         if not self.figma_token:
             raise ValueError("FIGMA_TOKEN 환경변수가 설정되지 않았습니다.")
+        # 로컬 스텁/프록시 사용 시 FIGMA_API_BASE로 변경 (부하 테스트 등)
+        self.api_base = (api_base or os.getenv("FIGMA_API_BASE") or FIGMA_API_BASE).rstrip("/")
+        # 토큰별 Figma 요청 예산 (CLI/배치 작업과 상태 파일로 공유, 프리패치는 batch 우선순위)
+        self.rate_budget = default_budget()
+        # 도구 간에 주고받는 큰 데이터 보관소 (클라이언트에는 핸들만 전달)
+        self.data_store = DataStore.from_env()
+        # 가져온 Figma 데이터와 파일별 분석 결과 캐시 (prefetch_figma_file/watch_list로 미리 채움)
+        self.fetch_cache = TTLCache(_rules.prefetch_max_files, _rules.prefetch_cache_ttl)
+        self.analysis_cache = TTLCache(_rules.prefetch_max_files, _rules.prefetch_cache_ttl)
     
     def parse_figma_url(self, figma_url: str) -> dict:
         """Figma URL에서 파일 ID와 노드 ID 추출"""
@@ -90,18 +251,120 @@ class FigmaMCPServer:
                 "error": str(e)
             }
     
-    def fetch_figma_data(self, file_id: str, node_id: str = None) -> dict:
-        """Figma API에서 데이터 가져오기"""
+    def _fetch_key(self, file_id: str, node_id: str = None) -> tuple:
+        return (self.api_base, self.figma_token, file_id, node_id.replace('-', ':') if node_id else None)
+    
+    def fetch_figma_data(self, file_id: str, node_id: str = None, refresh: bool = False) -> dict:
+        """
+        Figma API에서 데이터 가져오기
+        
+        - 캐시(mcp_prefetch.cache_ttl_seconds 동안 유효)에 있으면 바로 반환, refresh=True면 다시 가져옴
+        - 같은 file_id/node_id 요청이 진행 중이면 그 결과를 함께 받음
+          (진행 중인 요청이 batch 우선순위여도 interactive 호출이 합류하면 interactive로 올려 batch_reserve에 막히지 않음)
+        - data는 호출자 간 공유되므로 수정하지 말 것
+        - 함께 받던 요청이 취소/마감으로 중단되면, 이 호출이 아직 유효한 경우 다시 가져옴
+        """
+        key = self._fetch_key(file_id, node_id)
+        if not refresh:
+            cached = self.fetch_cache.get(key)
+            if cached is not None:
+                return dict(cached)
+        while True:
+            try:
+                cell = PriorityCell(current_priority())
+                with rate_priority(cell):
+                    result, _ = FETCH_FLIGHTS.do(key, self._fetch_figma_data, file_id, node_id, state=cell)
+                break
+            except ToolInterrupted:
+                checkpoint()  # 이 호출이 중단된 것이면 그대로 전파, 다른 호출의 중단이면 재시도
+        if result.get("success"):
+            self.fetch_cache.put(key, result)
+        return dict(result)  # 바깥 dict만 호출자별로 복사 (call_tool이 data를 꺼내 핸들로 바꿈)
+    
+    def analyze_cached(self, key, figma_data: dict, part: str) -> dict:
+        """
+        파일별 분석 결과 재사용 (requirements/keywords/ui_structure)
+        
+        key는 fetch 캐시 키. 같은 키라도 데이터를 새로 가져왔으면 다시 계산하며, key가 None이면 캐시하지 않음.
+        """
+        method = getattr(self, _ANALYSIS_PARTS[part])
+        if key is None:
+            return method(figma_data)
+        entry = self.analysis_cache.get(key)
+        if entry is None or entry["data"] is not figma_data:
+            entry = {"data": figma_data, "parts": {}}
+            self.analysis_cache.put(key, entry)
+        if part not in entry["parts"]:
+            result = method(figma_data)
+            if result.get("partial"):
+                return result  # 마감으로 중간에 끊긴 결과는 캐시하지 않음
+            entry["parts"][part] = result
+        return dict(entry["parts"][part])  # 호출자가 결과 dict를 고쳐도 캐시는 그대로
+    
+    def prefetch_figma_file(self, figma_url: str, refresh: bool = False) -> dict:
+        """Figma 파일을 미리 가져와 데이터/분석 캐시를 채움 (이후 도구 호출은 캐시 사용)"""
+        started = time.perf_counter()
+        parsed = self.parse_figma_url(figma_url)
+        if not parsed.get("success") or not parsed.get("file_id"):
+            error = parsed.get("error") or "파일 ID를 찾을 수 없습니다"
+            return {"success": False, "figma_url": figma_url, "error": f"URL 파싱 실패: {error}"}
+        file_id, node_id = parsed["file_id"], parsed.get("node_id")
+        
+        data_result = self.fetch_figma_data(file_id, node_id, refresh=refresh)
+        if not data_result.get("success"):
+            return {"success": False, "figma_url": figma_url, "error": data_result.get("error")}
+        key = self._fetch_key(file_id, node_id)
+        for part in _ANALYSIS_PARTS:
+            self.analyze_cached(key, data_result["data"], part)
+        return {
+            "success": True,
+            "figma_url": figma_url,
+            "file_id": file_id,
+            "node_id": node_id,
+            "requirements_count": self.analyze_cached(key, data_result["data"], "requirements")["count"],
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+    
+    def warm_up(self) -> None:
+        """템플릿 레이아웃 미리 계산 (첫 Excel 저장 지연 제거)"""
+        if os.path.exists(TEMPLATE_PATH):
+            _mcp_template_layout(TEMPLATE_PATH)
+    
+    def _get_json(self, url: str, headers: dict) -> dict:
+        """GET 응답을 JSON으로 (본문을 나눠 읽으며 취소/마감 확인, 타임아웃은 남은 마감 시간 이내)"""
+        checkpoint()
+        budget_waits = []
+        started = time.perf_counter()
+        try:
+            with budgeted_get(self.rate_budget, self.figma_token, url, headers=headers, stream=True,
+                              timeout=lambda: remaining_time(REQUEST_TIMEOUT),
+                              on_wait=budget_waits.append) as response:
+                response.raise_for_status()
+                chunks = []
+                for chunk in response.iter_content(chunk_size=_FETCH_CHUNK_SIZE):
+                    checkpoint()
+                    chunks.append(chunk)
+        except requests.Timeout:
+            checkpoint()  # 마감 때문에 줄어든 타임아웃이면 DeadlineExceeded
+            raise
+        finally:
+            # 예산 대기는 rate_budget 대기 시간으로 따로 집계되므로 가져오기 시간에서 제외
+            METRICS.observe("mcp_phase_seconds", max(0.0, time.perf_counter() - started - sum(budget_waits)),
+                            phase="fetch")
+        body = b"".join(chunks)
+        METRICS.inc("mcp_figma_bytes_fetched_total", len(body))
+        with METRICS.time("mcp_phase_seconds", phase="parse"):
+            return json.loads(body)
+    
+    def _fetch_figma_data(self, file_id: str, node_id: str = None) -> dict:
         headers = {"X-Figma-Token": self.figma_token}
         
         try:
             if node_id:
                 # 노드 ID 형식 변환 (2-4 -> 2:4)
                 node_id_formatted = node_id.replace('-', ':')
-                url = f"https://api.figma.com/v1/files/{file_id}/nodes?ids={node_id_formatted}"
-                response = requests.get(url, headers=headers)
-                response.raise_for_status()
-                data = response.json()
+                url = f"{self.api_base}/files/{file_id}/nodes?ids={node_id_formatted}"
+                data = self._get_json(url, headers)
                 
                 if 'nodes' in data and node_id_formatted in data['nodes']:
                     return {
@@ -114,21 +377,17 @@ class FigmaMCPServer:
                     }
                 else:
                     # 특정 노드를 찾지 못한 경우 전체 파일 가져오기
-                    url = f"https://api.figma.com/v1/files/{file_id}"
-                    response = requests.get(url, headers=headers)
-                    response.raise_for_status()
+                    url = f"{self.api_base}/files/{file_id}"
                     return {
                         "success": True,
-                        "data": response.json(),
+                        "data": self._get_json(url, headers),
                         "note": f"Node {node_id_formatted} not found, returning full file"
                     }
             else:
-                url = f"https://api.figma.com/v1/files/{file_id}"
-                response = requests.get(url, headers=headers)
-                response.raise_for_status()
+                url = f"{self.api_base}/files/{file_id}"
                 return {
                     "success": True,
-                    "data": response.json()
+                    "data": self._get_json(url, headers)
                 }
         except Exception as e:
             return {
@@ -136,6 +395,7 @@ class FigmaMCPServer:
                 "error": str(e)
             }
     
+    @METRICS.time("mcp_phase_seconds", phase="traverse")
     def extract_requirements(self, figma_data: dict) -> dict:
         """Figma 데이터에서 요구사항 추출"""
         requirements = []
@@ -145,6 +405,7 @@ class FigmaMCPServer:
                 for node in nodes:
                     traverse_nodes(node)
             elif isinstance(nodes, dict):
+                checkpoint()
                 # 텍스트 노드에서 추출
                 if nodes.get('type') == 'TEXT' and 'characters' in nodes:
                     text = nodes['characters'].strip()
@@ -172,175 +433,41 @@ class FigmaMCPServer:
                 if 'children' in nodes:
                     traverse_nodes(nodes['children'])
         
+        partial = False
         if figma_data and 'document' in figma_data:
-            traverse_nodes(figma_data['document'].get('children', []))
+            try:
+                traverse_nodes(figma_data['document'].get('children', []))
+            except DeadlineExceeded:
+                partial = True  # 마감까지 찾은 요구사항만 반환
         
         # 중복 제거
         unique_requirements = self._deduplicate_requirements(requirements)
         
-        return {
+        result = {
             "success": True,
             "requirements": unique_requirements,
             "count": len(unique_requirements)
         }
+        if partial:
+            result["partial"] = True
+        return result
     
     def _is_requirement_text(self, text: str) -> bool:
-        """텍스트가 요구사항인지 판단"""
-        if not text or len(text) < 3 or len(text) > 1000:
-            return False
-        
-        requirement_keywords = [
-            '기능', '요구사항', '사용자', '시스템', '화면', '페이지', '버튼',
-            '클릭', '선택', '입력', '검색', '필터', '정렬', '스크롤',
-            '로그인', '회원가입', '로그아웃', '프로필', '설정', '알림',
-            '목록', '리스트', '카드', '메뉴', '탭', '모달', '팝업',
-            '등록', '수정', '삭제', '추가', '업데이트', '동기화',
-            '거래', '주문', '보유', '자산', '포트폴리오', '접근성', '표시', '대기',
-            '자산관리', '잔고', '잔액', '총자산', '수익률', '계좌', '지갑',
-            '입금', '출금', '이체', '매수', '매도', '체결', '미체결', '취소',
-            '차트', '그래프', '통계', '분석', '리포트', '히스토리', '거래내역',
-            '대시보드', '새로고침', '실시간', '진행중', '완료', '실패', '승인',
-            # 피그마에서 추출된 새로운 키워드들 (한국어)
-            '출금한도', '한도', '인증', '검증', '보호', '손실', '평균', '단가',
-            '수익', '자동매수', '주소록', '주소', '확인', '네트워크', '블록체인',
-            '시스템점검', '점검', '내역', '포지션', '손익', '실현', '보류',
-            '상태', '유지보수', '전환', '거래정지', '무기한', '스왑', '트리거',
-            '실행', '대기중', '부족', '한계', '제한', '활성화', '업그레이드',
-            'login', 'signup', 'profile', 'setting', 'notification',
-            'search', 'filter', 'sort', 'upload', 'download',
-            'button', 'click', 'tap', 'swipe', 'scroll',
-            'spot', 'holdings', 'accessibility', 'display', 'pending', 'order',
-            'asset', 'portfolio', 'wallet', 'balance', 'total', 'deposit',
-            'withdrawal', 'transfer', 'transaction', 'buy', 'sell', 'trade',
-            'exchange', 'swap', 'profit', 'loss', 'chart', 'graph', 'analytics',
-            'report', 'history', 'dashboard', 'refresh', 'realtime', 'processing',
-            # 피그마에서 추출된 새로운 키워드들 (영어)
-            'funds', 'available', 'APR', 'withdraw', 'limit', 'verification',
-            'protection', 'average', 'cost', 'recurring', 'address', 'book',
-            'confirm', 'network', 'blockchain', 'maintenance', 'position',
-            'realized', 'cancel', 'status', 'convertible', 'tradable', 'insufficient',
-            'icon', 'unfilled', 'filled', 'media', 'radio', 'document',
-            'container', 'collapse', 'detail', 'trend', 'mini', 'graphic',
-            'boosted', 'protected', 'effective', 'contracts', 'trigger',
-            'execution', 'awaiting', 'perpetual', 'activate', 'upgrades',
-            'instantly', 'additionally', 'tradeable', 'non-tradable',
-            # 노드 추출 기반 보강 키워드
-            'market order', 'trigger order', 'order preview', 'order confirmation', 'order form',
-            'trade settings', 'positions', 'available funds', 'schedule order', 'trigger time',
-            'cancel order', 'unrealized p&l', 'take profit', 'stop loss', 'close position',
-            'estimated total value', 'funding fee', 'funding payment', 'auto-deleveraging',
-            'trading limit tier', 'perpetual swap', 'picture-in-picture', 'order value', 'max order value',
-            'leverage', 'multi-position mode', 'open positions', 'view holdings', 'latest trade', 'top traders',
-            # Curated from latest Figma screen analysis
-            'tab', 'PnL', 'funding', 'trending', 'favorites',
-            'volume', 'symbol', 'banner', 'badge', 'calendar',
-            'long', 'short', 'perp', 'market', 'trading',
-            # Curated from second Figma screen analysis
-            'feed', 'news', 'insights', 'crypto', 'price', 'assets',
-            'schedule', 'vip', 'vipstatus',
-            'social', 'events', 'economic', 'government', 'user', 'menu',
-            # Curated from third Figma screen analysis (Earn/Staking features)
-            'stake', 'staked', 'pool', 'rewards',
-            'earnings', 'launchpool', 'convert', 'auction',
-            'sparks', 'reward', 'flipster', 'pixel', 'ton',
-            # Curated from fourth Figma screen analysis (Promotion/Referral hub)
-            'claimed', 'hub', 'bonus', 'promotion', 'promotions', 'tasks',
-            'complete', 'completed', 'learn', 'identity', 'first', 'referee',
-            'referral', 'link',
-            # Curated from fifth Figma screen analysis (Notifications/Settings)
-            'notifications', 'liquidation', 'liquidated',
-            'system', 'notified', 'alerts',
-            'action', 'announcement', 'currency', 'warning',
-            'reached', 'initial', 'avoid', 'successful', 'amount', 'application',
-            '경우', '특정', '모든',
-            # Curated from sixth Figma screen analysis (Comprehensive dashboard)
-            'program', 'league', 'tier', 'level', 'benefits',
-            'day', 'time', 'share', 'empty',
-            'secondary', 'choice', 'my', 'basic', 'logomark', 'cropped',
-            # Curated from seventh Figma screen analysis (Login/Signup/Registration)
-            'log', 'password', 'email', 'input', 'hint',
-            'placeholder', 'checkbox', 'terms', 'privacy', 'notice',
-            'create', 'code', 'zero', 'fast', 'pairs', 'data',
-            'services', 'sso', 'body', 'title',
-            # 🏆 UPDATED: Trading Competition은 랭킹 시스템 (NOT 티어 시스템)
-            # 랭킹 시스템 키워드 (한국어)
-            '랭킹', '순위', '리더보드', '1위', '2위', '3위', '순위표', '등수',
-            '상위권', '순위권', '꼴지', '순위변동', '순위상승', '순위하락',
-            '경쟁', '경쟁자', '대회', '참가', '참가자', '우승', '우승자',
-            '마일스톤', '달성', '목표', '진행률', '보상', '상금',
-            '최종순위', '순위별보상', '차등보상', '참가보상',
-            # 랭킹 시스템 키워드 (영어)
-            'ranking', 'rank', 'leaderboard', '1st', '2nd', '3rd', 'first', 'second', 'third',
-            'position', 'standing', 'top', 'bottom', 'rank up', 'rank down',
-            'competition', 'competitor', 'participant', 'winner', 'champion',
-            'milestone', 'achievement', 'goal', 'progress', 'reward', 'prize',
-            'final rank', 'rank-based', 'tier-free', 'dynamic ranking',
-            # 🌟 ADDED: VIP 티어 시스템 (User Membership)
-            # VIP 티어 시스템 키워드 (한국어)
-            'VIP', 'SVIP', 'vip', 'svip', '티어', '등급', '멤버십', '회원등급', '사용자등급',
-            '베이직', '실버', '골드', '플래티넘', '승급', '강등', '업그레이드', '다운그레이드',
-            '혜택', '특권', '할인', '수수료할인', '전용서비스', '우대서비스', '프리미엄',
-            '진행률', '달성률', '요구사항', '조건', '거래량기준', '수수료기준', '보유기간',
-            '티어배지', '등급표시', '멤버십카드', '승급진행률', '다음등급', '현재등급',
-            # VIP 티어 시스템 키워드 (영어)  
-            'vip', 'svip', 'premium', 'elite', 'exclusive', 'tier', 'grade', 'level', 'membership', 'status',
-            'basic', 'silver', 'gold', 'platinum', 'upgrade', 'downgrade', 'promotion', 'demotion',
-            'benefit', 'privilege', 'discount', 'fee discount', 'exclusive service', 'premium service',
-            'progress', 'achievement', 'requirement', 'criteria', 'trading volume', 'fee threshold', 'tenure',
-            'tier badge', 'grade display', 'membership card', 'upgrade progress', 'next tier', 'current tier'
-        ]
-        
-        exclude_keywords = [
-            'px', 'pt', 'rem', 'color', 'font', 'weight', 'size',
-            'margin', 'padding', 'border', 'shadow', 'opacity'
-        ]
-        
-        text_lower = text.lower()
-        if any(exclude in text_lower for exclude in exclude_keywords):
-            return False
-        
-        return any(keyword in text for keyword in requirement_keywords)
+        """텍스트가 요구사항인지 판단 (공유 분석 엔진)"""
+        return ANALYSIS_ENGINE.is_requirement_text(text)
     
     def _deduplicate_requirements(self, requirements: list) -> list:
         """중복 요구사항 제거"""
-        seen = set()
-        unique_requirements = []
-        
-        for req in requirements:
-            text_hash = req['text'].strip().lower()
-            if text_hash not in seen:
-                seen.add(text_hash)
-                unique_requirements.append(req)
-        
-        return unique_requirements
+        # 공백/번호/대소문자 차이만 있는 텍스트를 같은 요구사항으로 취급
+        # (요구사항 텍스트는 짧아 근사 중복 탐지는 오탐이 많으므로 사용하지 않음)
+        return deduplicate_testcases(requirements, key_fields=("text",), near_duplicates=False).testcases
     
     def generate_testcase_structure(self, requirement: dict, test_type: str = None) -> dict:
         """테스트케이스 구조 생성 (AI 없이 기본 템플릿)"""
         req_text = requirement.get('text', '')
         
-        # 기본 카테고리 분류 (업데이트: 랭킹 시스템 포함)
-        category = "일반기능"
-        if any(keyword in req_text.lower() for keyword in ['로그인', 'login', '인증', 'auth']):
-            category = "사용자인증"
-        elif any(keyword in req_text.lower() for keyword in ['프로필', 'profile', '사용자정보']):
-            category = "프로필관리"
-        elif any(keyword in req_text.lower() for keyword in ['알림', 'notification', '푸시']):
-            category = "알림시스템"
-        elif any(keyword in req_text.lower() for keyword in ['검색', 'search', '필터', 'filter']):
-            category = "검색기능"
-        elif any(keyword in req_text.lower() for keyword in ['랭킹', 'ranking', '순위', 'rank', '리더보드', 'leaderboard', '대회', 'competition']):
-            category = "랭킹시스템"
-        elif any(keyword in req_text.lower() for keyword in ['vip', 'svip', '티어', 'tier', '등급', 'grade', '멤버십', 'membership', '승급', 'upgrade']):
-            category = "VIP티어시스템"
-        
-        # 우선순위 분류 (업데이트: 랭킹 시스템 고려)
-        priority = "P2"
-        if any(keyword in req_text.lower() for keyword in ['로그인', '회원가입', '결제', '보안', '랭킹', 'ranking', '순위', 'rank', '대회', 'competition', 'vip', 'svip', '티어', 'tier', '멤버십', 'membership']):
-            priority = "P1"
-        elif any(keyword in req_text.lower() for keyword in ['설정', '프로필', '알림', '리더보드', 'leaderboard', '마일스톤', 'milestone', '등급', 'grade', '혜택', 'benefit']):
-            priority = "P2"
-        else:
-            priority = "P3"
+        # 카테고리/우선순위 분류 (랭킹/VIP 티어 포함, 텍스트 1회 스캔)
+        priority, category = REQUIREMENT_CLASSIFIER.classify(req_text)
         
         # 기본 테스트케이스 구조
         testcase = {
@@ -372,6 +499,31 @@ class FigmaMCPServer:
             "testcase": testcase
         }
     
+    @METRICS.time("mcp_phase_seconds", phase="generate")
+    def generate_testcases(self, requirements: list, test_type: str = None, figma_url: str = None) -> dict:
+        """요구사항 목록 전체의 테스트케이스 생성 (마감이 지나면 그때까지 만든 것만 partial로 반환)"""
+        test_cases = []
+        partial = False
+        try:
+            for req in requirements:
+                checkpoint()
+                tc_result = self.generate_testcase_structure(req, test_type)
+                if tc_result["success"]:
+                    if figma_url:
+                        tc_result["testcase"]["Figma_URL"] = figma_url
+                    test_cases.append(tc_result["testcase"])
+        except DeadlineExceeded:
+            partial = True
+        result = {
+            "success": True,
+            "testcases": test_cases,
+            "count": len(test_cases)
+        }
+        if partial:
+            result["partial"] = True
+        return result
+    
+    @METRICS.time("mcp_phase_seconds", phase="save")
     def save_to_excel(self, test_cases: list, filename: str = None, use_template: bool = True) -> dict:
         """테스트케이스를 Excel 파일로 저장 (X Oauth.xlsx 템플릿 사용 가능)"""
         if not test_cases:
@@ -381,7 +533,7 @@ class FigmaMCPServer:
             }
         
         if not filename:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")  # 동시 호출 시 파일명 충돌 방지
             filename = f"mcp_figma_testcases_{timestamp}.xlsx"
         
         try:
@@ -398,165 +550,36 @@ class FigmaMCPServer:
     
     def _save_with_template(self, test_cases: list, filename: str) -> dict:
         """X Oauth.xlsx 템플릿을 사용하여 저장"""
-        import openpyxl
-        from openpyxl.styles import Font, PatternFill
-        try:
-            # repo 구조에서 룰 설정을 재사용 (없으면 동작에 영향 없도록 예외 처리)
-            from src.utils.rules_config import load_rules_config, normalize_testcase_fields  # type: ignore
-            rules = load_rules_config()
-        except Exception:
-            rules = None
-            normalize_testcase_fields = None  # type: ignore
-        
         # 템플릿 파일 경로 (우선순위: web/app 템플릿 -> 기존 X Oauth.xlsx)
-        template_path = os.path.join("templates", "QA_Testcase_Template_WebApp.xlsx")
+        template_path = TEMPLATE_PATH
         
         try:
-            # 템플릿 파일 복사
-            wb = openpyxl.load_workbook(template_path)
-            ws = wb.active
+            # 템플릿 레이아웃(헤더/스타일/열너비)과 컬럼 매핑은 한 번만 계산하여 캐시
+            layout, sheet_name = _mcp_template_layout(template_path)
             
-            # 기존 데이터 제거 (헤더는 유지)
-            for row in range(2, ws.max_row + 1):
-                for col in range(1, ws.max_column + 1):
-                    ws.cell(row=row, column=col).value = None
-            
-            def _norm_header(s: str) -> str:
-                return "".join(ch for ch in (s or "").strip().lower() if ch.isalnum())
-
-            def _infer_template_columns(worksheet) -> dict:
-                """
-                템플릿 헤더(1행)를 기반으로 컬럼 매핑을 동적으로 추론.
-                - 기존 템플릿(android/ios) + 신규 템플릿(web/app) 모두 지원
-                """
-                header_row = 1
-                inferred = {}
-                for col in range(1, worksheet.max_column + 1):
-                    header_val = worksheet.cell(row=header_row, column=col).value
-                    if not header_val:
-                        continue
-                    key = _norm_header(str(header_val))
-                    inferred[key] = openpyxl.utils.get_column_letter(col)
-                return inferred
-
-            inferred_headers = _infer_template_columns(ws)
-
-            # fallback: 기존 X Oauth.xlsx 템플릿 컬럼 매핑
-            fallback_columns = {
-                "domain": "A",
-                "section": "B",
-                "component": "C",
-                "feature": "D",
-                "title": "E",
-                "precondition": "F",
-                "teststep": "G",
-                "expectedresults": "H",
-                "priority": "I",
-                "type": "J",
-                "comment": "K",
-                "androidresult": "L",
-                "iosresult": "M",
-            }
-            
-            # 데이터 매핑 및 변환
-            converted_cases = []
-            for i, case in enumerate(test_cases):
-                converted_case = self._convert_to_template_format(case, i)
-                # 룰세팅 alias 정규화 (test_steps->test_step, android/ios->app_result 등)
-                if rules and normalize_testcase_fields:
-                    converted_case = normalize_testcase_fields(converted_case, rules.field_aliases)
-                converted_cases.append(converted_case)
-            
-            # 데이터 입력
-            for row_idx, case in enumerate(converted_cases, start=2):
-                # 헤더 기반 매핑 우선, 없으면 fallback 사용
-                col_domain = inferred_headers.get("domain", fallback_columns["domain"])
-                col_section = inferred_headers.get("section", fallback_columns["section"])
-                col_component = inferred_headers.get("component", inferred_headers.get("component", fallback_columns["component"]))
-                col_feature = inferred_headers.get("feature", fallback_columns["feature"])
-                col_title = inferred_headers.get("title", fallback_columns["title"])
-                col_precondition = inferred_headers.get("precondition", fallback_columns["precondition"])
-                col_test_step = inferred_headers.get("teststep", fallback_columns["teststep"])
-                col_expected = inferred_headers.get("expectedresults", fallback_columns["expectedresults"])
-                col_priority = inferred_headers.get("priority", fallback_columns["priority"])
-                col_type = inferred_headers.get("type", fallback_columns["type"])
-                col_comment = inferred_headers.get("comment", fallback_columns["comment"])
-                col_web_result = inferred_headers.get("webresult")
-                col_app_result = inferred_headers.get("appresult")
-                col_android = inferred_headers.get("androidresult", fallback_columns["androidresult"])
-                col_ios = inferred_headers.get("iosresult", fallback_columns["iosresult"])
-
-                # domain
-                ws[f'{col_domain}{row_idx}'].value = case.get('domain', '') or ""
-                ws[f'{col_domain}{row_idx}'].font = Font(name='맑은 고딕')
-                
-                # section (플로우 타입)
-                ws[f'{col_section}{row_idx}'].value = case.get('section', '')
-                ws[f'{col_section}{row_idx}'].font = Font(name='맑은 고딕')
-                
-                # Component (스크린 정보)
-                ws[f'{col_component}{row_idx}'].value = case.get('component', '')
-                ws[f'{col_component}{row_idx}'].font = Font(name='맑은 고딕')
-                
-                # Feature (기능)
-                ws[f'{col_feature}{row_idx}'].value = case.get('feature', '')
-                ws[f'{col_feature}{row_idx}'].font = Font(name='맑은 고딕')
-                
-                # title (제목)
-                ws[f'{col_title}{row_idx}'].value = case.get('title', '')
-                ws[f'{col_title}{row_idx}'].font = Font(name='맑은 고딕')
-                
-                # precondition (사전조건)
-                ws[f'{col_precondition}{row_idx}'].value = case.get('precondition', '')
-                ws[f'{col_precondition}{row_idx}'].font = Font(name='맑은 고딕')
-                
-                # Test step (테스트 절차)
-                ws[f'{col_test_step}{row_idx}'].value = case.get('test_step', case.get('test_steps', ''))
-                ws[f'{col_test_step}{row_idx}'].font = Font(name='맑은 고딕')
-                
-                # Expected-results (기대 결과)
-                ws[f'{col_expected}{row_idx}'].value = case.get('expected_results', '')
-                ws[f'{col_expected}{row_idx}'].font = Font(name='맑은 고딕')
-                
-                # Priority (우선순위)
-                ws[f'{col_priority}{row_idx}'].value = case.get('priority', 'P2')
-                ws[f'{col_priority}{row_idx}'].font = Font(name='맑은 고딕')
-                
-                # type (테스트 타입)
-                ws[f'{col_type}{row_idx}'].value = case.get('type', 'Functional')
-                ws[f'{col_type}{row_idx}'].font = Font(name='맑은 고딕')
-                
-                # comment (비고)
-                ws[f'{col_comment}{row_idx}'].value = case.get('comment', '')
-                ws[f'{col_comment}{row_idx}'].font = Font(name='맑은 고딕')
-
-                # 결과 컬럼 (web/app이 있으면 우선 채우고, 없으면 android/ios 템플릿 대응)
-                if col_web_result:
-                    ws[f'{col_web_result}{row_idx}'].value = case.get('web_result', '')
-                    ws[f'{col_web_result}{row_idx}'].font = Font(name='맑은 고딕')
-                if col_app_result:
-                    ws[f'{col_app_result}{row_idx}'].value = case.get('app_result', '')
-                    ws[f'{col_app_result}{row_idx}'].font = Font(name='맑은 고딕')
-                else:
-                    ws[f'{col_android}{row_idx}'].value = ''
-                    ws[f'{col_android}{row_idx}'].font = Font(name='맑은 고딕')
-                    ws[f'{col_ios}{row_idx}'].value = ''
-                    ws[f'{col_ios}{row_idx}'].font = Font(name='맑은 고딕')
+            # 데이터 매핑 및 변환 (룰세팅 alias 정규화: test_steps->test_step, android/ios->app_result 등)
+            field_aliases = _rules.field_aliases
+            rows = checked(
+                normalize_testcase_fields(self._convert_to_template_format(case, i), field_aliases)
+                for i, case in enumerate(test_cases)
+            )
             
-            # 파일 저장
-            wb.save(filename)
-            wb.close()
+            # 템플릿 레이아웃 아래에 데이터 행 스트리밍 기록 (예시 행은 복사하지 않으므로 시트 초기화 불필요)
+            # 임시 파일에 쓰고 끝나면 교체하므로 취소/마감으로 중단되어도 불완전한 파일이 남지 않음
+            with atomic_output(filename) as tmp_path:
+                count = write_xlsx(rows, tmp_path, layout, sheet_name=sheet_name)
             
             return {
                 "success": True,
                 "filename": filename,
-                "count": len(test_cases),
+                "count": count,
                 "template_used": "X Oauth.xlsx"
             }
             
         except FileNotFoundError:
             # 신규 템플릿이 없으면 기존 템플릿(X Oauth.xlsx) 시도, 그것도 없으면 기본 형식으로 저장
             try:
+                import openpyxl
                 template_path = "X Oauth.xlsx"
                 wb = openpyxl.load_workbook(template_path)
                 wb.close()
@@ -627,7 +650,9 @@ class FigmaMCPServer:
         existing_columns = [col for col in column_order if col in df.columns]
         df = df[existing_columns]
         
-        df.to_excel(filename, index=False, sheet_name='테스트케이스')
+        checkpoint()
+        with atomic_output(filename) as tmp_path:
+            df.to_excel(tmp_path, index=False, sheet_name='테스트케이스')
         
         return {
             "success": True,
@@ -635,8 +660,113 @@ class FigmaMCPServer:
             "count": len(test_cases)
         }
     
-    def enhanced_figma_analysis(self, figma_url: str, include_screenshot: bool = True) -> dict:
-        """향상된 Figma 분석 - 키워드 기반 + 스크린샷 유저플로우 분석"""
+    def process_figma_link(self, figma_url: str, test_type: str = None, progress=None,
+                           batch_size: int = PARTIAL_BATCH_SIZE, refresh: bool = False) -> dict:
+        """
+        Figma 링크 전체 프로세스 (URL 파싱 -> 데이터 -> 요구사항 -> 테스트케이스 -> Excel)
+        
+        progress: 단계가 끝날 때마다 호출되는 콜백 (이벤트 dict: phase/progress/total/message,
+                  생성 단계는 batch_size개씩 만든 테스트케이스를 testcases로 함께 전달)
+        batch_size: 생성 단계 배치 크기 (1 미만이면 1)
+        refresh: True면 캐시를 무시하고 Figma 데이터를 다시 가져옴
+        
+        Excel 저장에 실패하면 success=False와 함께 생성한 테스트케이스를 testcases_handle로 보관
+        """
+        batch_size = max(1, int(batch_size or PARTIAL_BATCH_SIZE))
+        def report(phase: str, message: str, fraction: float = 1.0, **extra):
+            if progress is not None:
+                progress({"phase": phase, "progress": PROCESS_PHASES.index(phase) + fraction,
+                          "total": len(PROCESS_PHASES), "message": message, **extra})
+        
+        # 1. URL 파싱
+        url_result = self.parse_figma_url(figma_url)
+        if not url_result["success"]:
+            return {"success": False, "error": "URL 파싱 실패"}
+        report("parse", f"URL 파싱 완료 (파일 {url_result['file_id']})")
+        
+        # 2. Figma 데이터 가져오기
+        data_result = self.fetch_figma_data(
+            url_result["file_id"], 
+            url_result.get("node_id"),
+            refresh=refresh
+        )
+        if not data_result["success"]:
+            return {"success": False, "error": "Figma 데이터 가져오기 실패"}
+        report("fetch", "Figma 데이터 가져오기 완료")
+        
+        # 3. 요구사항 추출
+        fetch_key = self._fetch_key(url_result["file_id"], url_result.get("node_id"))
+        req_result = self.analyze_cached(fetch_key, data_result["data"], "requirements")
+        if not req_result["success"]:
+            return {"success": False, "error": "요구사항 추출 실패"}
+        requirements = req_result["requirements"]
+        report("extract", f"요구사항 {len(requirements)}개 추출", requirements_count=len(requirements))
+        
+        if req_result.get("partial"):
+            return self._partial_process_result(figma_url, requirements, [])
+        
+        # 4. 테스트케이스 생성 (batch_size개씩 생성해 부분 결과 보고)
+        test_cases = []
+        for start in range(0, len(requirements), batch_size):
+            chunk = requirements[start:start + batch_size]
+            generated = self.generate_testcases(chunk, test_type, figma_url)
+            batch = generated["testcases"]
+            test_cases.extend(batch)
+            done = start + len(batch) if generated.get("partial") else start + len(chunk)
+            report("generate", f"테스트케이스 생성 {done}/{len(requirements)}", done / len(requirements),
+                   testcases=batch)
+            if generated.get("partial"):
+                return self._partial_process_result(figma_url, requirements, test_cases)
+        
+        if not test_cases:
+            return {"success": False, "error": "테스트케이스 생성 실패"}
+        
+        # 5. Excel 저장 (템플릿 사용)
+        try:
+            save_result = self.save_to_excel(test_cases, use_template=True)
+        except DeadlineExceeded:
+            return self._partial_process_result(figma_url, requirements, test_cases)
+        if not save_result.get("success"):
+            return {
+                "success": False,
+                "error": f"Excel 저장 실패: {save_result.get('error')}",
+                "requirements_count": len(requirements),
+                "testcases_count": len(test_cases),
+                "testcases_handle": self.data_store.put("testcases", test_cases),
+                "figma_url": figma_url,
+            }
+        report("save", f"Excel 저장 완료 ({save_result.get('filename')})")
+        return {
+            "success": True,
+            "requirements_count": len(req_result["requirements"]),
+            "testcases_count": len(test_cases),
+            "filename": save_result.get("filename"),
+            "template_used": save_result.get("template_used"),
+            "figma_url": figma_url
+        }
+    
+    def _partial_process_result(self, figma_url: str, requirements: list, test_cases: list) -> dict:
+        """마감으로 중단된 process_figma_link 결과 (그때까지 만든 데이터는 핸들로 보관, Excel은 저장하지 않음)"""
+        result = {
+            "success": True,
+            "partial": True,
+            "requirements_count": len(requirements),
+            "testcases_count": len(test_cases),
+            "filename": None,
+            "requirements_handle": self.data_store.put("requirements", requirements),
+            "figma_url": figma_url,
+        }
+        if test_cases:
+            result["testcases_handle"] = self.data_store.put("testcases", test_cases)
+        return result
+    
+    def enhanced_figma_analysis(self, figma_url: str, include_screenshot: bool = True,
+                                figma_data: dict = None, refresh: bool = False) -> dict:
+        """
+        향상된 Figma 분석 - 키워드 기반 + 스크린샷 유저플로우 분석
+        
+        figma_data가 있으면 다시 가져오지 않음, refresh=True면 캐시를 무시하고 다시 가져옴
+        """
         
         try:
             # 1. URL 파싱
@@ -647,23 +777,26 @@ class FigmaMCPServer:
             file_id = parsed.get("file_id")
             node_id = parsed.get("node_id")
             
-            # 2. Figma 데이터 가져오기
-            data_result = self.fetch_figma_data(file_id, node_id)
-            if not data_result.get("success"):
-                return {"success": False, "error": f"데이터 가져오기 실패: {data_result.get('error')}"}
-            
-            figma_data = data_result.get("data", {})
+            # 2. Figma 데이터 가져오기 (직접 가져온 데이터의 분석 결과는 파일별로 캐시)
+            fetch_key = None
+            if figma_data is None:
+                data_result = self.fetch_figma_data(file_id, node_id, refresh=refresh)
+                if not data_result.get("success"):
+                    return {"success": False, "error": f"데이터 가져오기 실패: {data_result.get('error')}"}
+                
+                figma_data = data_result.get("data", {})
+                fetch_key = self._fetch_key(file_id, node_id)
             
             # 3. 기본 키워드 분석
-            basic_requirements = self.extract_requirements(figma_data)
+            basic_requirements = self.analyze_cached(fetch_key, figma_data, "requirements")
             if not basic_requirements.get("success"):
                 return {"success": False, "error": "키워드 분석 실패"}
             
             # 4. 향상된 키워드 분석
-            enhanced_keywords = self._analyze_enhanced_keywords(figma_data)
+            enhanced_keywords = self.analyze_cached(fetch_key, figma_data, "keywords")
             
             # 5. UI 구조 분석
-            ui_analysis = self._analyze_ui_structure(figma_data)
+            ui_analysis = self.analyze_cached(fetch_key, figma_data, "ui_structure")
             
             # 6. 유저플로우 분석
             flow_analysis = self._analyze_user_flow(enhanced_keywords, ui_analysis)
@@ -676,7 +809,7 @@ class FigmaMCPServer:
             # 8. 권장사항 생성
             recommendations = self._generate_recommendations(enhanced_keywords, ui_analysis, flow_analysis)
             
-            return {
+            result = {
                 "success": True,
                 "file_info": {
                     "file_id": file_id,
@@ -702,202 +835,26 @@ class FigmaMCPServer:
                     "ui_complexity": ui_analysis.get("ui_complexity", "medium")
                 }
             }
+            if any(part.get("partial") for part in (basic_requirements, enhanced_keywords, ui_analysis)):
+                result["partial"] = True  # 마감까지 순회한 노드만 반영
+            return result
             
         except Exception as e:
             return {"success": False, "error": f"향상된 분석 실패: {str(e)}"}
     
+    @METRICS.time("mcp_phase_seconds", phase="traverse")
     def _analyze_enhanced_keywords(self, figma_data: dict) -> dict:
-        """향상된 키워드 분석"""
-        
-        # UI 패턴 정의 (업데이트: 랭킹 시스템 추가)
-        ui_patterns = {
-            "navigation": {
-                "keywords": ["nav", "menu", "tab", "breadcrumb", "back", "next", "home"],
-                "flow_type": "navigation"
-            },
-            "authentication": {
-                "keywords": ["login", "signup", "register", "signin", "oauth", "auth", "password"],
-                "flow_type": "auth_flow"
-            },
-            "form_input": {
-                "keywords": ["input", "field", "form", "textfield", "submit", "save", "cancel"],
-                "flow_type": "form_interaction"
-            },
-            "modal_popup": {
-                "keywords": ["modal", "popup", "dialog", "overlay", "confirm", "alert"],
-                "flow_type": "modal_flow"
-            },
-            "transaction": {
-                "keywords": ["buy", "sell", "trade", "order", "payment", "checkout", "confirm"],
-                "flow_type": "transaction_flow"
-            },
-            "social": {
-                "keywords": ["share", "like", "follow", "comment", "social", "connect"],
-                "flow_type": "social_interaction"
-            },
-            "settings": {
-                "keywords": ["settings", "preferences", "profile", "account", "config"],
-                "flow_type": "settings_flow"
-            },
-            "ranking_system": {
-                "keywords": ["ranking", "rank", "leaderboard", "position", "competition", "1st", "2nd", "3rd", "순위", "랭킹", "리더보드", "대회", "경쟁"],
-                "flow_type": "ranking_competition"
-            },
-            "vip_tier_system": {
-                "keywords": ["vip", "svip", "tier", "grade", "membership", "premium", "upgrade", "benefit", "privilege", "티어", "등급", "멤버십", "승급", "혜택"],
-                "flow_type": "vip_membership"
-            }
-        }
-        
-        texts = []
-        names = []
-        
-        def traverse_nodes(nodes, depth=0):
-            if isinstance(nodes, list):
-                for node in nodes:
-                    traverse_nodes(node, depth)
-            elif isinstance(nodes, dict):
-                node_type = nodes.get('type')
-                node_name = nodes.get('name', '')
-                
-                if node_type == 'TEXT' and 'characters' in nodes:
-                    text = nodes['characters'].strip()
-                    if text:
-                        texts.append({"text": text, "depth": depth})
-                
-                if node_type in ['FRAME', 'COMPONENT', 'INSTANCE'] and node_name:
-                    names.append({"name": node_name, "type": node_type.lower(), "depth": depth})
-                
-                if 'children' in nodes:
-                    traverse_nodes(nodes['children'], depth + 1)
-        
-        traverse_nodes(figma_data.get('document', {}).get('children', []))
-        
-        # 모든 텍스트 결합
-        all_text = " ".join([t["text"] for t in texts] + [n["name"] for n in names])
-        
-        # UI 패턴 매칭
-        detected_patterns = {}
-        for pattern_name, pattern_info in ui_patterns.items():
-            keywords = pattern_info["keywords"]
-            matches = sum(1 for keyword in keywords if keyword.lower() in all_text.lower())
-            if matches > 0:
-                detected_patterns[pattern_name] = {
-                    "matches": matches,
-                    "flow_type": pattern_info["flow_type"],
-                    "confidence": min(matches * 20, 100)
-                }
-        
-        return {
-            "texts": texts,
-            "names": names,
-            "detected_patterns": detected_patterns,
-            "total_elements": len(texts) + len(names)
-        }
+        """향상된 키워드 분석 (공유 분석 엔진, 마감 시 모은 텍스트/이름으로 패턴 매칭)"""
+        return ANALYSIS_ENGINE.analyze_keywords(figma_data)
     
+    @METRICS.time("mcp_phase_seconds", phase="traverse")
     def _analyze_ui_structure(self, figma_data: dict) -> dict:
-        """UI 구조 분석"""
-        
-        ui_elements = {
-            "buttons": [],
-            "inputs": [],
-            "navigation": [],
-            "containers": []
-        }
-        
-        layout_info = {
-            "depth_levels": 0,
-            "max_children": 0,
-            "component_count": 0
-        }
-        
-        def analyze_node(node, depth=0):
-            if isinstance(node, dict):
-                node_type = node.get('type', '')
-                node_name = node.get('name', '').lower()
-                
-                layout_info["depth_levels"] = max(layout_info["depth_levels"], depth)
-                
-                # UI 요소 분류
-                if 'button' in node_name or 'btn' in node_name:
-                    ui_elements["buttons"].append({"name": node.get('name', ''), "depth": depth})
-                elif any(keyword in node_name for keyword in ['input', 'field', 'textfield']):
-                    ui_elements["inputs"].append({"name": node.get('name', ''), "depth": depth})
-                elif any(keyword in node_name for keyword in ['nav', 'menu', 'tab']):
-                    ui_elements["navigation"].append({"name": node.get('name', ''), "depth": depth})
-                elif node_type in ['FRAME', 'GROUP']:
-                    ui_elements["containers"].append({"name": node.get('name', ''), "depth": depth})
-                
-                if node_type in ['COMPONENT', 'INSTANCE']:
-                    layout_info["component_count"] += 1
-                
-                children = node.get('children', [])
-                if children:
-                    layout_info["max_children"] = max(layout_info["max_children"], len(children))
-                    for child in children:
-                        analyze_node(child, depth + 1)
-        
-        for child in figma_data.get('document', {}).get('children', []):
-            analyze_node(child)
-        
-        # UI 복잡도 계산
-        total_elements = sum(len(elements) for elements in ui_elements.values())
-        complexity_score = total_elements + layout_info["depth_levels"] * 2 + layout_info["component_count"]
-        
-        if complexity_score < 20:
-            ui_complexity = "low"
-        elif complexity_score < 50:
-            ui_complexity = "medium"
-        else:
-            ui_complexity = "high"
-        
-        return {
-            "ui_elements": ui_elements,
-            "layout_info": layout_info,
-            "ui_complexity": ui_complexity
-        }
+        """UI 구조 분석 (공유 분석 엔진)"""
+        return ANALYSIS_ENGINE.analyze_ui_structure(figma_data)
     
     def _analyze_user_flow(self, keyword_analysis: dict, ui_analysis: dict) -> dict:
-        """유저플로우 분석"""
-        
-        detected_patterns = keyword_analysis.get("detected_patterns", {})
-        ui_elements = ui_analysis.get("ui_elements", {})
-        
-        # 플로우 단계 추론
-        flow_steps = []
-        
-        if "authentication" in detected_patterns:
-            flow_steps.append("사용자 인증")
-        else:
-            flow_steps.append("화면 진입")
-        
-        if ui_elements.get("inputs"):
-            flow_steps.append("정보 입력")
-        
-        if ui_elements.get("buttons"):
-            button_count = len(ui_elements["buttons"])
-            if button_count == 1:
-                flow_steps.append("액션 실행")
-            else:
-                flow_steps.append("옵션 선택")
-        
-        flow_steps.append("결과 확인")
-        
-        # 주요 플로우 타입 결정
-        primary_flow_type = "general"
-        max_confidence = 0
-        
-        for pattern_name, pattern_info in detected_patterns.items():
-            if pattern_info["confidence"] > max_confidence:
-                max_confidence = pattern_info["confidence"]
-                primary_flow_type = pattern_info["flow_type"]
-        
-        return {
-            "flow_steps": flow_steps,
-            "primary_flow_type": primary_flow_type,
-            "confidence": max_confidence,
-            "complexity": ui_analysis.get("ui_complexity", "medium")
-        }
+        """유저플로우 분석 (공유 분석 엔진)"""
+        return ANALYSIS_ENGINE.analyze_user_flow(keyword_analysis, ui_analysis)
     
     def _analyze_screenshot(self, file_id: str, node_id: str = None) -> dict:
         """스크린샷 분석 (간단버전)"""
@@ -907,11 +864,12 @@ class FigmaMCPServer:
             
             if node_id:
                 node_id_formatted = node_id.replace('-', ':')
-                image_url = f"https://api.figma.com/v1/images/{file_id}?ids={node_id_formatted}&format=png&scale=1"
+                image_url = f"{self.api_base}/images/{file_id}?ids={node_id_formatted}&format=png&scale=1"
             else:
                 return {"success": False, "error": "노드 ID 필요"}
             
-            response = requests.get(image_url, headers=headers)
+            response = budgeted_get(self.rate_budget, self.figma_token, image_url, headers=headers,
+                                    timeout=lambda: remaining_time(REQUEST_TIMEOUT))
             response.raise_for_status()
             
             image_data = response.json()
@@ -919,7 +877,8 @@ class FigmaMCPServer:
             if 'images' in image_data and image_data['images']:
                 image_urls = list(image_data['images'].values())
                 if image_urls and image_urls[0]:
-                    image_response = requests.get(image_urls[0])
+                    checkpoint()
+                    image_response = requests.get(image_urls[0], timeout=remaining_time(REQUEST_TIMEOUT))
                     image_response.raise_for_status()
                     
                     image_size = len(image_response.content)
@@ -970,20 +929,429 @@ class FigmaMCPServer:
         
         return recommendations
 
-# MCP 서버 설정
-if MCP_AVAILABLE:
-    server = Server("figma-testcase-generator")
+# ========== 도구 실행 (이벤트 루프 밖에서 실행, 도구별 실행 프로파일) ==========
+
+# inline: 가벼운 계산 / io: Figma API 대기 위주 (스레드 풀) / cpu: 노드 순회·엑셀 기록 (프로세스 풀)
+TOOL_PROFILES = {
+    "parse_figma_url": "inline",
+    "fetch_figma_data": "io",
+    "extract_requirements": "cpu",
+    "generate_testcase": "inline",  # requirements_handle로 목록 전체를 생성할 때는 io
+    "save_to_excel": "cpu",
+    "process_figma_link": "io",
+    "enhanced_figma_analysis": "io",
+    "release_handle": "inline",
+    "prefetch_figma_file": "io",
+    "server_stats": "inline",
+}
+
+# 목록이 큰 도구: 도구 -> (결과를 보관하는 핸들 종류, 전체 목록을 요청하는 옵션, 핸들 값 안에서 페이지를 나눌 목록 경로)
+# (요구사항/테스트케이스 핸들은 목록 자체를 보관하므로 경로가 비어 있음)
+_UI_ELEMENT_PATHS = tuple(("enhanced_analysis", "ui_structure", "ui_elements", kind)
+                          for kind in ("buttons", "inputs", "navigation", "containers"))
+PAGINATED_TOOLS = {
+    "extract_requirements": ("requirements", "include_requirements", ((),)),
+    "generate_testcase": ("testcases", "include_testcases", ((),)),
+    "enhanced_figma_analysis": ("analysis", "include_requirements", (
+        ("basic_analysis", "requirements"),
+        ("enhanced_analysis", "keywords", "texts"),
+        ("enhanced_analysis", "keywords", "names"),
+    ) + _UI_ELEMENT_PATHS),
+}
+# top-k 요약 시 빈도를 세는 필드 (목록 이름 기준)
+_TOP_K_FIELDS = {"requirements": "text", "texts": "text", "names": "name",
+                 "buttons": "name", "inputs": "name", "navigation": "name", "containers": "name"}
+
+_worker_server = None
+
+
+def _init_tool_worker(api_base: str) -> None:
+    """cpu 프로세스 풀 워커 초기화: 서버 인스턴스를 워커당 한 번만 구성"""
+    global _worker_server
+    METRICS.pop_state()  # start_method=fork로 복사된 주 프로세스 집계는 버림 (워커 집계만 돌려보냄)
+    _worker_server = FigmaMCPServer(api_base=api_base)
+    _worker_server.warm_up()
+
+
+def _run_in_worker(method: str, *args):
+    """
+    워커에서 서버 메소드 실행 (호출의 취소/마감은 ToolExecutor가 워커 쪽 토큰으로 전달)
     
+    Returns:
+        (결과, 워커에서 집계한 계측값) - 계측값은 주 프로세스의 METRICS에 합침
+    """
+    return getattr(_worker_server, method)(*args), METRICS.pop_state()
+
+
+def create_tool_executor(figma_server: FigmaMCPServer) -> ToolExecutor:
+    """환경변수(MCP_MAX_CONCURRENCY/MCP_IO_WORKERS/MCP_CPU_WORKERS/MCP_BACKGROUND_CONCURRENCY) 기반 도구 실행기"""
+    return ToolExecutor.from_env(cpu_initializer=_init_tool_worker, cpu_initargs=(figma_server.api_base,))
+
+
+def _resolve_argument(store: DataStore, arguments: dict, inline_key: str, handle_key: str, kind: str):
+    """인라인 데이터 또는 핸들로 전달된 입력값"""
+    if arguments.get(handle_key):
+        return store.get(arguments[handle_key], kind)
+    if inline_key in arguments:
+        return arguments[inline_key]
+    raise HandleError(f"{inline_key} 또는 {handle_key}가 필요합니다.")
+
+
+def _store_list(store: DataStore, result: dict, kind: str, limit, top_k) -> dict:
+    """결과의 목록을 저장소에 보관하고 핸들 + 첫 페이지(+ top-k 요약)로 교체 (limit=None이면 목록 전체 유지)"""
+    items = result.get(kind) or []
+    handle = result[f"{kind}_handle"] = store.put(kind, items)
+    if top_k:
+        result[f"{kind}_summary"] = _summarize_cases(items, kind, top_k)
+    if limit is not None and len(items) > limit:
+        result.update(page(items, handle, (), 0, limit, key=kind))
+    return result
+
+
+def _summarize_cases(items: list, kind: str, k: int) -> dict:
+    """요구사항/테스트케이스 top-k 요약: 우선순위/카테고리별 수 + 우선순위가 높은 k개"""
+    if kind == "requirements":
+        classified = [(REQUIREMENT_CLASSIFIER.classify(item.get("text", "")), item) for item in items]
+    else:
+        classified = [((item.get("우선순위", ""), item.get("카테고리", "")), item) for item in items]
+    ranked = sorted(classified, key=lambda entry: entry[0][0])  # P1 < P2 < ... (같은 우선순위는 원래 순서)
+    return {
+        "total": len(items),
+        "priority_counts": dict(Counter(priority for (priority, _), _ in classified)),
+        "category_counts": dict(Counter(category for (_, category), _ in classified)),
+        "top": [{**item, "priority": priority} for (priority, _), item in ranked[:k]],
+    }
+
+
+def _summarize_lists(source: dict, response: dict, paths, k: int) -> None:
+    """원본 분석 결과의 목록마다 빈도 상위 k개 요약을 응답 사본(paginate() 결과)에 <목록>_summary로 추가"""
+    for path in paths:
+        try:
+            items = get_path(source, path)
+        except (KeyError, TypeError):
+            continue
+        get_path(response, path[:-1])[f"{path[-1]}_summary"] = top_values(items, _TOP_K_FIELDS[path[-1]], k)
+
+
+def _page_from_cursor(store: DataStore, name: str, arguments: dict) -> dict:
+    """cursor로 요청한 다음 페이지 (도구를 다시 실행하지 않고 보관한 결과에서 잘라 반환)"""
+    kind, _, paths = PAGINATED_TOOLS[name]
+    handle, path, offset = decode_cursor(arguments["cursor"])
+    if path not in paths:
+        raise ValueError(f"이 도구의 커서가 아닙니다: {arguments['cursor']}")
+    items = get_path(store.get(handle, kind), path)
+    key = path[-1] if path else kind
+    return {"success": True, f"{kind}_handle": handle, "offset": offset,
+            **page(items, handle, path, offset, page_limit(arguments.get("limit")), key=key)}
+
+
+def encode_result(result: dict) -> str:
+    """도구 결과 JSON 텍스트 (기본은 공백 없는 compact 형식, MCP_PRETTY_JSON=1이면 들여쓰기)"""
+    if os.getenv("MCP_PRETTY_JSON", "").lower() in ("1", "true", "yes"):
+        return json.dumps(result, ensure_ascii=False, indent=2)
+    return json.dumps(result, ensure_ascii=False, separators=(",", ":"))
+
+
+def _figma_summary(figma_data: dict) -> dict:
+    document = figma_data.get("document") or {}
+    return {
+        "name": figma_data.get("name"),
+        "pages": [child.get("name") for child in document.get("children", [])][:20],
+    }
+
+
+async def call_tool(figma_server: FigmaMCPServer, executor: ToolExecutor, name: str, arguments: dict,
+                    progress=None) -> dict:
+    """
+    도구 호출을 실행 프로파일에 맞는 풀에서 실행하고 결과 dict 반환
+
+    - 큰 결과(Figma 문서, 요구사항/테스트케이스 목록, 분석 결과)는 저장소에 보관하고 *_handle 반환
+    - 입력은 인라인 데이터(figma_data/requirement/test_cases) 또는 핸들(data_handle/requirements_handle/
+      testcases_handle) 중 하나
+    - progress: process_figma_link 진행 이벤트 콜백 (풀 스레드에서 호출되므로 스레드 안전해야 함)
+    - deadline_ms(또는 MCP_DEFAULT_DEADLINE_MS)가 지나면 단계별 부분 결과(partial)를 반환하거나,
+      부분 결과가 없는 단계면 interrupted="deadline" 오류 반환
+    - 호출 작업이 취소되면 (클라이언트 취소 알림) 풀에서 실행 중인 작업도 다음 확인 지점에서 중단
+    """
+    token = CancelToken.from_deadline_ms(arguments.get("deadline_ms") or DEFAULT_DEADLINE_MS)
+    reset = set_token(token)  # executor.run이 컨텍스트를 풀 스레드로 복사
+    tool = name if name in TOOL_PROFILES else "unknown"
+    outcome = "error"
+    started = time.perf_counter()
+    METRICS.add_gauge("mcp_tool_in_flight", 1, tool=tool)
     try:
-        figma_server = FigmaMCPServer()
-    except ValueError as e:
-        print(f"❌ 서버 초기화 실패: {e}")
-        sys.exit(1)
+        result = await _call_tool(figma_server, executor, name, arguments, progress)
+        if result.get("success"):
+            outcome = "partial" if result.get("partial") else "ok"
+        return result
+    except asyncio.CancelledError:
+        token.cancel()
+        outcome = "cancelled"
+        raise
+    except ToolInterrupted as e:
+        outcome = "cancelled" if isinstance(e, ToolCancelled) else "deadline"
+        return {"success": False, "error": str(e), "interrupted": outcome}
+    finally:
+        reset_token(reset)
+        METRICS.add_gauge("mcp_tool_in_flight", -1, tool=tool)
+        METRICS.observe("mcp_tool_seconds", time.perf_counter() - started, tool=tool)
+        METRICS.inc("mcp_tool_calls_total", tool=tool, outcome=outcome)
+
+
+async def _call_tool(figma_server: FigmaMCPServer, executor: ToolExecutor, name: str, arguments: dict,
+                     progress) -> dict:
+    profile = TOOL_PROFILES.get(name)
+    if profile is None:
+        return {"success": False, "error": f"알 수 없는 도구: {name}"}
+    store = figma_server.data_store
+    
+    try:
+        if arguments.get("cursor") and name in PAGINATED_TOOLS:
+            return _page_from_cursor(store, name, arguments)
+        if name == "parse_figma_url":
+            method, args = "parse_figma_url", (arguments["figma_url"],)
+        elif name == "fetch_figma_data":
+            method, args = "fetch_figma_data", (
+                arguments["file_id"], arguments.get("node_id"), arguments.get("refresh", False)
+            )
+        elif name == "extract_requirements":
+            figma_data = _resolve_argument(store, arguments, "figma_data", "data_handle", "figma")
+            method, args = "extract_requirements", (figma_data,)
+        elif name == "generate_testcase" and arguments.get("requirements_handle"):
+            requirements = store.get(arguments["requirements_handle"], "requirements")
+            profile = "io"
+            method, args = "generate_testcases", (requirements, arguments.get("test_type"))
+        elif name == "generate_testcase":
+            method, args = "generate_testcase_structure", (arguments["requirement"], arguments.get("test_type"))
+        elif name == "save_to_excel":
+            test_cases = _resolve_argument(store, arguments, "test_cases", "testcases_handle", "testcases")
+            method, args = "save_to_excel", (test_cases, arguments.get("filename"), arguments.get("use_template", True))
+        elif name == "process_figma_link":
+            method, args = "process_figma_link", (
+                arguments["figma_url"], arguments.get("test_type"), progress,
+                arguments.get("partial_batch_size") or PARTIAL_BATCH_SIZE, arguments.get("refresh", False)
+            )
+        elif name == "enhanced_figma_analysis":
+            figma_data = store.get(arguments["data_handle"], "figma") if arguments.get("data_handle") else None
+            method, args = "enhanced_figma_analysis", (
+                arguments["figma_url"], arguments.get("include_screenshot", True), figma_data,
+                arguments.get("refresh", False)
+            )
+        elif name == "prefetch_figma_file":
+            urls = arguments.get("figma_urls") or [arguments["figma_url"]]
+            tasks = start_prefetch(figma_server, executor, urls, arguments.get("refresh", False))
+            if not arguments.get("wait"):
+                return {"success": True, "scheduled": urls, "background": True}
+            results = await asyncio.gather(*tasks)
+            return {"success": all(r.get("success") for r in results), "results": results}
+        elif name == "server_stats":
+            if arguments.get("format") == "prometheus":
+                return {"success": True, "format": "prometheus", "text": metrics_text(figma_server, executor)}
+            return server_stats(figma_server, executor)
+        else:  # release_handle
+            return {"success": store.release(arguments["handle"]), "handle": arguments["handle"]}
+    except (HandleError, ValueError) as e:
+        return {"success": False, "error": str(e)}
+    
+    if profile == "cpu" and executor.cpu_workers > 0:
+        # 프로세스 풀 워커는 자체 서버 인스턴스의 같은 메소드를 실행
+        result, worker_metrics = await executor.run(profile, _run_in_worker, method, *args)
+        METRICS.merge(worker_metrics)
+    else:
+        result = await executor.run(profile, getattr(figma_server, method), *args)
+    if not result.get("success"):
+        return result
+    
+    if name == "fetch_figma_data" and not arguments.get("include_data"):
+        figma_data = result.pop("data")
+        result["data_handle"] = store.put("figma", figma_data)
+        result["summary"] = _figma_summary(figma_data)
+    elif name in PAGINATED_TOOLS and method != "generate_testcase_structure":
+        # 목록은 첫 페이지만 보내고 나머지는 next_cursor로 요청 (include_* 옵션이면 전체)
+        kind, include_flag, paths = PAGINATED_TOOLS[name]
+        limit = None if arguments.get(include_flag) else page_limit(arguments.get("limit"))
+        top_k = arguments.get("top_k")
+        if kind != "analysis":
+            return _store_list(store, result, kind, limit, top_k)
+        handle = store.put("analysis", result)
+        # 저장한 분석 결과는 그대로 두고 응답용 사본만 줄임
+        response = paginate(result, handle, paths, limit)
+        if top_k:
+            _summarize_lists(result, response, paths, top_k)
+        result = {**response, "analysis_handle": handle}
+    return result
+
+def server_stats(figma_server: FigmaMCPServer, executor: ToolExecutor) -> dict:
+    """
+    서버 계측 요약 (server_stats 도구)
+    
+    - histograms: 도구별(mcp_tool_seconds)/단계별(mcp_phase_seconds) 호출 수와 평균/p50/p95/p99/최대 지연(ms)
+    - counters: 도구 호출 결과별 수, Figma 응답 바이트 수 / gauges: 도구별 실행 중인 호출 수
+    - executor/single_flight/caches/handles: 풀 대기·실행 수, 요청 병합, 캐시 적중률, 보관 중인 핸들 수
+    - rate_budget: 우선순위별 Figma 요청 수와 예산 대기 시간, 받은 429 응답 수
+    """
+    return {
+        "success": True,
+        "uptime_seconds": round(time.monotonic() - SERVER_STARTED, 1),
+        **METRICS.snapshot(),
+        "executor": executor.stats(),
+        "single_flight": FETCH_FLIGHTS.stats(),
+        "caches": {"fetch": figma_server.fetch_cache.stats(), "analysis": figma_server.analysis_cache.stats()},
+        "handles": figma_server.data_store.stats(),
+        "rate_budget": figma_server.rate_budget.stats(),
+    }
+
+
+def metrics_text(figma_server: FigmaMCPServer, executor: ToolExecutor) -> str:
+    """server_stats와 같은 값의 Prometheus 텍스트 형식"""
+    executor_stats = executor.stats()
+    flights = FETCH_FLIGHTS.stats()
+    caches = {"fetch": figma_server.fetch_cache.stats(), "analysis": figma_server.analysis_cache.stats()}
+    handles = figma_server.data_store.stats()
+    budget = figma_server.rate_budget.stats()
+    gauges = {
+        "mcp_uptime_seconds": [({}, round(time.monotonic() - SERVER_STARTED, 1))],
+        "mcp_executor_in_flight": [({}, executor_stats["in_flight"])],
+        "mcp_executor_waiting": [({}, executor_stats["waiting"])],
+        "mcp_executor_background_in_flight": [({}, executor_stats["background_in_flight"])],
+        "mcp_fetch_flights_in_flight": [({}, flights["in_flight"])],
+        "mcp_fetch_flights_executed": [({}, flights["executed"])],
+        "mcp_fetch_flights_shared": [({}, flights["shared"])],
+        "mcp_cache_items": [({"cache": name}, stats["items"]) for name, stats in caches.items()],
+        "mcp_cache_hits": [({"cache": name}, stats["hits"]) for name, stats in caches.items()],
+        "mcp_cache_misses": [({"cache": name}, stats["misses"]) for name, stats in caches.items()],
+        "mcp_cache_hit_ratio": [({"cache": name}, stats["hit_rate"]) for name, stats in caches.items()],
+        "mcp_handles": [({"tier": "memory"}, handles["memory_items"]), ({"tier": "disk"}, handles["disk_items"])],
+        "mcp_figma_rate_acquired": [({"priority": p}, n) for p, n in budget["acquired"].items()],
+        "mcp_figma_rate_wait_seconds": [({"priority": p}, n) for p, n in budget["wait_seconds"].items()],
+        "mcp_figma_throttled": [({}, budget["throttled"])],
+    }
+    return METRICS.to_prometheus(gauges)
+
+
+def _write_metrics_file(path: str, text: str) -> None:
+    # 수집기(node_exporter 등)가 다른 사용자로 실행되어도 읽을 수 있도록 0644
+    with atomic_output(path, mode=0o644) as tmp_path:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+async def dump_metrics(figma_server: FigmaMCPServer, executor: ToolExecutor, path: str, interval: float) -> None:
+    """
+    interval초마다 Prometheus 텍스트를 path에 기록 (node_exporter textfile collector 등에서 수집)
+
+    - 파일 기록은 스레드에서 하므로 이벤트 루프를 막지 않음
+    - 기록에 실패하면 (디렉토리 없음, 권한, 디스크 부족 등) stderr에 남기고 다음 주기에 다시 시도
+    """
+    while True:
+        text = metrics_text(figma_server, executor)
+        try:
+            await asyncio.to_thread(_write_metrics_file, path, text)
+        except OSError as e:
+            print(f"⚠️ 계측 파일 기록 실패 ({path}): {e}", file=sys.stderr)
+        await asyncio.sleep(interval)
+
+# 도구 공통 입력: 마감 시간 (지나면 부분 결과 또는 interrupted 오류)
+DEADLINE_MS_SCHEMA = {
+    "type": "number",
+    "description": "호출 마감 시간(ms). 지나면 그때까지의 부분 결과(partial: true)를 반환하거나 중단",
+    "minimum": 1,
+}
+
+# 백그라운드 프리패치 작업 (완료 전에 가비지 컬렉션되지 않도록 참조 유지)
+_background_tasks = set()
+
+
+def start_prefetch(figma_server: FigmaMCPServer, executor: ToolExecutor, figma_urls, refresh: bool = False) -> list:
+    """
+    Figma 파일 프리패치를 background 풀에서 시작하고 작업 목록 반환 (실행 중인 이벤트 루프 필요)
+
+    - 프리패치는 공유 캐시를 채우므로 요청한 도구 호출의 취소/마감과 관계없이 끝까지 실행
+    - Figma 요청은 batch 우선순위 (사용자 요청이 대기 중이면 양보)
+    - background 프로파일로 실행하므로 예산을 기다리는 동안에도 도구 호출 슬롯(MCP_MAX_CONCURRENCY)을 차지하지 않음
+    """
+    tasks = []
+    reset = set_token(None)  # 작업은 생성 시점의 컨텍스트를 복사
+    try:
+        with rate_priority("batch"):
+            for url in figma_urls:
+                task = asyncio.ensure_future(executor.run("background", figma_server.prefetch_figma_file, url, refresh))
+                _background_tasks.add(task)
+                task.add_done_callback(_background_tasks.discard)
+                tasks.append(task)
+    finally:
+        reset_token(reset)
+    return tasks
+
+
+async def watch_prefetch(figma_server: FigmaMCPServer, executor: ToolExecutor, figma_urls,
+                         interval: float) -> None:
+    """
+    워치 리스트를 기동 시 가져오고 interval초마다 다시 가져와 캐시가 만료되지 않도록 유지
+
+    - 다시 가져오는 동안에도 기존 캐시 항목은 만료 전까지 그대로 사용
+    - interval이 0 이하면 (캐시 만료 없음) 한 번만 가져옴
+    """
+    refresh = False
+    while True:
+        await asyncio.gather(*start_prefetch(figma_server, executor, figma_urls, refresh), return_exceptions=True)
+        if interval <= 0:
+            return
+        await asyncio.sleep(interval)
+        refresh = True
+
+
+async def call_tool_with_progress(figma_server: FigmaMCPServer, executor: ToolExecutor, name: str,
+                                  arguments: dict, send_progress=None, send_partial=None) -> dict:
+    """
+    call_tool + 진행 이벤트 전달
+
+    - send_progress(progress, total, message): 단계별 진행률 전송 코루틴
+    - send_partial(data): 생성된 테스트케이스 배치 전송 코루틴
+    - 이벤트는 발생 순서대로 전송하고, 모두 전송한 뒤 결과를 반환 (부분 결과가 최종 결과보다 먼저 도착)
+    - 전송이 실패하면 (클라이언트 연결 종료 등) 이후 이벤트는 버리고 도구 실행은 계속
+    """
+    if send_progress is None and send_partial is None:
+        return await call_tool(figma_server, executor, name, arguments)
+    
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
+    
+    async def forward():
+        sending = True
+        while True:
+            event = await events.get()
+            if event is None:
+                return
+            if not sending:
+                continue
+            try:
+                if send_progress is not None:
+                    await send_progress(event["progress"], event["total"], event["message"])
+                if send_partial is not None and event.get("testcases"):
+                    await send_partial({"phase": event["phase"], "progress": event["progress"],
+                                        "count": len(event["testcases"]), "testcases": event["testcases"]})
+            except Exception:
+                sending = False
+    
+    forwarder = asyncio.create_task(forward())
+    try:
+        # 도구는 풀 스레드에서 실행되므로 이벤트는 이벤트 루프로 넘겨서 큐에 넣음
+        return await call_tool(figma_server, executor, name, arguments,
+                               progress=lambda event: loop.call_soon_threadsafe(events.put_nowait, event))
+    finally:
+        events.put_nowait(None)
+        await forwarder
+
+# MCP 서버 설정
+def create_mcp_server(figma_server: FigmaMCPServer, tool_executor: ToolExecutor) -> "Server":
+    """MCP 서버 생성 (도구 목록/호출 핸들러 등록)"""
+    server = Server("figma-testcase-generator")
 
     @server.list_tools()
     async def handle_list_tools() -> list[Tool]:
         """사용 가능한 도구 목록 반환"""
-        return [
+        tools = [
             Tool(
                 name="parse_figma_url",
                 description="Figma URL에서 파일 ID와 노드 ID를 추출합니다.",
@@ -1000,7 +1368,7 @@ if MCP_AVAILABLE:
             ),
             Tool(
                 name="fetch_figma_data",
-                description="Figma API에서 파일 데이터를 가져옵니다.",
+                description="Figma API에서 파일 데이터를 가져옵니다. 데이터는 서버에 보관하고 data_handle을 반환합니다.",
                 inputSchema={
                     "type": "object",
                     "properties": {
@@ -1011,6 +1379,16 @@ if MCP_AVAILABLE:
                         "node_id": {
                             "type": "string",
                             "description": "특정 노드 ID (선택사항)"
+                        },
+                        "include_data": {
+                            "type": "boolean",
+                            "description": "핸들 대신 데이터 전체를 반환 (기본값: false)",
+                            "default": False
+                        },
+                        "refresh": {
+                            "type": "boolean",
+                            "description": "캐시를 무시하고 다시 가져오기 (기본값: false)",
+                            "default": False
                         }
                     },
                     "required": ["file_id"]
@@ -1018,21 +1396,42 @@ if MCP_AVAILABLE:
             ),
             Tool(
                 name="extract_requirements",
-                description="Figma 데이터에서 요구사항을 추출합니다.",
+                description="Figma 데이터에서 요구사항을 추출합니다. 목록은 requirements_handle로 보관됩니다.",
                 inputSchema={
                     "type": "object",
                     "properties": {
+                        "data_handle": {
+                            "type": "string",
+                            "description": "fetch_figma_data가 반환한 데이터 핸들"
+                        },
                         "figma_data": {
                             "type": "object",
-                            "description": "Figma API에서 가져온 데이터"
+                            "description": "Figma API에서 가져온 데이터 (data_handle 대신 사용)"
+                        },
+                        "include_requirements": {
+                            "type": "boolean",
+                            "description": "페이지로 나누지 않고 요구사항 전체를 반환 (기본값: false)",
+                            "default": False
+                        },
+                        "cursor": {
+                            "type": "string",
+                            "description": "이전 응답의 *_next_cursor (다음 페이지 요청, 다른 인자는 무시)"
+                        },
+                        "limit": {
+                            "type": "integer",
+                            "description": f"목록 페이지 크기 (기본값: {DEFAULT_PAGE_LIMIT}, 최대 {MAX_PAGE_LIMIT})",
+                            "default": DEFAULT_PAGE_LIMIT
+                        },
+                        "top_k": {
+                            "type": "integer",
+                            "description": "목록별 상위 k개 요약(*_summary) 추가"
                         }
-                    },
-                    "required": ["figma_data"]
+                    }
                 }
             ),
             Tool(
                 name="generate_testcase",
-                description="요구사항으로부터 테스트케이스를 생성합니다.",
+                description="요구사항으로부터 테스트케이스를 생성합니다. requirements_handle을 주면 목록 전체를 생성해 testcases_handle로 보관합니다.",
                 inputSchema={
                     "type": "object",
                     "properties": {
@@ -1040,12 +1439,33 @@ if MCP_AVAILABLE:
                             "type": "object",
                             "description": "요구사항 객체"
                         },
+                        "requirements_handle": {
+                            "type": "string",
+                            "description": "extract_requirements가 반환한 요구사항 핸들 (requirement 대신 사용)"
+                        },
                         "test_type": {
                             "type": "string",
                             "description": "테스트 유형 (예: UI테스트, 성능테스트)"
+                        },
+                        "include_testcases": {
+                            "type": "boolean",
+                            "description": "requirements_handle 사용 시 페이지로 나누지 않고 전체 반환 (기본값: false)",
+                            "default": False
+                        },
+                        "cursor": {
+                            "type": "string",
+                            "description": "이전 응답의 *_next_cursor (다음 페이지 요청, 다른 인자는 무시)"
+                        },
+                        "limit": {
+                            "type": "integer",
+                            "description": f"목록 페이지 크기 (기본값: {DEFAULT_PAGE_LIMIT}, 최대 {MAX_PAGE_LIMIT})",
+                            "default": DEFAULT_PAGE_LIMIT
+                        },
+                        "top_k": {
+                            "type": "integer",
+                            "description": "목록별 상위 k개 요약(*_summary) 추가"
                         }
-                    },
-                    "required": ["requirement"]
+                    }
                 }
             ),
             Tool(
@@ -1058,6 +1478,10 @@ if MCP_AVAILABLE:
                             "type": "array",
                             "description": "저장할 테스트케이스 목록"
                         },
+                        "testcases_handle": {
+                            "type": "string",
+                            "description": "generate_testcase가 반환한 테스트케이스 핸들 (test_cases 대신 사용)"
+                        },
                         "filename": {
                             "type": "string",
                             "description": "저장할 파일명 (선택사항)"
@@ -1067,13 +1491,12 @@ if MCP_AVAILABLE:
                             "description": "X Oauth.xlsx 템플릿 사용 여부 (기본값: true)",
                             "default": True
                         }
-                    },
-                    "required": ["test_cases"]
+                    }
                 }
             ),
             Tool(
                 name="process_figma_link",
-                description="Figma 링크를 입력받아 전체 프로세스를 실행합니다.",
+                description="Figma 링크를 입력받아 전체 프로세스를 실행합니다. 진행 토큰을 주면 단계별 진행 알림을 보냅니다.",
                 inputSchema={
                     "type": "object",
                     "properties": {
@@ -1084,6 +1507,22 @@ if MCP_AVAILABLE:
                         "test_type": {
                             "type": "string",
                             "description": "테스트 유형 (선택사항)"
+                        },
+                        "stream_partial": {
+                            "type": "boolean",
+                            "description": "생성된 테스트케이스를 배치마다 로그 알림으로 먼저 전송 (기본값: false)",
+                            "default": False
+                        },
+                        "partial_batch_size": {
+                            "type": "integer",
+                            "description": f"부분 결과 배치 크기 (기본값: {PARTIAL_BATCH_SIZE})",
+                            "default": PARTIAL_BATCH_SIZE,
+                            "minimum": 1
+                        },
+                        "refresh": {
+                            "type": "boolean",
+                            "description": "캐시를 무시하고 Figma 데이터를 다시 가져오기 (기본값: false)",
+                            "default": False
                         }
                     },
                     "required": ["figma_url"]
@@ -1103,123 +1542,178 @@ if MCP_AVAILABLE:
                             "type": "boolean",
                             "description": "스크린샷 분석 포함 여부 (기본값: true)",
                             "default": True
+                        },
+                        "data_handle": {
+                            "type": "string",
+                            "description": "이미 가져온 Figma 데이터 핸들 (있으면 다시 가져오지 않음)"
+                        },
+                        "refresh": {
+                            "type": "boolean",
+                            "description": "캐시를 무시하고 Figma 데이터를 다시 가져오기 (기본값: false)",
+                            "default": False
+                        },
+                        "include_requirements": {
+                            "type": "boolean",
+                            "description": "페이지로 나누지 않고 목록 전체를 반환 (기본값: false)",
+                            "default": False
+                        },
+                        "cursor": {
+                            "type": "string",
+                            "description": "이전 응답의 *_next_cursor (다음 페이지 요청, 다른 인자는 무시)"
+                        },
+                        "limit": {
+                            "type": "integer",
+                            "description": f"목록 페이지 크기 (기본값: {DEFAULT_PAGE_LIMIT}, 최대 {MAX_PAGE_LIMIT})",
+                            "default": DEFAULT_PAGE_LIMIT
+                        },
+                        "top_k": {
+                            "type": "integer",
+                            "description": "목록별 상위 k개 요약(*_summary) 추가"
                         }
                     },
                     "required": ["figma_url"]
                 }
+            ),
+            Tool(
+                name="prefetch_figma_file",
+                description="Figma 파일을 백그라운드로 미리 가져와 데이터/요구사항/키워드/UI 구조 분석을 캐시합니다.",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "figma_url": {
+                            "type": "string",
+                            "description": "미리 가져올 Figma URL"
+                        },
+                        "figma_urls": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": "여러 파일을 한 번에 미리 가져올 때 사용"
+                        },
+                        "wait": {
+                            "type": "boolean",
+                            "description": "완료까지 기다린 뒤 결과 반환 (기본값: false, 바로 반환)",
+                            "default": False
+                        },
+                        "refresh": {
+                            "type": "boolean",
+                            "description": "캐시를 무시하고 다시 가져오기 (기본값: false)",
+                            "default": False
+                        }
+                    }
+                }
+            ),
+            Tool(
+                name="release_handle",
+                description="서버에 보관한 데이터 핸들을 해제합니다.",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "handle": {
+                            "type": "string",
+                            "description": "해제할 핸들 (data_handle/requirements_handle 등)"
+                        }
+                    },
+                    "required": ["handle"]
+                }
+            ),
+            Tool(
+                name="server_stats",
+                description="서버 계측값: 도구/단계별 지연 시간, Figma 응답 바이트 수, 캐시 적중률, 실행 중인 호출 수",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "format": {
+                            "type": "string",
+                            "enum": ["json", "prometheus"],
+                            "description": "json(기본값) 또는 Prometheus 텍스트 형식",
+                            "default": "json"
+                        }
+                    }
+                }
             )
         ]
+        # 모든 도구 공통: 호출 마감 시간
+        for tool in tools:
+            tool.inputSchema["properties"]["deadline_ms"] = DEADLINE_MS_SCHEMA
+        return tools
 
     @server.call_tool()
     async def handle_call_tool(name: str, arguments: dict) -> list[TextContent]:
-        """도구 호출 처리"""
+        """도구 호출 처리 (도구 실행은 풀에서 진행되어 다른 호출을 막지 않음)"""
         try:
-            if name == "parse_figma_url":
-                result = figma_server.parse_figma_url(arguments["figma_url"])
-                
-            elif name == "fetch_figma_data":
-                result = figma_server.fetch_figma_data(
-                    arguments["file_id"], 
-                    arguments.get("node_id")
-                )
-                
-            elif name == "extract_requirements":
-                result = figma_server.extract_requirements(arguments["figma_data"])
-                
-            elif name == "generate_testcase":
-                result = figma_server.generate_testcase_structure(
-                    arguments["requirement"],
-                    arguments.get("test_type")
-                )
-                
-            elif name == "save_to_excel":
-                result = figma_server.save_to_excel(
-                    arguments["test_cases"],
-                    arguments.get("filename"),
-                    arguments.get("use_template", True)
-                )
-                
-            elif name == "process_figma_link":
-                # 전체 프로세스 실행
-                figma_url = arguments["figma_url"]
-                test_type = arguments.get("test_type")
-                
-                # 1. URL 파싱
-                url_result = figma_server.parse_figma_url(figma_url)
-                if not url_result["success"]:
-                    result = {"success": False, "error": "URL 파싱 실패"}
-                else:
-                    # 2. Figma 데이터 가져오기
-                    data_result = figma_server.fetch_figma_data(
-                        url_result["file_id"], 
-                        url_result.get("node_id")
-                    )
-                    if not data_result["success"]:
-                        result = {"success": False, "error": "Figma 데이터 가져오기 실패"}
-                    else:
-                        # 3. 요구사항 추출
-                        req_result = figma_server.extract_requirements(data_result["data"])
-                        if not req_result["success"]:
-                            result = {"success": False, "error": "요구사항 추출 실패"}
-                        else:
-                            # 4. 테스트케이스 생성
-                            test_cases = []
-                            for req in req_result["requirements"]:
-                                tc_result = figma_server.generate_testcase_structure(req, test_type)
-                                if tc_result["success"]:
-                                    tc_result["testcase"]["Figma_URL"] = figma_url
-                                    test_cases.append(tc_result["testcase"])
-                            
-                            # 5. Excel 저장 (템플릿 사용)
-                            if test_cases:
-                                save_result = figma_server.save_to_excel(test_cases, use_template=True)
-                                result = {
-                                    "success": True,
-                                    "requirements_count": len(req_result["requirements"]),
-                                    "testcases_count": len(test_cases),
-                                    "filename": save_result.get("filename"),
-                                    "template_used": save_result.get("template_used"),
-                                    "figma_url": figma_url
-                                }
-                            else:
-                                result = {"success": False, "error": "테스트케이스 생성 실패"}
-                                
-            elif name == "enhanced_figma_analysis":
-                # 향상된 Figma 분석 실행
-                figma_url = arguments["figma_url"]
-                include_screenshot = arguments.get("include_screenshot", True)
-                
-                result = figma_server.enhanced_figma_analysis(figma_url, include_screenshot)
-                
-            else:
-                result = {"success": False, "error": f"알 수 없는 도구: {name}"}
-                
-            return [TextContent(type="text", text=json.dumps(result, ensure_ascii=False, indent=2))]
+            ctx = server.request_context
+            progress_token = getattr(ctx.meta, "progressToken", None) if ctx.meta else None
+            send_progress = send_partial = None
+            if progress_token is not None:
+                async def send_progress(progress, total, message):
+                    try:
+                        await ctx.session.send_progress_notification(progress_token, progress, total, message=message)
+                    except TypeError:  # message 인자가 없는 구버전 mcp
+                        await ctx.session.send_progress_notification(progress_token, progress, total)
+            if arguments.get("stream_partial"):
+                async def send_partial(data):
+                    await ctx.session.send_log_message(level="info", data=data, logger=name)
+            
+            result = await call_tool_with_progress(figma_server, tool_executor, name, arguments,
+                                                   send_progress, send_partial)
+            return [TextContent(type="text", text=encode_result(result))]
             
         except Exception as e:
             error_result = {"success": False, "error": str(e)}
-            return [TextContent(type="text", text=json.dumps(error_result, ensure_ascii=False, indent=2))]
+            return [TextContent(type="text", text=encode_result(error_result))]
 
-    async def main():
-        """MCP 서버 실행"""
-        try:
-            from mcp.server.stdio import stdio_server
-            
-            async with stdio_server() as (read_stream, write_stream):
-                await server.run(
-                    read_stream,
-                    write_stream,
-                    InitializationOptions(
-                        server_name="figma-testcase-generator",
-                        server_version="1.0.0",
-                        capabilities=server.get_capabilities(
-                            notification_options=NotificationOptions(),
-                            experimental_capabilities={},
-                        ),
+    return server
+
+
+async def main():
+    """
+    MCP 서버 실행
+
+    서버/도구 실행기는 여기서 생성 (cpu 풀 워커가 spawn/forkserver로 이 파일을 __mp_main__으로
+    다시 불러와도 서버/실행기를 만들지 않음)
+    """
+    try:
+        figma_server = FigmaMCPServer()
+    except ValueError as e:
+        print(f"❌ 서버 초기화 실패: {e}")
+        sys.exit(1)
+    tool_executor = create_tool_executor(figma_server)
+    server = create_mcp_server(figma_server, tool_executor)
+    try:
+        from mcp.server.stdio import stdio_server
+        
+        # 워치 리스트 파일은 캐시 TTL의 절반마다 다시 가져와 항상 캐시에 두고, 템플릿은 미리 준비
+        if _rules.prefetch_watch_list:
+            task = asyncio.ensure_future(watch_prefetch(figma_server, tool_executor, _rules.prefetch_watch_list,
+                                                        _rules.prefetch_cache_ttl / 2))
+            _background_tasks.add(task)
+        figma_server.warm_up()
+        
+        # MCP_METRICS_FILE이 있으면 계측값을 주기적으로 파일에 기록
+        metrics_file = os.getenv("MCP_METRICS_FILE")
+        if metrics_file:
+            interval = float(os.getenv("MCP_METRICS_INTERVAL") or 15)
+            task = asyncio.ensure_future(dump_metrics(figma_server, tool_executor, metrics_file, interval))
+            _background_tasks.add(task)
+        
+        async with stdio_server() as (read_stream, write_stream):
+            await server.run(
+                read_stream,
+                write_stream,
+                InitializationOptions(
+                    server_name="figma-testcase-generator",
+                    server_version="1.0.0",
+                    capabilities=server.get_capabilities(
+                        notification_options=NotificationOptions(),
+                        experimental_capabilities={},
                     ),
-                )
-        except Exception as e:
-            print(f"❌ MCP 서버 실행 오류: {e}")
+                ),
+            )
+    except Exception as e:
+        print(f"❌ MCP 서버 실행 오류: {e}")
+    finally:
+        tool_executor.shutdown(wait=False)
+
 
 if __name__ == "__main__":
     if MCP_AVAILABLE:
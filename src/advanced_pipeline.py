@@ -20,13 +20,15 @@
 """
 
 import json
-import pandas as pd
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 
 from src.analyzers.figma_analyzer import FigmaAnalyzer
 from src.generators.testcase_generator import TestCaseGenerator
+from src.utils.excel_writer import SheetLayout, write_xlsx
+from src.utils.export import fan_out, write_csv
+from src.utils.rules_config import normalize_testcase_fields
 
 
 class AdvancedPipeline:
@@ -208,38 +210,29 @@ class AdvancedPipeline:
                 'priority', 'type', 'comment', 'web_result', 'app_result'
             ]
         
-        # DataFrame 생성
-        df = pd.DataFrame(self.testcases)
-        
-        # 누락 컬럼 추가
-        for col in template_columns:
-            if col not in df.columns:
-                df[col] = ""
-        
-        # 컬럼 순서 정렬
-        df = df[template_columns]
+        # 정규화된 행 버퍼 하나를 CSV/Excel writer에 동시에 전달 (파일별 원자적 교체)
+        rows = [normalize_testcase_fields(tc, self.generator.rules.field_aliases) for tc in self.testcases]
         
         # 타임스탬프
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        # CSV 저장
         csv_filename = f"TestCases_{timestamp}.csv"
         csv_path = self.output_dir / csv_filename
-        df.to_csv(csv_path, index=False, encoding='utf-8-sig')
-        
-        print(f"✅ CSV 파일 생성: {csv_filename}")
-        
-        # Excel 저장
         excel_filename = f"TestCases_{timestamp}.xlsx"
         excel_path = self.output_dir / excel_filename
-        df.to_excel(excel_path, index=False, engine='openpyxl')
         
+        fan_out(rows, {
+            "csv": (str(csv_path), lambda r, path: write_csv(r, path, template_columns)),
+            "excel": (str(excel_path), lambda r, path: write_xlsx(
+                r, path, SheetLayout.default(template_columns), sheet_name="Sheet1")),
+        })
+        
+        print(f"✅ CSV 파일 생성: {csv_filename}")
         print(f"✅ Excel 파일 생성: {excel_filename}")
         
         return {
             "csv_path": str(csv_path),
             "excel_path": str(excel_path),
-            "count": len(df)
+            "count": len(rows)
         }
     
     def run(
@@ -2,7 +2,8 @@
 Figma 분석 모듈
 """
 
+from .analysis_engine import AnalysisEngine, shared_engine
 from .figma_analyzer import FigmaAnalyzer
 
-__all__ = ["FigmaAnalyzer"]
+__all__ = ["AnalysisEngine", "FigmaAnalyzer", "shared_engine"]
 
@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+"""
+공유 분석 엔진 (요구사항 판별 / UI 패턴 / UI 구조 / 유저플로우)
+
+- 요구사항/제외 키워드는 하나의 Aho-Corasick 오토마톤으로, 패턴 키워드는 소문자 튜플로,
+  UI 요소 규칙은 규칙별 정규식으로 생성 시 한 번만 컴파일
+- 호출마다 키워드 목록과 패턴 표를 다시 만들지 않음 (텍스트 하나당 오토마톤 1회 스캔)
+- MCP 서버(주 프로세스와 cpu 워커)와 FigmaAnalyzer(CLI)가 shared_engine() 하나를 공유
+- 노드 순회 중 checkpoint()로 취소/마감 확인, 마감이면 그때까지의 결과에 partial 표시
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ..utils.cancellation import DeadlineExceeded, checkpoint
+from ..utils.keyword_classifier import KeywordAutomaton
+
+
+# 요구사항 키워드 (대소문자 구분, 부분 문자열 매칭)
+REQUIREMENT_KEYWORDS: Tuple[str, ...] = (
+    '기능', '요구사항', '사용자', '시스템', '화면', '페이지', '버튼',
+    '클릭', '선택', '입력', '검색', '필터', '정렬', '스크롤',
+    '로그인', '회원가입', '로그아웃', '프로필', '설정', '알림',
+    '목록', '리스트', '카드', '메뉴', '탭', '모달', '팝업',
+    '등록', '수정', '삭제', '추가', '업데이트', '동기화',
+    '거래', '주문', '보유', '자산', '포트폴리오', '접근성', '표시', '대기',
+    '자산관리', '잔고', '잔액', '총자산', '수익률', '계좌', '지갑',
+    '입금', '출금', '이체', '매수', '매도', '체결', '미체결', '취소',
+    '차트', '그래프', '통계', '분석', '리포트', '히스토리', '거래내역',
+    '대시보드', '새로고침', '실시간', '진행중', '완료', '실패', '승인',
+    # 피그마에서 추출된 새로운 키워드들 (한국어)
+    '출금한도', '한도', '인증', '검증', '보호', '손실', '평균', '단가',
+    '수익', '자동매수', '주소록', '주소', '확인', '네트워크', '블록체인',
+    '시스템점검', '점검', '내역', '포지션', '손익', '실현', '보류',
+    '상태', '유지보수', '전환', '거래정지', '무기한', '스왑', '트리거',
+    '실행', '대기중', '부족', '한계', '제한', '활성화', '업그레이드',
+    'login', 'signup', 'profile', 'setting', 'notification',
+    'search', 'filter', 'sort', 'upload', 'download',
+    'button', 'click', 'tap', 'swipe', 'scroll',
+    'spot', 'holdings', 'accessibility', 'display', 'pending', 'order',
+    'asset', 'portfolio', 'wallet', 'balance', 'total', 'deposit',
+    'withdrawal', 'transfer', 'transaction', 'buy', 'sell', 'trade',
+    'exchange', 'swap', 'profit', 'loss', 'chart', 'graph', 'analytics',
+    'report', 'history', 'dashboard', 'refresh', 'realtime', 'processing',
+    # 피그마에서 추출된 새로운 키워드들 (영어)
+    'funds', 'available', 'APR', 'withdraw', 'limit', 'verification',
+    'protection', 'average', 'cost', 'recurring', 'address', 'book',
+    'confirm', 'network', 'blockchain', 'maintenance', 'position',
+    'realized', 'cancel', 'status', 'convertible', 'tradable', 'insufficient',
+    'icon', 'unfilled', 'filled', 'media', 'radio', 'document',
+    'container', 'collapse', 'detail', 'trend', 'mini', 'graphic',
+    'boosted', 'protected', 'effective', 'contracts', 'trigger',
+    'execution', 'awaiting', 'perpetual', 'activate', 'upgrades',
+    'instantly', 'additionally', 'tradeable', 'non-tradable',
+    # 노드 추출 기반 보강 키워드
+    'market order', 'trigger order', 'order preview', 'order confirmation', 'order form',
+    'trade settings', 'positions', 'available funds', 'schedule order', 'trigger time',
+    'cancel order', 'unrealized p&l', 'take profit', 'stop loss', 'close position',
+    'estimated total value', 'funding fee', 'funding payment', 'auto-deleveraging',
+    'trading limit tier', 'perpetual swap', 'picture-in-picture', 'order value', 'max order value',
+    'leverage', 'multi-position mode', 'open positions', 'view holdings', 'latest trade', 'top traders',
+    # Curated from latest Figma screen analysis
+    'tab', 'PnL', 'funding', 'trending', 'favorites',
+    'volume', 'symbol', 'banner', 'badge', 'calendar',
+    'long', 'short', 'perp', 'market', 'trading',
+    # Curated from second Figma screen analysis
+    'feed', 'news', 'insights', 'crypto', 'price', 'assets',
+    'schedule', 'vip', 'vipstatus',
+    'social', 'events', 'economic', 'government', 'user', 'menu',
+    # Curated from third Figma screen analysis (Earn/Staking features)
+    'stake', 'staked', 'pool', 'rewards',
+    'earnings', 'launchpool', 'convert', 'auction',
+    'sparks', 'reward', 'flipster', 'pixel', 'ton',
+    # Curated from fourth Figma screen analysis (Promotion/Referral hub)
+    'claimed', 'hub', 'bonus', 'promotion', 'promotions', 'tasks',
+    'complete', 'completed', 'learn', 'identity', 'first', 'referee',
+    'referral', 'link',
+    # Curated from fifth Figma screen analysis (Notifications/Settings)
+    'notifications', 'liquidation', 'liquidated',
+    'system', 'notified', 'alerts',
+    'action', 'announcement', 'currency', 'warning',
+    'reached', 'initial', 'avoid', 'successful', 'amount', 'application',
+    '경우', '특정', '모든',
+    # Curated from sixth Figma screen analysis (Comprehensive dashboard)
+    'program', 'league', 'tier', 'level', 'benefits',
+    'day', 'time', 'share', 'empty',
+    'secondary', 'choice', 'my', 'basic', 'logomark', 'cropped',
+    # Curated from seventh Figma screen analysis (Login/Signup/Registration)
+    'log', 'password', 'email', 'input', 'hint',
+    'placeholder', 'checkbox', 'terms', 'privacy', 'notice',
+    'create', 'code', 'zero', 'fast', 'pairs', 'data',
+    'services', 'sso', 'body', 'title',
+    # 🏆 UPDATED: Trading Competition은 랭킹 시스템 (NOT 티어 시스템)
+    # 랭킹 시스템 키워드 (한국어)
+    '랭킹', '순위', '리더보드', '1위', '2위', '3위', '순위표', '등수',
+    '상위권', '순위권', '꼴지', '순위변동', '순위상승', '순위하락',
+    '경쟁', '경쟁자', '대회', '참가', '참가자', '우승', '우승자',
+    '마일스톤', '달성', '목표', '진행률', '보상', '상금',
+    '최종순위', '순위별보상', '차등보상', '참가보상',
+    # 랭킹 시스템 키워드 (영어)
+    'ranking', 'rank', 'leaderboard', '1st', '2nd', '3rd', 'first', 'second', 'third',
+    'position', 'standing', 'top', 'bottom', 'rank up', 'rank down',
+    'competition', 'competitor', 'participant', 'winner', 'champion',
+    'milestone', 'achievement', 'goal', 'progress', 'reward', 'prize',
+    'final rank', 'rank-based', 'tier-free', 'dynamic ranking',
+    # 🌟 ADDED: VIP 티어 시스템 (User Membership)
+    # VIP 티어 시스템 키워드 (한국어)
+    'VIP', 'SVIP', 'vip', 'svip', '티어', '등급', '멤버십', '회원등급', '사용자등급',
+    '베이직', '실버', '골드', '플래티넘', '승급', '강등', '업그레이드', '다운그레이드',
+    '혜택', '특권', '할인', '수수료할인', '전용서비스', '우대서비스', '프리미엄',
+    '진행률', '달성률', '요구사항', '조건', '거래량기준', '수수료기준', '보유기간',
+    '티어배지', '등급표시', '멤버십카드', '승급진행률', '다음등급', '현재등급',
+    # VIP 티어 시스템 키워드 (영어)
+    'vip', 'svip', 'premium', 'elite', 'exclusive', 'tier', 'grade', 'level', 'membership', 'status',
+    'basic', 'silver', 'gold', 'platinum', 'upgrade', 'downgrade', 'promotion', 'demotion',
+    'benefit', 'privilege', 'discount', 'fee discount', 'exclusive service', 'premium service',
+    'progress', 'achievement', 'requirement', 'criteria', 'trading volume', 'fee threshold', 'tenure',
+    'tier badge', 'grade display', 'membership card', 'upgrade progress', 'next tier', 'current tier'
+)
+
+# 제외 키워드 (대소문자 무시, 하나라도 있으면 스타일 속성으로 보고 제외)
+EXCLUDE_KEYWORDS: Tuple[str, ...] = (
+    'px', 'pt', 'rem', 'color', 'font', 'weight', 'size',
+    'margin', 'padding', 'border', 'shadow', 'opacity'
+)
+
+# UI 패턴 정의 (랭킹 시스템 / VIP 티어 시스템 포함, 대소문자 무시)
+UI_PATTERNS: Dict[str, Dict[str, Any]] = {
+    "navigation": {
+        "keywords": ["nav", "menu", "tab", "breadcrumb", "back", "next", "home"],
+        "flow_type": "navigation"
+    },
+    "authentication": {
+        "keywords": ["login", "signup", "register", "signin", "oauth", "auth", "password"],
+        "flow_type": "auth_flow"
+    },
+    "form_input": {
+        "keywords": ["input", "field", "form", "textfield", "submit", "save", "cancel"],
+        "flow_type": "form_interaction"
+    },
+    "modal_popup": {
+        "keywords": ["modal", "popup", "dialog", "overlay", "confirm", "alert"],
+        "flow_type": "modal_flow"
+    },
+    "transaction": {
+        "keywords": ["buy", "sell", "trade", "order", "payment", "checkout", "confirm"],
+        "flow_type": "transaction_flow"
+    },
+    "social": {
+        "keywords": ["share", "like", "follow", "comment", "social", "connect"],
+        "flow_type": "social_interaction"
+    },
+    "settings": {
+        "keywords": ["settings", "preferences", "profile", "account", "config"],
+        "flow_type": "settings_flow"
+    },
+    "ranking_system": {
+        "keywords": ["ranking", "rank", "leaderboard", "position", "competition", "1st", "2nd", "3rd", "순위", "랭킹", "리더보드", "대회", "경쟁"],
+        "flow_type": "ranking_competition"
+    },
+    "vip_tier_system": {
+        "keywords": ["vip", "svip", "tier", "grade", "membership", "premium", "upgrade", "benefit", "privilege", "티어", "등급", "멤버십", "승급", "혜택"],
+        "flow_type": "vip_membership"
+    }
+}
+
+# 플로우 패턴 정의 (대소문자 무시)
+FLOW_PATTERNS: Dict[str, List[str]] = {
+    "onboarding": ["welcome", "intro", "tutorial", "getting started", "setup"],
+    "purchasing": ["add to cart", "checkout", "payment", "order", "buy"],
+    "registration": ["sign up", "register", "create account", "join"],
+    "verification": ["verify", "confirm", "validate", "check", "code"],
+    "error_handling": ["error", "failed", "retry", "oops", "something went wrong"],
+    "success": ["success", "complete", "done", "congratulations", "thank you"]
+}
+
+# UI 요소 분류 규칙 (노드 이름 소문자 기준, 앞 규칙 우선 / 매칭 없으면 FRAME·GROUP은 containers)
+UI_ELEMENT_RULES: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("buttons", ("button", "btn")),
+    ("inputs", ("input", "field", "textfield")),
+    ("navigation", ("nav", "menu", "tab")),
+)
+
+_EXCLUDE = object()  # 오토마톤 payload: 제외 키워드
+
+
+class AnalysisEngine:
+    """
+    Figma 문서 분석 엔진 (키워드/패턴/규칙은 생성 시 한 번만 컴파일, 스레드/워커 간 공유 가능)
+
+    Args:
+        requirement_keywords: 요구사항 키워드 (대소문자 구분)
+        exclude_keywords: 제외 키워드 (대소문자 무시)
+        ui_patterns: 패턴 이름 -> {"keywords": [...], "flow_type": ...}
+        flow_patterns: 플로우 이름 -> 키워드 목록
+        ui_element_rules: (UI 요소 종류, 이름 키워드) 목록
+        min_length / max_length: 요구사항 텍스트 길이 범위
+    """
+
+    def __init__(self, requirement_keywords: Iterable[str] = REQUIREMENT_KEYWORDS,
+                 exclude_keywords: Iterable[str] = EXCLUDE_KEYWORDS,
+                 ui_patterns: Optional[Dict[str, Dict[str, Any]]] = None,
+                 flow_patterns: Optional[Dict[str, Sequence[str]]] = None,
+                 ui_element_rules: Sequence[Tuple[str, Sequence[str]]] = UI_ELEMENT_RULES,
+                 min_length: int = 3, max_length: int = 1000):
+        self.min_length = min_length
+        self.max_length = max_length
+
+        # 요구사항/제외 키워드를 한 오토마톤으로 (오토마톤은 대소문자 무시 -> 요구사항 후보는 원문으로 재확인)
+        patterns: Dict[str, set] = {}
+        for keyword in requirement_keywords:
+            patterns.setdefault(keyword.lower(), set()).add(keyword)
+        for keyword in exclude_keywords:
+            patterns.setdefault(keyword.lower(), set()).add(_EXCLUDE)
+        self._requirement_automaton = KeywordAutomaton(patterns)
+
+        # 패턴 점수: (이름, flow_type, 소문자 키워드) - 같은 키워드가 여러 번 있으면 여러 번 셈 (기존 점수와 동일)
+        self._ui_patterns = tuple(
+            (name, info["flow_type"], tuple(keyword.lower() for keyword in info["keywords"]))
+            for name, info in (UI_PATTERNS if ui_patterns is None else ui_patterns).items()
+        )
+        self._flow_patterns = tuple(
+            (name, tuple(keyword.lower() for keyword in keywords))
+            for name, keywords in (FLOW_PATTERNS if flow_patterns is None else flow_patterns).items()
+        )
+        self._ui_element_rules = tuple((kind, tuple(keywords)) for kind, keywords in ui_element_rules if keywords)
+        # 규칙별 키워드를 정규식 하나로 (노드마다 키워드 수만큼 부분 문자열 검사를 하지 않도록)
+        self._ui_element_searches = tuple(
+            (kind, re.compile("|".join(map(re.escape, keywords))).search) for kind, keywords in self._ui_element_rules
+        )
+        self.ui_element_kinds = [kind for kind, _ in self._ui_element_rules] + ["containers"]
+
+    # ---- 요구사항 판별 ----
+
+    def is_requirement_text(self, text: str) -> bool:
+        """텍스트가 요구사항인지 판단 (길이 범위 안, 제외 키워드 없음, 요구사항 키워드 포함)"""
+        if not text or len(text) < self.min_length or len(text) > self.max_length:
+            return False
+        found = self._requirement_automaton.search(text)
+        if _EXCLUDE in found:
+            return False
+        return any(keyword in text for keyword in found)
+
+    # ---- 키워드 / 패턴 분석 ----
+
+    def score_patterns(self, all_text: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """결합 텍스트 -> (detected_patterns, detected_flows) (소문자 변환은 한 번만)"""
+        lowered = all_text.lower()
+        detected_patterns = {}
+        for name, flow_type, keywords in self._ui_patterns:
+            matches = sum(1 for keyword in keywords if keyword in lowered)
+            if matches > 0:
+                detected_patterns[name] = {
+                    "matches": matches,
+                    "flow_type": flow_type,
+                    "confidence": min(matches * 20, 100)
+                }
+        detected_flows = {}
+        for name, keywords in self._flow_patterns:
+            matches = sum(1 for keyword in keywords if keyword in lowered)
+            if matches > 0:
+                detected_flows[name] = {
+                    "matches": matches,
+                    "confidence": min(matches * 25, 100)
+                }
+        return detected_patterns, detected_flows
+
+    def analyze_keywords(self, figma_data: dict) -> Dict[str, Any]:
+        """텍스트/이름 수집 후 UI·플로우 패턴 매칭 (마감 시 모은 만큼으로 매칭하고 partial 표시)"""
+        texts = []
+        names = []
+
+        def traverse_nodes(nodes, depth=0):
+            if isinstance(nodes, list):
+                for node in nodes:
+                    traverse_nodes(node, depth)
+            elif isinstance(nodes, dict):
+                checkpoint()
+                node_type = nodes.get('type')
+                node_name = nodes.get('name', '')
+
+                if node_type == 'TEXT' and 'characters' in nodes:
+                    text = nodes['characters'].strip()
+                    if text:
+                        texts.append({"text": text, "depth": depth})
+
+                if node_type in ('FRAME', 'COMPONENT', 'INSTANCE') and node_name:
+                    names.append({"name": node_name, "type": node_type.lower(), "depth": depth})
+
+                if 'children' in nodes:
+                    traverse_nodes(nodes['children'], depth + 1)
+
+        partial = False
+        try:
+            traverse_nodes(figma_data.get('document', {}).get('children', []))
+        except DeadlineExceeded:
+            partial = True
+
+        all_text = " ".join([t["text"] for t in texts] + [n["name"] for n in names])
+        detected_patterns, detected_flows = self.score_patterns(all_text)
+
+        result = {
+            "texts": texts,
+            "names": names,
+            "detected_patterns": detected_patterns,
+            "detected_flows": detected_flows,
+            "total_elements": len(texts) + len(names)
+        }
+        if partial:
+            result["partial"] = True
+        return result
+
+    # ---- UI 구조 분석 ----
+
+    def classify_ui_element(self, node_name: str, node_type: str) -> Optional[str]:
+        """노드 이름(소문자)/타입 -> UI 요소 종류 (해당 없으면 None)"""
+        for kind, search in self._ui_element_searches:
+            if search(node_name):
+                return kind
+        if node_type in ('FRAME', 'GROUP'):
+            return "containers"
+        return None
+
+    @staticmethod
+    def ui_complexity(ui_elements: Dict[str, list], layout_info: Dict[str, int]) -> str:
+        """UI 요소 수 + 깊이*2 + 컴포넌트 수 -> low(<20) / medium(<50) / high"""
+        total_elements = sum(len(elements) for elements in ui_elements.values())
+        complexity_score = total_elements + layout_info["depth_levels"] * 2 + layout_info["component_count"]
+        if complexity_score < 20:
+            return "low"
+        if complexity_score < 50:
+            return "medium"
+        return "high"
+
+    def analyze_ui_structure(self, figma_data: dict) -> Dict[str, Any]:
+        """UI 요소 분류 / 레이아웃 정보 / 복잡도 (마감 시 순회한 만큼으로 계산하고 partial 표시)"""
+        ui_elements: Dict[str, list] = {kind: [] for kind in self.ui_element_kinds}
+        layout_info = {
+            "depth_levels": 0,
+            "max_children": 0,
+            "component_count": 0
+        }
+
+        rules = self._ui_element_searches
+
+        def analyze_node(node, depth=0):
+            if isinstance(node, dict):
+                checkpoint()
+                node_type = node.get('type', '')
+                name = node.get('name', '')
+                node_name = name.lower()
+
+                layout_info["depth_levels"] = max(layout_info["depth_levels"], depth)
+
+                # classify_ui_element와 같은 규칙 (노드마다 메소드 호출을 피하려고 풀어 씀)
+                for kind, search in rules:
+                    if search(node_name):
+                        ui_elements[kind].append({"name": name, "depth": depth})
+                        break
+                else:
+                    if node_type in ('FRAME', 'GROUP'):
+                        ui_elements["containers"].append({"name": name, "depth": depth})
+
+                if node_type in ('COMPONENT', 'INSTANCE'):
+                    layout_info["component_count"] += 1
+
+                children = node.get('children', [])
+                if children:
+                    layout_info["max_children"] = max(layout_info["max_children"], len(children))
+                    for child in children:
+                        analyze_node(child, depth + 1)
+
+        partial = False
+        try:
+            for child in figma_data.get('document', {}).get('children', []):
+                analyze_node(child)
+        except DeadlineExceeded:
+            partial = True
+
+        result = {
+            "ui_elements": ui_elements,
+            "layout_info": layout_info,
+            "ui_complexity": self.ui_complexity(ui_elements, layout_info)
+        }
+        if partial:
+            result["partial"] = True
+        return result
+
+    # ---- 유저플로우 ----
+
+    @staticmethod
+    def analyze_user_flow(keyword_analysis: dict, ui_analysis: dict) -> Dict[str, Any]:
+        """감지된 패턴과 UI 요소로 플로우 단계 / 주요 플로우 타입 추론"""
+        detected_patterns = keyword_analysis.get("detected_patterns", {})
+        ui_elements = ui_analysis.get("ui_elements", {})
+
+        flow_steps = ["사용자 인증" if "authentication" in detected_patterns else "화면 진입"]
+        if ui_elements.get("inputs"):
+            flow_steps.append("정보 입력")
+        if ui_elements.get("buttons"):
+            flow_steps.append("액션 실행" if len(ui_elements["buttons"]) == 1 else "옵션 선택")
+        flow_steps.append("결과 확인")
+
+        # 가장 신뢰도가 높은 패턴 (동점이면 먼저 감지된 패턴)
+        primary_flow_type = "general"
+        max_confidence = 0
+        for pattern_info in detected_patterns.values():
+            if pattern_info["confidence"] > max_confidence:
+                max_confidence = pattern_info["confidence"]
+                primary_flow_type = pattern_info["flow_type"]
+
+        return {
+            "flow_steps": flow_steps,
+            "primary_flow_type": primary_flow_type,
+            "confidence": max_confidence,
+            "complexity": ui_analysis.get("ui_complexity", "medium")
+        }
+
+
+_shared_engine: Optional[AnalysisEngine] = None
+_shared_lock = threading.Lock()
+
+
+def shared_engine() -> AnalysisEngine:
+    """프로세스 공용 엔진 (처음 사용할 때 한 번 컴파일, 서버 cpu 워커도 워커당 한 번)"""
+    global _shared_engine
+    with _shared_lock:
+        if _shared_engine is None:
+            _shared_engine = AnalysisEngine()
+        return _shared_engine
@@ -14,73 +14,35 @@ import requests
 from typing import Dict, List, Optional, Any
 from urllib.parse import urlparse
 
+from ..utils.columnar import save_analysis_tables
+from ..utils.rate_budget import RateBudget, budgeted_get, default_budget
+from ..utils.single_flight import SingleFlight
+from .analysis_engine import shared_engine
+
+# 같은 파일/노드를 동시에 요청하면 한 번만 가져와 결과를 공유 (분석기 인스턴스 간 공유)
+_FETCH_FLIGHTS = SingleFlight()
+
 class FigmaAnalyzer:
     """향상된 Figma 분석기"""
     
-    def __init__(self, figma_token: Optional[str] = None):
+    def __init__(self, figma_token: Optional[str] = None, rate_class: Optional[str] = None,
+                 rate_budget: Optional[RateBudget] = None):
         """
         초기화
         
         Args:
             figma_token: Figma API 토큰 (환경변수에서 자동 로드 가능)
+            rate_class: Figma 요청 우선순위 (interactive/batch, 기본값: FIGMA_RATE_CLASS 또는 interactive)
+            rate_budget: 토큰별 요청 예산 (기본값: rules_config.json의 figma_rate_limit, 프로세스 간 공유)
         """
         self.figma_token = figma_token or os.getenv("FIGMA_TOKEN")
         if not self.figma_token:
             raise ValueError("FIGMA_TOKEN이 설정되지 않았습니다.")
+        self.rate_class = rate_class
+        self.rate_budget = rate_budget or default_budget()
         
-        # UI 패턴 정의
-        self.ui_patterns = {
-            "navigation": {
-                "keywords": ["nav", "menu", "tab", "breadcrumb", "back", "next", "home"],
-                "flow_type": "navigation"
-            },
-            "authentication": {
-                "keywords": ["login", "signup", "register", "signin", "oauth", "auth", "password"],
-                "flow_type": "auth_flow"
-            },
-            "form_input": {
-                "keywords": ["input", "field", "form", "textfield", "submit", "save", "cancel"],
-                "flow_type": "form_interaction"
-            },
-            "modal_popup": {
-                "keywords": ["modal", "popup", "dialog", "overlay", "confirm", "alert"],
-                "flow_type": "modal_flow"
-            },
-            "transaction": {
-                "keywords": ["buy", "sell", "trade", "order", "payment", "checkout", "confirm"],
-                "flow_type": "transaction_flow"
-            },
-            "social": {
-                "keywords": ["share", "like", "follow", "comment", "social", "connect"],
-                "flow_type": "social_interaction"
-            },
-            "settings": {
-                "keywords": ["settings", "preferences", "profile", "account", "config"],
-                "flow_type": "settings_flow"
-            }
-        }
-        
-        # 플로우 패턴 정의
-        self.flow_patterns = {
-            "onboarding": ["welcome", "intro", "tutorial", "getting started", "setup"],
-            "purchasing": ["add to cart", "checkout", "payment", "order", "buy"],
-            "registration": ["sign up", "register", "create account", "join"],
-            "verification": ["verify", "confirm", "validate", "check", "code"],
-            "error_handling": ["error", "failed", "retry", "oops", "something went wrong"],
-            "success": ["success", "complete", "done", "congratulations", "thank you"]
-        }
-        
-        # 요구사항 키워드 (기존 mcp_figma_server.py에서 가져옴)
-        self.requirement_keywords = [
-            '기능', '요구사항', '사용자', '시스템', '화면', '페이지', '버튼',
-            '클릭', '선택', '입력', '검색', '필터', '정렬', '스크롤',
-            '로그인', '회원가입', '로그아웃', '프로필', '설정', '알림',
-            '목록', '리스트', '카드', '메뉴', '탭', '모달', '팝업',
-            '등록', '수정', '삭제', '추가', '업데이트', '동기화',
-            # ... (전체 키워드 리스트)
-            'login', 'signup', 'setting', 'search', 'filter', 'sort', 'upload', 'download',
-            'button', 'click', 'tap', 'swipe', 'scroll'
-        ]
+        # 요구사항 판별 / UI 패턴 / UI 구조 / 유저플로우 분석 엔진 (MCP 서버와 같은 엔진, 프로세스당 한 번 컴파일)
+        self.engine = shared_engine()
     
     def parse_figma_url(self, url: str) -> Dict[str, Any]:
         """Figma URL 파싱"""
@@ -105,7 +67,16 @@ class FigmaAnalyzer:
             return {"success": False, "error": f"URL 파싱 오류: {str(e)}"}
     
     def fetch_figma_data(self, file_id: str, node_id: Optional[str] = None) -> Dict[str, Any]:
-        """Figma API에서 데이터 가져오기"""
+        """
+        Figma API에서 데이터 가져오기
+        
+        같은 file_id/node_id 요청이 진행 중이면 그 결과를 함께 받음 (data는 호출자 간 공유되므로 수정하지 말 것)
+        """
+        key = (self.figma_token, file_id, node_id.replace('-', ':') if node_id else None)
+        result, _ = _FETCH_FLIGHTS.do(key, self._fetch_figma_data, file_id, node_id)
+        return dict(result)
+    
+    def _fetch_figma_data(self, file_id: str, node_id: Optional[str] = None) -> Dict[str, Any]:
         try:
             headers = {"X-Figma-Token": self.figma_token}
             
@@ -117,7 +88,7 @@ class FigmaAnalyzer:
                 # 전체 파일 데이터 가져오기
                 url = f"https://api.figma.com/v1/files/{file_id}"
             
-            response = requests.get(url, headers=headers)
+            response = budgeted_get(self.rate_budget, self.figma_token, url, self.rate_class, headers=headers)
             response.raise_for_status()
             
             data = response.json()
@@ -261,183 +232,19 @@ class FigmaAnalyzer:
     
     def _is_requirement_text(self, text: str) -> bool:
         """텍스트가 요구사항인지 판단"""
-        if not text or len(text) < 3 or len(text) > 1000:
-            return False
-        
-        # 제외할 키워드들
-        exclude_keywords = [
-            'px', 'pt', 'rem', 'color', 'font', 'weight', 'size',
-            'margin', 'padding', 'border', 'shadow', 'opacity'
-        ]
-        
-        text_lower = text.lower()
-        if any(exclude in text_lower for exclude in exclude_keywords):
-            return False
-        
-        # 요구사항 키워드 포함 여부 확인
-        return any(keyword in text for keyword in self.requirement_keywords)
+        return self.engine.is_requirement_text(text)
     
     def _analyze_enhanced_keywords(self, figma_data: Dict) -> Dict[str, Any]:
-        """향상된 키워드 분석"""
-        texts = []
-        names = []
-        
-        def traverse_nodes(nodes, depth=0):
-            if isinstance(nodes, list):
-                for node in nodes:
-                    traverse_nodes(node, depth)
-            elif isinstance(nodes, dict):
-                node = nodes  # dict인 경우 nodes를 node로 할당
-                node_type = node.get('type')
-                node_name = node.get('name', '')
-                
-                if node_type == 'TEXT' and 'characters' in node:
-                    text = node['characters'].strip()
-                    if text:
-                        texts.append({"text": text, "depth": depth})
-                
-                if node_type in ['FRAME', 'COMPONENT', 'INSTANCE'] and node_name:
-                    names.append({"name": node_name, "type": node_type.lower(), "depth": depth})
-                
-                if 'children' in node:
-                    traverse_nodes(node['children'], depth + 1)
-        
-        traverse_nodes(figma_data.get('document', {}).get('children', []))
-        
-        # 모든 텍스트 결합
-        all_text = " ".join([t["text"] for t in texts] + [n["name"] for n in names])
-        
-        # UI 패턴 매칭
-        detected_patterns = {}
-        for pattern_name, pattern_info in self.ui_patterns.items():
-            keywords = pattern_info["keywords"]
-            matches = sum(1 for keyword in keywords if keyword.lower() in all_text.lower())
-            if matches > 0:
-                detected_patterns[pattern_name] = {
-                    "matches": matches,
-                    "flow_type": pattern_info["flow_type"],
-                    "confidence": min(matches * 20, 100)
-                }
-        
-        # 플로우 패턴 매칭
-        detected_flows = {}
-        for flow_name, flow_keywords in self.flow_patterns.items():
-            matches = sum(1 for keyword in flow_keywords if keyword.lower() in all_text.lower())
-            if matches > 0:
-                detected_flows[flow_name] = {
-                    "matches": matches,
-                    "confidence": min(matches * 25, 100)
-                }
-        
-        return {
-            "texts": texts,
-            "names": names,
-            "detected_patterns": detected_patterns,
-            "detected_flows": detected_flows,
-            "total_elements": len(texts) + len(names)
-        }
+        """향상된 키워드 분석 (UI 패턴 + 플로우 패턴)"""
+        return self.engine.analyze_keywords(figma_data)
     
     def _analyze_ui_structure(self, figma_data: Dict) -> Dict[str, Any]:
         """UI 구조 분석"""
-        ui_elements = {
-            "buttons": [],
-            "inputs": [],
-            "navigation": [],
-            "containers": []
-        }
-        
-        layout_info = {
-            "depth_levels": 0,
-            "max_children": 0,
-            "component_count": 0
-        }
-        
-        def analyze_node(node, depth=0):
-            if isinstance(node, dict):
-                node_type = node.get('type', '')
-                node_name = node.get('name', '').lower()
-                
-                layout_info["depth_levels"] = max(layout_info["depth_levels"], depth)
-                
-                # UI 요소 분류
-                if 'button' in node_name or 'btn' in node_name:
-                    ui_elements["buttons"].append({"name": node.get('name', ''), "depth": depth})
-                elif any(keyword in node_name for keyword in ['input', 'field', 'textfield']):
-                    ui_elements["inputs"].append({"name": node.get('name', ''), "depth": depth})
-                elif any(keyword in node_name for keyword in ['nav', 'menu', 'tab']):
-                    ui_elements["navigation"].append({"name": node.get('name', ''), "depth": depth})
-                elif node_type in ['FRAME', 'GROUP']:
-                    ui_elements["containers"].append({"name": node.get('name', ''), "depth": depth})
-                
-                if node_type in ['COMPONENT', 'INSTANCE']:
-                    layout_info["component_count"] += 1
-                
-                children = node.get('children', [])
-                if children:
-                    layout_info["max_children"] = max(layout_info["max_children"], len(children))
-                    for child in children:
-                        analyze_node(child, depth + 1)
-        
-        for child in figma_data.get('document', {}).get('children', []):
-            analyze_node(child)
-        
-        # UI 복잡도 계산
-        total_elements = sum(len(elements) for elements in ui_elements.values())
-        complexity_score = total_elements + layout_info["depth_levels"] * 2 + layout_info["component_count"]
-        
-        if complexity_score < 20:
-            ui_complexity = "low"
-        elif complexity_score < 50:
-            ui_complexity = "medium"
-        else:
-            ui_complexity = "high"
-        
-        return {
-            "ui_elements": ui_elements,
-            "layout_info": layout_info,
-            "ui_complexity": ui_complexity
-        }
+        return self.engine.analyze_ui_structure(figma_data)
     
     def _analyze_user_flow(self, keyword_analysis: Dict, ui_analysis: Dict) -> Dict[str, Any]:
         """유저플로우 분석"""
-        detected_patterns = keyword_analysis.get("detected_patterns", {})
-        ui_elements = ui_analysis.get("ui_elements", {})
-        
-        # 플로우 단계 추론
-        flow_steps = []
-        
-        if "authentication" in detected_patterns:
-            flow_steps.append("사용자 인증")
-        else:
-            flow_steps.append("화면 진입")
-        
-        if ui_elements.get("inputs"):
-            flow_steps.append("정보 입력")
-        
-        if ui_elements.get("buttons"):
-            button_count = len(ui_elements["buttons"])
-            if button_count == 1:
-                flow_steps.append("액션 실행")
-            else:
-                flow_steps.append("옵션 선택")
-        
-        flow_steps.append("결과 확인")
-        
-        # 주요 플로우 타입 결정
-        primary_flow_type = "general"
-        max_confidence = 0
-        
-        for pattern_name, pattern_info in detected_patterns.items():
-            if pattern_info["confidence"] > max_confidence:
-                max_confidence = pattern_info["confidence"]
-                primary_flow_type = pattern_info["flow_type"]
-        
-        return {
-            "flow_steps": flow_steps,
-            "primary_flow_type": primary_flow_type,
-            "confidence": max_confidence,
-            "complexity": ui_analysis.get("ui_complexity", "medium")
-        }
+        return self.engine.analyze_user_flow(keyword_analysis, ui_analysis)
     
     def _analyze_screenshot(self, file_id: str, node_id: str = None) -> Dict[str, Any]:
         """스크린샷 분석"""
@@ -450,7 +257,7 @@ class FigmaAnalyzer:
             else:
                 return {"success": False, "error": "노드 ID 필요"}
             
-            response = requests.get(image_url, headers=headers)
+            response = budgeted_get(self.rate_budget, self.figma_token, image_url, self.rate_class, headers=headers)
             response.raise_for_status()
             
             image_data = response.json()
@@ -508,6 +315,23 @@ class FigmaAnalyzer:
         
         return recommendations
     
+    def save_analysis_tables(self, analysis_result: Dict[str, Any], output_dir: str,
+                             fmt: str = "parquet") -> Dict[str, str]:
+        """
+        enhanced_analysis() 결과의 texts / names / ui_elements를 Parquet 또는 Feather로 저장 (pyarrow 필요)
+
+        Args:
+            analysis_result: enhanced_analysis() 결과
+            output_dir: 저장 디렉토리
+            fmt: "parquet" 또는 "feather"
+
+        Returns:
+            Dict[str, str]: 테이블 이름 -> 파일 경로
+        """
+        if not analysis_result.get("success"):
+            raise ValueError(f"분석 결과 오류: {analysis_result.get('error')}")
+        return save_analysis_tables(analysis_result, output_dir, fmt)
+    
     def compare_screens(self, as_is_url: str, to_be_url: str) -> Dict[str, Any]:
         """AS-IS vs TO-BE 화면 비교 분석"""
         # AS-IS 분석
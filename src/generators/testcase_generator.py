@@ -7,13 +7,29 @@
 """
 
 import json
-import pandas as pd
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Iterable, Iterator, Sequence, Tuple, Union
 from ..analyzers.figma_analyzer import FigmaAnalyzer
 from ..utils.rules_config import RulesConfig, load_rules_config, normalize_testcase_fields
+from ..utils.dedupe import DedupeResult, deduplicate_testcases, iter_deduplicated
+from ..utils.streaming import DEFAULT_BUFFER_SIZE, iter_by_priority, iter_normalized
+from ..utils.keyword_classifier import KeywordClassifier
+from ..utils.generation_cache import GenerationCache
+from ..utils.excel_writer import SheetLayout, load_template_layout, write_xlsx
+from ..utils.excel_merge import MergeResult, merge_xlsx
+from ..utils.testcase_store import TestCaseStore
+from ..utils.export import fan_out
+from ..utils.sharding import DEFAULT_SHARD_ROWS, write_sharded_xlsx
+from ..utils.json_formats import open_text, write_columnar_json, write_ndjson
+from ..utils.testrail import write_testrail_csv
+from ..utils.columnar import TESTCASE_DICTIONARY_COLUMNS, rows_to_table, write_table
 import os
 
+# 템플릿/생성 로직이 바뀌면 올려서 생성 캐시를 무효화
+GENERATOR_VERSION = "1.0.0"
+
 class TestCaseGenerator:
     """테스트케이스 생성기"""
     
@@ -46,6 +62,12 @@ class TestCaseGenerator:
             "accessibility": "Accessibility",
             "usability": "Usability"
         }
+
+        # 키워드 기반 우선순위/카테고리 분류기 (rules_config.json 키워드를 한 번만 컴파일)
+        self.classifier = KeywordClassifier.from_rules(self.rules)
+
+        # 마지막 중복 제거 결과 (어떤 케이스가 병합되었는지 확인용)
+        self.last_dedupe_result: Optional[DedupeResult] = None
     
     def generate_from_analysis(self, analysis_result: Dict[str, Any], 
                              custom_scenarios: Optional[List[Dict]] = None) -> List[Dict]:
@@ -59,10 +81,63 @@ class TestCaseGenerator:
         Returns:
             List[Dict]: 생성된 테스트케이스 목록
         """
+        testcases = list(self._iter_raw_testcases(analysis_result, custom_scenarios))
+        
+        # 6. 우선순위 조정 및 중복 제거
+        testcases = self._optimize_testcases(testcases)
+        
+        # 7. 필드 정규화 (test_steps -> test_step 등)
+        testcases = [normalize_testcase_fields(tc, self.rules.field_aliases) for tc in testcases]
+        return testcases
+
+    def generate_cached(self, analysis_result: Dict[str, Any], cache: GenerationCache,
+                        min_priority: Optional[str] = None) -> Tuple[List[Dict], str, bool]:
+        """
+        캐시를 사용하는 generate_from_analysis()/generate_by_priority()
+
+        - 캐시 키: 분석 결과 fingerprint + 룰 설정 해시 + 생성기 버전 + 우선순위 필터
+        - 캐시 적중 시 생성 과정을 건너뛰고 저장된 정규화 케이스를 그대로 반환
+
+        Returns:
+            (테스트케이스 목록, 캐시 키, 캐시 적중 여부)
+        """
+        key = cache.key_for(analysis_result, self.rules, GENERATOR_VERSION, variant=min_priority or "")
+        testcases = cache.get(key)
+        if testcases is not None:
+            return testcases, key, True
+
+        if min_priority:
+            testcases = self.generate_by_priority(analysis_result, min_priority)
+        else:
+            testcases = self.generate_from_analysis(analysis_result)
+        cache.put(key, testcases)
+        return testcases, key, False
+
+    def iter_from_analysis(self, analysis_result: Dict[str, Any],
+                           custom_scenarios: Optional[Iterable[Dict]] = None,
+                           buffer_size: int = DEFAULT_BUFFER_SIZE) -> Iterator[Dict]:
+        """
+        generate_from_analysis()의 스트리밍 버전
+
+        - 케이스를 지연 생성하고 중복 제거/우선순위 정렬/필드 정규화를 이터레이터로 연결
+        - 우선순위 정렬은 buffer_size를 넘으면 임시 파일로 내보내므로 메모리 사용량이 일정
+        - 반환값은 save_to_excel/save_to_testrail_csv/save_to_json에 그대로 전달 가능
+        """
+        if not analysis_result.get("success"):
+            raise ValueError(f"분석 결과 오류: {analysis_result.get('error')}")
+
+        testcases = self._iter_raw_testcases(analysis_result, custom_scenarios)
+        if self.rules.priority_keyword_override:
+            testcases = self._iter_classified(testcases, overwrite=True)
+        testcases = iter_deduplicated(testcases)
+        testcases = iter_by_priority(testcases, self.rules.priority_order, buffer_size)
+        return iter_normalized(testcases, self.rules.field_aliases)
+
+    def _iter_raw_testcases(self, analysis_result: Dict[str, Any],
+                            custom_scenarios: Optional[Iterable[Dict]] = None) -> Iterator[Dict]:
+        """분석 결과에서 (중복 제거/정렬 전) 테스트케이스를 순서대로 생성"""
         if not analysis_result.get("success"):
             raise ValueError(f"분석 결과 오류: {analysis_result.get('error')}")
-        
-        testcases = []
         
         # 분석 결과에서 정보 추출
         enhanced_analysis = analysis_result.get("enhanced_analysis", {})
@@ -76,38 +151,55 @@ class TestCaseGenerator:
         
         # 1. UI 패턴 기반 테스트케이스 생성
         for pattern_name, pattern_info in detected_patterns.items():
-            pattern_testcases = self._generate_pattern_testcases(
-                pattern_name, pattern_info, ui_elements
-            )
-            testcases.extend(pattern_testcases)
+            yield from self._generate_pattern_testcases(pattern_name, pattern_info, ui_elements)
         
         # 2. 유저플로우 기반 테스트케이스 생성
-        flow_testcases = self._generate_flow_testcases(user_flow, ui_elements)
-        testcases.extend(flow_testcases)
+        yield from self._generate_flow_testcases(user_flow, ui_elements)
         
         # 3. UI 요소 기반 테스트케이스 생성
-        ui_testcases = self._generate_ui_testcases(ui_elements, ui_structure)
-        testcases.extend(ui_testcases)
+        yield from self._generate_ui_testcases(ui_elements, ui_structure)
         
         # 4. 권장사항 기반 테스트케이스 생성
-        recommendation_testcases = self._generate_recommendation_testcases(recommendations)
-        testcases.extend(recommendation_testcases)
+        yield from self._generate_recommendation_testcases(recommendations)
 
         # 4.5 룰 기반 기본 커버리지 보강 (접근성/사용성/엣지/네거티브/크로스플랫폼)
-        rule_coverage_tests = self._generate_rule_coverage_testcases(user_flow, ui_structure, ui_elements)
-        testcases.extend(rule_coverage_tests)
+        yield from self._generate_rule_coverage_testcases(user_flow, ui_structure, ui_elements)
         
         # 5. 커스텀 시나리오 추가
         if custom_scenarios:
-            custom_testcases = self._generate_custom_testcases(custom_scenarios)
-            testcases.extend(custom_testcases)
-        
-        # 6. 우선순위 조정 및 중복 제거
-        testcases = self._optimize_testcases(testcases)
-        
-        # 7. 필드 정규화 (test_steps -> test_step 등)
-        testcases = [normalize_testcase_fields(tc, self.rules.field_aliases) for tc in testcases]
-        return testcases
+            yield from self._iter_custom_testcases(custom_scenarios)
+
+    def generate_many(self, analyses: Sequence[Dict[str, Any]], jobs: Optional[int] = None,
+                      custom_scenarios: Optional[List[Dict]] = None) -> List[Dict[str, Any]]:
+        """
+        여러 분석 결과를 한 번에 테스트케이스로 변환 (프로세스 풀 사용)
+
+        - 워커 프로세스마다 한 번만 룰 설정/템플릿을 구성하고 재사용
+        - 결과는 입력 순서를 유지하며, 분석 결과별 소요 시간을 함께 반환
+        - 개별 분석 실패는 해당 항목에만 기록 (배치 전체를 중단하지 않음)
+
+        Args:
+            analyses: FigmaAnalyzer.enhanced_analysis() 결과 목록
+            jobs: 워커 프로세스 수 (None이면 CPU 코어 수, 1이면 현재 프로세스에서 순차 실행)
+            custom_scenarios: 모든 분석 결과에 공통 적용할 커스텀 시나리오 (선택사항)
+
+        Returns:
+            List[Dict]: [{"success", "testcases" | "error", "elapsed_sec"}, ...] (입력 순서)
+        """
+        analyses = list(analyses)
+        if not analyses:
+            return []
+
+        jobs = jobs or os.cpu_count() or 1
+        jobs = min(jobs, len(analyses))
+        if jobs <= 1:
+            return [_generate_one(self, analysis, custom_scenarios) for analysis in analyses]
+
+        # 워커 간 분배 단위 (IPC 오버헤드를 줄이면서 부하 균형 유지)
+        chunksize = max(1, len(analyses) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_batch_worker,
+                                 initargs=(self.rules.raw, custom_scenarios)) as executor:
+            return list(executor.map(_generate_in_worker, analyses, chunksize=chunksize))
 
     def get_flow_clarification_questions(self, analysis_result: Dict[str, Any]) -> List[str]:
         """
@@ -409,29 +501,41 @@ class TestCaseGenerator:
         
         return testcases
     
-    def _generate_custom_testcases(self, custom_scenarios: List[Dict]) -> List[Dict]:
-        """커스텀 시나리오 기반 테스트케이스 생성"""
-        testcases = []
-        
+    def _iter_custom_testcases(self, custom_scenarios: Iterable[Dict]) -> Iterator[Dict]:
+        """커스텀 시나리오 기반 테스트케이스 생성 (대량 시나리오도 하나씩 변환)"""
         for scenario in custom_scenarios:
             testcase = {**self.testcase_template}
             testcase.update(scenario)
             testcase["comment"] = "사용자 정의 시나리오"
-            testcases.append(testcase)
-        
-        return testcases
+            if not scenario.get("priority"):
+                testcase["priority"] = self.classifier.classify_testcase(testcase)[0]
+            yield testcase
+
+    def _iter_classified(self, testcases: Iterable[Dict], overwrite: bool = False) -> Iterator[Dict]:
+        """키워드 분류 우선순위를 케이스 단위로 지연 적용"""
+        for testcase in testcases:
+            if overwrite or not testcase.get("priority"):
+                testcase["priority"] = self.classifier.classify_testcase(testcase)[0]
+            yield testcase
+
+    def assign_priorities(self, testcases: Iterable[Dict], overwrite: bool = False) -> List[Dict]:
+        """
+        키워드 기반 우선순위 일괄 지정 (케이스당 텍스트 1회 스캔)
+
+        Args:
+            testcases: 테스트케이스 목록
+            overwrite: True면 기존 우선순위도 덮어씀 (False면 비어있는 경우만 채움)
+        """
+        return list(self._iter_classified(testcases, overwrite))
     
     def _optimize_testcases(self, testcases: List[Dict]) -> List[Dict]:
         """테스트케이스 최적화 (중복 제거, 우선순위 조정)"""
-        # 제목 기반 중복 제거
-        seen_titles = set()
-        unique_testcases = []
-        
-        for testcase in testcases:
-            title = testcase.get("title", "")
-            if title not in seen_titles:
-                seen_titles.add(title)
-                unique_testcases.append(testcase)
+        if self.rules.priority_keyword_override:
+            testcases = self.assign_priorities(testcases, overwrite=True)
+
+        # 정규화된 제목/절차/기대 결과 기반 중복 + 근사 중복 제거
+        self.last_dedupe_result = deduplicate_testcases(testcases)
+        unique_testcases = self.last_dedupe_result.testcases
         
         # 우선순위별 정렬 (P1 > P2 > P3 > P4)
         priority_order = {"P1": 1, "P2": 2, "P3": 3, "P4": 4}
@@ -442,7 +546,7 @@ class TestCaseGenerator:
     def generate_scenarios(self, feature_config: Dict[str, Any]) -> List[Dict]:
         """시나리오 설정 기반 테스트케이스 생성"""
         feature_name = feature_config.get("feature_name", "Unknown Feature")
-        priority = feature_config.get("priority", "P2") 
+        priority = feature_config.get("priority")
         scenarios = feature_config.get("scenarios", [])
         
         testcases = []
@@ -456,17 +560,28 @@ class TestCaseGenerator:
                 "comment": "시나리오 기반 생성"
             }
             testcases.append(testcase)
+
+        # 우선순위가 지정되지 않은 기능은 시나리오 제목 키워드로 분류
+        if not priority:
+            testcases = self.assign_priorities(testcases)
         
         return testcases
     
-    def identify_missing_tests(self, existing_tests: List[Dict], 
+    def identify_missing_tests(self, existing_tests: Union[List[Dict], TestCaseStore],
                              analysis_result: Dict[str, Any]) -> List[Dict]:
-        """기존 테스트와 분석 결과를 비교하여 누락된 테스트 식별"""
+        """
+        기존 테스트와 분석 결과를 비교하여 누락된 테스트 식별
+
+        existing_tests가 TestCaseStore면 전체를 읽지 않고 title 인덱스로 조회
+        """
         # 분석 결과에서 생성된 테스트케이스
         generated_tests = self.generate_from_analysis(analysis_result)
         
         # 기존 테스트 제목들
-        existing_titles = {test.get("title", "") for test in existing_tests}
+        if isinstance(existing_tests, TestCaseStore):
+            existing_titles = existing_tests.existing_titles(test.get("title", "") for test in generated_tests)
+        else:
+            existing_titles = {test.get("title", "") for test in existing_tests}
         
         # 누락된 테스트케이스 필터링
         missing_tests = [
@@ -477,12 +592,23 @@ class TestCaseGenerator:
         return missing_tests
     
     def generate_by_priority(self, analysis_result: Dict[str, Any], 
-                           min_priority: str = "P1") -> List[Dict]:
-        """우선순위 기반 테스트케이스 생성"""
+                           min_priority: str = "P1", store: Optional[TestCaseStore] = None) -> List[Dict]:
+        """
+        우선순위 기반 테스트케이스 생성
+
+        store를 지정하면 생성한 케이스를 저장소에 upsert한 뒤 priority 인덱스로 조회
+        (저장소에 이미 있던 케이스도 함께 반환)
+        """
         all_tests = self.generate_from_analysis(analysis_result)
         
         priority_filter = {"P1": 1, "P2": 2, "P3": 3, "P4": 4}
         min_level = priority_filter.get(min_priority, 2)
+
+        if store is not None:
+            store.add_many(all_tests)
+            # 알 수 없는 우선순위는 P4로 취급하므로 P4 이상이면 필터 없음
+            priorities = None if min_level >= 4 else [p for p, level in priority_filter.items() if level <= min_level]
+            return list(store.iter_testcases(priorities=priorities))
         
         filtered_tests = [
             test for test in all_tests
@@ -491,129 +617,246 @@ class TestCaseGenerator:
         
         return filtered_tests
     
-    def save_to_excel(self, testcases: List[Dict], filename: str):
-        """Excel 형식으로 저장"""
-        # 1) 룰 기반 정규화 + 컬럼 정렬
-        normalized = [normalize_testcase_fields(tc, self.rules.field_aliases) for tc in testcases]
-        df = pd.DataFrame(normalized)
-        for col in self.rules.output_columns:
-            if col not in df.columns:
-                df[col] = ""
-        df = df[self.rules.output_columns]
-
-        # 2) 템플릿을 사용해 스타일 유지 (가능하면)
+    def save_to_excel(self, testcases: Iterable[Dict], filename: str, use_template: bool = True):
+        """
+        Excel 형식으로 저장 (리스트 또는 iter_from_analysis() 이터레이터)
+
+        Args:
+            testcases: 테스트케이스 목록 또는 이터레이터
+            filename: 저장 경로
+            use_template: False면 템플릿 없이 스트리밍 writer로 바로 기록 (대량 스위트용)
+        """
+        # 룰 기반 정규화 (케이스 단위 지연 적용)
+        self._write_excel(iter_normalized(testcases, self.rules.field_aliases), filename, use_template)
+
+    def _write_excel(self, rows: Iterable[Dict], filename: str, use_template: bool = True) -> None:
+        """정규화된 행을 Excel로 기록"""
+        layout, sheet_name = self._excel_layout(use_template)
+        write_xlsx(rows, filename, layout, sheet_name=sheet_name)
+
+    def save_to_excel_sharded(self, testcases: Iterable[Dict], filename: str, by: str = "domain",
+                              max_rows: int = DEFAULT_SHARD_ROWS, mode: str = "files",
+                              jobs: Optional[int] = None, use_template: bool = True) -> List[Dict[str, Any]]:
+        """
+        대용량 스위트를 domain별 또는 행 수 기준으로 나눠 Excel로 저장
+
+        - mode="files": filename은 Index 워크북, 분할 단위별 워크북은 워커 프로세스에서 동시에 기록
+        - mode="sheets": filename 하나에 Index 시트 + 분할 단위별 시트
+
+        Args:
+            testcases: 테스트케이스 목록 또는 이터레이터
+            filename: Index 워크북 경로
+            by: "domain" 또는 "rows"
+            max_rows: 시트/파일당 최대 행 수 (domain이 이보다 크면 추가 분할)
+            mode: "files" 또는 "sheets"
+            jobs: 워커 프로세스 수 (None이면 CPU 코어 수)
+            use_template: 템플릿 레이아웃 사용 여부 (save_to_excel과 동일)
+
+        Returns:
+            List[Dict]: [{"name", "rows", "path", "sheet"}, ...]
+        """
+        layout, sheet_name = self._excel_layout(use_template)
+        return write_sharded_xlsx(iter_normalized(testcases, self.rules.field_aliases), filename, layout,
+                                  by=by, max_rows=max_rows, mode=mode, jobs=jobs, sheet_name=sheet_name)
+
+    def merge_into_excel(self, testcases: Iterable[Dict], filename: str,
+                         use_template: bool = True) -> MergeResult:
+        """
+        기존 Excel 스위트에 증분 병합 (테스터가 기록한 결과 컬럼 유지)
+
+        - 케이스는 domain/section/component/feature/title로 식별
+        - 새 케이스는 끝에 추가, 바뀐 케이스는 생성 컬럼만 갱신
+          (rules_config.json result_recording_rules의 columns/tester_columns는 기존 값 유지)
+        - 기존 파일에만 있는 케이스는 삭제하지 않음, 변경분이 없으면 파일을 다시 쓰지 않음
+        - 파일이 없으면 새로 생성
+
+        Args:
+            testcases: 테스트케이스 목록 또는 이터레이터
+            filename: 기존 워크북 경로
+            use_template: 템플릿 레이아웃 사용 여부 (save_to_excel과 동일)
+
+        Returns:
+            MergeResult: added/updated/unchanged/kept 개수와 파일 기록 여부
+        """
+        layout, sheet_name = self._excel_layout(use_template)
+        return merge_xlsx(iter_normalized(testcases, self.rules.field_aliases), filename, layout,
+                          sheet_name=sheet_name, preserve_columns=self.rules.preserved_columns)
+
+    def _excel_layout(self, use_template: bool = True) -> Tuple[SheetLayout, str]:
+        """Excel 저장 레이아웃 (템플릿이 있으면 템플릿 레이아웃, 없으면 기본 레이아웃)과 시트 이름"""
+        # 1) 템플릿을 사용해 스타일 유지 (가능하면)
         template_path = os.path.join(
             os.path.dirname(os.path.dirname(os.path.dirname(__file__))),  # project root
             "templates",
             "QA_Testcase_Template_WebApp.xlsx",
         )
-        if os.path.exists(template_path):
+        if use_template and os.path.exists(template_path):
             try:
-                self._save_to_excel_with_template(df, filename, template_path)
-                return
+                return self._load_excel_template(template_path)
             except Exception:
-                # 템플릿 저장 실패 시 기존 방식으로 폴백
+                # 템플릿 로드 실패 시 기존 방식으로 폴백
                 pass
 
-        # 3) 폴백: DataFrame 기반 저장(스타일 일부만 적용)
-        with pd.ExcelWriter(filename, engine="openpyxl") as writer:
-            df.to_excel(writer, sheet_name="TestCases", index=False)
-            worksheet = writer.sheets["TestCases"]
-            column_widths = {
-                "A": 15,  # domain
-                "B": 20,  # section
-                "C": 20,  # component
-                "D": 25,  # feature
-                "E": 50,  # title
-                "F": 40,  # precondition
-                "G": 60,  # test_step
-                "H": 60,  # expected_results
-                "I": 10,  # priority
-                "J": 15,  # type
-                "K": 30,  # comment
-                "L": 15,  # web_result
-                "M": 15,  # app_result
-            }
-            for col, width in column_widths.items():
-                worksheet.column_dimensions[col].width = width
+        # 2) 폴백: write-only 스트리밍 저장 (헤더 스타일/열 너비만 적용, 메모리 사용량 일정)
+        column_widths = {
+            "A": 15,  # domain
+            "B": 20,  # section
+            "C": 20,  # component
+            "D": 25,  # feature
+            "E": 50,  # title
+            "F": 40,  # precondition
+            "G": 60,  # test_step
+            "H": 60,  # expected_results
+            "I": 10,  # priority
+            "J": 15,  # type
+            "K": 30,  # comment
+            "L": 15,  # web_result
+            "M": 15,  # app_result
+        }
+        return SheetLayout.default(self.rules.output_columns, column_widths), "TestCases"
 
-    def _save_to_excel_with_template(self, df: pd.DataFrame, filename: str, template_path: str) -> None:
+    def _load_excel_template(self, template_path: str):
         """
-        템플릿 엑셀을 복제하여 데이터만 채움 (헤더/열너비/고정행 등 스타일 유지).
+        템플릿 엑셀의 헤더/열너비/고정행/스타일을 한 번만 읽어 캐시된 레이아웃으로 반환.
         템플릿 가정:
         - 1행: 헤더
-        - 2행 이후: 데이터
+        - 2행: 예시 데이터 (데이터 셀 스타일로 사용)
         """
-        import openpyxl
-
-        wb = openpyxl.load_workbook(template_path)
-        ws = wb.active
+        # 템플릿에 없는 컬럼이 있으면 저장은 하되, 해당 컬럼은 스킵
+        # (일관성은 rules_config.json이 관리)
+        return load_template_layout(template_path, self.rules.output_columns)
 
-        # 헤더(1행) 기반 컬럼 매핑
-        def _norm_header(s: str) -> str:
-            return "".join(ch for ch in (s or "").strip().lower() if ch.isalnum() or ch == "_")
+    def save_to_testrail_csv(self, testcases: Iterable[Dict], filename: str,
+                             section_fields: Optional[Sequence[str]] = None):
+        """
+        TestRail 가져오기용 CSV 형식으로 저장 (케이스를 하나씩 변환해 chunk 단위로 기록)
 
-        header_row = 1
-        header_to_col_idx: Dict[str, int] = {}
-        for col_idx in range(1, ws.max_column + 1):
-            v = ws.cell(row=header_row, column=col_idx).value
-            if not v:
-                continue
-            header_to_col_idx[_norm_header(str(v))] = col_idx
+        Args:
+            testcases: 테스트케이스 목록 또는 이터레이터
+            filename: 저장 경로
+            section_fields: Section 경로 필드 (기본값: rules_config.json testrail_export.section_fields)
+        """
+        self._write_testrail_csv(iter_normalized(testcases, self.rules.field_aliases), filename, section_fields)
 
-        # 템플릿에 없는 컬럼이 있으면 저장은 하되, 해당 컬럼은 스킵
-        # (일관성은 rules_config.json이 관리)
-        # 기존 데이터 제거 (2행부터)
-        if ws.max_row >= 2:
-            ws.delete_rows(2, ws.max_row - 1)
-
-        # 데이터 입력 (2행부터)
-        for r_idx, row in enumerate(df.to_dict("records"), start=2):
-            for key, value in row.items():
-                col_idx = header_to_col_idx.get(_norm_header(key))
-                if not col_idx:
-                    continue
-                ws.cell(row=r_idx, column=col_idx).value = value
-
-        wb.save(filename)
-        wb.close()
-    
-    def save_to_testrail_csv(self, testcases: List[Dict], filename: str):
-        """TestRail 가져오기용 CSV 형식으로 저장"""
-        # TestRail 필드로 변환
-        testrail_data = []
-        
-        for testcase in [normalize_testcase_fields(tc, self.rules.field_aliases) for tc in testcases]:
-            testrail_testcase = {
-                "Section": f"{testcase.get('domain', '')}/{testcase.get('section', '')}",
-                "Title": testcase.get("title", ""),
-                "Type": testcase.get("type", "Functional"),
-                "Priority": testcase.get("priority", "P2"),
-                "Estimate": "5m",
-                "References": "",
-                "Preconditions": testcase.get("precondition", ""),
-                "Steps": testcase.get("test_step", ""),
-                "Expected Result": testcase.get("expected_results", "")
-            }
-            testrail_data.append(testrail_testcase)
-        
-        df = pd.DataFrame(testrail_data)
-        df.to_csv(filename, index=False, encoding='utf-8-sig')
+    def _write_testrail_csv(self, rows: Iterable[Dict], filename: str,
+                            section_fields: Optional[Sequence[str]] = None) -> None:
+        """정규화된 행을 TestRail CSV로 기록 (Estimate는 스텝 수 기반)"""
+        write_testrail_csv(
+            rows,
+            filename,
+            section_fields=section_fields or self.rules.testrail_section_fields,
+            section_separator=self.rules.testrail_section_separator,
+            base_minutes=self.rules.testrail_estimate_base_minutes,
+            minutes_per_step=self.rules.testrail_estimate_minutes_per_step,
+        )
     
-    def save_to_json(self, testcases: List[Dict], filename: str):
-        """JSON 형식으로 저장"""
-        normalized = [normalize_testcase_fields(tc, self.rules.field_aliases) for tc in testcases]
-        output_data = {
-            "metadata": {
-                "generated_at": datetime.now().isoformat(),
-                "total_testcases": len(normalized),
-                "generator_version": "1.0.0"
-            },
-            "testcases": normalized
+    def save_to_json(self, testcases: Iterable[Dict], filename: str,
+                     mode: str = "document", compress: bool = False):
+        """
+        JSON 형식으로 저장
+
+        케이스를 하나씩 기록하므로 전체 목록을 메모리에 올리지 않음.
+        (총 개수를 기록 후에 알 수 있어 metadata는 testcases 뒤에 위치)
+
+        Args:
+            testcases: 테스트케이스 목록 또는 이터레이터
+            filename: 저장 경로
+            mode: "document"({"testcases": [...], "metadata": {...}}),
+                  "ndjson"(한 줄에 케이스 하나), "columnar"(컬럼 배열 + 공유 문자열 테이블)
+            compress: gzip 압축 여부
+        """
+        rows = iter_normalized(testcases, self.rules.field_aliases)
+        if mode == "document":
+            self._write_json(rows, filename, compress)
+        elif mode == "ndjson":
+            write_ndjson(rows, filename, compress)
+        elif mode == "columnar":
+            self._write_columnar_json(rows, filename, compress)
+        else:
+            raise ValueError(f"지원하지 않는 JSON 모드: {mode}")
+
+    def _json_metadata(self, total: int) -> Dict[str, Any]:
+        return {
+            "generated_at": datetime.now().isoformat(),
+            "total_testcases": total,
+            "generator_version": GENERATOR_VERSION
         }
-        
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(output_data, f, ensure_ascii=False, indent=2)
+
+    def _write_json(self, rows: Iterable[Dict], filename: str, compress: bool = False) -> None:
+        """정규화된 행을 JSON으로 기록"""
+        total = 0
+        with open_text(filename, 'w', compress) as f:
+            f.write('{\n  "testcases": [')
+            for testcase in rows:
+                f.write(",\n" if total else "\n")
+                f.write(_indent_json(testcase, 4))
+                total += 1
+            f.write("\n  ]," if total else "],")
+
+            f.write('\n  "metadata": ')
+            f.write(_indent_json(self._json_metadata(total), 2).lstrip())
+            f.write("\n}")
+
+    def _write_columnar_json(self, rows: Iterable[Dict], filename: str, compress: bool = False) -> None:
+        """정규화된 행을 컬럼형 JSON으로 기록 (출력 컬럼 순서 우선)"""
+        write_columnar_json(rows, filename, self.rules.output_columns,
+                            metadata=self._json_metadata, compress=compress)
+
+    def save_to_table(self, testcases: Iterable[Dict], filename: str, fmt: Optional[str] = None,
+                      compression: Optional[str] = None):
+        """
+        Parquet / Feather 형식으로 저장 (pyarrow 필요)
+
+        - domain/priority/type 컬럼은 dictionary 인코딩
+        - Feather는 기본 비압축이라 memory map으로 바로 로드 가능
+
+        Args:
+            testcases: 테스트케이스 목록 또는 이터레이터
+            filename: 저장 경로
+            fmt: "parquet" 또는 "feather" (기본값: 확장자로 판단, .parquet 외에는 feather)
+            compression: 압축 코덱 (기본값: parquet=snappy, feather=비압축)
+        """
+        self._write_table(iter_normalized(testcases, self.rules.field_aliases), filename, fmt, compression)
+
+    def _write_table(self, rows: Iterable[Dict], filename: str, fmt: Optional[str] = None,
+                     compression: Optional[str] = None) -> None:
+        """정규화된 행을 Parquet/Feather로 기록"""
+        fmt = fmt or ("parquet" if filename.endswith(".parquet") else "feather")
+        table = rows_to_table(rows, self.rules.output_columns, TESTCASE_DICTIONARY_COLUMNS)
+        write_table(table, filename, fmt, compression)
+
+    def save_all(self, testcases: Iterable[Dict], outputs: Dict[str, str],
+                 max_workers: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        여러 형식으로 동시에 저장 (정규화는 한 번만 수행하고 같은 버퍼를 각 writer에 전달)
+
+        - 형식별 writer는 스레드 풀에서 동시에 실행
+        - 각 파일은 임시 파일에 기록 후 rename (원자적 교체)
+
+        Args:
+            testcases: 테스트케이스 목록 또는 이터레이터
+            outputs: 형식("excel"/"testrail"/"json"/"ndjson"/"columnar"/"parquet"/"feather") -> 출력 경로
+            max_workers: 스레드 수 (기본값: 형식 수)
+
+        Returns:
+            형식 -> {"path": 경로, "elapsed_sec": 기록 시간}
+        """
+        writers = {
+            "excel": self._write_excel,
+            "testrail": self._write_testrail_csv,
+            "json": self._write_json,
+            "ndjson": write_ndjson,
+            "columnar": self._write_columnar_json,
+            "parquet": lambda rows, path: self._write_table(rows, path, "parquet"),
+            "feather": lambda rows, path: self._write_table(rows, path, "feather"),
+        }
+        unknown = set(outputs) - set(writers)
+        if unknown:
+            raise ValueError(f"지원하지 않는 출력 형식: {', '.join(sorted(unknown))}")
+
+        rows = list(iter_normalized(testcases, self.rules.field_aliases))
+        sinks = {fmt: (path, writers[fmt]) for fmt, path in outputs.items()}
+        return fan_out(rows, sinks, max_workers)
 
     def _generate_rule_coverage_testcases(self, user_flow: Dict, ui_structure: Dict, ui_elements: Dict) -> List[Dict]:
         """
@@ -707,3 +950,36 @@ class TestCaseGenerator:
             })
 
         return testcases
+
+
+def _indent_json(value: Any, indent: int) -> str:
+    """json.dump(indent=2)와 같은 모양으로 중첩 위치(indent칸)에 맞춰 직렬화"""
+    prefix = " " * indent
+    return prefix + json.dumps(value, ensure_ascii=False, indent=2).replace("\n", "\n" + prefix)
+
+
+# ========== 배치 생성 워커 (프로세스 풀) ==========
+
+_batch_generator: Optional[TestCaseGenerator] = None
+_batch_custom_scenarios: Optional[List[Dict]] = None
+
+
+def _init_batch_worker(rules_raw: Dict[str, Any], custom_scenarios: Optional[List[Dict]]) -> None:
+    """워커 프로세스 초기화: 룰 설정/템플릿을 프로세스당 한 번만 구성"""
+    global _batch_generator, _batch_custom_scenarios
+    _batch_generator = TestCaseGenerator(rules=RulesConfig(raw=rules_raw))
+    _batch_custom_scenarios = custom_scenarios
+
+
+def _generate_in_worker(analysis_result: Dict[str, Any]) -> Dict[str, Any]:
+    return _generate_one(_batch_generator, analysis_result, _batch_custom_scenarios)
+
+
+def _generate_one(generator: TestCaseGenerator, analysis_result: Dict[str, Any],
+                  custom_scenarios: Optional[List[Dict]]) -> Dict[str, Any]:
+    started = time.perf_counter()
+    try:
+        testcases = generator.generate_from_analysis(analysis_result, custom_scenarios)
+    except Exception as e:
+        return {"success": False, "error": str(e), "elapsed_sec": time.perf_counter() - started}
+    return {"success": True, "testcases": testcases, "elapsed_sec": time.perf_counter() - started}
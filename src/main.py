@@ -15,6 +15,9 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from src.analyzers.figma_analyzer import FigmaAnalyzer
 from src.generators.testcase_generator import TestCaseGenerator
 from src.utils.rules_config import DEFAULT_RULES_PATH
+from src.utils.generation_cache import DEFAULT_CACHE_DIR, GenerationCache
+from src.utils.sharding import DEFAULT_SHARD_ROWS
+from src.utils.testcase_store import TestCaseStore
 
 def main():
     """메인 실행 함수"""
@@ -33,8 +36,10 @@ def main():
     parser.add_argument('figma_url', help='분석할 Figma URL')
     parser.add_argument('--output', '-o', default='output/testcases.xlsx', 
                        help='출력 파일 경로 (기본값: output/testcases.xlsx)')
-    parser.add_argument('--format', '-f', choices=['excel', 'testrail', 'json'], 
-                       default='excel', help='출력 형식 (기본값: excel)')
+    parser.add_argument('--format', '-f', choices=['excel', 'testrail', 'json', 'ndjson', 'columnar'], 
+                       default='excel', help='출력 형식 (기본값: excel, ndjson=한 줄에 케이스 하나, columnar=컬럼형 JSON)')
+    parser.add_argument('--gzip', action='store_true',
+                       help='JSON 계열 형식(json/ndjson/columnar)을 gzip으로 압축')
     parser.add_argument('--analysis', '-a', choices=['basic', 'enhanced'], 
                        default='enhanced', help='분석 유형 (기본값: enhanced)')
     parser.add_argument('--priority', '-p', choices=['P1', 'P2', 'P3', 'P4'],
@@ -47,8 +52,30 @@ def main():
                        help=f'룰/템플릿 설정 파일 경로 (기본값: {DEFAULT_RULES_PATH})')
     parser.add_argument('--show-flow-questions', action='store_true',
                        help='유저플로우 신뢰도가 낮으면 확인 질문을 출력')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                       help=f'생성 결과 캐시 디렉토리 (기본값: {DEFAULT_CACHE_DIR})')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='생성 결과 캐시를 사용하지 않음')
+    parser.add_argument('--store',
+                       help='생성한 케이스를 누적할 SQLite 저장소 경로 (fingerprint 기준 upsert, -v 통계는 저장소 전체 기준)')
+    parser.add_argument('--merge', action='store_true',
+                       help='기존 Excel 파일에 증분 병합 (새 케이스 추가/바뀐 케이스 갱신, web_result/app_result 유지)')
+    parser.add_argument('--shard-by', choices=['domain', 'rows'],
+                       help='Excel 분할 저장 기준 (domain별 또는 --shard-rows 행씩, --output은 Index 워크북)')
+    parser.add_argument('--shard-mode', choices=['files', 'sheets'], default='files',
+                       help='분할 단위를 별도 워크북(files, 병렬 기록) 또는 시트(sheets)로 저장 (기본값: files)')
+    parser.add_argument('--shard-rows', type=int, default=DEFAULT_SHARD_ROWS,
+                       help=f'분할 단위당 최대 행 수 (기본값: {DEFAULT_SHARD_ROWS:,})')
+    parser.add_argument('--rate-class', choices=['interactive', 'batch'],
+                       help='Figma 요청 우선순위 (야간/배치 실행은 batch, 기본값: FIGMA_RATE_CLASS 또는 interactive)')
     
     args = parser.parse_args()
+    if args.gzip and args.format not in ('json', 'ndjson', 'columnar'):
+        parser.error("--gzip은 json/ndjson/columnar 형식에서만 사용할 수 있습니다.")
+    if args.shard_by and args.format != 'excel':
+        parser.error("--shard-by는 excel 형식에서만 사용할 수 있습니다.")
+    if args.merge and (args.format != 'excel' or args.shard_by):
+        parser.error("--merge는 분할하지 않는 excel 형식에서만 사용할 수 있습니다.")
     
     try:
         print("🚀 Figma QA TestCase Generator")
@@ -63,7 +90,7 @@ def main():
         if args.verbose:
             print("🔍 Figma 분석기 초기화 중...")
         
-        analyzer = FigmaAnalyzer()
+        analyzer = FigmaAnalyzer(rate_class=args.rate_class)
         
         # Figma 분석 실행
         include_screenshot = not args.no_screenshot
@@ -99,8 +126,14 @@ def main():
                 for i, q in enumerate(questions, 1):
                     print(f"  {i}. {q}")
         
-        # 테스트케이스 생성
-        if args.priority:
+        # 테스트케이스 생성 (분석 결과/룰/생성기 버전이 같으면 캐시 사용)
+        cache = None if args.no_cache else GenerationCache(args.cache_dir)
+        cache_key = None
+        if cache is not None:
+            testcases, cache_key, cache_hit = generator.generate_cached(result, cache, args.priority)
+            if args.verbose and cache_hit:
+                print(f"⚡ 캐시 적중: {cache_key}")
+        elif args.priority:
             testcases = generator.generate_by_priority(result, args.priority)
         else:
             testcases = generator.generate_from_analysis(result)
@@ -109,24 +142,56 @@ def main():
             print("⚠️ 생성된 테스트케이스가 없습니다.")
             return 1
         
-        # 파일 저장
-        if args.verbose:
-            print(f"💾 {len(testcases)}개 테스트케이스를 {args.format} 형식으로 저장 중...")
+        output_format = f"{args.format}+gzip" if args.gzip else args.format
+        if args.shard_by:
+            output_format = f"{output_format}+shard:{args.shard_by}:{args.shard_mode}:{args.shard_rows}"
+        elif args.merge:
+            output_format = f"{output_format}+merge"
         
-        if args.format == 'excel':
-            generator.save_to_excel(testcases, args.output)
-        elif args.format == 'testrail':
-            generator.save_to_testrail_csv(testcases, args.output)
-        elif args.format == 'json':
-            generator.save_to_json(testcases, args.output)
+        # 파일 저장 (같은 결과로 이미 기록된 파일은 다시 쓰지 않음)
+        if cache is not None and cache.output_is_current(args.output, cache_key, output_format):
+            if args.verbose:
+                print("⏭️ 출력 파일이 최신 상태입니다. 저장을 건너뜁니다.")
+        else:
+            if args.verbose:
+                print(f"💾 {len(testcases)}개 테스트케이스를 {args.format} 형식으로 저장 중...")
+            
+            if args.format == 'excel' and args.shard_by:
+                shards = generator.save_to_excel_sharded(testcases, args.output, by=args.shard_by,
+                                                         max_rows=args.shard_rows, mode=args.shard_mode)
+                if args.verbose:
+                    print(f"🗂️ {len(shards)}개 {'파일' if args.shard_mode == 'files' else '시트'}로 분할 저장")
+            elif args.format == 'excel' and args.merge:
+                merged = generator.merge_into_excel(testcases, args.output)
+                print(f"🔀 병합: 추가 {merged.added}개, 갱신 {merged.updated}개, 유지 {merged.unchanged + merged.kept}개"
+                      + ("" if merged.written else " (변경 없음, 파일 유지)"))
+            elif args.format == 'excel':
+                generator.save_to_excel(testcases, args.output)
+            elif args.format == 'testrail':
+                generator.save_to_testrail_csv(testcases, args.output)
+            elif args.format == 'json':
+                generator.save_to_json(testcases, args.output, compress=args.gzip)
+            elif args.format in ('ndjson', 'columnar'):
+                generator.save_to_json(testcases, args.output, mode=args.format, compress=args.gzip)
+            
+            if cache is not None:
+                cache.mark_output(args.output, cache_key, output_format)
         
         # 완료 메시지
         print(f"✅ 완료!")
         print(f"📁 파일: {args.output}")
         print(f"📊 테스트케이스: {len(testcases)}개")
         
+        # 저장소 누적 (Figma 노드 단위로 조회할 수 있도록 node_id 함께 저장)
+        if args.store:
+            with TestCaseStore(args.store) as store:
+                store.add_many(testcases, node_id=result.get("file_info", {}).get("node_id"))
+                print(f"🗄️ 저장소: {args.store} (누적 {len(store)}개)")
+                if args.verbose:
+                    print_testcase_statistics(store)
+        
         # 우선순위별 통계
-        if args.verbose:
+        elif args.verbose:
             print_testcase_statistics(testcases)
         
         return 0
@@ -165,23 +230,28 @@ def print_analysis_summary(result):
         print(f"  추출된 요구사항: {len(basic)}개")
 
 def print_testcase_statistics(testcases):
-    """테스트케이스 통계 출력"""
+    """테스트케이스 통계 출력 (TestCaseStore면 인덱스 GROUP BY로 집계)"""
     print("\n📈 테스트케이스 통계:")
     print("-" * 30)
     
     # 우선순위별 통계
-    priority_counts = {}
-    type_counts = {}
-    domain_counts = {}
-    
-    for tc in testcases:
-        priority = tc.get("priority", "Unknown")
-        test_type = tc.get("type", "Unknown")
-        domain = tc.get("domain", "Unknown")
-        
-        priority_counts[priority] = priority_counts.get(priority, 0) + 1
-        type_counts[test_type] = type_counts.get(test_type, 0) + 1
-        domain_counts[domain] = domain_counts.get(domain, 0) + 1
+    if isinstance(testcases, TestCaseStore):
+        priority_counts = testcases.counts_by("priority")
+        type_counts = testcases.counts_by("type")
+        domain_counts = testcases.counts_by("domain")
+    else:
+        priority_counts = {}
+        type_counts = {}
+        domain_counts = {}
+        
+        for tc in testcases:
+            priority = tc.get("priority", "Unknown")
+            test_type = tc.get("type", "Unknown")
+            domain = tc.get("domain", "Unknown")
+            
+            priority_counts[priority] = priority_counts.get(priority, 0) + 1
+            type_counts[test_type] = type_counts.get(test_type, 0) + 1
+            domain_counts[domain] = domain_counts.get(domain, 0) + 1
     
     print("  우선순위별:")
     for priority in ["P1", "P2", "P3", "P4"]:
@@ -190,11 +260,11 @@ def print_testcase_statistics(testcases):
             print(f"    {priority}: {count}개")
     
     print("  타입별:")
-    for test_type, count in sorted(type_counts.items()):
+    for test_type, count in sorted(type_counts.items(), key=lambda item: str(item[0])):
         print(f"    {test_type}: {count}개")
     
     print("  도메인별:")
-    for domain, count in sorted(domain_counts.items()):
+    for domain, count in sorted(domain_counts.items(), key=lambda item: str(item[0])):
         print(f"    {domain}: {count}개")
 
 if __name__ == "__main__":
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+도구 호출 취소 / 마감 시간 (협조적 취소)
+
+- 도구 호출마다 CancelToken을 만들어 현재 컨텍스트에 설정 (ToolExecutor가 풀 스레드로 컨텍스트를 복사)
+- 가져오기/노드 순회/생성/Excel 기록 루프는 checkpoint()로 취소·마감 여부를 확인하고 즉시 중단
+- 취소(ToolCancelled)는 호출 전체를 중단, 마감 초과(DeadlineExceeded)는 단계별로 잡아 부분 결과 반환
+- 두 예외 모두 BaseException 계열이므로 기존 `except Exception` 오류 처리에 삼켜지지 않음
+- 프로세스 풀 워커에서는 SharedCancelToken이 주 프로세스와 공유하는 플래그로 취소를 확인
+"""
+
+from __future__ import annotations
+
+import contextvars
+import time
+from typing import Iterable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class ToolInterrupted(BaseException):
+    """도구 실행 중단 (취소 또는 마감 초과)"""
+
+
+class ToolCancelled(ToolInterrupted):
+    """클라이언트가 호출을 취소함"""
+
+
+class DeadlineExceeded(ToolInterrupted):
+    """도구 호출의 마감 시간이 지남"""
+
+
+class CancelToken:
+    """
+    도구 호출 하나의 취소 상태와 마감 시간
+
+    Args:
+        timeout: 마감까지 남은 시간(초), None이면 마감 없음
+    """
+
+    def __init__(self, timeout: Optional[float] = None):
+        self.deadline = time.monotonic() + timeout if timeout is not None else None
+        self.cancelled = False
+
+    @classmethod
+    def from_deadline_ms(cls, deadline_ms: Optional[float]) -> "CancelToken":
+        return cls(deadline_ms / 1000.0 if deadline_ms else None)
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+    def remaining(self) -> Optional[float]:
+        """마감까지 남은 시간(초, 0 이상), 마감이 없으면 None"""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def check(self) -> None:
+        if self.cancelled:
+            raise ToolCancelled("도구 호출이 취소되었습니다.")
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            raise DeadlineExceeded("도구 호출 마감 시간이 지났습니다.")
+
+
+class SharedCancelToken(CancelToken):
+    """
+    다른 프로세스의 호출 취소를 따르는 토큰 (프로세스 풀 워커용)
+
+    Args:
+        flags: 프로세스 간 공유 배열 (multiprocessing Array/RawArray), 0이 아니면 취소
+        slot: 이 호출이 쓰는 flags 위치
+        timeout: 마감까지 남은 시간(초), None이면 마감 없음
+    """
+
+    def __init__(self, flags, slot: int, timeout: Optional[float] = None):
+        super().__init__(timeout)
+        self._flags = flags
+        self._slot = slot
+
+    def cancel(self) -> None:
+        super().cancel()
+        self._flags[self._slot] = 1
+
+    def check(self) -> None:
+        if self._flags[self._slot]:
+            self.cancelled = True
+        super().check()
+
+
+_current_token: contextvars.ContextVar[Optional[CancelToken]] = contextvars.ContextVar("tool_cancel_token",
+                                                                                       default=None)
+
+
+def current_token() -> Optional[CancelToken]:
+    return _current_token.get()
+
+
+def set_token(token: Optional[CancelToken]) -> contextvars.Token:
+    """현재 컨텍스트의 토큰 설정 (반환값으로 reset_token 호출)"""
+    return _current_token.set(token)
+
+
+def reset_token(reset: contextvars.Token) -> None:
+    _current_token.reset(reset)
+
+
+def checkpoint() -> None:
+    """현재 호출이 취소되었거나 마감이 지났으면 예외 (토큰이 없으면 아무것도 하지 않음)"""
+    token = _current_token.get()
+    if token is not None:
+        token.check()
+
+
+def remaining_time(default: Optional[float] = None) -> Optional[float]:
+    """현재 호출의 남은 시간(초)과 default 중 작은 값 (예: 네트워크 타임아웃)"""
+    token = _current_token.get()
+    remaining = token.remaining() if token is not None else None
+    if remaining is None:
+        return default
+    return remaining if default is None else min(remaining, default)
+
+
+def checked(iterable: Iterable[T]) -> Iterator[T]:
+    """항목마다 checkpoint()를 거치는 이터레이터 (Excel 행 스트림 등)"""
+    for item in iterable:
+        checkpoint()
+        yield item
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Parquet / Feather 컬럼형 저장 (pyarrow 필요)
+
+- 테스트케이스: domain/priority/type 등 반복 값 컬럼은 dictionary 인코딩
+- 분석 결과: texts / names / ui_elements 테이블
+- Feather는 기본 비압축으로 저장하여 memory map으로 즉시 로드 가능
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = feather = pq = None
+    PYARROW_AVAILABLE = False
+
+
+TABLE_FORMATS = ("parquet", "feather")
+TESTCASE_DICTIONARY_COLUMNS = ("domain", "priority", "type")
+DEFAULT_BATCH_SIZE = 50_000
+
+
+def _require_pyarrow() -> None:
+    if not PYARROW_AVAILABLE:
+        raise ImportError("Parquet/Feather 저장에는 pyarrow가 필요합니다. 설치: pip install pyarrow")
+
+
+def _string_value(value: Any) -> Optional[str]:
+    if value is None or isinstance(value, str):
+        return value
+    return str(value)
+
+
+def _record_batch(columns: Dict[str, List[Any]], dictionary_columns: Sequence[str]):
+    arrays = []
+    for name, values in columns.items():
+        if name == "depth":
+            arrays.append(pa.array(values, type=pa.int32()))
+            continue
+        array = pa.array(values, type=pa.string())
+        if name in dictionary_columns:
+            array = array.dictionary_encode()
+        arrays.append(array)
+    return pa.RecordBatch.from_arrays(arrays, names=list(columns))
+
+
+def rows_to_table(rows: Iterable[Dict[str, Any]], columns: Sequence[str],
+                  dictionary_columns: Sequence[str] = (), batch_size: int = DEFAULT_BATCH_SIZE):
+    """
+    dict 행 -> pyarrow Table (batch_size 행 단위로 변환하여 중간 리스트 크기를 제한)
+
+    - columns에 지정한 컬럼만 저장 ("depth"는 int32, 나머지는 문자열)
+    - dictionary_columns는 dictionary<int32, string>으로 인코딩 (배치 간 사전은 저장 전에 통합)
+    """
+    _require_pyarrow()
+    columns = list(columns)
+    batches = []
+    buffer: Dict[str, List[Any]] = {col: [] for col in columns}
+    count = 0
+    for row in rows:
+        for col in columns:
+            value = row.get(col)
+            buffer[col].append(value if col == "depth" else _string_value(value))
+        count += 1
+        if count % batch_size == 0:
+            batches.append(_record_batch(buffer, dictionary_columns))
+            buffer = {col: [] for col in columns}
+    if count % batch_size or not batches:
+        batches.append(_record_batch(buffer, dictionary_columns))
+    return pa.Table.from_batches(batches).unify_dictionaries()
+
+
+def write_table(table, filename: str, fmt: str = "parquet", compression: Optional[str] = None) -> None:
+    """
+    Table 저장
+
+    Args:
+        fmt: "parquet" 또는 "feather"
+        compression: 압축 코덱 (기본값: parquet=snappy, feather=비압축 - memory map 가능)
+    """
+    _require_pyarrow()
+    if fmt == "parquet":
+        pq.write_table(table, filename, compression=compression or "snappy")
+    elif fmt == "feather":
+        feather.write_feather(table, filename, compression=compression or "uncompressed")
+    else:
+        raise ValueError(f"지원하지 않는 형식: {fmt} (지원: {', '.join(TABLE_FORMATS)})")
+
+
+def read_table(filename: str, memory_map: bool = True):
+    """Parquet/Feather 파일을 pyarrow Table로 로드 (확장자로 형식 판단, .to_pandas()로 DataFrame 변환)"""
+    _require_pyarrow()
+    if filename.endswith(".parquet"):
+        return pq.read_table(filename, memory_map=memory_map)
+    return feather.read_table(filename, memory_map=memory_map)
+
+
+def analysis_tables(analysis_result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    enhanced_analysis() 결과의 texts / names / ui_elements를 Table로 변환
+
+    - texts: text, depth
+    - names: name, type(dictionary), depth
+    - ui_elements: category(dictionary: buttons/inputs/navigation/containers), name, depth
+    """
+    _require_pyarrow()
+    enhanced = analysis_result.get("enhanced_analysis", {})
+    keywords = enhanced.get("keywords", {})
+    ui_elements = enhanced.get("ui_structure", {}).get("ui_elements", {})
+
+    elements = (
+        {"category": category, **element}
+        for category, items in ui_elements.items()
+        for element in items
+    )
+    return {
+        "texts": rows_to_table(keywords.get("texts", []), ("text", "depth")),
+        "names": rows_to_table(keywords.get("names", []), ("name", "type", "depth"), ("type",)),
+        "ui_elements": rows_to_table(elements, ("category", "name", "depth"), ("category",)),
+    }
+
+
+def save_analysis_tables(analysis_result: Dict[str, Any], output_dir: str,
+                         fmt: str = "parquet") -> Dict[str, str]:
+    """분석 테이블을 output_dir/{texts,names,ui_elements}.{fmt}로 저장하고 경로를 반환"""
+    os.makedirs(output_dir, exist_ok=True)
+    paths = {}
+    for name, table in analysis_tables(analysis_result).items():
+        path = os.path.join(output_dir, f"{name}.{fmt}")
+        write_table(table, path, fmt)
+        paths[name] = path
+    return paths
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+MCP 서버 측 데이터 저장소 (핸들 기반)
+
+- Figma 문서/요구사항/테스트케이스/분석 결과를 서버에 보관하고 짧은 핸들만 클라이언트에 전달
+- 메모리에는 최근 사용한 max_items개만 유지 (LRU), 밀려난 항목은 디스크(JSON)로 옮겼다가 다시 요청되면 복원
+- 디스크 항목도 max_disk_items개를 넘으면 오래된 것부터 삭제 (삭제된 핸들은 만료 오류)
+- 디스크 기록(JSON 직렬화)은 잠금 밖의 전용 스레드에서 수행 (이벤트 루프에서 put해도 막히지 않음)
+- 디스크 항목은 store_dir/<pid>/ 아래에 두고, 시작 시 종료된 프로세스가 남긴 파일을 정리
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Optional, Tuple
+
+DEFAULT_STORE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),  # 프로젝트 루트
+    ".cache", "mcp_handles",
+)
+DEFAULT_MAX_ITEMS = 32
+DEFAULT_MAX_DISK_ITEMS = 256
+HANDLE_KINDS = ("figma", "requirements", "testcases", "analysis")
+
+
+class HandleError(LookupError):
+    """핸들이 없거나 만료되었거나 종류가 다름"""
+
+
+class DataStore:
+    """
+    핸들 -> 값 저장소
+
+    Args:
+        max_items: 메모리에 유지할 최대 항목 수
+        max_disk_items: 디스크에 유지할 최대 항목 수 (0이면 밀려난 항목은 바로 삭제)
+        store_dir: 디스크 항목 디렉토리 (프로세스별 하위 디렉토리를 처음 밀려날 때 생성)
+    """
+
+    def __init__(self, max_items: int = DEFAULT_MAX_ITEMS, max_disk_items: int = DEFAULT_MAX_DISK_ITEMS,
+                 store_dir: str = DEFAULT_STORE_DIR):
+        if max_items < 1:
+            raise ValueError(f"max_items는 1 이상이어야 합니다: {max_items}")
+        self.max_items = max_items
+        self.max_disk_items = max_disk_items
+        self.store_dir = store_dir
+        self.spill_dir = os.path.join(store_dir, str(os.getpid()))
+        self._memory: "OrderedDict[str, Any]" = OrderedDict()
+        self._spilling: "dict[str, Tuple[int, Any]]" = {}  # 디스크 기록 대기 중: 핸들 -> (순번, 값)
+        self._disk: "OrderedDict[str, str]" = OrderedDict()  # 핸들 -> 파일 경로 (오래된 순)
+        self._spill_seq = 0
+        self._spill_errors = 0
+        self._lock = threading.Lock()
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mcp-handle-spill")
+        _clear_stale_spills(store_dir, self.spill_dir)
+
+    @classmethod
+    def from_env(cls) -> "DataStore":
+        """환경변수 MCP_HANDLE_MEMORY_ITEMS / MCP_HANDLE_DISK_ITEMS / MCP_HANDLE_DIR로 구성"""
+        def _env_int(name: str, default: int) -> int:
+            value = os.getenv(name)
+            return int(value) if value not in (None, "") else default
+
+        return cls(
+            max_items=_env_int("MCP_HANDLE_MEMORY_ITEMS", DEFAULT_MAX_ITEMS),
+            max_disk_items=_env_int("MCP_HANDLE_DISK_ITEMS", DEFAULT_MAX_DISK_ITEMS),
+            store_dir=os.getenv("MCP_HANDLE_DIR") or DEFAULT_STORE_DIR,
+        )
+
+    def __len__(self) -> int:
+        return len(self._memory) + len(self._spilling) + len(self._disk)
+
+    def __contains__(self, handle: str) -> bool:
+        return handle in self._memory or handle in self._spilling or handle in self._disk
+
+    def put(self, kind: str, value: Any) -> str:
+        """값을 저장하고 새 핸들 반환 (예: "figma:3f2a...")"""
+        if kind not in HANDLE_KINDS:
+            raise ValueError(f"지원하지 않는 핸들 종류: {kind} (지원: {', '.join(HANDLE_KINDS)})")
+        handle = f"{kind}:{uuid.uuid4().hex}"
+        with self._lock:
+            self._memory[handle] = value
+            evicted = self._evict()
+        self._spill(evicted)
+        return handle
+
+    def get(self, handle: str, kind: Optional[str] = None) -> Any:
+        """
+        핸들의 값 반환 (디스크로 밀려난 항목은 메모리로 복원)
+
+        Raises:
+            HandleError: 핸들이 없거나 만료되었거나, kind가 주어졌는데 종류가 다를 때
+        """
+        if not isinstance(handle, str) or ":" not in handle:
+            raise HandleError(f"잘못된 핸들: {handle!r}")
+        if kind is not None and handle.split(":", 1)[0] != kind:
+            raise HandleError(f"{kind} 핸들이 아닙니다: {handle}")
+        with self._lock:
+            if handle in self._memory:
+                self._memory.move_to_end(handle)
+                return self._memory[handle]
+            if handle in self._spilling:
+                # 아직 기록 전이면 기록을 취소하고 그대로 복원
+                value = self._spilling.pop(handle)[1]
+                return self._restore(handle, value)
+            path = self._disk.get(handle)
+        if path is None:
+            raise HandleError(f"핸들이 없거나 만료되었습니다: {handle}")
+
+        # 파일 읽기는 잠금 밖에서 (같은 핸들을 동시에 읽으면 먼저 복원한 쪽 값을 사용)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = json.load(f)
+        except (OSError, ValueError) as e:
+            value, error = None, e
+        else:
+            error = None
+        with self._lock:
+            if handle in self._memory:
+                self._memory.move_to_end(handle)
+                return self._memory[handle]
+            if error is not None or self._disk.get(handle) != path:
+                raise HandleError(f"핸들이 없거나 만료되었습니다: {handle}" + (f" ({error})" if error else ""))
+            del self._disk[handle]
+            _remove(path)
+            return self._restore(handle, value)
+
+    def release(self, handle: str) -> bool:
+        """핸들 삭제. 있었으면 True."""
+        with self._lock:
+            if self._memory.pop(handle, None) is not None or self._spilling.pop(handle, None) is not None:
+                return True
+            path = self._disk.pop(handle, None)
+        if path is None:
+            return False
+        _remove(path)
+        return True
+
+    def flush(self) -> None:
+        """대기 중인 디스크 기록이 끝날 때까지 대기 (기록 스레드는 하나라 순서대로 처리)"""
+        self._writer.submit(lambda: None).result()
+
+    def stats(self) -> dict:
+        return {
+            "memory_items": len(self._memory),
+            "disk_items": len(self._disk),
+            "pending_spills": len(self._spilling),
+            "spill_errors": self._spill_errors,
+        }
+
+    def _restore(self, handle: str, value: Any) -> Any:
+        # 잠금 안에서 호출: 메모리로 되돌리고 밀려나는 항목은 기록 스레드에 넘김 (잠금을 잡은 채로 기록하지 않음)
+        self._memory[handle] = value
+        self._spill(self._evict())
+        return value
+
+    def _evict(self) -> List[Tuple[str, int, Any]]:
+        # 잠금 안에서 호출: 메모리 한도를 넘은 오래된 항목을 기록 대기로 옮기고 목록 반환
+        evicted = []
+        while len(self._memory) > self.max_items:
+            handle, value = self._memory.popitem(last=False)
+            if self.max_disk_items <= 0:
+                continue
+            self._spill_seq += 1
+            self._spilling[handle] = (self._spill_seq, value)
+            evicted.append((handle, self._spill_seq, value))
+        return evicted
+
+    def _spill(self, evicted: List[Tuple[str, int, Any]]) -> None:
+        for handle, seq, value in evicted:
+            self._writer.submit(self._write_spill, handle, seq, value)
+
+    def _write_spill(self, handle: str, seq: int, value: Any) -> None:
+        # 기록 스레드: 직렬화/기록은 잠금 밖, 기록 후 그사이 복원/해제되지 않았을 때만 디스크 항목으로 등록
+        path = os.path.join(self.spill_dir, f"{handle.replace(':', '_')}.json")
+        try:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(value, f, ensure_ascii=False, separators=(",", ":"))
+        except (OSError, TypeError, ValueError):
+            with self._lock:
+                if self._spilling.get(handle, (None,))[0] == seq:
+                    del self._spilling[handle]  # 기록 실패 -> 만료 처리
+                    self._spill_errors += 1
+            _remove(path)
+            return
+
+        expired = []
+        with self._lock:
+            pending = self._spilling.get(handle)
+            if pending is not None and pending[0] == seq:
+                del self._spilling[handle]
+                self._disk[handle] = path
+                while len(self._disk) > self.max_disk_items:
+                    expired.append(self._disk.popitem(last=False)[1])
+            elif pending is None:
+                expired.append(path)  # 기록 중에 복원/해제됨 (다시 밀려난 경우는 뒤 기록이 덮어씀)
+        for old_path in expired:
+            _remove(old_path)
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _pid_alive(pid: int) -> bool:
+    if os.name != "posix":
+        return True  # 확인할 수 없으면 다른 서버가 쓰는 중일 수 있으므로 유지
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _clear_stale_spills(store_dir: str, own_dir: str) -> None:
+    """종료된 프로세스(와 같은 pid를 쓰던 이전 프로세스)가 남긴 디스크 항목 삭제"""
+    try:
+        names = os.listdir(store_dir)
+    except OSError:
+        return
+    for name in names:
+        path = os.path.join(store_dir, name)
+        if name.endswith(".json") and name.split("_", 1)[0] in HANDLE_KINDS:  # 프로세스별 디렉토리 이전의 배치
+            _remove(path)
+        elif name.isdigit() and (path == own_dir or not _pid_alive(int(name))):
+            shutil.rmtree(path, ignore_errors=True)
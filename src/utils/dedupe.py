@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+테스트케이스 중복 제거
+
+- 제목/테스트 절차/기대 결과를 정규화한 뒤 콘텐츠 해시(fingerprint)로 완전 중복 제거
+- MinHash + LSH 밴드 버킷으로 근사 중복(near-duplicate) 탐지 (대량 스위트에서도 거의 선형 시간)
+- 어떤 케이스가 어떤 케이스에 병합되었는지 리포트 제공
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import zlib
+from collections import deque
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+
+DEFAULT_KEY_FIELDS: Tuple[str, ...] = ("title", "test_step", "expected_results")
+
+# 레거시 키도 같은 필드로 취급 (rules_config.json의 field_aliases와 동일한 의미)
+_FIELD_FALLBACKS: Dict[str, Tuple[str, ...]] = {
+    "test_step": ("test_step", "test_steps", "Test step"),
+    "expected_results": ("expected_results", "Expected-results"),
+}
+
+MINHASH_PERMUTATIONS = 32
+LSH_BANDS = 8  # 8 밴드 x 4 행: 유사도 0.9 쌍은 99.9% 이상 후보가 되고, 0.5 이하 쌍은 대부분 걸러짐
+LSH_ROWS = MINHASH_PERMUTATIONS // LSH_BANDS
+MAX_BUCKET_CANDIDATES = 32  # 한 버킷에서 비교할 최대 후보 수 (최악의 경우에도 선형 시간 보장)
+
+# multiply-shift 해싱 ((a * x + b) mod 2^64 >> 32, a는 홀수)으로 순열 근사
+_rng = np.random.default_rng(20240613)
+_PERM_A = _rng.integers(0, np.iinfo(np.uint64).max, size=MINHASH_PERMUTATIONS, dtype=np.uint64) | np.uint64(1)
+_PERM_B = _rng.integers(0, np.iinfo(np.uint64).max, size=MINHASH_PERMUTATIONS, dtype=np.uint64)
+_SHIFT = np.uint64(32)
+del _rng
+
+# 줄 머리 또는 한 줄로 합쳐진 절차 중간의 "1." / "2)" / "1-6." / 불릿
+_STEP_NUMBER_RE = re.compile(r"(?:^|(?<=\s))(?:\d+(?:-\d+)?[.)]|[-*•])(?=\s|$)", re.MULTILINE)
+_WHITESPACE_RE = re.compile(r"\s+")
+_PUNCT_RE = re.compile(r"[^\w\s%.:/+\-×]")
+
+
+def normalize_text(value: Any) -> str:
+    """비교용 텍스트 정규화 (스텝 번호/불릿 제거, 공백 축약, 소문자화)."""
+    if value is None:
+        return ""
+    text = str(value)
+    text = _STEP_NUMBER_RE.sub("", text)
+    text = _PUNCT_RE.sub(" ", text.lower())
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+def _field_value(testcase: Dict[str, Any], key: str) -> Any:
+    for candidate in _FIELD_FALLBACKS.get(key, (key,)):
+        value = testcase.get(candidate)
+        if value not in (None, ""):
+            return value
+    return ""
+
+
+def normalized_content(testcase: Dict[str, Any], key_fields: Sequence[str] = DEFAULT_KEY_FIELDS) -> str:
+    """fingerprint 대상이 되는 정규화된 콘텐츠 문자열."""
+    return "\x1f".join(normalize_text(_field_value(testcase, key)) for key in key_fields)
+
+
+def content_fingerprint(testcase: Dict[str, Any], key_fields: Sequence[str] = DEFAULT_KEY_FIELDS) -> str:
+    """정규화된 제목 + 절차 + 기대 결과의 안정적인 콘텐츠 해시."""
+    content = normalized_content(testcase, key_fields)
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def shingles(text: str) -> Set[str]:
+    """단어 unigram + bigram 집합."""
+    words = text.split()
+    tokens = set(words)
+    tokens.update(f"{a} {b}" for a, b in zip(words, words[1:]))
+    return tokens
+
+
+def minhash_signature(tokens: Iterable[str]) -> np.ndarray:
+    """토큰 집합의 MinHash 시그니처 (MINHASH_PERMUTATIONS 길이)."""
+    hashes = np.array(list(map(zlib.crc32, map(str.encode, tokens))), dtype=np.uint64)
+    if hashes.size == 0:
+        return np.zeros(MINHASH_PERMUTATIONS, dtype=np.uint64)
+    permuted = (hashes[:, None] * _PERM_A + _PERM_B) >> _SHIFT
+    return permuted.min(axis=0)
+
+
+def estimate_similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """두 MinHash 시그니처로 Jaccard 유사도 추정."""
+    return float(np.count_nonzero(a == b)) / MINHASH_PERMUTATIONS
+
+
+def _bands(signature: np.ndarray) -> List[Tuple[int, bytes]]:
+    return [
+        (band, signature[band * LSH_ROWS:(band + 1) * LSH_ROWS].tobytes())
+        for band in range(LSH_BANDS)
+    ]
+
+
+@dataclass
+class DedupeResult:
+    """중복 제거 결과"""
+
+    testcases: List[Dict[str, Any]]
+    # {"kept_index", "dropped_index", "kept_title", "dropped_title", "reason": "exact"|"near", "similarity"}
+    merged: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def exact_count(self) -> int:
+        return sum(1 for m in self.merged if m["reason"] == "exact")
+
+    @property
+    def near_count(self) -> int:
+        return sum(1 for m in self.merged if m["reason"] == "near")
+
+
+class Deduplicator:
+    """
+    스트리밍 중복 제거기 (케이스를 하나씩 넣으면 중복 여부를 판정)
+
+    - 완전 중복: 전체 스트림에 대해 16byte fingerprint만 보관
+    - 근사 중복: window가 주어지면 최근 window개의 유지 케이스만 비교 대상으로 보관 (메모리 상한)
+    """
+
+    def __init__(self, key_fields: Sequence[str] = DEFAULT_KEY_FIELDS, near_duplicates: bool = True,
+                 threshold: float = 0.85, min_tokens: int = 8, window: Optional[int] = None):
+        self.key_fields = tuple(key_fields)
+        self.near_duplicates = near_duplicates
+        self.threshold = threshold
+        self.min_tokens = min_tokens
+        self.window = window
+
+        self._index = 0
+        self._seen: Dict[bytes, int] = {}  # fingerprint -> 유지된 케이스의 원본 index
+        self._titles: Dict[int, str] = {}  # 원본 index -> 제목 (리포트용)
+        self._signatures: Dict[int, np.ndarray] = {}  # 원본 index -> MinHash 시그니처
+        self._buckets: Dict[Tuple[int, bytes], Deque[int]] = {}
+        self._recent: Deque[Tuple[int, List[Tuple[int, bytes]]]] = deque()
+
+    def add(self, testcase: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        케이스 추가. 유지되면 None, 중복이면 병합 리포트(dict)를 반환.
+        """
+        idx = self._index
+        self._index += 1
+
+        content = normalized_content(testcase, self.key_fields)
+        fingerprint = hashlib.blake2b(content.encode("utf-8"), digest_size=16).digest()
+
+        kept = self._seen.get(fingerprint)
+        if kept is not None:
+            return self._merge_record(kept, testcase, idx, "exact", 1.0)
+
+        signature = None
+        band_keys: List[Tuple[int, bytes]] = []
+        if self.near_duplicates and content.count(" ") + 1 >= self.min_tokens:
+            signature = minhash_signature(shingles(content))
+            band_keys = _bands(signature)
+            match = self._best_match(signature, band_keys)
+            if match is not None:
+                kept, similarity = match
+                self._seen[fingerprint] = kept
+                return self._merge_record(kept, testcase, idx, "near", similarity)
+
+        self._seen[fingerprint] = idx
+        self._titles[idx] = str(testcase.get("title", ""))
+        if signature is not None:
+            self._signatures[idx] = signature
+            for band_key in band_keys:
+                self._buckets.setdefault(band_key, deque()).append(idx)
+        if self.window is not None:
+            self._recent.append((idx, band_keys))
+            if len(self._recent) > self.window:
+                self._evict(*self._recent.popleft())
+        return None
+
+    def _best_match(self, signature: np.ndarray,
+                    band_keys: List[Tuple[int, bytes]]) -> Optional[Tuple[int, float]]:
+        candidates: Dict[int, None] = {}
+        for band_key in band_keys:
+            bucket = self._buckets.get(band_key)
+            if bucket:
+                for candidate in islice(reversed(bucket), MAX_BUCKET_CANDIDATES):
+                    candidates[candidate] = None
+        if not candidates:
+            return None
+
+        ids = list(candidates)
+        stacked = np.stack([self._signatures[c] for c in ids])
+        scores = np.count_nonzero(stacked == signature, axis=1) / MINHASH_PERMUTATIONS
+        best = int(scores.argmax())
+        if scores[best] < self.threshold:
+            return None
+        return ids[best], float(scores[best])
+
+    def _evict(self, idx: int, band_keys: List[Tuple[int, bytes]]) -> None:
+        # 버킷에는 index가 오름차순으로 쌓이므로 가장 오래된 항목은 항상 왼쪽 끝
+        self._titles.pop(idx, None)
+        self._signatures.pop(idx, None)
+        for band_key in band_keys:
+            bucket = self._buckets.get(band_key)
+            if bucket and bucket[0] == idx:
+                bucket.popleft()
+                if not bucket:
+                    del self._buckets[band_key]
+
+    def _merge_record(self, kept_index: int, dropped: Dict[str, Any], dropped_index: int,
+                      reason: str, similarity: float) -> Dict[str, Any]:
+        return {
+            "kept_index": kept_index,
+            "dropped_index": dropped_index,
+            "kept_title": self._titles.get(kept_index, ""),
+            "dropped_title": dropped.get("title", ""),
+            "reason": reason,
+            "similarity": round(similarity, 3),
+        }
+
+
+def iter_deduplicated(
+    testcases: Iterable[Dict[str, Any]],
+    deduplicator: Optional[Deduplicator] = None,
+    on_merge: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    중복이 아닌 케이스만 순서대로 yield (스트리밍).
+
+    Args:
+        testcases: 테스트케이스 이터러블
+        deduplicator: 설정된 Deduplicator (없으면 기본 설정, 근사 중복 비교 window 10,000)
+        on_merge: 중복 병합 시 리포트를 받을 콜백 (선택사항)
+    """
+    deduplicator = deduplicator or Deduplicator(window=10_000)
+    for testcase in testcases:
+        merge = deduplicator.add(testcase)
+        if merge is None:
+            yield testcase
+        elif on_merge is not None:
+            on_merge(merge)
+
+
+def deduplicate_testcases(
+    testcases: Iterable[Dict[str, Any]],
+    key_fields: Sequence[str] = DEFAULT_KEY_FIELDS,
+    near_duplicates: bool = True,
+    threshold: float = 0.85,
+    min_tokens: int = 8,
+) -> DedupeResult:
+    """
+    테스트케이스 중복 제거 (입력 순서 유지, 먼저 나온 케이스를 남김)
+
+    Args:
+        testcases: 테스트케이스 목록 (또는 이터러블)
+        key_fields: fingerprint 대상 필드
+        near_duplicates: MinHash 기반 근사 중복 탐지 여부
+        threshold: 근사 중복으로 판단할 최소 추정 Jaccard 유사도
+        min_tokens: 근사 중복 비교 대상이 되는 최소 단어 수 (짧은 텍스트 오탐 방지)
+
+    Returns:
+        DedupeResult: 남은 테스트케이스와 병합 리포트
+    """
+    deduplicator = Deduplicator(key_fields, near_duplicates, threshold, min_tokens)
+    merged: List[Dict[str, Any]] = []
+    unique = list(iter_deduplicated(testcases, deduplicator, on_merge=merged.append))
+    return DedupeResult(testcases=unique, merged=merged)
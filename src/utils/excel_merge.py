@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+기존 Excel 스위트에 증분 병합
+
+- 기존 워크북은 read-only 모드로 행 단위 스트리밍 (전체 셀을 메모리에 올리지 않음)
+- 케이스 식별: domain/section/component/feature/title 정규화 해시 (절차/기대 결과가 바뀌어도 같은 케이스)
+- 새 케이스는 끝에 추가, 바뀐 케이스는 생성기가 만든 컬럼만 갱신
+- 테스터가 관리하는 컬럼(결과 web_result/app_result, comment)은 기존 값 유지
+- 변경분이 없으면 파일을 다시 쓰지 않음
+- 레이아웃에 없는 열(예: 테스터가 추가한 JIRA 열)은 헤더/값을 레이아웃 열 뒤에 그대로 옮김
+- 케이스 시트의 기존 행은 셀 스타일(테스터가 칠한 색 등)/행 높이/병합을 유지, 새 행은 레이아웃 스타일
+- 다른 시트는 값/셀 스타일/열 너비/행 높이/병합/틀 고정을 옮기고, 옮길 수 없는 요소(조건부 서식, 그림,
+  메모, 표, 하이퍼링크 등)가 있으면 파일을 건드리지 않고 MergeConflictError
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from xml.etree.ElementTree import iterparse
+
+from openpyxl import load_workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.utils import get_column_letter, range_boundaries
+
+from .dedupe import content_fingerprint
+from .excel_writer import (
+    SheetLayout, _cell_style, _cell_value, _norm_header, _styled_cell, column_style_arrays, new_workbook,
+    start_sheet, write_xlsx,
+)
+from .export import atomic_output
+
+MERGE_KEY_FIELDS: Tuple[str, ...] = ("domain", "section", "component", "feature", "title")
+DEFAULT_PRESERVE_COLUMNS: Tuple[str, ...] = ("web_result", "app_result", "comment")
+DEFAULT_BUFFER_ROWS = 100_000  # 이 행 수까지는 1차에서 읽은 기존 행을 보관해 2차 파싱을 생략
+
+# 다시 쓸 때 옮기지 못하는 시트 요소 (XML 태그 -> 설명)
+_UNSUPPORTED_SHEET_PARTS = {
+    "conditionalFormatting": "조건부 서식",
+    "dataValidations": "데이터 유효성 검사",
+    "hyperlinks": "하이퍼링크",
+    "drawing": "그림/차트",
+    "legacyDrawing": "메모",
+    "tableParts": "표",
+    "oleObjects": "OLE 개체",
+}
+# 케이스 시트는 레이아웃으로 다시 그리므로 레이아웃이 만드는 요소는 허용
+_LAYOUT_SHEET_PARTS = {"conditionalFormatting": "conditional_formatting", "dataValidations": "data_validations"}
+
+
+class MergeConflictError(ValueError):
+    """기존 워크북을 변경분 외에는 그대로 보존하며 다시 쓸 수 없음 (파일은 변경하지 않음)"""
+
+
+@dataclass
+class MergeResult:
+    """병합 결과"""
+
+    path: str
+    added: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    kept: int = 0  # 기존 파일에만 있는 케이스 (삭제하지 않고 유지)
+    written: bool = False
+    extra_columns: List[str] = field(default_factory=list)  # 레이아웃 뒤로 옮긴 기존 열 헤더
+
+    @property
+    def changed(self) -> int:
+        return self.added + self.updated
+
+
+def case_key(testcase: Dict[str, Any]) -> str:
+    """병합용 케이스 식별 키"""
+    return content_fingerprint(testcase, MERGE_KEY_FIELDS)
+
+
+def _text(value: Any) -> str:
+    value = _cell_value(value)
+    return "" if value is None else str(value)
+
+
+@dataclass
+class _SheetXml:
+    """read-only 모드가 주지 않는 시트 정보 (시트 XML에서 직접 읽음)"""
+
+    column_widths: Dict[int, float] = field(default_factory=dict)  # 열 번호 -> 너비
+    row_heights: Dict[int, float] = field(default_factory=dict)  # 행 번호 -> 높이 (사용자 지정만)
+    merged: List[str] = field(default_factory=list)
+    freeze_panes: Optional[str] = None
+    auto_filter: Optional[str] = None
+    parts: List[str] = field(default_factory=list)  # _UNSUPPORTED_SHEET_PARTS 중 시트에 있는 태그
+
+
+def _read_sheet_xml(ws) -> _SheetXml:
+    info = _SheetXml()
+    with ws._get_source() as source:
+        for _, element in iterparse(source, events=("end",)):
+            tag = element.tag.rsplit("}", 1)[-1]
+            if tag == "c":
+                element.clear()  # 셀은 건너뜀 (큰 시트도 메모리를 쓰지 않도록)
+            elif tag == "row":
+                if element.get("customHeight") in ("1", "true") and element.get("ht"):
+                    info.row_heights[int(element.get("r"))] = float(element.get("ht"))
+                element.clear()
+            elif tag == "col" and element.get("width") and element.get("customWidth") in ("1", "true"):
+                for index in range(int(element.get("min")), int(element.get("max")) + 1):
+                    info.column_widths[index] = float(element.get("width"))
+            elif tag == "mergeCell":
+                info.merged.append(element.get("ref"))
+            elif tag == "pane" and element.get("state") in ("frozen", "frozenSplit"):
+                info.freeze_panes = element.get("topLeftCell")
+            elif tag == "autoFilter":
+                info.auto_filter = element.get("ref")
+            elif tag in _UNSUPPORTED_SHEET_PARTS:
+                info.parts.append(tag)
+    return info
+
+
+def _check_sheet(ws, info: _SheetXml, allowed: Iterable[str] = ()) -> None:
+    unsupported = [_UNSUPPORTED_SHEET_PARTS[tag] for tag in dict.fromkeys(info.parts) if tag not in allowed]
+    if unsupported:
+        raise MergeConflictError(
+            f"'{ws.title}' 시트의 {', '.join(unsupported)}은(는) 병합 시 보존할 수 없어 파일을 변경하지 않았습니다. "
+            f"해당 요소를 제거하거나 새 파일로 저장하세요."
+        )
+
+
+def _case_columns(ws, layout: SheetLayout) -> Tuple[List[Any], List[Tuple[Any, Any, Optional[Dict[str, Any]]]]]:
+    """
+    케이스 시트 헤더 -> (열별 행 키, 레이아웃에 없는 열 목록)
+
+    레이아웃에 없는 열(같은 헤더가 두 번 나온 열 포함)은 ("extra", 열 번호) 키로 읽어 두었다가
+    (키, 헤더 값, 헤더 스타일)로 레이아웃 뒤에 붙임
+    """
+    keys_by_header = {_norm_header(key): key for key, _ in layout.columns if key}
+    header = next(ws.iter_rows(min_row=1, max_row=1, min_col=1), ())
+    keys: List[Any] = []
+    extras = []
+    seen = set()
+    for index, cell in enumerate(header, start=1):
+        value = getattr(cell, "value", None)
+        key = keys_by_header.get(_norm_header(value))
+        if key is None or key in seen:
+            key = ("extra", index)
+            extras.append((key, value, _cell_style(cell) if getattr(cell, "has_style", False) else None))
+        seen.add(key)
+        keys.append(key)
+    return keys, extras
+
+
+class _CellStyles:
+    """기존 셀 스타일 표 (같은 스타일 배열은 한 번만 해석하고 행에는 스타일 번호만 보관)"""
+
+    def __init__(self):
+        self._ids: Dict[Tuple[int, ...], int] = {}
+        self.styles: List[Dict[str, Any]] = []
+
+    def id(self, cell) -> Optional[int]:
+        if not getattr(cell, "has_style", False):
+            return None
+        key = tuple(cell.style_array)
+        style_id = self._ids.get(key)
+        if style_id is None:
+            style_id = self._ids[key] = len(self.styles)
+            self.styles.append(_cell_style(cell))
+        return style_id
+
+
+def _iter_case_rows(ws, keys: Sequence[Any],
+                    styles: _CellStyles) -> Iterator[Tuple[int, Dict[str, Any], Dict[Any, int]]]:
+    """read-only 시트를 (행 번호, 헤더 기준 dict 행, 키 -> 스타일 번호)로 스트리밍 (빈 행 포함)"""
+    rows = ws.iter_rows(min_row=1, min_col=1)
+    next(rows, ())
+    for number, cells in enumerate(rows, start=2):
+        values: Dict[Any, Any] = {}
+        cell_styles: Dict[Any, int] = {}
+        for key, cell in zip(keys, cells):
+            value = getattr(cell, "value", None)
+            if value is not None:
+                values[key] = value
+            style_id = styles.id(cell)
+            if style_id is not None:
+                cell_styles[key] = style_id
+        yield number, values, cell_styles
+
+
+def _is_blank(row: Dict[str, Any]) -> bool:
+    return all(value in (None, "") for value in row.values())
+
+
+def _extended_layout(layout: SheetLayout, extras, used: set, info: _SheetXml) -> SheetLayout:
+    """레이아웃 뒤에 기존 열 추가 (헤더가 비어 있고 값도 없는 열은 제외)"""
+    extras = [extra for extra in extras if extra[1] not in (None, "") or extra[0] in used]
+    if not extras:
+        return layout
+    width = len(layout.columns)
+    header_styles = list(layout.header_styles)
+    if header_styles:
+        header_styles += [None] * (width - len(header_styles)) + [style for _, _, style in extras]
+    column_widths = dict(layout.column_widths)
+    for offset, (key, _, _) in enumerate(extras, start=width + 1):
+        if key[1] in info.column_widths:
+            column_widths[get_column_letter(offset)] = info.column_widths[key[1]]
+    return replace(layout, columns=list(layout.columns) + [(key, header) for key, header, _ in extras],
+                   header_styles=header_styles, column_widths=column_widths)
+
+
+def _case_merges(ws, info: _SheetXml, keys: Sequence[Any], layout: SheetLayout, last_row: int) -> List[str]:
+    """케이스 시트의 병합 범위를 다시 쓰는 열 배치로 옮김 (옮길 수 없으면 MergeConflictError)"""
+    columns = {key: index for index, (key, _) in enumerate(layout.columns, start=1)}
+    merged = []
+    for cell_range in info.merged:
+        min_col, min_row, max_col, max_row = range_boundaries(cell_range)
+        mapped = [columns.get(keys[col - 1]) if col <= len(keys) else None for col in range(min_col, max_col + 1)]
+        if max_row > last_row or None in mapped or mapped != list(range(mapped[0], mapped[0] + len(mapped))):
+            raise MergeConflictError(
+                f"'{ws.title}' 시트의 병합된 셀 {cell_range}은(는) 병합 후 열/행 배치에서 유지할 수 없어 "
+                f"파일을 변경하지 않았습니다. 병합을 해제하거나 새 파일로 저장하세요."
+            )
+        merged.append(f"{get_column_letter(mapped[0])}{min_row}:{get_column_letter(mapped[-1])}{max_row}")
+    return merged
+
+
+def _copy_sheet(wb, ws, info: _SheetXml) -> None:
+    """케이스 시트 외의 시트 복사 (값 + 셀 스타일 + 열 너비/행 높이/병합/틀 고정/자동 필터)"""
+    other = wb.create_sheet(ws.title)
+    other.sheet_state = ws.sheet_state
+    for index, width in info.column_widths.items():
+        other.column_dimensions[get_column_letter(index)].width = width
+    for row, height in info.row_heights.items():
+        other.row_dimensions[row].height = height
+    for cell_range in info.merged:
+        other.merged_cells.add(cell_range)
+    if info.freeze_panes:
+        other.freeze_panes = info.freeze_panes
+    if info.auto_filter:
+        other.auto_filter.ref = info.auto_filter
+
+    styles: Dict[Any, Any] = {}  # 원본 스타일 배열 -> 이 워크북의 스타일 배열 (같은 스타일은 한 번만 해석)
+    for cells in ws.iter_rows(min_row=1, min_col=1):  # 시트 범위가 A1에서 시작하지 않아도 위치 유지
+        values = []
+        for cell in cells:
+            if not getattr(cell, "has_style", False):
+                values.append(cell.value)
+                continue
+            key = tuple(cell.style_array)
+            if key not in styles:
+                styles[key] = _styled_cell(other, None, _cell_style(cell))._style
+            value = WriteOnlyCell(other, value=cell.value)
+            value._style = styles[key]
+            values.append(value)
+        other.append(values)
+
+
+def _write_case_sheet(wb, title: str, layout: SheetLayout, info: _SheetXml, merged: List[str], last_row: int,
+                      rows: Iterable[Tuple[Dict[str, Any], Optional[Dict[Any, int]]]], styles: _CellStyles) -> None:
+    """
+    케이스 시트 기록 (헤더는 레이아웃으로 다시 그림)
+
+    기존 행(스타일 번호가 있는 행)은 셀마다 원래 스타일을 유지하고 스타일이 없는 셀만 레이아웃 스타일,
+    새 행(None)은 레이아웃 스타일로 기록. 행 높이/병합은 기존 행 범위에서만 옮김
+    """
+    ws = start_sheet(wb, layout, title)
+    for row, height in info.row_heights.items():
+        if 1 < row <= last_row or (row == 1 and not layout.header_height):
+            ws.row_dimensions[row].height = height
+    for cell_range in merged:
+        ws.merged_cells.add(cell_range)
+
+    keys = [key for key, _ in layout.columns]
+    layout_styles = column_style_arrays(ws, layout)
+    converted: Dict[int, Any] = {}  # 기존 스타일 번호 -> 이 워크북의 스타일 배열
+    for row, row_styles in rows:
+        blank = row_styles is not None and _is_blank(row)
+        cells = []
+        for key, layout_style in zip(keys, layout_styles):
+            value = _cell_value(row.get(key))
+            style_id = row_styles.get(key) if row_styles else None
+            if style_id is not None:
+                if style_id not in converted:
+                    converted[style_id] = _styled_cell(ws, None, styles.styles[style_id])._style
+                style = converted[style_id]
+            else:
+                style = None if blank else layout_style  # 기존 빈 행은 원래대로 스타일 없이
+            if style is not None:
+                value = WriteOnlyCell(ws, value=value)
+                value._style = style
+            cells.append(value)
+        ws.append(cells)
+
+
+def merge_xlsx(rows: Iterable[Dict[str, Any]], filename: str, layout: SheetLayout,
+               sheet_name: str = "TestCases", preserve_columns: Sequence[str] = DEFAULT_PRESERVE_COLUMNS,
+               buffer_rows: int = DEFAULT_BUFFER_ROWS) -> MergeResult:
+    """
+    새로 생성한 케이스를 기존 워크북에 병합
+
+    - 1차: 기존 시트를 스트리밍하며 새 케이스와 비교해 변경분만 계산
+    - 변경분이 있을 때만 2차로 기존 행 순서를 유지한 채 다시 기록 (임시 파일 기록 후 교체)
+    - 같은 키의 기존 행이 여러 개면 첫 번째 행만 갱신 대상
+    - 비교/갱신은 새 케이스에 있는 컬럼만 (생성기가 만들지 않은 컬럼은 기존 값 유지)
+
+    Args:
+        rows: 정규화된 테스트케이스 이터러블
+        filename: 기존(또는 새로 만들) 워크북 경로
+        layout: 컬럼/스타일 레이아웃
+        sheet_name: 케이스 시트 이름 (없으면 첫 번째 시트)
+        preserve_columns: 새 케이스 값과 관계없이 기존 값을 유지할 컬럼 (테스터가 기록하는 결과/코멘트)
+        buffer_rows: 기존 시트가 이 행 수 이하면 1차에서 읽은 행을 재사용 (초과 시 2차에서 다시 스트리밍)
+
+    Returns:
+        MergeResult
+    """
+    incoming: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        incoming.setdefault(case_key(row), row)
+
+    if not os.path.exists(filename):
+        with atomic_output(filename) as tmp_path:
+            write_xlsx(incoming.values(), tmp_path, layout, sheet_name)
+        return MergeResult(path=filename, added=len(incoming), written=True)
+
+    preserve_columns = set(preserve_columns)
+    compare_keys = [key for key, _ in layout.columns if key and key not in preserve_columns]
+    result = MergeResult(path=filename)
+
+    # read-only 워크북은 한 번만 열고, 시트 XML은 iter_rows()마다 처음부터 다시 스트리밍
+    source = load_workbook(filename, read_only=True)
+    try:
+        case_sheet = source[sheet_name] if sheet_name in source.sheetnames else source.worksheets[0]
+        keys, extras = _case_columns(case_sheet, layout)
+        extra_keys = {key for key, _, _ in extras}
+
+        # 1차: 변경분 계산 (바뀐 행은 위치만 기억)
+        matched: set = set()
+        used_extras: set = set()  # 값이 있는 기존 전용 열
+        updates: Dict[int, str] = {}  # 기존 행 순번 -> 케이스 키
+        styles = _CellStyles()
+        last_row = 1  # 값이 있는 마지막 기존 행 (뒤쪽 빈 행은 버리고 새 케이스를 이어 붙임)
+        buffered: Optional[List[Tuple[int, Dict[str, Any], Dict[Any, int]]]] = []
+        for position, (number, row, row_styles) in enumerate(_iter_case_rows(case_sheet, keys, styles)):
+            if buffered is not None:
+                if position < buffer_rows:
+                    buffered.append((number, row, row_styles))
+                else:
+                    buffered = None  # 큰 시트는 보관하지 않고 2차에서 다시 스트리밍
+            if _is_blank(row):
+                continue
+            last_row = number
+            if extra_keys:
+                used_extras.update(key for key in row if key in extra_keys and row[key] != "")
+            key = case_key(row)
+            new_row = incoming.get(key)
+            if new_row is None or key in matched:
+                result.kept += 1
+                continue
+            matched.add(key)
+            if any(_text(row.get(col)) != _text(new_row[col]) for col in compare_keys if col in new_row):
+                updates[position] = key
+        result.updated = len(updates)
+        result.unchanged = len(matched) - len(updates)
+        result.added = len(incoming) - len(matched)
+        if not result.changed:
+            return result
+
+        # 옮길 수 없는 요소가 있으면 쓰기 전에 중단 (기존 파일 유지)
+        case_info = _read_sheet_xml(case_sheet)
+        _check_sheet(case_sheet, case_info,
+                     allowed=[tag for tag, attr in _LAYOUT_SHEET_PARTS.items() if getattr(layout, attr)])
+        others = {}
+        for ws in source.worksheets:
+            if ws is not case_sheet:
+                others[ws.title] = _read_sheet_xml(ws)
+                _check_sheet(ws, others[ws.title])
+        case_layout = _extended_layout(layout, extras, used_extras, case_info)
+        result.extra_columns = [str(header or "") for _, header in case_layout.columns[len(layout.columns):]]
+        merged = _case_merges(case_sheet, case_info, keys, case_layout, last_row)
+
+        # 2차: 기존 순서대로 기록 (바뀐 행은 생성 컬럼만 교체, 기존 셀 스타일 유지) + 새 케이스 추가
+        def merged_rows() -> Iterator[Tuple[Dict[str, Any], Optional[Dict[Any, int]]]]:
+            existing_rows = buffered if buffered is not None else _iter_case_rows(case_sheet, keys, styles)
+            for position, (number, row, row_styles) in enumerate(existing_rows):
+                if number > last_row:
+                    break
+                key = updates.get(position)
+                if key is not None:
+                    new_row = incoming[key]
+                    row = {**row, **{col: new_row[col] for col in compare_keys if col in new_row}}
+                yield row, row_styles
+            for key, new_row in incoming.items():
+                if key not in matched:
+                    yield new_row, None
+
+        wb = new_workbook(case_layout)
+        for ws in source.worksheets:
+            if ws is case_sheet:
+                _write_case_sheet(wb, ws.title, case_layout, case_info, merged, last_row, merged_rows(), styles)
+            else:
+                _copy_sheet(wb, ws, others[ws.title])
+    finally:
+        source.close()
+
+    # write-only 시트는 append 시점에 기록되므로 원본을 닫은 뒤 교체 (Windows 파일 잠금 방지)
+    with atomic_output(filename) as tmp_path:
+        wb.save(tmp_path)
+    result.written = True
+    return result
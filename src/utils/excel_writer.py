@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+스트리밍 Excel(xlsx) 저장
+
+- openpyxl write-only 모드로 행을 이터레이터에서 바로 기록 (셀 객체를 메모리에 유지하지 않음)
+- 헤더 스타일/열 너비/고정 행은 SheetLayout으로 한 번만 준비하여 모든 행에 재사용
+- 템플릿 엑셀은 레이아웃만 한 번 읽어 메모리에 캐시 (이후 저장은 템플릿을 다시 열지 않음)
+"""
+
+from __future__ import annotations
+
+import os
+from copy import copy
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, Side
+
+
+_STYLE_ATTRS = ("font", "fill", "border", "alignment", "number_format", "protection")
+
+# 기존 DataFrame 폴백 경로(pandas to_excel)의 헤더 스타일: 굵게 + 얇은 테두리 + 가운데 정렬
+_THIN = Side(style="thin")
+DEFAULT_HEADER_FONT = Font(bold=True)
+DEFAULT_HEADER_BORDER = Border(left=_THIN, right=_THIN, top=_THIN, bottom=_THIN)
+DEFAULT_HEADER_ALIGNMENT = Alignment(horizontal="center", vertical="top")
+
+
+@dataclass
+class SheetLayout:
+    """
+    시트 레이아웃 (출력 컬럼 배치 + 헤더/데이터 스타일)
+
+    Attributes:
+        columns: (테스트케이스 키, 헤더 텍스트) 목록. 목록 순서대로 A열부터 기록
+        column_widths: 열 문자 -> 너비
+        header_styles: 열별 헤더 스타일 속성 (font/fill/border/alignment/number_format/protection)
+        data_styles: 열별 데이터 셀 스타일 속성 (없으면 스타일 없이 기록)
+        freeze_panes: 고정 셀 (예: "A2")
+        header_height: 헤더 행 높이
+        conditional_formatting: (셀 범위, 규칙 목록) 목록
+        data_validations: 데이터 유효성 검사 목록
+        auto_filter: 자동 필터 범위 (예: "A1:M1")
+        named_styles: 워크북에 등록할 NamedStyle 목록 (data_styles에서 {"style": 이름}으로 참조)
+    """
+
+    columns: List[tuple]
+    column_widths: Dict[str, float] = field(default_factory=dict)
+    header_styles: List[Dict[str, Any]] = field(default_factory=list)
+    data_styles: List[Dict[str, Any]] = field(default_factory=list)
+    freeze_panes: Optional[str] = None
+    header_height: Optional[float] = None
+    conditional_formatting: List[Tuple[str, List[Any]]] = field(default_factory=list)
+    data_validations: List[Any] = field(default_factory=list)
+    auto_filter: Optional[str] = None
+    named_styles: List[Any] = field(default_factory=list)
+
+    @classmethod
+    def default(cls, columns: Sequence[str], column_widths: Optional[Dict[str, float]] = None) -> "SheetLayout":
+        """헤더 = 컬럼 키, 기존 폴백 경로와 같은 헤더 스타일"""
+        header_style = {
+            "font": DEFAULT_HEADER_FONT,
+            "border": DEFAULT_HEADER_BORDER,
+            "alignment": DEFAULT_HEADER_ALIGNMENT,
+        }
+        return cls(
+            columns=[(key, key) for key in columns],
+            column_widths=dict(column_widths or {}),
+            header_styles=[header_style] * len(columns),
+        )
+
+
+def _styled_cell(ws, value: Any, style: Optional[Dict[str, Any]]) -> Any:
+    if not style:
+        return value
+    cell = WriteOnlyCell(ws, value=value)
+    for attr, style_value in style.items():
+        setattr(cell, attr, style_value)
+    return cell
+
+
+def write_xlsx(rows: Iterable[Dict[str, Any]], filename: str, layout: SheetLayout,
+               sheet_name: str = "TestCases") -> int:
+    """
+    테스트케이스를 write-only 워크북으로 스트리밍 저장
+
+    Args:
+        rows: 테스트케이스 이터러블 (하나씩 소비하며 기록)
+        filename: 저장 경로
+        layout: 컬럼/스타일 레이아웃
+        sheet_name: 시트 이름
+
+    Returns:
+        int: 기록한 데이터 행 수
+    """
+    wb = new_workbook(layout)
+    try:
+        count = write_sheet(wb, rows, layout, sheet_name)
+    except BaseException:
+        # 행 소비 중 중단 (취소/마감 등): 시트 임시 파일 정리
+        discard_workbook(wb)
+        raise
+    wb.save(filename)
+    return count
+
+
+def discard_workbook(wb: Workbook) -> None:
+    """저장하지 않을 write-only 워크북의 시트 임시 파일 삭제"""
+    for ws in wb.worksheets:
+        writer = getattr(ws, "_writer", None)
+        if writer is None:
+            continue
+        try:
+            ws.close()
+        except Exception:
+            pass
+        if os.path.exists(writer.out):
+            writer.cleanup()
+
+
+def new_workbook(layout: SheetLayout) -> Workbook:
+    """write-only 워크북 생성 (layout의 NamedStyle 등록)"""
+    wb = Workbook(write_only=True)
+    for named_style in layout.named_styles:
+        # NamedStyle은 등록 시 워크북에 바인딩되므로 저장마다 복사본을 등록
+        wb.add_named_style(copy(named_style))
+    return wb
+
+
+def write_sheet(wb: Workbook, rows: Iterable[Dict[str, Any]], layout: SheetLayout, sheet_name: str) -> int:
+    """write-only 워크북에 시트 하나를 추가하고 헤더 + 데이터 행을 기록. 기록한 데이터 행 수를 반환."""
+    ws = start_sheet(wb, layout, sheet_name)
+    keys = [key for key, _ in layout.columns]
+    count = 0
+    if any(layout.data_styles):
+        # 열별 스타일을 한 번만 해석해 두고 모든 행의 셀이 같은 스타일 배열을 공유
+        columns = list(zip(keys, column_style_arrays(ws, layout)))
+        for row in rows:
+            cells = []
+            for key, style_array in columns:
+                value = _cell_value(row.get(key))
+                if style_array is not None:
+                    value = WriteOnlyCell(ws, value=value)
+                    value._style = style_array
+                cells.append(value)
+            ws.append(cells)
+            count += 1
+    else:
+        for row in rows:
+            ws.append([_cell_value(row.get(key)) for key in keys])
+            count += 1
+    return count
+
+
+def start_sheet(wb: Workbook, layout: SheetLayout, sheet_name: str):
+    """write-only 워크북에 시트를 추가하고 시트 설정(열 너비/고정 행/조건부 서식 등) + 헤더 행까지 기록"""
+    ws = wb.create_sheet(sheet_name)
+
+    # write-only 시트는 행을 쓰기 전에 열 너비/고정 행을 지정해야 함
+    for letter, width in layout.column_widths.items():
+        ws.column_dimensions[letter].width = width
+    if layout.freeze_panes:
+        ws.freeze_panes = layout.freeze_panes
+    if layout.header_height:
+        ws.row_dimensions[1].height = layout.header_height
+    for cell_range, rules in layout.conditional_formatting:
+        for rule in rules:
+            ws.conditional_formatting.add(cell_range, rule)
+    for validation in layout.data_validations:
+        ws.data_validations.append(validation)
+    if layout.auto_filter:
+        ws.auto_filter.ref = layout.auto_filter
+
+    header_styles = layout.header_styles or [None] * len(layout.columns)
+    ws.append([
+        _styled_cell(ws, header, style)
+        for (_, header), style in zip(layout.columns, header_styles)
+    ])
+    return ws
+
+
+def column_style_arrays(ws, layout: SheetLayout) -> List[Any]:
+    """열별 데이터 스타일을 시트 워크북의 스타일 배열로 해석 (스타일이 없는 열은 None)"""
+    styles = list(layout.data_styles) + [None] * (len(layout.columns) - len(layout.data_styles))
+    return [_styled_cell(ws, None, style)._style if style else None for style in styles]
+
+
+def _cell_value(value: Any) -> Any:
+    # 기존 경로와 동일하게 빈 값은 빈 셀, 리스트/딕셔너리는 문자열로 기록
+    if value is None:
+        return None
+    if isinstance(value, (list, tuple, dict, set)):
+        return str(value)
+    return value
+
+
+
+def _norm_header(value: Any) -> str:
+    return "".join(ch for ch in str(value or "").strip().lower() if ch.isalnum() or ch == "_")
+
+
+def _cell_style(cell) -> Optional[Dict[str, Any]]:
+    if not cell.has_style:
+        return None
+    # StyleProxy -> 실제 스타일 객체 (다른 워크북에서 재사용 가능하도록)
+    return {attr: copy(getattr(cell, attr)) for attr in _STYLE_ATTRS}
+
+
+def capture_template_layout(template_path: str, columns: Sequence[str],
+                            header_row: int = 1) -> Tuple[SheetLayout, str]:
+    """
+    템플릿 엑셀의 레이아웃 추출 (헤더 행, 열 너비, 고정 행, 스타일, 조건부 서식/유효성 검사)
+
+    - 템플릿 헤더와 columns를 대소문자/공백/특수문자 무시하고 매칭
+    - 템플릿 열 순서를 유지하고, 매칭되지 않는 템플릿 열은 빈 칸으로 기록
+    - 데이터 행 스타일은 헤더 다음 행(예시 행)의 셀 스타일을 사용
+
+    Returns:
+        (SheetLayout, 시트 이름)
+    """
+    wb = load_workbook(template_path)
+    try:
+        ws = wb.active
+        keys_by_header = {_norm_header(key): key for key in columns}
+
+        layout_columns: List[tuple] = []
+        header_styles: List[Optional[Dict[str, Any]]] = []
+        data_styles: List[Optional[Dict[str, Any]]] = []
+        for col_idx in range(1, ws.max_column + 1):
+            header_cell = ws.cell(row=header_row, column=col_idx)
+            layout_columns.append((keys_by_header.get(_norm_header(header_cell.value)), header_cell.value))
+            header_styles.append(_cell_style(header_cell))
+            data_styles.append(_cell_style(ws.cell(row=header_row + 1, column=col_idx)))
+
+        conditional_formatting = [
+            (str(cf.sqref), list(cf.rules)) for cf in ws.conditional_formatting
+        ]
+        return SheetLayout(
+            columns=layout_columns,
+            column_widths={
+                letter: dim.width for letter, dim in ws.column_dimensions.items() if dim.width
+            },
+            header_styles=header_styles,
+            data_styles=data_styles,
+            freeze_panes=ws.freeze_panes,
+            header_height=ws.row_dimensions[header_row].height,
+            conditional_formatting=conditional_formatting,
+            data_validations=list(ws.data_validations.dataValidation),
+            auto_filter=ws.auto_filter.ref,
+        ), ws.title
+    finally:
+        wb.close()
+
+
+# (템플릿 경로, 수정 시각, 컬럼) -> 캡처된 레이아웃
+_TEMPLATE_LAYOUTS: Dict[Tuple[str, int, Tuple[str, ...]], Tuple[SheetLayout, str]] = {}
+
+
+def load_template_layout(template_path: str, columns: Sequence[str]) -> Tuple[SheetLayout, str]:
+    """capture_template_layout()의 캐시 버전 (템플릿 파일이 바뀌면 다시 읽음)"""
+    key = (os.path.abspath(template_path), os.stat(template_path).st_mtime_ns, tuple(columns))
+    layout = _TEMPLATE_LAYOUTS.get(key)
+    if layout is None:
+        layout = _TEMPLATE_LAYOUTS[key] = capture_template_layout(template_path, columns)
+    return layout
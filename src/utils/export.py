@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+다중 형식 동시 저장
+
+- 정규화가 끝난 테스트케이스 버퍼 하나를 여러 writer(Excel/CSV/JSON 등)에 동시에 전달 (스레드 풀)
+- 모든 파일은 같은 디렉토리의 임시 파일에 기록한 뒤 rename하므로, 중간에 실패해도 기존 파일이 깨지지 않음
+"""
+
+from __future__ import annotations
+
+import csv
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Sequence, Tuple
+
+# (출력 경로, writer(rows, 경로))
+ExportSink = Tuple[str, Callable[[Sequence[Dict[str, Any]], str], Any]]
+
+
+def _current_umask() -> int:
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+# 프로세스 시작 시 umask (스레드가 돌기 전에 한 번만 읽음 - os.umask는 읽으면서 바꾸므로)
+_UMASK = _current_umask()
+
+
+def _output_mode(path: str) -> int:
+    """교체할 파일이 있으면 그 권한, 없으면 일반 open과 같은 0o666 & ~umask"""
+    try:
+        return os.stat(path).st_mode & 0o7777
+    except OSError:
+        return 0o666 & ~_UMASK
+
+
+@contextmanager
+def atomic_output(path: str, mode: Optional[int] = None) -> Iterator[str]:
+    """
+    임시 경로를 yield하고, 블록이 정상 종료되면 path로 교체 (예외 시 임시 파일 삭제)
+
+    임시 파일은 확장자를 유지하므로 확장자로 형식을 판단하는 writer도 그대로 사용 가능
+    교체 전에 권한을 mode(기본값: 기존 파일 권한, 새 파일이면 0o666 & ~umask)로 맞춤
+    (mkstemp의 0o600이 결과 파일에 남지 않도록)
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    base, ext = os.path.splitext(os.path.basename(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{base}.", suffix=f".tmp{ext}", dir=directory)
+    os.close(fd)
+    try:
+        yield tmp_path
+        os.chmod(tmp_path, _output_mode(path) if mode is None else mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _write_sink(rows: Sequence[Dict[str, Any]], path: str, writer) -> float:
+    started = time.perf_counter()
+    with atomic_output(path) as tmp_path:
+        writer(rows, tmp_path)
+    return time.perf_counter() - started
+
+
+def fan_out(rows: Sequence[Dict[str, Any]], sinks: Dict[str, ExportSink],
+            max_workers: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    같은 행 버퍼를 여러 sink에 동시에 기록
+
+    Args:
+        rows: 정규화된 테스트케이스 목록 (writer는 읽기만 해야 함)
+        sinks: sink 이름 -> (출력 경로, writer)
+        max_workers: 스레드 수 (기본값: sink 수)
+
+    Returns:
+        sink 이름 -> {"path": 경로, "elapsed_sec": 기록 시간}
+
+    Raises:
+        실패한 sink가 있으면 모든 sink가 끝난 뒤 첫 번째 예외를 다시 발생 (성공한 파일은 유지)
+    """
+    if not sinks:
+        return {}
+
+    results: Dict[str, Dict[str, Any]] = {}
+    errors = []
+    with ThreadPoolExecutor(max_workers=max_workers or len(sinks)) as pool:
+        futures = {
+            name: pool.submit(_write_sink, rows, path, writer)
+            for name, (path, writer) in sinks.items()
+        }
+        for name, future in futures.items():
+            try:
+                elapsed = future.result()
+            except Exception as e:
+                errors.append(e)
+                continue
+            results[name] = {"path": sinks[name][0], "elapsed_sec": round(elapsed, 3)}
+
+    if errors:
+        raise errors[0]
+    return results
+
+
+def write_csv(rows: Iterable[Dict[str, Any]], filename: str, columns: Sequence[str]) -> None:
+    """지정한 컬럼 순서의 일반 CSV (엑셀 호환 UTF-8 BOM, 없는 값은 빈 칸)"""
+    with open(filename, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow(["" if row.get(col) is None else row.get(col) for col in columns])
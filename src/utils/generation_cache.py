@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+테스트케이스 생성 결과 캐시
+
+- 분석 결과 중 생성에 쓰이는 섹션 + 룰 설정 + 생성기 버전으로 캐시 키를 계산
+- 정규화된 테스트케이스를 디스크(JSON)에 저장하고, 같은 키면 생성 없이 그대로 반환
+- 스크린샷(서명된 이미지 URL 등)처럼 실행마다 달라지지만 생성에 쓰이지 않는 값은 키에서 제외
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from .rules_config import RulesConfig
+
+
+DEFAULT_CACHE_DIR = os.path.join(".cache", "testcases")
+
+# TestCaseGenerator._iter_raw_testcases()가 읽는 enhanced_analysis 섹션
+_ENHANCED_SECTIONS = ("keywords", "ui_structure", "user_flow")
+
+
+def _stable_hash(value: Any) -> str:
+    payload = json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def analysis_fingerprint(analysis_result: Dict[str, Any]) -> str:
+    """생성 결과에 영향을 주는 분석 섹션만의 안정적인 해시"""
+    enhanced = analysis_result.get("enhanced_analysis") or {}
+    return _stable_hash({
+        "enhanced_analysis": {name: enhanced.get(name) for name in _ENHANCED_SECTIONS},
+        "recommendations": analysis_result.get("recommendations"),
+    })
+
+
+def rules_fingerprint(rules: RulesConfig) -> str:
+    """룰 설정 전체의 해시 (키 순서와 무관)"""
+    return _stable_hash(rules.raw)
+
+
+class GenerationCache:
+    """정규화된 테스트케이스의 디스크 캐시 (키당 JSON 파일 1개)"""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    def key_for(self, analysis_result: Dict[str, Any], rules: RulesConfig,
+                generator_version: str, variant: str = "") -> str:
+        """
+        캐시 키 계산
+
+        Args:
+            analysis_result: FigmaAnalyzer 분석 결과
+            rules: 생성에 사용한 룰 설정
+            generator_version: 생성기 버전 (템플릿이 바뀌면 버전을 올려 캐시 무효화)
+            variant: 같은 분석이라도 결과가 달라지는 옵션 (예: 우선순위 필터)
+        """
+        return _stable_hash([
+            analysis_fingerprint(analysis_result),
+            rules_fingerprint(rules),
+            generator_version,
+            variant,
+        ])[:32]
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """캐시된 테스트케이스 (없거나 손상된 경우 None)"""
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get("key") != key:
+            return None
+        return entry.get("testcases")
+
+    def put(self, key: str, testcases: List[Dict[str, Any]]) -> str:
+        """테스트케이스 저장 (임시 파일 기록 후 교체하여 동시 실행에도 손상되지 않음)"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        entry = {
+            "key": key,
+            "created_at": datetime.now().isoformat(),
+            "testcases": testcases,
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return self._path(key)
+
+    def _output_stamp_path(self, output_path: str) -> str:
+        digest = hashlib.sha256(os.path.abspath(output_path).encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.cache_dir, "outputs", f"{digest}.json")
+
+    @staticmethod
+    def _file_state(output_path: str) -> Optional[List[int]]:
+        try:
+            stat = os.stat(output_path)
+        except OSError:
+            return None
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def mark_output(self, output_path: str, key: str, output_format: str) -> None:
+        """출력 파일이 어떤 캐시 키/형식으로 기록되었는지 기록"""
+        stamp_path = self._output_stamp_path(output_path)
+        os.makedirs(os.path.dirname(stamp_path), exist_ok=True)
+        with open(stamp_path, "w", encoding="utf-8") as f:
+            json.dump({"key": key, "format": output_format, "file": self._file_state(output_path)}, f)
+
+    def output_is_current(self, output_path: str, key: str, output_format: str) -> bool:
+        """출력 파일이 같은 키/형식으로 기록된 뒤 변경되지 않았는지 (다시 쓸 필요가 없는지)"""
+        try:
+            with open(self._output_stamp_path(output_path), "r", encoding="utf-8") as f:
+                stamp = json.load(f)
+        except (OSError, ValueError):
+            return False
+        state = self._file_state(output_path)
+        return (
+            state is not None
+            and stamp.get("key") == key
+            and stamp.get("format") == output_format
+            and stamp.get("file") == state
+        )
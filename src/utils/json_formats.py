@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+JSON 계열 저장 형식
+
+- NDJSON: 한 줄에 케이스 하나 (스트리밍 기록/부분 읽기/tail 가능)
+- 컬럼형 JSON: 컬럼별 배열 + 공유 문자열 테이블 (반복되는 domain/priority/type 등이 한 번만 저장됨)
+- 모든 형식은 gzip 압축 선택 가능
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Sequence, Union
+
+COLUMNAR_FORMAT = "columnar"
+COLUMNAR_VERSION = 1
+
+
+def open_text(filename: str, mode: str = "r", compress: bool = False) -> IO[str]:
+    """UTF-8 텍스트 파일 열기 (compress=True면 gzip)"""
+    if compress:
+        return gzip.open(filename, mode + "t", encoding="utf-8")
+    return open(filename, mode, encoding="utf-8")
+
+
+def write_ndjson(rows: Iterable[Dict[str, Any]], filename: str, compress: bool = False) -> int:
+    """케이스를 한 줄씩 기록. 기록한 케이스 수를 반환."""
+    count = 0
+    with open_text(filename, "w", compress) as f:
+        for row in rows:
+            f.write(json.dumps(row, ensure_ascii=False, separators=(",", ":")))
+            f.write("\n")
+            count += 1
+    return count
+
+
+def iter_ndjson(filename: str, compress: bool = False) -> Iterator[Dict[str, Any]]:
+    """NDJSON 파일을 한 줄씩 읽기 (빈 줄 무시)"""
+    with open_text(filename, "r", compress) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def write_columnar_json(rows: Iterable[Dict[str, Any]], filename: str, columns: Sequence[str] = (),
+                        metadata: Union[Dict[str, Any], Callable[[int], Dict[str, Any]], None] = None,
+                        compress: bool = False) -> int:
+    """
+    컬럼형 JSON 기록
+
+    {"format": "columnar", "version": 1, "row_count": N, "columns": [...],
+     "strings": [...], "data": {컬럼: [값, ...]}, "metadata": {...}}
+
+    - 값: 문자열 테이블 index(int), 없음(null), 문자열이 아닌 값은 [값] 형태로 그대로 저장
+    - columns에 없는 키는 처음 나타난 순서대로 컬럼 추가 (이전 행은 null)
+    - metadata는 dict 또는 기록한 행 수를 받아 dict를 반환하는 함수
+    """
+    column_names: List[str] = list(columns)
+    data: Dict[str, List[Any]] = {col: [] for col in column_names}
+    string_index: Dict[str, int] = {}
+    count = 0
+
+    for row in rows:
+        for key in row:
+            if key not in data:
+                column_names.append(key)
+                data[key] = [None] * count
+        for col in column_names:
+            value = row.get(col)
+            if value is None:
+                data[col].append(None)
+                continue
+            if not isinstance(value, str):
+                data[col].append([value])
+                continue
+            idx = string_index.get(value)
+            if idx is None:
+                idx = string_index[value] = len(string_index)
+            data[col].append(idx)
+        count += 1
+
+    document = {
+        "format": COLUMNAR_FORMAT,
+        "version": COLUMNAR_VERSION,
+        "row_count": count,
+        "columns": column_names,
+        "strings": list(string_index),
+        "data": data,
+    }
+    if metadata is not None:
+        document["metadata"] = metadata(count) if callable(metadata) else metadata
+
+    with open_text(filename, "w", compress) as f:
+        json.dump(document, f, ensure_ascii=False, separators=(",", ":"))
+    return count
+
+
+def read_columnar_json(filename: str, compress: bool = False) -> List[Dict[str, Any]]:
+    """컬럼형 JSON을 케이스 목록으로 복원 (null인 값은 키를 생략)"""
+    with open_text(filename, "r", compress) as f:
+        document = json.load(f)
+    if document.get("format") != COLUMNAR_FORMAT:
+        raise ValueError(f"컬럼형 JSON 파일이 아닙니다: {filename}")
+
+    strings = document["strings"]
+    columns = [(col, document["data"][col]) for col in document["columns"]]
+    rows = []
+    for i in range(document["row_count"]):
+        row = {}
+        for col, values in columns:
+            value = values[i]
+            if isinstance(value, int):
+                row[col] = strings[value]
+            elif isinstance(value, list):
+                row[col] = value[0]
+        rows.append(row)
+    return rows
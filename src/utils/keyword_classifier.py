@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+키워드 기반 우선순위/카테고리 분류기
+
+- 우선순위(P1~P4) 키워드와 카테고리 키워드를 하나의 Aho-Corasick 오토마톤으로 컴파일
+- 텍스트를 한 번만 스캔하여 우선순위와 카테고리를 동시에 결정
+- TestCaseGenerator와 MCP 서버가 공유
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .rules_config import RulesConfig
+
+
+DEFAULT_CLASSIFY_FIELDS: Tuple[str, ...] = ("title", "section", "component", "feature")
+
+
+class KeywordAutomaton:
+    """다중 패턴 부분 문자열 매칭 (Aho-Corasick, 대소문자 무시)"""
+
+    def __init__(self, patterns: Dict[str, Iterable[Any]]):
+        """
+        Args:
+            patterns: 키워드 -> 매칭 시 반환할 payload 목록
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Set[Any]] = [set()]
+
+        for keyword, payloads in patterns.items():
+            keyword = keyword.lower()
+            if not keyword:
+                continue
+            node = 0
+            for ch in keyword:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(set())
+                node = nxt
+            self._out[node].update(payloads)
+
+        # BFS로 실패 링크 구성 (출력은 실패 링크를 따라 미리 병합)
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(ch, 0)
+                self._out[child] |= self._out[self._fail[child]]
+
+    def search(self, text: str) -> Set[Any]:
+        """텍스트에 포함된 모든 키워드의 payload 집합 (텍스트 1회 스캔)"""
+        goto, fail, out = self._goto, self._fail, self._out
+        found: Set[Any] = set()
+        node = 0
+        for ch in text.lower():
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                found |= out[node]
+        return found
+
+
+class KeywordClassifier:
+    """우선순위 + 카테고리 분류기 (키워드는 생성 시 한 번만 컴파일)"""
+
+    def __init__(self, priority_keywords: Dict[str, Sequence[str]],
+                 priority_order: Sequence[str] = ("P1", "P2", "P3", "P4"),
+                 default_priority: str = "P2",
+                 category_keywords: Optional[Dict[str, Sequence[str]]] = None,
+                 default_category: str = ""):
+        """
+        Args:
+            priority_keywords: 우선순위 -> 키워드 목록 (여러 우선순위가 매칭되면 priority_order상 높은 쪽)
+            priority_order: 우선순위 순서
+            default_priority: 매칭되는 키워드가 없을 때의 우선순위
+            category_keywords: 카테고리 -> 키워드 목록 (선언 순서가 먼저인 카테고리가 우선)
+            default_category: 매칭되는 카테고리가 없을 때의 카테고리
+        """
+        self.priority_order = list(priority_order)
+        self.default_priority = default_priority
+        self.categories = list((category_keywords or {}).keys())
+        self.default_category = default_category
+
+        patterns: Dict[str, Set[Tuple[str, str]]] = {}
+        for priority, keywords in priority_keywords.items():
+            for keyword in keywords:
+                patterns.setdefault(keyword.lower(), set()).add(("priority", priority))
+        for category, keywords in (category_keywords or {}).items():
+            for keyword in keywords:
+                patterns.setdefault(keyword.lower(), set()).add(("category", category))
+        self._automaton = KeywordAutomaton(patterns)
+
+    @classmethod
+    def from_rules(cls, rules: RulesConfig) -> "KeywordClassifier":
+        """rules_config.json의 priority_rules/category_rules로 분류기 생성"""
+        return cls(
+            priority_keywords=rules.priority_keywords,
+            priority_order=rules.priority_order,
+            default_priority=rules.priority_default,
+            category_keywords=rules.category_keywords,
+            default_category=rules.category_default,
+        )
+
+    def classify(self, text: str) -> Tuple[str, str]:
+        """텍스트 -> (우선순위, 카테고리)"""
+        matches = self._automaton.search(text or "")
+        priority = next((p for p in self.priority_order if ("priority", p) in matches), self.default_priority)
+        category = next((c for c in self.categories if ("category", c) in matches), self.default_category)
+        return priority, category
+
+    def classify_testcase(self, testcase: Dict[str, Any],
+                          fields: Sequence[str] = DEFAULT_CLASSIFY_FIELDS) -> Tuple[str, str]:
+        """테스트케이스의 지정 필드를 한 번에 스캔하여 분류"""
+        return self.classify("\n".join(str(testcase.get(f) or "") for f in fields))
+
+    def classify_many(self, testcases: Iterable[Dict[str, Any]],
+                      fields: Sequence[str] = DEFAULT_CLASSIFY_FIELDS) -> List[Tuple[str, str]]:
+        """테스트케이스 배치 분류 (케이스당 1회 스캔)"""
+        return [self.classify_testcase(tc, fields) for tc in testcases]
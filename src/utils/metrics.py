@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+서버 계측 (지연 시간 히스토그램 / 카운터 / 게이지)
+
+- 도구별/단계별 소요 시간을 고정 버킷 히스토그램으로 집계 (p50/p95/p99는 버킷 보간 추정값)
+- 카운터(누적 값)와 게이지(현재 값)는 이름 + 레이블 조합별로 집계
+- 프로세스 풀 워커의 집계는 pop_state()로 꺼내 주 프로세스에서 merge()
+- Prometheus 텍스트 형식 출력 (textfile collector 등으로 수집)
+"""
+
+from __future__ import annotations
+
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# 초 단위 버킷 상한 (마지막 +Inf 버킷은 자동 추가)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Dict[str, Any]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _label_key(labels: Labels) -> str:
+    """snapshot()의 레이블 조합 키 (예: "tool=extract_requirements", 레이블이 없으면 "")"""
+    return ",".join(f"{key}={value}" for key, value in labels)
+
+
+def _prom_labels(labels: Labels, extra: Sequence[Tuple[str, str]] = ()) -> str:
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + "}"
+
+
+def _prom_number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """고정 버킷 히스토그램 (값 단위: 초)"""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.bounds = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.bounds) + 1)  # 마지막은 +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """버킷 안에서 선형 보간한 q 분위수 추정값 (관측 최솟값~최댓값 범위로 제한)"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                if i == len(self.bounds):
+                    return self.max
+                lower = max(self.bounds[i - 1] if i else 0.0, self.min)
+                upper = min(self.bounds[i], self.max)
+                return lower + (upper - lower) * max(0.0, rank - seen) / bucket_count
+            seen += bucket_count
+        return self.max
+
+    def snapshot(self) -> Dict[str, Any]:
+        def ms(value):
+            return round(value * 1000, 2) if value is not None else None
+
+        return {
+            "count": self.count,
+            "sum_ms": ms(self.sum),
+            "mean_ms": ms(self.sum / self.count) if self.count else None,
+            "p50_ms": ms(self.quantile(0.5)),
+            "p95_ms": ms(self.quantile(0.95)),
+            "p99_ms": ms(self.quantile(0.99)),
+            "max_ms": ms(self.max) if self.count else None,
+        }
+
+    def state(self) -> Dict[str, Any]:
+        return {"bounds": list(self.bounds), "counts": list(self.counts), "count": self.count,
+                "sum": self.sum, "min": self.min, "max": self.max}
+
+    def merge(self, state: Dict[str, Any]) -> None:
+        if tuple(state["bounds"]) != self.bounds:
+            raise ValueError("버킷 구성이 다른 히스토그램은 합칠 수 없습니다.")
+        self.counts = [a + b for a, b in zip(self.counts, state["counts"])]
+        self.count += state["count"]
+        self.sum += state["sum"]
+        self.min = min(self.min, state["min"])
+        self.max = max(self.max, state["max"])
+
+
+class MetricsRegistry:
+    """
+    이름 + 레이블별 히스토그램/카운터/게이지 모음 (스레드 안전)
+
+    Args:
+        buckets: 히스토그램 버킷 상한(초)
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._gauges: Dict[str, Dict[Labels, float]] = {}
+        self._help: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def describe(self, name: str, help_text: str) -> None:
+        """Prometheus 출력의 # HELP 설명"""
+        self._help[name] = help_text
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        key = _labels(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(self.buckets)
+            histogram.observe(value)
+
+    def inc(self, name: str, value: float = 1, **labels: Any) -> None:
+        key = _labels(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def add_gauge(self, name: str, delta: float, **labels: Any) -> None:
+        key = _labels(labels)
+        with self._lock:
+            series = self._gauges.setdefault(name, {})
+            series[key] = series.get(key, 0) + delta
+
+    @contextmanager
+    def time(self, name: str, **labels: Any) -> Iterator[None]:
+        """블록(또는 데코레이터로 감싼 함수) 소요 시간을 name 히스토그램에 기록 (예외로 끝나도 기록)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON용 집계: {"histograms": {이름: {레이블 키: 요약}}, "counters": ..., "gauges": ...}"""
+        with self._lock:
+            return {
+                "histograms": {name: {_label_key(key): h.snapshot() for key, h in series.items()}
+                               for name, series in self._histograms.items()},
+                "counters": {name: {_label_key(key): value for key, value in series.items()}
+                             for name, series in self._counters.items()},
+                "gauges": {name: {_label_key(key): value for key, value in series.items()}
+                           for name, series in self._gauges.items()},
+            }
+
+    def pop_state(self) -> Dict[str, Any]:
+        """히스토그램/카운터 누적값을 꺼내고 비움 (게이지는 제외, 워커 -> 주 프로세스 전달용)"""
+        with self._lock:
+            state = {
+                "histograms": [(name, key, h.state()) for name, series in self._histograms.items()
+                               for key, h in series.items()],
+                "counters": [(name, key, value) for name, series in self._counters.items()
+                             for key, value in series.items()],
+            }
+            self._histograms = {}
+            self._counters = {}
+        return state
+
+    def merge(self, state: Dict[str, Any]) -> None:
+        """pop_state() 결과를 더함"""
+        with self._lock:
+            for name, key, h_state in state.get("histograms", ()):
+                key = tuple(tuple(pair) for pair in key)
+                series = self._histograms.setdefault(name, {})
+                histogram = series.get(key)
+                if histogram is None:
+                    histogram = series[key] = Histogram(h_state["bounds"])
+                histogram.merge(h_state)
+            for name, key, value in state.get("counters", ()):
+                key = tuple(tuple(pair) for pair in key)
+                series = self._counters.setdefault(name, {})
+                series[key] = series.get(key, 0) + value
+
+    def to_prometheus(self, gauges: Optional[Dict[str, Iterable[Tuple[Dict[str, Any], float]]]] = None) -> str:
+        """
+        Prometheus 텍스트 형식 (exposition format 0.0.4)
+
+        gauges: 출력 시점에 함께 내보낼 외부 값 {이름: [(레이블, 값), ...]} (캐시/풀 상태 등)
+        """
+        lines: List[str] = []
+
+        def header(name: str, kind: str) -> None:
+            if name in self._help:
+                lines.append(f"# HELP {name} {self._help[name]}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        with self._lock:
+            for name, series in sorted(self._histograms.items()):
+                header(name, "histogram")
+                for key, h in sorted(series.items()):
+                    cumulative = 0
+                    for bound, bucket_count in zip(h.bounds + (math.inf,), h.counts):
+                        cumulative += bucket_count
+                        lines.append(f"{name}_bucket{_prom_labels(key, [('le', _prom_number(bound))])} {cumulative}")
+                    lines.append(f"{name}_sum{_prom_labels(key)} {_prom_number(h.sum)}")
+                    lines.append(f"{name}_count{_prom_labels(key)} {h.count}")
+            for name, series in sorted(self._counters.items()):
+                header(name, "counter")
+                for key, value in sorted(series.items()):
+                    lines.append(f"{name}{_prom_labels(key)} {_prom_number(value)}")
+            own_gauges = {name: [(dict(key), value) for key, value in series.items()]
+                          for name, series in self._gauges.items()}
+
+        for name, samples in sorted({**own_gauges, **(gauges or {})}.items()):
+            header(name, "gauge")
+            for labels, value in samples:
+                if value is not None:
+                    lines.append(f"{name}{_prom_labels(_labels(labels))} {_prom_number(value)}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+MCP 도구 응답 페이지 나누기 / 요약
+
+- 저장소(DataStore)에 보관한 결과의 목록을 limit개씩 잘라 보내고, 다음 페이지는 커서로 요청
+- 커서: 핸들 + 결과 안의 목록 경로 + 시작 위치를 담은 불투명 문자열 (같은 도구에 cursor로 전달)
+- 잘린 목록 옆에는 <키>_total(전체 수)과 <키>_next_cursor(다음 페이지 커서)를 추가
+- top-k 요약: 목록을 값별 빈도 상위 k개로 줄임
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_PAGE_LIMIT = 50
+MAX_PAGE_LIMIT = 1000
+
+Path = Tuple[str, ...]
+
+
+def encode_cursor(handle: str, path: Sequence[str], offset: int) -> str:
+    payload = json.dumps([handle, list(path), offset], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, Path, int]:
+    """커서 -> (핸들, 목록 경로, 시작 위치). 형식이 잘못되면 ValueError."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        handle, path, offset = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(handle, str) or not isinstance(offset, int) or offset < 0:
+            raise ValueError
+        return handle, tuple(str(key) for key in path), offset
+    except (ValueError, TypeError, UnicodeError):
+        raise ValueError(f"잘못된 커서: {cursor!r}")
+
+
+def page_limit(limit: Optional[int]) -> int:
+    """요청 limit을 0..MAX_PAGE_LIMIT 범위로 (None이면 기본값)"""
+    if limit is None:
+        return DEFAULT_PAGE_LIMIT
+    return max(0, min(int(limit), MAX_PAGE_LIMIT))
+
+
+def get_path(value: Any, path: Path) -> Any:
+    for key in path:
+        value = value[key]
+    return value
+
+
+def page(items: List[Any], handle: str, path: Path, offset: int, limit: int,
+         key: Optional[str] = None) -> Dict[str, Any]:
+    """
+    items[offset:offset+limit]와 다음 페이지 커서 (마지막 페이지면 None)
+
+    key: 응답에서 쓸 목록 이름 (기본값: 경로의 마지막 키)
+    """
+    key = key or (path[-1] if path else "items")
+    end = offset + limit
+    return {
+        key: items[offset:end],
+        f"{key}_total": len(items),
+        f"{key}_next_cursor": encode_cursor(handle, path, end) if end < len(items) else None,
+    }
+
+
+def paginate(result: Dict[str, Any], handle: str, paths: Iterable[Path], limit: Optional[int]) -> Dict[str, Any]:
+    """
+    result 안의 목록(paths)을 첫 페이지로 줄인 사본 (result 자체는 수정하지 않음)
+
+    - 경로상의 dict는 모두 복사하므로 사본의 해당 위치에 값을 추가해도 원본은 바뀌지 않음
+    - limit이 None이면 복사만 하고 목록은 그대로 둠
+    - 없는 경로는 무시
+
+    Args:
+        result: handle로 보관한 결과
+        handle: result를 보관한 핸들
+        paths: 나눌 목록 경로
+        limit: 페이지 크기
+    """
+    result = dict(result)
+    for path in paths:
+        parent = result
+        try:
+            for key in path[:-1]:
+                parent[key] = dict(parent[key])
+                parent = parent[key]
+            items = parent[path[-1]]
+        except (KeyError, TypeError):
+            continue
+        if limit is not None and isinstance(items, list) and len(items) > limit:
+            parent.update(page(items, handle, tuple(path), 0, limit))
+    return result
+
+
+def top_values(items: Iterable[Dict[str, Any]], field: str, k: int) -> Dict[str, Any]:
+    """dict 목록을 field 값 빈도 상위 k개로 요약"""
+    counts = Counter(item.get(field) for item in items)
+    return {
+        "total": sum(counts.values()),
+        "distinct": len(counts),
+        "top": [{"value": value, "count": count} for value, count in counts.most_common(k)],
+    }
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Figma API 요청 예산 (토큰별 token bucket)
+
+- 같은 Figma 토큰을 쓰는 모든 요청(MCP 서버, CLI, 배치 작업)이 하나의 버킷을 공유
+- 버킷 상태는 파일(state_file)에 두고 파일 잠금으로 갱신하므로 여러 프로세스가 함께 예산을 나눠 씀
+  (fcntl이 없는 환경이나 state_file이 없으면 프로세스 안에서만 공유)
+- 우선순위: interactive(사용자 요청) > batch(프리패치, 야간 작업)
+  batch는 버킷에 batch_reserve개보다 많이 남아 있고 대기 중인 interactive 요청이 없을 때만 사용
+  (PriorityCell로 지정한 우선순위는 대기 중에 올릴 수 있음: batch 요청을 interactive 호출자가 기다리게 된 경우)
+- 429 응답을 받으면 Retry-After 동안 같은 토큰의 모든 요청을 멈추고 재시도
+- 상태 파일에는 토큰 원문 대신 해시만 기록
+"""
+
+from __future__ import annotations
+
+import contextvars
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Union
+
+import requests
+
+from .cancellation import checkpoint
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 공유 없이 동작
+    fcntl = None
+
+PRIORITIES = ("interactive", "batch")
+# 작업 디렉토리나 체크아웃 위치와 관계없이 같은 토큰은 같은 버킷을 쓰도록 사용자 캐시 디렉토리에 둠
+DEFAULT_STATE_FILE = os.path.join(
+    os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "figma-qa-testcase-generator",
+    "figma_rate_budget.json",
+)
+DEFAULT_RETRY_AFTER = 10.0  # Retry-After 헤더가 없을 때 대기 시간(초)
+_MAX_SLEEP = 0.5  # 대기 중 상태를 다시 확인하는 간격(초)
+_WAITER_TTL = 2.0  # 대기 표시 유효 시간 (프로세스가 죽어도 batch가 영원히 막히지 않도록)
+
+def _check_priority(priority: str) -> str:
+    if priority not in PRIORITIES:
+        raise ValueError(f"지원하지 않는 우선순위: {priority} (지원: {', '.join(PRIORITIES)})")
+    return priority
+
+
+class PriorityCell:
+    """
+    요청 도중 올릴 수 있는 우선순위
+
+    rate_priority에 넘기면 예산을 기다리는 acquire가 매번 다시 읽으므로, 다른 스레드에서 promote하면
+    이미 대기 중인 요청에도 바로 반영됨
+    """
+
+    __slots__ = ("priority",)
+
+    def __init__(self, priority: str):
+        self.priority = _check_priority(priority)
+
+    def promote(self, priority: str) -> None:
+        """priority가 더 높으면 올림 (낮추지는 않음)"""
+        if PRIORITIES.index(_check_priority(priority)) < PRIORITIES.index(self.priority):
+            self.priority = priority
+
+
+_current_priority: contextvars.ContextVar[Union[None, str, PriorityCell]] = contextvars.ContextVar(
+    "figma_rate_priority", default=None)
+
+
+def current_priority() -> str:
+    """현재 컨텍스트의 우선순위 (rate_priority > 환경변수 FIGMA_RATE_CLASS > interactive)"""
+    priority = _current_priority.get()
+    if isinstance(priority, PriorityCell):
+        return priority.priority
+    return _check_priority(priority or os.getenv("FIGMA_RATE_CLASS") or "interactive")
+
+
+@contextmanager
+def rate_priority(priority: Union[str, PriorityCell]) -> Iterator[None]:
+    """블록 안(과 그 안에서 만든 작업/풀 호출)의 Figma 요청 우선순위 지정 (PriorityCell이면 대기 중에도 갱신)"""
+    if not isinstance(priority, PriorityCell):
+        priority = _check_priority(priority)
+    reset = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(reset)
+
+
+def _budget_key(figma_token: str) -> str:
+    return hashlib.sha256(figma_token.encode("utf-8")).hexdigest()[:16]
+
+
+class RateBudget:
+    """
+    Figma 토큰별 요청 예산
+
+    Args:
+        requests_per_minute: 토큰당 분당 요청 수 (0 이하면 제한 없음)
+        burst: 버킷 크기 (한 번에 보낼 수 있는 최대 요청 수)
+        batch_reserve: batch 요청이 남겨 두어야 하는 버킷 양 (interactive 전용, burst - 1 이하로 제한)
+        state_file: 프로세스 간 공유 상태 파일 (None이면 프로세스 안에서만 공유)
+        max_retries: 429 응답 시 재시도 횟수
+    """
+
+    def __init__(self, requests_per_minute: float = 60, burst: float = 10, batch_reserve: float = 3,
+                 state_file: Optional[str] = DEFAULT_STATE_FILE, max_retries: int = 2):
+        self.rate = requests_per_minute / 60.0
+        self.burst = max(1.0, float(burst))
+        self.batch_reserve = max(0.0, min(float(batch_reserve), self.burst - 1))
+        self.state_file = os.path.abspath(state_file) if state_file and fcntl is not None else None
+        self.max_retries = max_retries
+        self._lock = threading.Lock()
+        self._memory_state: Dict[str, Any] = {}
+        self.acquired = {priority: 0 for priority in PRIORITIES}
+        self.wait_seconds = {priority: 0.0 for priority in PRIORITIES}
+        self.throttled = 0  # 받은 429 응답 수
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    @contextmanager
+    def _locked_state(self) -> Iterator[Dict[str, Any]]:
+        with self._lock:
+            if self.state_file is None:
+                yield self._memory_state
+                return
+            directory = os.path.dirname(os.path.abspath(self.state_file))
+            os.makedirs(directory, exist_ok=True)
+            with open(self.state_file, "a+", encoding="utf-8") as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    f.seek(0)
+                    try:
+                        state = json.loads(f.read() or "{}")
+                    except ValueError:
+                        state = {}  # 손상된 파일은 새 버킷으로 시작
+                    yield state
+                    f.seek(0)
+                    f.truncate()
+                    json.dump(state, f, separators=(",", ":"))
+                    f.flush()
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _entry(self, state: Dict[str, Any], key: str, now: float) -> Dict[str, Any]:
+        # 마지막 갱신 이후 흐른 시간만큼 버킷 채움
+        entry = state.setdefault(key, {"tokens": self.burst, "updated": now})
+        elapsed = max(0.0, now - entry["updated"])
+        entry["tokens"] = min(self.burst, entry["tokens"] + elapsed * self.rate)
+        entry["updated"] = now
+        return entry
+
+    def _try_acquire(self, state: Dict[str, Any], key: str, priority: str, waiter: str) -> float:
+        """버킷에서 하나를 꺼내면 0, 아니면 다시 시도하기까지 기다릴 시간(초)"""
+        now = time.time()
+        entry = self._entry(state, key, now)
+        waiting = {w: expires for w, expires in entry.get("waiting", {}).items() if expires > now}
+        blocked = entry.get("blocked_until", 0) - now
+
+        wait = 0.0
+        if priority == "interactive":
+            if blocked <= 0 and entry["tokens"] >= 1:
+                entry["tokens"] -= 1
+                waiting.pop(waiter, None)
+            else:
+                waiting[waiter] = now + _WAITER_TTL  # batch가 양보하도록 대기 표시
+                wait = max(blocked, (1 - entry["tokens"]) / self.rate)
+        else:
+            floor = 1 + self.batch_reserve
+            if blocked <= 0 and not waiting and entry["tokens"] >= floor:
+                entry["tokens"] -= 1
+            else:
+                wait = max(blocked, (floor - entry["tokens"]) / self.rate, 1 / self.rate if waiting else 0.0)
+
+        if waiting:
+            entry["waiting"] = waiting
+        else:
+            entry.pop("waiting", None)
+        return wait
+
+    def acquire(self, figma_token: str, priority: Optional[str] = None) -> float:
+        """
+        요청 하나를 보낼 수 있을 때까지 대기 (취소/마감 시 checkpoint 예외)
+
+        Returns:
+            기다린 시간(초)
+        """
+        explicit = _check_priority(priority) if priority else None
+        priority = explicit or current_priority()
+        if not self.enabled:
+            return 0.0
+        key = _budget_key(figma_token)
+        waiter = f"{os.getpid()}:{threading.get_ident()}"
+        started = time.monotonic()
+        while True:
+            checkpoint()
+            priority = explicit or current_priority()  # 대기 중에 올라갈 수 있음 (PriorityCell)
+            with self._locked_state() as state:
+                wait = self._try_acquire(state, key, priority, waiter)
+            if wait <= 0:
+                break
+            time.sleep(min(wait, _MAX_SLEEP))
+        waited = time.monotonic() - started
+        with self._lock:
+            self.acquired[priority] += 1
+            self.wait_seconds[priority] += waited
+        return waited
+
+    def penalize(self, figma_token: str, retry_after: float) -> None:
+        """429 응답: retry_after초 동안 이 토큰의 모든 요청(다른 프로세스 포함)을 멈춤"""
+        with self._lock:
+            self.throttled += 1
+        if not self.enabled:
+            return
+        with self._locked_state() as state:
+            now = time.time()
+            entry = self._entry(state, _budget_key(figma_token), now)
+            entry["tokens"] = 0.0
+            entry["blocked_until"] = max(entry.get("blocked_until", 0), now + retry_after)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests_per_minute": round(self.rate * 60, 2),
+            "burst": self.burst,
+            "shared": self.state_file is not None,
+            "acquired": dict(self.acquired),
+            "wait_seconds": {priority: round(value, 3) for priority, value in self.wait_seconds.items()},
+            "throttled": self.throttled,
+        }
+
+
+def _retry_after(response: requests.Response) -> float:
+    try:
+        return max(0.0, float(response.headers.get("Retry-After", DEFAULT_RETRY_AFTER)))
+    except ValueError:
+        return DEFAULT_RETRY_AFTER
+
+
+def budgeted_get(budget: RateBudget, figma_token: str, url: str, priority: Optional[str] = None,
+                 timeout: Union[None, float, Callable[[], Optional[float]]] = None,
+                 on_wait: Optional[Callable[[float], None]] = None, **kwargs: Any) -> requests.Response:
+    """
+    예산 안에서 requests.get (429면 Retry-After만큼 모든 요청을 멈췄다가 max_retries번 재시도)
+
+    timeout: 초 또는 요청 직전에 계산할 함수 (대기 후 남은 마감 시간 반영)
+    on_wait: 예산 대기마다 기다린 시간(초)으로 호출 (요청 소요 시간에서 대기 시간을 뺄 때)
+    """
+    for attempt in range(budget.max_retries + 1):
+        waited = budget.acquire(figma_token, priority)
+        if on_wait is not None:
+            on_wait(waited)
+        response = requests.get(url, timeout=timeout() if callable(timeout) else timeout, **kwargs)
+        if response.status_code != 429 or attempt == budget.max_retries:
+            return response
+        budget.penalize(figma_token, _retry_after(response))
+        response.close()
+    return response
+
+
+_default_budget: Optional[RateBudget] = None
+_default_lock = threading.Lock()
+
+
+def default_budget() -> RateBudget:
+    """
+    프로세스 공용 예산 (rules_config.json의 figma_rate_limit, 처음 사용할 때 구성)
+
+    환경변수 FIGMA_RATE_PER_MINUTE(0이면 제한 없음) / FIGMA_RATE_STATE_FILE로 덮어쓸 수 있음
+    """
+    global _default_budget
+    with _default_lock:
+        if _default_budget is None:
+            from .rules_config import load_rules_config
+
+            rules = load_rules_config()
+            per_minute = os.getenv("FIGMA_RATE_PER_MINUTE")
+            _default_budget = RateBudget(
+                requests_per_minute=float(per_minute) if per_minute not in (None, "") else rules.rate_limit_per_minute,
+                burst=rules.rate_limit_burst,
+                batch_reserve=rules.rate_limit_batch_reserve,
+                state_file=os.getenv("FIGMA_RATE_STATE_FILE") or rules.rate_limit_state_file,
+                max_retries=rules.rate_limit_max_retries,
+            )
+        return _default_budget
@@ -13,12 +13,10 @@ import os
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 
+from .rate_budget import DEFAULT_STATE_FILE
 
-DEFAULT_RULES_PATH = os.path.join(
-    os.path.dirname(os.path.dirname(os.path.dirname(__file__))),  # src/
-    "config",
-    "rules_config.json",
-)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_RULES_PATH = os.path.join(PROJECT_ROOT, "config", "rules_config.json")
 
 
 @dataclass(frozen=True)
@@ -45,6 +43,19 @@ class RulesConfig:
     def priority_keywords(self) -> Dict[str, List[str]]:
         return dict(self.raw.get("priority_rules", {}).get("keywords", {}))
 
+    @property
+    def priority_keyword_override(self) -> bool:
+        """True면 템플릿에 지정된 우선순위도 키워드 분류 결과로 덮어씀"""
+        return bool(self.raw.get("priority_rules", {}).get("keyword_override", False))
+
+    @property
+    def category_default(self) -> str:
+        return str(self.raw.get("category_rules", {}).get("default", ""))
+
+    @property
+    def category_keywords(self) -> Dict[str, List[str]]:
+        return dict(self.raw.get("category_rules", {}).get("keywords", {}))
+
     @property
     def flow_confidence_threshold(self) -> float:
         return float(self.raw.get("flow_clarification", {}).get("confidence_threshold", 0.55))
@@ -61,6 +72,71 @@ class RulesConfig:
     def platforms(self) -> List[str]:
         return list(self.raw.get("coverage_rules", {}).get("platforms", ["web", "app"]))
 
+    @property
+    def result_columns(self) -> List[str]:
+        columns = self.raw.get("result_recording_rules", {}).get("columns", {})
+        return list(columns.values()) or ["web_result", "app_result"]
+
+    @property
+    def tester_columns(self) -> List[str]:
+        """결과 컬럼 외에 테스터가 작성하는 컬럼 (병합 시 기존 값 유지)"""
+        return list(self.raw.get("result_recording_rules", {}).get("tester_columns", ["comment"]))
+
+    @property
+    def preserved_columns(self) -> List[str]:
+        """Excel 병합 시 기존 값을 유지할 컬럼 (결과 컬럼 + 테스터 작성 컬럼)"""
+        return list(dict.fromkeys(self.result_columns + self.tester_columns))
+
+    @property
+    def testrail_section_fields(self) -> List[str]:
+        return list(self.raw.get("testrail_export", {}).get("section_fields", ["domain", "section"]))
+
+    @property
+    def testrail_section_separator(self) -> str:
+        return str(self.raw.get("testrail_export", {}).get("section_separator", "/"))
+
+    @property
+    def testrail_estimate_base_minutes(self) -> float:
+        return float(self.raw.get("testrail_export", {}).get("estimate", {}).get("base_minutes", 1))
+
+    @property
+    def testrail_estimate_minutes_per_step(self) -> float:
+        return float(self.raw.get("testrail_export", {}).get("estimate", {}).get("minutes_per_step", 1))
+
+    @property
+    def prefetch_watch_list(self) -> List[str]:
+        return list(self.raw.get("mcp_prefetch", {}).get("watch_list", []))
+
+    @property
+    def prefetch_cache_ttl(self) -> float:
+        return float(self.raw.get("mcp_prefetch", {}).get("cache_ttl_seconds", 300))
+
+    @property
+    def prefetch_max_files(self) -> int:
+        return int(self.raw.get("mcp_prefetch", {}).get("max_files", 16))
+
+    @property
+    def rate_limit_per_minute(self) -> float:
+        return float(self.raw.get("figma_rate_limit", {}).get("requests_per_minute", 60))
+
+    @property
+    def rate_limit_burst(self) -> float:
+        return float(self.raw.get("figma_rate_limit", {}).get("burst", 10))
+
+    @property
+    def rate_limit_batch_reserve(self) -> float:
+        return float(self.raw.get("figma_rate_limit", {}).get("batch_reserve", 3))
+
+    @property
+    def rate_limit_state_file(self) -> Optional[str]:
+        # 상대 경로는 작업 디렉토리가 아닌 프로젝트 루트 기준 (null이면 프로세스 안에서만 공유)
+        path = self.raw.get("figma_rate_limit", {}).get("state_file", DEFAULT_STATE_FILE)
+        return os.path.join(PROJECT_ROOT, path) if path else None
+
+    @property
+    def rate_limit_max_retries(self) -> int:
+        return int(self.raw.get("figma_rate_limit", {}).get("max_retries", 2))
+
     @property
     def excel_formula_enabled(self) -> bool:
         return bool(self.raw.get("excel_formula_output", {}).get("enabled", False))
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+대용량 Excel 분할 저장
+
+- 스위트를 domain별 또는 행 수 기준으로 나눠 여러 시트/워크북에 기록 (시트당 1,048,576행 제한 대응)
+- 워크북 분할 시 각 파일을 별도 워커 프로세스에서 동시에 기록
+- 분할 결과는 Index 시트(각 시트/파일로의 하이퍼링크)로 정리
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .excel_writer import SheetLayout, new_workbook, write_sheet, write_xlsx
+from .export import atomic_output
+
+MAX_SHEET_ROWS = 1_048_575  # Excel 시트 최대 행 수 - 헤더 1행
+DEFAULT_SHARD_ROWS = 100_000
+SHARD_BY = ("domain", "rows")
+SHARD_MODES = ("files", "sheets")
+INDEX_SHEET = "Index"
+
+_INDEX_LAYOUT = SheetLayout.default(["shard", "rows", "link"], {"A": 40, "B": 12, "C": 50})
+_SHEET_TITLE_MAX = 31
+_SHEET_TITLE_INVALID = set('[]:*?/\\')
+
+
+@dataclass
+class Shard:
+    """분할 단위 (이름 + 행 목록)"""
+
+    name: str
+    rows: List[Dict[str, Any]] = field(default_factory=list)
+
+
+def plan_shards(rows: Iterable[Dict[str, Any]], by: str = "domain",
+                max_rows: int = DEFAULT_SHARD_ROWS) -> List[Shard]:
+    """
+    행을 분할 단위로 나누기 (입력 순서 유지)
+
+    Args:
+        rows: 정규화된 테스트케이스 이터러블
+        by: "domain"(domain 값별, 처음 나타난 순서) 또는 "rows"(max_rows행씩)
+        max_rows: 분할 단위당 최대 행 수 (domain이 이보다 크면 "domain (2)" 형태로 추가 분할)
+
+    Returns:
+        List[Shard]: 빈 입력이면 빈 목록
+    """
+    if by not in SHARD_BY:
+        raise ValueError(f"지원하지 않는 분할 기준: {by} (지원: {', '.join(SHARD_BY)})")
+    if not 0 < max_rows <= MAX_SHEET_ROWS:
+        raise ValueError(f"max_rows는 1 ~ {MAX_SHEET_ROWS:,} 사이여야 합니다: {max_rows}")
+
+    if by == "rows":
+        shards: List[Shard] = []
+        for row in rows:
+            if not shards or len(shards[-1].rows) >= max_rows:
+                start = len(shards) * max_rows + 1
+                shards.append(Shard(name=f"{start}-{start + max_rows - 1}"))
+            shards[-1].rows.append(row)
+        if shards:
+            last = shards[-1]
+            start = (len(shards) - 1) * max_rows + 1
+            last.name = f"{start}-{start + len(last.rows) - 1}"
+        return shards
+
+    groups: Dict[str, List[Shard]] = {}
+    for row in rows:
+        domain = str(row.get("domain") or "미지정")
+        parts = groups.get(domain)
+        if parts is None:
+            parts = groups[domain] = [Shard(name=domain)]
+        elif len(parts[-1].rows) >= max_rows:
+            parts.append(Shard(name=f"{domain} ({len(parts) + 1})"))
+        parts[-1].rows.append(row)
+    return [shard for parts in groups.values() for shard in parts]
+
+
+def write_sharded_xlsx(rows: Iterable[Dict[str, Any]], filename: str, layout: SheetLayout,
+                       by: str = "domain", max_rows: int = DEFAULT_SHARD_ROWS, mode: str = "files",
+                       jobs: Optional[int] = None, sheet_name: str = "TestCases") -> List[Dict[str, Any]]:
+    """
+    분할 저장
+
+    - mode="files": filename에는 Index 시트만 두고, 분할 단위마다 {이름}_{번호}_{분할명}.xlsx 워크북을
+      워커 프로세스에서 동시에 기록
+    - mode="sheets": filename 하나에 Index 시트 + 분할 단위별 시트 (단일 워크북은 하나의 zip 스트림이라 순차 기록)
+
+    Args:
+        rows: 정규화된 테스트케이스 이터러블
+        filename: Index 워크북 경로
+        layout: 데이터 시트 레이아웃 (모든 분할에 동일 적용)
+        by / max_rows: plan_shards() 참고
+        mode: "files" 또는 "sheets"
+        jobs: 워커 프로세스 수 (None이면 CPU 코어 수, 1이면 현재 프로세스에서 순차 기록)
+        sheet_name: mode="files"일 때 각 워크북의 데이터 시트 이름
+
+    Returns:
+        List[Dict]: [{"name", "rows", "path", "sheet"}, ...] (Index 순서)
+    """
+    if mode not in SHARD_MODES:
+        raise ValueError(f"지원하지 않는 분할 모드: {mode} (지원: {', '.join(SHARD_MODES)})")
+    shards = plan_shards(rows, by, max_rows)
+
+    if mode == "sheets":
+        used = {INDEX_SHEET.lower()}
+        entries = [
+            {"name": shard.name, "rows": len(shard.rows), "path": filename,
+             "sheet": _sheet_title(shard.name, used)}
+            for shard in shards
+        ]
+        wb = new_workbook(layout)
+        write_sheet(wb, _index_rows(entries, internal=True), _INDEX_LAYOUT, INDEX_SHEET)
+        for shard, entry in zip(shards, entries):
+            write_sheet(wb, shard.rows, layout, entry["sheet"])
+        with atomic_output(filename) as tmp_path:
+            wb.save(tmp_path)
+        return entries
+
+    base, ext = os.path.splitext(filename)
+    entries = [
+        {"name": shard.name, "rows": len(shard.rows),
+         "path": f"{base}_{i:03d}_{_file_label(shard.name)}{ext or '.xlsx'}", "sheet": sheet_name}
+        for i, shard in enumerate(shards, 1)
+    ]
+    tasks = [(shard.rows, entry["path"], layout, sheet_name) for shard, entry in zip(shards, entries)]
+
+    jobs = min(jobs or os.cpu_count() or 1, len(tasks))
+    if jobs <= 1:
+        for task in tasks:
+            _write_shard_file(task)
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            list(executor.map(_write_shard_file, tasks))
+
+    with atomic_output(filename) as tmp_path:
+        write_xlsx(_index_rows(entries, internal=False), tmp_path, _INDEX_LAYOUT, INDEX_SHEET)
+    return entries
+
+
+def _write_shard_file(task: Tuple[List[Dict[str, Any]], str, SheetLayout, str]) -> int:
+    rows, path, layout, sheet_name = task
+    with atomic_output(path) as tmp_path:
+        return write_xlsx(rows, tmp_path, layout, sheet_name)
+
+
+def _index_rows(entries: List[Dict[str, Any]], internal: bool) -> Iterable[Dict[str, Any]]:
+    # write-only 셀은 하이퍼링크 객체를 지원하지 않으므로 HYPERLINK 수식 사용
+    for entry in entries:
+        if internal:
+            sheet = entry["sheet"].replace("'", "''")
+            target = f"#'{sheet}'!A1"
+        else:
+            target = os.path.basename(entry["path"])
+        label = entry["name"]
+        yield {
+            "shard": label,
+            "rows": entry["rows"],
+            "link": f'=HYPERLINK("{_quote(target)}","{_quote(label)}")',
+        }
+
+
+def _quote(value: str) -> str:
+    return value.replace('"', '""')
+
+
+def _sheet_title(name: str, used: set) -> str:
+    """Excel 시트 이름 규칙(31자, 특수문자 불가, 중복 불가)에 맞춘 이름"""
+    title = "".join("_" if ch in _SHEET_TITLE_INVALID else ch for ch in name).strip("'") or "Sheet"
+    title = title[:_SHEET_TITLE_MAX]
+    candidate, n = title, 2
+    while candidate.lower() in used:
+        suffix = f" ({n})"
+        candidate = title[:_SHEET_TITLE_MAX - len(suffix)] + suffix
+        n += 1
+    used.add(candidate.lower())
+    return candidate
+
+
+def _file_label(name: str) -> str:
+    label = "".join(ch if ch.isalnum() or ch in "-_" else "_" for ch in name).strip("_")
+    return label[:40] or "shard"
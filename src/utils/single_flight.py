@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+요청 병합 (single-flight)
+
+- 같은 키의 호출이 진행 중이면 새로 실행하지 않고 진행 중인 호출의 결과를 함께 받음
+- 결과 객체는 모든 호출자가 공유하므로 읽기 전용으로 다뤄야 함
+- 호출이 끝나면 키를 비우므로 이후 호출은 다시 실행 (결과 캐시가 아님)
+- 스레드 기반: 스레드 풀에서 실행되는 MCP 도구와 파이프라인 작업 모두에서 사용
+- 기다리는 호출은 wait_interval초마다 wait_check()를 불러 자신의 취소/마감을 확인 (예외를 던지면 대기 중단,
+  진행 중인 호출은 계속 실행)
+- 실행하는 호출이 state를 넘기면 합류하는 호출마다 on_join(state)를 합류한 쪽 스레드에서 호출
+  (예: 진행 중인 batch 요청을 interactive 호출자가 기다리게 되면 요청 우선순위를 올림)
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "state")
+
+    def __init__(self, state: Any = None):
+        self.done = threading.Event()
+        self.state = state
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    키별 진행 중인 호출 병합
+
+    Args:
+        wait_check: 결과를 기다리는 동안 주기적으로 부를 함수 (예: checkpoint), 예외를 던지면 대기 중단
+        wait_interval: wait_check 호출 간격(초)
+        on_join: 진행 중인 호출에 합류할 때 그 호출의 state로 부를 함수
+    """
+
+    def __init__(self, wait_check: Optional[Callable[[], None]] = None, wait_interval: float = 0.05,
+                 on_join: Optional[Callable[[Any], None]] = None):
+        self.wait_check = wait_check
+        self.wait_interval = wait_interval
+        self.on_join = on_join
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.executed = 0  # 실제로 실행한 호출 수
+        self.shared = 0  # 진행 중인 호출의 결과를 받은 호출 수
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args: Any, state: Any = None,
+           **kwargs: Any) -> Tuple[Any, bool]:
+        """
+        key에 대해 fn(*args, **kwargs)를 한 번만 실행 (state는 fn에 넘기지 않고, 실행하게 되면 합류하는 호출의
+        on_join에 전달)
+
+        Returns:
+            (결과, 공유 여부) - 다른 호출이 실행한 결과를 받았으면 공유 여부 True
+            (fn이 예외를 던지면 대기 중인 호출 모두 같은 예외를 받음, 기다리다 wait_check가 던진 예외는 그대로 전파)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call(state)
+                self.executed += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            if self.on_join is not None:
+                self.on_join(call.state)
+            if self.wait_check is None:
+                call.done.wait()
+            else:
+                while not call.done.wait(self.wait_interval):
+                    self.wait_check()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self) -> Dict[str, int]:
+        return {"executed": self.executed, "shared": self.shared, "in_flight": self.in_flight()}
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+테스트케이스 스트리밍 유틸
+
+- 생성 → 중복 제거 → 우선순위 정렬 → 저장까지 리스트를 만들지 않고 이터레이터로 연결
+- 우선순위 정렬은 버퍼 크기를 넘으면 임시 파일로 내보내는(spill) 외부 버킷 정렬
+"""
+
+from __future__ import annotations
+
+import json
+import tempfile
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from .rules_config import normalize_testcase_fields
+
+
+DEFAULT_BUFFER_SIZE = 1000
+
+
+def iter_normalized(testcases: Iterable[Dict[str, Any]], field_aliases: Dict[str, str]) -> Iterator[Dict[str, Any]]:
+    """필드 정규화를 케이스 단위로 지연 적용."""
+    for testcase in testcases:
+        yield normalize_testcase_fields(testcase, field_aliases)
+
+
+class _PriorityBucket:
+    """한 우선순위의 케이스 버퍼 (가득 차면 임시 파일에 JSON Lines로 기록)"""
+
+    def __init__(self, buffer_size: int):
+        self.buffer_size = buffer_size
+        self.buffer: List[Dict[str, Any]] = []
+        self.spill: Optional[IO[str]] = None
+
+    def append(self, testcase: Dict[str, Any]) -> None:
+        self.buffer.append(testcase)
+        if len(self.buffer) >= self.buffer_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self.spill is None:
+            self.spill = tempfile.TemporaryFile("w+", encoding="utf-8")
+        for testcase in self.buffer:
+            self.spill.write(json.dumps(testcase, ensure_ascii=False))
+            self.spill.write("\n")
+        self.buffer = []
+
+    def drain(self) -> Iterator[Dict[str, Any]]:
+        if self.spill is not None:
+            self.spill.seek(0)
+            for line in self.spill:
+                yield json.loads(line)
+            self.spill.close()
+            self.spill = None
+        yield from self.buffer
+        self.buffer = []
+
+
+def iter_by_priority(
+    testcases: Iterable[Dict[str, Any]],
+    priority_order: Sequence[str] = ("P1", "P2", "P3", "P4"),
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+) -> Iterator[Dict[str, Any]]:
+    """
+    우선순위 순서로 안정 정렬하여 yield (메모리 사용량은 우선순위별 buffer_size로 제한)
+
+    - 최상위 우선순위 케이스는 버퍼링 없이 즉시 yield
+    - 알 수 없는 우선순위는 가장 낮은 우선순위와 같은 순위로 취급 (기존 정렬 규칙과 동일)
+    """
+    order = list(priority_order)
+    if len(order) <= 1:
+        yield from testcases
+        return
+
+    top, lowest = order[0], order[-1]
+    buckets: Dict[str, _PriorityBucket] = {p: _PriorityBucket(buffer_size) for p in order[1:]}
+    try:
+        for testcase in testcases:
+            priority = testcase.get("priority", lowest)
+            if priority == top:
+                yield testcase
+            else:
+                buckets.get(priority, buckets.get(lowest)).append(testcase)
+
+        for priority in order[1:]:
+            yield from buckets[priority].drain()
+    finally:
+        for bucket in buckets.values():
+            if bucket.spill is not None:
+                bucket.spill.close()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+SQLite 기반 테스트케이스 저장소
+
+- 생성된 스위트를 임베디드 SQLite에 저장하고 domain/priority/type/fingerprint/node_id/title 인덱스로 조회
+- executemany 배치 삽입, fingerprint 기준 upsert (같은 케이스는 처음 위치를 유지한 채 내용만 갱신)
+- 파일 DB를 사용하면 메모리보다 큰 스위트도 인덱스 조회로 바로 필터/집계 가능
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set
+
+from .dedupe import content_fingerprint
+
+DEFAULT_BATCH_SIZE = 5000
+INDEXED_COLUMNS = ("domain", "priority", "type", "node_id", "title")
+_SQL_VARIABLE_LIMIT = 500  # IN (...) 한 번에 넘기는 값 수
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS testcases (
+    id INTEGER PRIMARY KEY,
+    fingerprint TEXT NOT NULL UNIQUE,
+    domain TEXT,
+    priority TEXT,
+    type TEXT,
+    node_id TEXT,
+    title TEXT,
+    data TEXT NOT NULL
+)
+"""
+
+_UPSERT = """
+INSERT INTO testcases (fingerprint, domain, priority, type, node_id, title, data)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(fingerprint) DO UPDATE SET
+    domain = excluded.domain,
+    priority = excluded.priority,
+    type = excluded.type,
+    node_id = COALESCE(excluded.node_id, testcases.node_id),
+    title = excluded.title,
+    data = excluded.data
+"""
+
+
+class TestCaseStore:
+    """
+    SQLite 테스트케이스 저장소
+
+    Args:
+        path: DB 파일 경로 (기본값: ":memory:")
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        if path != ":memory:":
+            # 배치 삽입 중에도 다른 프로세스가 읽을 수 있도록 WAL 사용
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.execute(_SCHEMA)
+            for column in INDEXED_COLUMNS:
+                self.conn.execute(f"CREATE INDEX IF NOT EXISTS idx_testcases_{column} ON testcases ({column})")
+
+    def __enter__(self) -> "TestCaseStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM testcases").fetchone()[0]
+
+    # ========== 저장 ==========
+
+    def add_many(self, testcases: Iterable[Dict[str, Any]], node_id: Optional[str] = None,
+                 batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        """
+        케이스 일괄 upsert (batch_size행씩 executemany, 전체를 한 트랜잭션으로 처리)
+
+        Args:
+            testcases: 정규화된 테스트케이스 이터러블
+            node_id: 케이스에 node_id가 없을 때 사용할 Figma 노드 ID
+            batch_size: executemany 한 번에 넘기는 행 수
+
+        Returns:
+            int: 처리한 케이스 수 (upsert로 갱신된 케이스 포함)
+        """
+        rows = (self._row(testcase, node_id) for testcase in testcases)
+        count = 0
+        with self.conn:
+            while True:
+                batch = list(islice(rows, batch_size))
+                if not batch:
+                    break
+                self.conn.executemany(_UPSERT, batch)
+                count += len(batch)
+        return count
+
+    @staticmethod
+    def _row(testcase: Dict[str, Any], node_id: Optional[str]) -> tuple:
+        return (
+            content_fingerprint(testcase),
+            testcase.get("domain"),
+            testcase.get("priority"),
+            testcase.get("type"),
+            testcase.get("node_id") or node_id,
+            testcase.get("title"),
+            json.dumps(testcase, ensure_ascii=False),
+        )
+
+    # ========== 조회 ==========
+
+    def iter_testcases(self, domain: Optional[str] = None, priorities: Optional[Sequence[str]] = None,
+                       test_type: Optional[str] = None, node_id: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """조건에 맞는 케이스를 저장 순서대로 yield (조건은 인덱스 컬럼, None이면 조건 없음)"""
+        clauses: List[str] = []
+        params: List[Any] = []
+        for column, value in (("domain", domain), ("type", test_type), ("node_id", node_id)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if priorities is not None:
+            clauses.append(f"priority IN ({', '.join('?' * len(priorities))})")
+            params.extend(priorities)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        cursor = self.conn.execute(f"SELECT data FROM testcases{where} ORDER BY id", params)
+        for (data,) in cursor:
+            yield json.loads(data)
+
+    def counts_by(self, column: str) -> Dict[Any, int]:
+        """인덱스 컬럼별 케이스 수 (GROUP BY)"""
+        if column not in INDEXED_COLUMNS:
+            raise ValueError(f"집계할 수 없는 컬럼: {column} (지원: {', '.join(INDEXED_COLUMNS)})")
+        cursor = self.conn.execute(f"SELECT {column}, COUNT(*) FROM testcases GROUP BY {column}")
+        return dict(cursor.fetchall())
+
+    def existing_titles(self, titles: Iterable[str]) -> Set[str]:
+        """titles 중 저장소에 있는 제목 (title 인덱스로 조회)"""
+        found: Set[str] = set()
+        titles = iter(set(titles))
+        while True:
+            chunk = list(islice(titles, _SQL_VARIABLE_LIMIT))
+            if not chunk:
+                return found
+            cursor = self.conn.execute(
+                f"SELECT DISTINCT title FROM testcases WHERE title IN ({', '.join('?' * len(chunk))})", chunk
+            )
+            found.update(title for (title,) in cursor)
+
+    def has_fingerprint(self, fingerprint: str) -> bool:
+        row = self.conn.execute("SELECT 1 FROM testcases WHERE fingerprint = ?", (fingerprint,)).fetchone()
+        return row is not None
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+TestRail 가져오기용 CSV 스트리밍 저장
+
+- 케이스를 TestRail 컬럼으로 변환해 chunk 단위로 바로 기록 (메모리 사용량 일정)
+- Section 경로는 지정한 필드를 구분자로 연결 (예: domain/section)
+- Estimate는 테스트 절차의 스텝 수로 케이스별 계산
+"""
+
+from __future__ import annotations
+
+import csv
+import math
+from typing import Any, Dict, Iterable, List, Sequence
+
+TESTRAIL_COLUMNS = ["Section", "Title", "Type", "Priority", "Estimate", "References",
+                    "Preconditions", "Steps", "Expected Result"]
+DEFAULT_CHUNK_SIZE = 10_000
+
+
+def count_steps(test_step: Any) -> int:
+    """테스트 절차의 스텝 수 (리스트면 항목 수, 문자열이면 비어있지 않은 줄 수)"""
+    if not test_step:
+        return 0
+    if isinstance(test_step, (list, tuple)):
+        return len(test_step)
+    return sum(1 for line in str(test_step).splitlines() if line.strip())
+
+
+def format_estimate(minutes: float) -> str:
+    """분 -> TestRail timespan 문자열 (예: 5m, 1h 30m)"""
+    minutes = max(1, int(math.ceil(minutes)))
+    hours, minutes = divmod(minutes, 60)
+    if hours and minutes:
+        return f"{hours}h {minutes}m"
+    if hours:
+        return f"{hours}h"
+    return f"{minutes}m"
+
+
+def write_testrail_csv(
+    rows: Iterable[Dict[str, Any]],
+    filename: str,
+    section_fields: Sequence[str] = ("domain", "section"),
+    section_separator: str = "/",
+    base_minutes: float = 1,
+    minutes_per_step: float = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """
+    정규화된 테스트케이스를 TestRail CSV로 기록
+
+    Args:
+        rows: 정규화된 테스트케이스 이터러블
+        filename: 저장 경로
+        section_fields: Section 경로를 구성할 필드 (순서대로 연결)
+        section_separator: Section 경로 구분자
+        base_minutes: 케이스당 기본 소요 시간(분)
+        minutes_per_step: 스텝당 추가 소요 시간(분)
+        chunk_size: 한 번에 기록할 행 수
+
+    Returns:
+        int: 기록한 케이스 수
+    """
+    section_fields = list(section_fields)
+    estimates: Dict[int, str] = {}  # 스텝 수 -> Estimate 문자열 (같은 스텝 수는 재계산하지 않음)
+    count = 0
+
+    with open(filename, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(TESTRAIL_COLUMNS)
+
+        chunk: List[List[Any]] = []
+        for testcase in rows:
+            get = testcase.get
+            steps = get("test_step", "")
+            step_count = count_steps(steps)
+            estimate = estimates.get(step_count)
+            if estimate is None:
+                estimate = estimates[step_count] = format_estimate(base_minutes + minutes_per_step * step_count)
+            chunk.append([
+                section_separator.join(str(get(field) or "") for field in section_fields),
+                get("title", ""),
+                get("type", "Functional"),
+                get("priority", "P2"),
+                estimate,
+                get("references", ""),
+                get("precondition", ""),
+                steps,
+                get("expected_results", ""),
+            ])
+            if len(chunk) >= chunk_size:
+                writer.writerows(chunk)
+                count += len(chunk)
+                chunk = []
+        writer.writerows(chunk)
+        count += len(chunk)
+    return count
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+MCP 도구 비동기 실행기
+
+- 도구 호출을 이벤트 루프 밖(스레드/프로세스 풀)에서 실행하여 느린 호출이 다른 호출을 막지 않도록 함
+- 도구별 실행 프로파일: inline(가벼운 계산, 루프에서 바로 실행) / io(네트워크 대기, 스레드 풀) / cpu(순회/엑셀, 프로세스 풀)
+  / background(프리패치 등 사용자가 기다리지 않는 작업, 별도의 작은 스레드 풀)
+- 풀에서 동시에 실행되는 도구 호출 수는 max_concurrency로 제한 (초과 호출은 대기, inline 호출은 제한 없이 즉시 실행)
+- background 작업은 background_concurrency개까지 따로 실행하므로 예산 대기 등으로 오래 걸려도 도구 호출 슬롯을 차지하지 않음
+- 스레드 풀 작업은 호출한 쪽의 컨텍스트(contextvars, 예: 취소 토큰)를 복사해서 실행
+- 프로세스 풀 작업에는 호출한 쪽의 취소 토큰을 공유 메모리 플래그(호출별 슬롯)와 마감 시각으로 전달
+  (호출 작업이 취소되면 플래그를 세워 워커의 checkpoint()가 중단, 슬롯은 워커 작업이 끝난 뒤 반납)
+- 동시 실행 제한 세마포어는 처음 호출될 때 실행 중인 루프에서 생성 (Python 3.9는 생성 시점의 루프에 묶이므로
+  루프 밖에서 만든 실행기를 asyncio.run 안에서 써도 "attached to a different loop" 오류가 나지 않도록)
+- 프로세스 풀은 forkserver(없으면 spawn)로 시작: 풀은 스레드가 돌고 있을 때 처음 만들어지므로
+  fork하면 다른 스레드가 잡고 있던 잠금이 워커에 잠긴 채 복사되어 워커가 멈출 수 있음
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import multiprocessing
+import os
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .cancellation import SharedCancelToken, current_token, reset_token, set_token
+
+PROFILES = ("inline", "io", "cpu", "background")
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_BACKGROUND_CONCURRENCY = 2
+
+
+def default_start_method() -> str:
+    """스레드가 있는 프로세스에서도 안전한 시작 방식 (forkserver, 지원하지 않으면 spawn)"""
+    return "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+_worker_cancel_flags = None
+
+
+def _init_cpu_worker(cancel_flags, initializer: Optional[Callable[..., None]], initargs: Tuple[Any, ...]) -> None:
+    global _worker_cancel_flags
+    _worker_cancel_flags = cancel_flags
+    if initializer is not None:
+        initializer(*initargs)
+
+
+def _run_cpu_call(slot: int, deadline_at: Optional[float], fn: Callable[..., Any], args: Tuple[Any, ...],
+                  kwargs: Dict[str, Any]) -> Any:
+    # 워커: 주 프로세스 호출의 취소 플래그와 마감 시각(벽시계, 큐에서 기다린 시간도 포함)으로 토큰 설정
+    timeout = max(0.0, deadline_at - time.time()) if deadline_at is not None else None
+    reset = set_token(SharedCancelToken(_worker_cancel_flags, slot, timeout))
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        reset_token(reset)
+
+
+class ToolExecutor:
+    """
+    도구 호출 실행기
+
+    Args:
+        max_concurrency: 동시에 실행할 최대 도구 호출 수
+        io_workers: io 스레드 풀 크기 (기본값: max_concurrency)
+        cpu_workers: cpu 프로세스 풀 크기 (기본값: CPU 코어 수, 0이면 cpu 작업도 io 스레드 풀에서 실행)
+        cpu_initializer: 프로세스 풀 워커 초기화 함수 (워커당 1회, 예: 서버 인스턴스 구성)
+        cpu_initargs: cpu_initializer 인자 (워커로 전달 가능해야 함)
+        start_method: 프로세스 풀 시작 방식 (기본값: default_start_method())
+        background_concurrency: background 작업 스레드 풀 크기 (= 동시에 실행할 최대 background 작업 수)
+    """
+
+    def __init__(self, max_concurrency: int = DEFAULT_MAX_CONCURRENCY, io_workers: Optional[int] = None,
+                 cpu_workers: Optional[int] = None, cpu_initializer: Optional[Callable[..., None]] = None,
+                 cpu_initargs: Tuple[Any, ...] = (), start_method: Optional[str] = None,
+                 background_concurrency: int = DEFAULT_BACKGROUND_CONCURRENCY):
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency는 1 이상이어야 합니다: {max_concurrency}")
+        if background_concurrency < 1:
+            raise ValueError(f"background_concurrency는 1 이상이어야 합니다: {background_concurrency}")
+        self.max_concurrency = max_concurrency
+        self.background_concurrency = background_concurrency
+        self.io_workers = io_workers or max_concurrency
+        self.cpu_workers = (os.cpu_count() or 1) if cpu_workers is None else cpu_workers
+        self._cpu_initializer = cpu_initializer
+        self._cpu_initargs = cpu_initargs
+        self.start_method = start_method or default_start_method()
+        self._io_pool: Optional[ThreadPoolExecutor] = None
+        self._cpu_pool: Optional[Executor] = None
+        self._background_pool: Optional[ThreadPoolExecutor] = None
+        self._cancel_flags = None  # cpu 호출별 취소 플래그 (프로세스 풀과 함께 생성)
+        self._free_slots: List[int] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None  # 세마포어를 만든 루프
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._background_semaphore: Optional[asyncio.Semaphore] = None
+        self.in_flight = 0
+        self.waiting = 0
+        self.background_in_flight = 0
+
+    @classmethod
+    def from_env(cls, **kwargs) -> "ToolExecutor":
+        """환경변수 MCP_MAX_CONCURRENCY / MCP_IO_WORKERS / MCP_CPU_WORKERS / MCP_BACKGROUND_CONCURRENCY로 구성"""
+        def _env_int(name: str) -> Optional[int]:
+            value = os.getenv(name)
+            return int(value) if value not in (None, "") else None
+
+        return cls(
+            max_concurrency=_env_int("MCP_MAX_CONCURRENCY") or DEFAULT_MAX_CONCURRENCY,
+            io_workers=_env_int("MCP_IO_WORKERS"),
+            cpu_workers=_env_int("MCP_CPU_WORKERS"),
+            background_concurrency=_env_int("MCP_BACKGROUND_CONCURRENCY") or DEFAULT_BACKGROUND_CONCURRENCY,
+            **kwargs,
+        )
+
+    def _pool(self, profile: str) -> Executor:
+        # 풀은 처음 필요할 때 생성 (inline 도구만 쓰는 세션은 스레드/프로세스를 만들지 않음)
+        if profile == "background":
+            if self._background_pool is None:
+                self._background_pool = ThreadPoolExecutor(max_workers=self.background_concurrency,
+                                                           thread_name_prefix="mcp-background")
+            return self._background_pool
+        if profile == "cpu" and self.cpu_workers > 0:
+            if self._cpu_pool is None:
+                # 실행 중인 호출은 각자 슬롯 하나를 쓰고 슬롯 수 = 동시 실행 한도
+                context = multiprocessing.get_context(self.start_method)
+                self._cancel_flags = context.RawArray("b", self.max_concurrency)
+                self._free_slots = list(range(self.max_concurrency))
+                self._cpu_pool = ProcessPoolExecutor(max_workers=self.cpu_workers, mp_context=context,
+                                                     initializer=_init_cpu_worker,
+                                                     initargs=(self._cancel_flags, self._cpu_initializer,
+                                                               self._cpu_initargs))
+            return self._cpu_pool
+        if self._io_pool is None:
+            self._io_pool = ThreadPoolExecutor(max_workers=self.io_workers, thread_name_prefix="mcp-tool")
+        return self._io_pool
+
+    async def run(self, profile: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        프로파일에 맞는 곳에서 fn(*args, **kwargs) 실행
+
+        - inline은 동시 실행 제한 없이 바로 실행 (무거운 호출이 슬롯을 모두 차지해도 가벼운 호출은 대기하지 않음)
+        - cpu 프로파일의 fn/인자는 프로세스 간 전달 가능해야 함 (모듈 수준 함수)
+        - cpu 호출이 취소되어도 워커가 중단할 때까지 (다음 checkpoint까지) 동시 실행 슬롯을 유지
+        - background는 max_concurrency와 별개로 background_concurrency개까지만 실행
+        """
+        if profile not in PROFILES:
+            raise ValueError(f"지원하지 않는 실행 프로파일: {profile} (지원: {', '.join(PROFILES)})")
+        if profile == "inline":
+            return fn(*args, **kwargs)
+        self._bind_loop()
+        if profile == "background":
+            async with self._background_semaphore:
+                self.background_in_flight += 1
+                try:
+                    return await self._submit(profile, fn, *args, **kwargs)
+                finally:
+                    self.background_in_flight -= 1
+
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+        if profile == "cpu" and self.cpu_workers > 0:
+            return await self._run_in_process(fn, args, kwargs)
+        try:
+            return await self._submit(profile, fn, *args, **kwargs)
+        finally:
+            self._release_slot(None)
+
+    def _bind_loop(self) -> None:
+        # 세마포어는 실행 중인 루프에서 생성하고, 루프가 바뀌면 (예: asyncio.run을 다시 호출) 새로 만듦
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._background_semaphore = asyncio.Semaphore(self.background_concurrency)
+
+    async def _run_in_process(self, fn: Callable[..., Any], args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Any:
+        loop = asyncio.get_running_loop()
+        try:
+            pool = self._pool("cpu")
+        except BaseException:
+            self._release_slot(None)
+            raise
+        slot = self._free_slots.pop()
+        token = current_token()
+        self._cancel_flags[slot] = 1 if token is not None and token.cancelled else 0
+        # 마감 시각은 슬롯을 얻은 뒤 계산하고, 풀 큐에서 기다리는 시간도 빠지도록 벽시계 기준으로 전달
+        remaining = token.remaining() if token is not None else None
+        deadline_at = time.time() + remaining if remaining is not None else None
+        try:
+            future = pool.submit(_run_cpu_call, slot, deadline_at, fn, args, kwargs)
+        except BaseException:
+            self._release_slot(slot)
+            raise
+
+        def finished(_: Future) -> None:
+            try:
+                loop.call_soon_threadsafe(self._release_slot, slot)
+            except RuntimeError:  # 이벤트 루프가 이미 닫힘
+                pass
+
+        future.add_done_callback(finished)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            self._cancel_flags[slot] = 1  # 실행 중인 워커는 다음 checkpoint()에서 ToolCancelled
+            raise
+
+    def _release_slot(self, slot: Optional[int]) -> None:
+        if slot is not None:
+            self._free_slots.append(slot)
+        self.in_flight -= 1
+        self._semaphore.release()
+
+    async def _submit(self, profile: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        pool = self._pool(profile)
+        call = partial(fn, *args, **kwargs)
+        if isinstance(pool, ThreadPoolExecutor):
+            call = partial(contextvars.copy_context().run, call)
+        return await asyncio.get_running_loop().run_in_executor(pool, call)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "io_workers": self.io_workers,
+            "cpu_workers": self.cpu_workers,
+            "start_method": self.start_method,
+            "background_concurrency": self.background_concurrency,
+            "background_in_flight": self.background_in_flight,
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        for pool in (self._io_pool, self._cpu_pool, self._background_pool):
+            if pool is not None:
+                pool.shutdown(wait=wait)
+        self._io_pool = self._cpu_pool = self._background_pool = None
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+만료 시간이 있는 메모리 LRU 캐시
+
+- 최근 사용한 max_items개만 유지, 저장 후 ttl초가 지난 항목은 조회 시 만료
+- 여러 스레드(도구 실행 풀, 백그라운드 프리패치)에서 함께 사용
+- 조회 적중/실패 수 집계 (서버 통계용)
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """
+    TTL + LRU 캐시
+
+    Args:
+        max_items: 최대 항목 수 (넘으면 가장 오래 사용하지 않은 항목 삭제)
+        ttl: 항목 유효 시간(초), 0 이하면 만료 없음
+    """
+
+    def __init__(self, max_items: int = 16, ttl: float = 600.0):
+        if max_items < 1:
+            raise ValueError(f"max_items는 1 이상이어야 합니다: {max_items}")
+        self.max_items = max_items
+        self.ttl = ttl
+        self._items: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """유효한 값 (없거나 만료되었으면 None)"""
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is not None and (self.ttl <= 0 or time.monotonic() - entry[0] < self.ttl):
+                self._items.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._items[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._items[key] = (time.monotonic(), value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> bool:
+        with self._lock:
+            return self._items.pop(key, None) is not None
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "items": len(self._items),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+        }
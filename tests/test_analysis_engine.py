@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+공유 분석 엔진 테스트
+"""
+
+import os
+import sys
+import time
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.analyzers import AnalysisEngine, FigmaAnalyzer, shared_engine
+from src.utils.cancellation import CancelToken, reset_token, set_token
+
+
+def _document(*children):
+    return {"document": {"children": list(children)}}
+
+
+class TestAnalysisEngine:
+    """분석 엔진 테스트 클래스"""
+
+    def test_requirement_text_rules(self):
+        """요구사항 키워드는 대소문자 구분, 제외 키워드는 대소문자 무시, 길이 범위 밖은 제외"""
+        engine = AnalysisEngine(requirement_keywords=["login", "APR", "로그인"], exclude_keywords=["px", "color"])
+
+        assert engine.is_requirement_text("user login page") is True
+        assert engine.is_requirement_text("로그인 버튼") is True
+        assert engine.is_requirement_text("Login page") is False  # 'login'과 대소문자가 다름
+        assert engine.is_requirement_text("APR 5%") is True
+        assert engine.is_requirement_text("apr 5%") is False
+        assert engine.is_requirement_text("login 16PX") is False  # 제외 키워드
+        assert engine.is_requirement_text("Color of login") is False
+        assert engine.is_requirement_text("lo") is False
+        assert engine.is_requirement_text("login " * 200) is False  # 1000자 초과
+        assert engine.is_requirement_text("") is False
+
+    def test_pattern_scores(self):
+        """패턴별 매칭 키워드 수로 신뢰도 계산 (선언 순서 유지, 매칭 없는 패턴은 제외)"""
+        engine = AnalysisEngine(
+            ui_patterns={
+                "auth": {"keywords": ["login", "password", "oauth"], "flow_type": "auth_flow"},
+                "none": {"keywords": ["zzz"], "flow_type": "none_flow"},
+                "confirm": {"keywords": ["confirm", "CONFIRM"], "flow_type": "modal_flow"},
+            },
+            flow_patterns={"success": ["done", "complete"]},
+        )
+
+        patterns, flows = engine.score_patterns("Login with PASSWORD then Confirm. Done")
+
+        assert list(patterns) == ["auth", "confirm"]
+        assert patterns["auth"] == {"matches": 2, "flow_type": "auth_flow", "confidence": 40}
+        assert patterns["confirm"]["matches"] == 2  # 중복 키워드도 각각 셈
+        assert flows == {"success": {"matches": 1, "confidence": 25}}
+
+    def test_ui_structure_rules(self):
+        """UI 요소는 앞 규칙 우선, 규칙에 없는 FRAME/GROUP은 containers"""
+        engine = AnalysisEngine()
+        result = engine.analyze_ui_structure(_document(
+            {"type": "FRAME", "name": "Screen", "children": [
+                {"type": "INSTANCE", "name": "Nav Button"},
+                {"type": "INSTANCE", "name": "Email Field"},
+                {"type": "COMPONENT", "name": "Tab Bar"},
+                {"type": "TEXT", "name": "Label"},
+            ]},
+        ))
+
+        elements = result["ui_elements"]
+        assert [e["name"] for e in elements["buttons"]] == ["Nav Button"]
+        assert [e["name"] for e in elements["inputs"]] == ["Email Field"]
+        assert [e["name"] for e in elements["navigation"]] == ["Tab Bar"]
+        assert elements["containers"] == [{"name": "Screen", "depth": 0}]
+        assert result["layout_info"] == {"depth_levels": 1, "max_children": 4, "component_count": 3}
+        assert result["ui_complexity"] == "low"
+        assert engine.classify_ui_element("group 1", "GROUP") == "containers"
+        assert engine.classify_ui_element("label", "TEXT") is None
+
+    def test_keywords_and_user_flow(self):
+        """키워드 분석 결과로 유저플로우 추론 (가장 높은 신뢰도 패턴이 주요 플로우)"""
+        engine = AnalysisEngine()
+        keywords = engine.analyze_keywords(_document(
+            {"type": "FRAME", "name": "Login", "children": [
+                {"type": "TEXT", "characters": " password  "},
+                {"type": "TEXT", "characters": "oauth signin"},
+                {"type": "INSTANCE", "name": "Submit"},
+            ]},
+        ))
+        ui = engine.analyze_ui_structure(_document({"type": "FRAME", "name": "Submit Button"}))
+
+        assert [t["text"] for t in keywords["texts"]] == ["password", "oauth signin"]
+        assert [n["name"] for n in keywords["names"]] == ["Login", "Submit"]
+        assert keywords["detected_patterns"]["authentication"]["confidence"] == 100
+        flow = engine.analyze_user_flow(keywords, ui)
+        assert flow["flow_steps"] == ["사용자 인증", "액션 실행", "결과 확인"]
+        assert flow["primary_flow_type"] == "auth_flow"
+        assert flow["complexity"] == "low"
+
+    def test_deadline_returns_partial(self):
+        """마감이 지나면 순회한 만큼으로 결과를 만들고 partial 표시"""
+        engine = AnalysisEngine()
+        data = _document(*({"type": "FRAME", "name": f"Button {i}"} for i in range(10)))
+        reset = set_token(CancelToken(0.01))
+        try:
+            time.sleep(0.02)
+            keywords = engine.analyze_keywords(data)
+            ui = engine.analyze_ui_structure(data)
+        finally:
+            reset_token(reset)
+
+        assert keywords["partial"] is True and keywords["names"] == []
+        assert ui["partial"] is True and ui["ui_elements"]["buttons"] == []
+        assert "partial" not in engine.analyze_ui_structure(data)
+
+    def test_shared_engine_used_by_analyzer(self):
+        """프로세스 공용 엔진은 한 번만 만들고 FigmaAnalyzer도 같은 엔진 사용"""
+        engine = shared_engine()
+
+        assert shared_engine() is engine
+        assert FigmaAnalyzer(figma_token="test_token").engine is engine
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+도구 호출 취소 / 마감 시간 테스트
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.cancellation import (
+    CancelToken, DeadlineExceeded, ToolCancelled, checked, checkpoint, current_token, remaining_time,
+    reset_token, set_token,
+)
+from src.utils.excel_writer import SheetLayout, write_xlsx
+from src.utils.export import atomic_output
+from src.utils.tool_executor import ToolExecutor
+
+
+class TestCancellation:
+    """취소 토큰 / 확인 지점 테스트 클래스"""
+
+    def test_checkpoint_without_token_is_noop(self):
+        """토큰이 없으면 checkpoint()는 아무것도 하지 않고 남은 시간은 기본값"""
+        assert current_token() is None
+        checkpoint()
+        assert remaining_time(30) == 30
+        assert remaining_time() is None
+
+    def test_deadline_and_cancel(self):
+        """마감이 지나면 DeadlineExceeded, cancel()하면 ToolCancelled (둘 다 Exception이 아님)"""
+        token = CancelToken.from_deadline_ms(20)
+        assert 0 < token.remaining() <= 0.02
+        token.check()
+        time.sleep(0.03)
+        assert token.remaining() == 0
+        with pytest.raises(DeadlineExceeded):
+            token.check()
+
+        token = CancelToken()
+        assert token.remaining() is None
+        token.cancel()
+        with pytest.raises(ToolCancelled):
+            token.check()
+        assert not issubclass(ToolCancelled, Exception)
+
+    def test_remaining_time_caps_default(self):
+        """remaining_time은 남은 마감 시간과 기본값 중 작은 값"""
+        reset = set_token(CancelToken(0.5))
+        try:
+            assert remaining_time(30) <= 0.5
+            assert remaining_time(0.1) == 0.1
+        finally:
+            reset_token(reset)
+        assert current_token() is None
+
+    def test_checked_stops_iteration(self):
+        """checked()는 항목마다 확인하여 취소되면 소비를 멈춤"""
+        token = CancelToken()
+        consumed = []
+
+        def items():
+            for i in range(10):
+                if i == 3:
+                    token.cancel()
+                yield i
+
+        reset = set_token(token)
+        try:
+            with pytest.raises(ToolCancelled):
+                for item in checked(items()):
+                    consumed.append(item)
+        finally:
+            reset_token(reset)
+        assert consumed == [0, 1, 2]
+
+    def test_token_propagates_to_pool_thread(self):
+        """ToolExecutor는 호출 시점의 토큰을 풀 스레드로 전달하고, 취소하면 실행 중인 작업이 중단됨"""
+        executor = ToolExecutor(max_concurrency=2, cpu_workers=0)
+        started = threading.Event()
+
+        def loop_until_cancelled():
+            started.set()
+            while True:
+                checkpoint()
+                time.sleep(0.005)
+
+        async def scenario():
+            token = CancelToken()
+            reset = set_token(token)
+            try:
+                future = asyncio.ensure_future(executor.run("io", loop_until_cancelled))
+            finally:
+                reset_token(reset)
+            await asyncio.get_running_loop().run_in_executor(None, started.wait, 1)
+            token.cancel()
+            with pytest.raises(ToolCancelled):
+                await future
+
+        try:
+            asyncio.run(scenario())
+        finally:
+            executor.shutdown()
+        assert executor.stats()["in_flight"] == 0
+
+    def test_interrupted_write_leaves_no_file(self, tmp_path):
+        """행 기록 중 마감이 지나면 출력 파일을 만들지 않음"""
+        filename = str(tmp_path / "out.xlsx")
+        layout = SheetLayout.default(["title"], {})
+        token = CancelToken()
+
+        def rows():
+            for i in range(100):
+                if i == 50:
+                    token.deadline = time.monotonic()
+                yield {"title": f"케이스 {i}"}
+
+        reset = set_token(token)
+        try:
+            with pytest.raises(DeadlineExceeded):
+                with atomic_output(filename) as tmp_file:
+                    write_xlsx(checked(rows()), tmp_file, layout)
+        finally:
+            reset_token(reset)
+        assert os.listdir(tmp_path) == []
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Parquet / Feather 저장 테스트
+"""
+
+import os
+import sys
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.generators import testcase_generator
+from src.utils.columnar import analysis_tables, read_table, rows_to_table
+from tests.test_testcase_generator import make_analysis
+
+
+class TestColumnar:
+    """컬럼형 바이너리 저장 테스트 클래스"""
+
+    def setup_method(self):
+        """테스트 설정"""
+        self.generator = testcase_generator.TestCaseGenerator()
+
+    @pytest.mark.parametrize("ext", ["parquet", "feather"])
+    def test_save_to_table_round_trip(self, tmp_path, ext):
+        """저장 후 로드 시 같은 값 + domain/priority/type dictionary 인코딩"""
+        testcases = self.generator.generate_from_analysis(make_analysis())
+        filename = str(tmp_path / f"cases.{ext}")
+
+        self.generator.save_to_table(iter(testcases), filename)
+
+        table = read_table(filename)
+        assert table.column_names == self.generator.rules.output_columns
+        for col in ("domain", "priority", "type"):
+            assert pa.types.is_dictionary(table.schema.field(col).type)
+        assert table.column("title").to_pylist() == [tc["title"] for tc in testcases]
+        assert table.column("priority").to_pylist() == [tc["priority"] for tc in testcases]
+
+    def test_dictionaries_unified_across_batches(self):
+        """배치 단위 변환 후에도 하나의 테이블로 합쳐짐"""
+        rows = [{"domain": f"d{i % 3}", "title": str(i)} for i in range(10)]
+
+        table = rows_to_table(rows, ("domain", "title"), ("domain",), batch_size=4)
+
+        assert table.num_rows == 10
+        assert table.column("domain").to_pylist() == [r["domain"] for r in rows]
+
+    def test_analysis_tables(self):
+        """분석 결과 texts/names/ui_elements 테이블"""
+        analysis = make_analysis(buttons=2, inputs=1)
+        analysis["enhanced_analysis"]["keywords"]["texts"] = [{"text": "로그인", "depth": 2}]
+        analysis["enhanced_analysis"]["keywords"]["names"] = [{"name": "Login", "type": "frame", "depth": 1}]
+
+        tables = analysis_tables(analysis)
+
+        assert tables["texts"].to_pylist() == [{"text": "로그인", "depth": 2}]
+        assert tables["names"].column("type").to_pylist() == ["frame"]
+        assert tables["ui_elements"].column("category").to_pylist() == ["buttons", "buttons", "inputs"]
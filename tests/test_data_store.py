@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+MCP 데이터 핸들 저장소 테스트
+"""
+
+import os
+import subprocess
+import sys
+import threading
+
+import pytest
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils import data_store
+from src.utils.data_store import DataStore, HandleError
+
+
+class TestDataStore:
+    """데이터 저장소 테스트 클래스"""
+
+    def test_lru_spills_to_disk_and_restores(self, tmp_path):
+        """메모리 한도를 넘은 항목은 디스크로 이동했다가 요청 시 복원, 디스크 한도를 넘으면 만료"""
+        store = DataStore(max_items=2, max_disk_items=1, store_dir=str(tmp_path))
+        first = store.put("figma", {"name": "첫 번째", "document": {"children": []}})
+        second = store.put("requirements", [{"text": "로그인"}])
+        store.get(first)  # first를 최근 사용으로 갱신 -> second가 먼저 밀려남
+        third = store.put("testcases", [])
+        store.flush()
+
+        assert os.listdir(store.spill_dir) == [f"{second.replace(':', '_')}.json"]
+        assert store.get(second, "requirements") == [{"text": "로그인"}]  # 복원 (first가 디스크로)
+        assert len(store) == 3
+
+        store.put("analysis", {})  # third가 디스크로 -> 디스크 한도 1개라 first 만료
+        store.flush()
+        with pytest.raises(HandleError):
+            store.get(first)
+        assert store.get(third) == []
+
+    def test_kind_mismatch_and_release(self, tmp_path):
+        store = DataStore(store_dir=str(tmp_path))
+        handle = store.put("figma", {"document": {}})
+        with pytest.raises(HandleError):
+            store.get(handle, "testcases")
+        with pytest.raises(HandleError):
+            store.get("not-a-handle")
+        with pytest.raises(ValueError):
+            store.put("unknown", {})
+
+        assert store.release(handle) is True
+        assert store.release(handle) is False
+        assert handle not in store
+
+    def test_put_does_not_wait_for_spill(self, tmp_path, monkeypatch):
+        """디스크 기록이 느려도 put은 바로 반환, 기록 전에 다시 요청된 항목은 기록 없이 복원"""
+        started, unblock = threading.Event(), threading.Event()
+        real_dump = data_store.json.dump
+
+        def slow_dump(value, f, **kwargs):
+            started.set()
+            unblock.wait(5)
+            real_dump(value, f, **kwargs)
+
+        monkeypatch.setattr(data_store.json, "dump", slow_dump)
+        store = DataStore(max_items=1, store_dir=str(tmp_path))
+        first = store.put("figma", {"document": {"children": []}})
+        second = store.put("requirements", [])  # first가 밀려나 기록 시작
+        assert started.wait(5)
+
+        third = store.put("testcases", [])  # 기록이 막혀 있어도 반환
+        assert store.stats()["pending_spills"] == 2
+        assert store.get(first, "figma") == {"document": {"children": []}}
+        unblock.set()
+        store.flush()
+
+        assert store.stats() == {"memory_items": 1, "disk_items": 2, "pending_spills": 0, "spill_errors": 0}
+        assert sorted(os.listdir(store.spill_dir)) == sorted(f"{h.replace(':', '_')}.json" for h in (second, third))
+        assert store.get(third) == []
+
+    def test_default_dir_and_stale_spill_cleanup(self, tmp_path):
+        """기본 디렉토리는 작업 디렉토리와 무관한 절대 경로, 시작 시 종료된 프로세스의 파일 정리"""
+        assert os.path.isabs(data_store.DEFAULT_STORE_DIR)
+
+        done = subprocess.Popen([sys.executable, "-c", "pass"])
+        done.wait()
+        for pid in (done.pid, os.getpid(), os.getppid()):
+            (tmp_path / str(pid)).mkdir()
+            (tmp_path / str(pid) / "figma_old.json").write_text("{}", encoding="utf-8")
+        (tmp_path / "figma_legacy.json").write_text("{}", encoding="utf-8")
+        (tmp_path / "notes.json").write_text("keep", encoding="utf-8")
+
+        DataStore(store_dir=str(tmp_path))
+
+        assert sorted(os.listdir(tmp_path)) == sorted([str(os.getppid()), "notes.json"])  # 살아 있는 프로세스 것만 유지
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+테스트케이스 중복 제거 테스트
+"""
+
+import os
+import sys
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.dedupe import deduplicate_testcases, normalize_text, content_fingerprint
+
+
+def _case(title, steps, expected="1. 정상 동작함"):
+    return {"title": title, "test_step": steps, "expected_results": expected}
+
+
+class TestDedupe:
+    """중복 제거 테스트 클래스"""
+
+    def test_normalize_text_strips_numbering_and_whitespace(self):
+        """스텝 번호/공백 차이 정규화 테스트"""
+        assert normalize_text("1. 앱 실행\n2.  로그인") == normalize_text("앱 실행\n   로그인")
+        assert normalize_text(None) == ""
+
+    def test_fingerprint_ignores_formatting(self):
+        """포맷만 다른 케이스는 같은 fingerprint"""
+        a = _case("정상 로그인 플로우", "1. 앱 실행\n2. 로그인 버튼 클릭")
+        b = _case("정상  로그인 플로우 ", "1) 앱 실행\n  2) 로그인 버튼 클릭")
+        c = {"title": "정상 로그인 플로우", "test_steps": "앱 실행\n로그인 버튼 클릭",
+             "expected_results": "1. 정상 동작함"}
+        assert content_fingerprint(a) == content_fingerprint(b) == content_fingerprint(c)
+
+    def test_exact_duplicates_reported(self):
+        """완전 중복 제거 및 리포트"""
+        cases = [
+            _case("A", "1. 첫 번째 단계"),
+            _case("B", "1. 다른 단계"),
+            _case(" a ", "첫 번째 단계"),
+        ]
+        result = deduplicate_testcases(cases)
+
+        assert [tc["title"] for tc in result.testcases] == ["A", "B"]
+        assert result.exact_count == 1
+        assert result.merged[0]["kept_index"] == 0
+        assert result.merged[0]["dropped_index"] == 2
+
+    def test_same_title_different_content_kept(self):
+        """제목이 같아도 절차가 다르면 유지"""
+        cases = [
+            _case("버튼 테스트", "1. 확인 버튼 클릭"),
+            _case("버튼 테스트", "1. 취소 버튼 클릭"),
+        ]
+        assert len(deduplicate_testcases(cases, near_duplicates=False).testcases) == 2
+
+    def test_near_duplicates_merged(self):
+        """근사 중복 탐지 (긴 절차에서 한 단어만 다른 경우)"""
+        steps = "\n".join(f"{i}. 단계 {i} 화면에서 주문 정보 입력 후 확인 버튼 클릭" for i in range(1, 21))
+        changed = steps.replace("단계 7 화면에서", "단계 7 페이지에서")
+        other = "\n".join(f"{i}. 설정 메뉴 {i} 진입 후 알림 토글 변경" for i in range(1, 21))
+        cases = [_case("주문 플로우", steps), _case("주문 플로우", changed), _case("알림 설정", other)]
+
+        result = deduplicate_testcases(cases)
+
+        assert [tc["title"] for tc in result.testcases] == ["주문 플로우", "알림 설정"]
+        assert result.near_count == 1
+        assert result.merged[0]["similarity"] >= 0.85
+
+        assert len(deduplicate_testcases(cases, near_duplicates=False).testcases) == 3
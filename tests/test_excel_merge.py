@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Excel 증분 병합 테스트
+"""
+
+import os
+import sys
+
+import pytest
+from openpyxl import load_workbook
+from openpyxl.styles import Font, PatternFill
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.generators import testcase_generator
+from src.utils.excel_merge import MergeConflictError, merge_xlsx
+
+
+def _case(i, step="1. 실행"):
+    return {"domain": "로그인", "feature": "인증", "title": f"케이스 {i}", "test_step": step, "priority": "P2"}
+
+
+def _rows(path):
+    wb = load_workbook(path, read_only=True)
+    ws = wb["TestCases"]
+    values = ws.iter_rows(values_only=True)
+    header = next(values)
+    rows = [dict(zip(header, row)) for row in values]
+    wb.close()
+    return rows
+
+
+class TestExcelMerge:
+    """증분 병합 테스트 클래스"""
+
+    def test_merge_keeps_results_and_appends_new(self, tmp_path):
+        """결과 컬럼 유지, 바뀐 케이스 갱신, 새 케이스 추가, 기존 전용 케이스 유지"""
+        generator = testcase_generator.TestCaseGenerator()
+        path = str(tmp_path / "suite.xlsx")
+        generator.save_to_excel([_case(0), _case(1), _case(2)], path)
+
+        # 테스터가 결과 기록 + 별도 시트 추가
+        wb = load_workbook(path)
+        ws = wb["TestCases"]
+        ws["L2"] = "Pass"
+        ws["M3"] = "Fail | BUG-1"
+        wb.create_sheet("메모")["A1"] = "회귀 범위"
+        wb.save(path)
+
+        result = generator.merge_into_excel([_case(1, "1. 실행\n2. 확인"), _case(0), _case(3)], path)
+
+        assert (result.added, result.updated, result.unchanged, result.kept) == (1, 1, 1, 1)
+        assert result.written
+        rows = _rows(path)
+        assert [row["title"] for row in rows] == ["케이스 0", "케이스 1", "케이스 2", "케이스 3"]
+        assert rows[0]["web_result"] == "Pass"
+        assert rows[1]["app_result"] == "Fail | BUG-1"
+        assert rows[1]["test_step"] == "1. 실행\n2. 확인"
+        assert load_workbook(path, read_only=True)["메모"]["A1"].value == "회귀 범위"
+
+    def test_merge_keeps_tester_comment(self, tmp_path):
+        """테스터가 작성한 comment는 유지, 새 케이스에 없는 컬럼은 비교/갱신하지 않음"""
+        generator = testcase_generator.TestCaseGenerator()
+        path = str(tmp_path / "suite.xlsx")
+        generator.save_to_excel([dict(_case(0), comment="AI 생성"), dict(_case(1), type="UI")], path)
+
+        wb = load_workbook(path)
+        ws = wb["TestCases"]
+        column = {cell.value: cell.column for cell in ws[1]}
+        ws.cell(row=2, column=column["comment"], value="T1: 재현 어려움, 로그 첨부")
+        wb.save(path)
+
+        # 생성기 comment가 달라도, type이 빠져 있어도 바뀐 케이스가 아님
+        result = generator.merge_into_excel([dict(_case(0), comment="AI 생성 - 인증 패턴"), _case(1)], path)
+        assert (result.updated, result.unchanged, result.written) == (0, 2, False)
+
+        result = generator.merge_into_excel([dict(_case(0, "1. 변경"), comment="AI 생성 - 인증 패턴"), _case(1)],
+                                            path)
+        assert (result.updated, result.unchanged) == (1, 1)
+        rows = _rows(path)
+        assert rows[0]["comment"] == "T1: 재현 어려움, 로그 첨부" and rows[0]["test_step"] == "1. 변경"
+        assert rows[1]["type"] == "UI"
+
+    def test_merge_without_changes_does_not_rewrite(self, tmp_path):
+        """변경분이 없으면 파일을 다시 쓰지 않음, 파일이 없으면 새로 생성"""
+        generator = testcase_generator.TestCaseGenerator()
+        path = str(tmp_path / "suite.xlsx")
+
+        created = generator.merge_into_excel([_case(0), _case(1)], path)
+        assert created.written and created.added == 2
+
+        mtime = os.stat(path).st_mtime_ns
+        result = generator.merge_into_excel([_case(1), _case(0)], path)
+        assert not result.written and result.unchanged == 2
+        assert os.stat(path).st_mtime_ns == mtime
+
+    def test_merge_restreams_large_sheets(self, tmp_path):
+        """보관 한도를 넘는 시트는 2차에서 다시 읽어도 같은 결과"""
+        generator = testcase_generator.TestCaseGenerator()
+        layout, sheet_name = generator._excel_layout()
+        buffered, streamed = str(tmp_path / "a.xlsx"), str(tmp_path / "b.xlsx")
+        for path in (buffered, streamed):
+            generator.save_to_excel([_case(i) for i in range(5)], path)
+
+        update = [_case(i, "1. 변경") for i in range(5)] + [_case(9)]
+        merge_xlsx(update, buffered, layout, sheet_name)
+        merge_xlsx(update, streamed, layout, sheet_name, buffer_rows=2)
+
+        assert _rows(buffered) == _rows(streamed)
+        assert len(_rows(streamed)) == 6
+
+    def test_merge_keeps_extra_columns_and_other_sheet_formatting(self, tmp_path):
+        """레이아웃에 없는 열은 값과 함께 뒤로 옮기고, 다른 시트는 서식까지 유지"""
+        generator = testcase_generator.TestCaseGenerator()
+        path = str(tmp_path / "suite.xlsx")
+        generator.save_to_excel([_case(0), _case(1)], path)
+
+        wb = load_workbook(path)
+        ws = wb["TestCases"]
+        jira = ws.max_column + 1
+        ws.cell(row=1, column=jira, value="JIRA").font = Font(bold=True)
+        ws.cell(row=2, column=jira, value="QA-123")
+        ws.column_dimensions[ws.cell(row=1, column=jira).column_letter].width = 21
+        memo = wb.create_sheet("메모")
+        memo["B2"] = "회귀 범위"
+        memo["B2"].font = Font(bold=True, color="FF0000")
+        memo["B2"].fill = PatternFill("solid", fgColor="FFFF00")
+        memo.merge_cells("B2:D2")
+        memo.column_dimensions["B"].width = 40
+        memo.freeze_panes = "A2"
+        wb.save(path)
+
+        result = generator.merge_into_excel([_case(0), _case(1), _case(2)], path)
+
+        assert result.written and result.added == 1
+        assert result.extra_columns == ["JIRA"]
+        rows = _rows(path)
+        assert [row.get("JIRA") for row in rows] == ["QA-123", None, None]
+        wb = load_workbook(path)
+        header = wb["TestCases"][1]
+        assert header[-1].value == "JIRA" and header[-1].font.bold
+        assert wb["TestCases"].column_dimensions[header[-1].column_letter].width == 21
+        memo = wb["메모"]
+        assert memo["B2"].value == "회귀 범위"
+        assert memo["B2"].font.bold and memo["B2"].font.color.rgb == "00FF0000"
+        assert memo["B2"].fill.fgColor.rgb == "00FFFF00"
+        assert [str(r) for r in memo.merged_cells.ranges] == ["B2:D2"]
+        assert memo.column_dimensions["B"].width == 40
+        assert memo.freeze_panes == "A2"
+
+    def test_merge_keeps_case_sheet_formatting(self, tmp_path):
+        """케이스 시트의 기존 셀 스타일/행 높이/병합은 유지, 새 행은 레이아웃 스타일"""
+        generator = testcase_generator.TestCaseGenerator()
+        path = str(tmp_path / "suite.xlsx")
+        generator.save_to_excel([_case(0), _case(1), _case(2)], path)
+
+        wb = load_workbook(path)
+        ws = wb["TestCases"]
+        column = {cell.value: cell.column_letter for cell in ws[1]}
+        failed = ws[f"{column['web_result']}2"]
+        failed.value = "Fail | BUG-7"
+        failed.fill = PatternFill("solid", fgColor="FF0000")
+        ws[f"{column['test_step']}2"].font = Font(italic=True)
+        ws.row_dimensions[3].height = 45
+        ws.merge_cells(f"{column['precondition']}3:{column['precondition']}4")
+        wb.save(path)
+
+        result = generator.merge_into_excel([_case(0, "1. 변경"), _case(1), _case(2), _case(3)], path)
+
+        assert result.written and (result.added, result.updated) == (1, 1)
+        wb = load_workbook(path)
+        ws = wb["TestCases"]
+        failed = ws[f"{column['web_result']}2"]
+        assert failed.value == "Fail | BUG-7" and failed.fill.fgColor.rgb == "00FF0000"
+        step = ws[f"{column['test_step']}2"]
+        assert step.value == "1. 변경" and step.font.italic
+        assert ws.row_dimensions[3].height == 45
+        assert [str(r) for r in ws.merged_cells.ranges] == [f"{column['precondition']}3:{column['precondition']}4"]
+        assert ws[f"{column['title']}5"].value == "케이스 3"
+        assert ws[f"{column['web_result']}5"].fill.fill_type is None  # 새 행은 레이아웃 스타일
+
+    def test_merge_refuses_unsupported_sheet_parts(self, tmp_path):
+        """옮길 수 없는 요소(메모 등)가 있으면 파일을 변경하지 않고 충돌로 보고"""
+        from openpyxl.comments import Comment
+
+        generator = testcase_generator.TestCaseGenerator()
+        path = str(tmp_path / "suite.xlsx")
+        generator.save_to_excel([_case(0)], path)
+        wb = load_workbook(path)
+        wb.create_sheet("메모")["A1"].comment = Comment("확인 필요", "QA")
+        wb.save(path)
+        before = open(path, "rb").read()
+
+        with pytest.raises(MergeConflictError, match="메모"):
+            generator.merge_into_excel([_case(0), _case(1)], path)
+        assert open(path, "rb").read() == before
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+스트리밍 Excel 저장 테스트
+"""
+
+import os
+import sys
+
+import openpyxl
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.generators import testcase_generator
+from src.utils.excel_writer import SheetLayout, write_xlsx
+
+
+class TestExcelWriter:
+    """스트리밍 Excel 저장 테스트 클래스"""
+
+    def test_write_xlsx_from_generator(self, tmp_path):
+        """이터레이터에서 바로 기록 + 헤더 스타일/열 너비 적용"""
+        filename = str(tmp_path / "out.xlsx")
+        layout = SheetLayout.default(["title", "priority"], {"A": 50, "B": 10})
+        rows = ({"title": f"케이스 {i}", "priority": "P1"} for i in range(3))
+
+        assert write_xlsx(rows, filename, layout) == 3
+
+        ws = openpyxl.load_workbook(filename)["TestCases"]
+        assert [c.value for c in ws[1]] == ["title", "priority"]
+        assert ws["A1"].font.b and ws["A1"].border.left.style == "thin"
+        assert ws.column_dimensions["A"].width == 50
+        assert ws["A4"].value == "케이스 2"
+        assert ws["B2"].font.b is False
+
+    def test_save_to_excel_without_template(self, tmp_path):
+        """use_template=False는 출력 컬럼 순서대로 스트리밍 저장"""
+        generator = testcase_generator.TestCaseGenerator()
+        filename = str(tmp_path / "out.xlsx")
+        testcases = [{"title": "A", "test_steps": "1. 실행", "priority": "P2"}]
+
+        generator.save_to_excel(iter(testcases), filename, use_template=False)
+
+        ws = openpyxl.load_workbook(filename)["TestCases"]
+        header = [c.value for c in ws[1]]
+        assert header == generator.rules.output_columns
+        row = dict(zip(header, (c.value for c in ws[2])))
+        assert row["title"] == "A"
+        assert row["test_step"] == "1. 실행"
+
+    def test_template_layout_preserved(self, tmp_path):
+        """템플릿 헤더/스타일/열 너비/고정 행 유지, 예시 행은 제외"""
+        generator = testcase_generator.TestCaseGenerator()
+        template_path = os.path.join(
+            os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            "templates", "QA_Testcase_Template_WebApp.xlsx",
+        )
+        filename = str(tmp_path / "out.xlsx")
+
+        generator.save_to_excel([{"title": "A", "priority": "P1"}], filename)
+
+        template = openpyxl.load_workbook(template_path).active
+        ws = openpyxl.load_workbook(filename).active
+        assert ws.title == template.title
+        assert ws.freeze_panes == template.freeze_panes
+        assert [c.value for c in ws[1]] == [c.value for c in template[1]]
+        assert ws["A1"].fill.fgColor.rgb == template["A1"].fill.fgColor.rgb
+        assert ws["A1"].alignment.wrap_text == template["A1"].alignment.wrap_text
+        assert ws.column_dimensions["E"].width == template.column_dimensions["E"].width
+        assert ws.max_row == 2
+        assert ws.cell(row=2, column=5).value == "A"
+
+        # 레이아웃은 한 번만 캡처
+        assert generator._load_excel_template(template_path) is generator._load_excel_template(template_path)
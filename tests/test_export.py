@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+다중 형식 동시 저장 테스트
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.generators import testcase_generator
+from src.utils.export import atomic_output, fan_out
+
+
+def _write_text(text):
+    def writer(rows, path):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+    return writer
+
+
+def _fail(rows, path):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("partial")
+    raise RuntimeError("writer failed")
+
+
+class TestExport:
+    """다중 형식 저장 테스트 클래스"""
+
+    def test_atomic_output_keeps_previous_file_on_failure(self, tmp_path):
+        """실패 시 기존 파일 유지 + 임시 파일 정리"""
+        target = tmp_path / "out.csv"
+        target.write_text("old", encoding="utf-8")
+
+        with pytest.raises(RuntimeError):
+            with atomic_output(str(target)) as tmp:
+                assert tmp.endswith(".csv") and tmp != str(target)
+                _fail([], tmp)
+
+        assert target.read_text(encoding="utf-8") == "old"
+        assert os.listdir(tmp_path) == ["out.csv"]
+
+    def test_atomic_output_file_mode(self, tmp_path):
+        """새 파일은 일반 open과 같은 권한, 기존 파일은 권한 유지, mode 지정 시 그 권한"""
+        plain = tmp_path / "plain.csv"
+        plain.write_text("x", encoding="utf-8")
+        new = tmp_path / "new.csv"
+        with atomic_output(str(new)) as tmp:
+            _write_text("new")([], tmp)
+        assert os.stat(new).st_mode & 0o777 == os.stat(plain).st_mode & 0o777
+
+        existing = tmp_path / "existing.csv"
+        existing.write_text("old", encoding="utf-8")
+        os.chmod(existing, 0o640)
+        with atomic_output(str(existing)) as tmp:
+            _write_text("merged")([], tmp)
+        assert os.stat(existing).st_mode & 0o777 == 0o640
+
+        with atomic_output(str(tmp_path / "metrics.prom"), mode=0o644) as tmp:
+            _write_text("m 1")([], tmp)
+        assert os.stat(tmp_path / "metrics.prom").st_mode & 0o777 == 0o644
+
+    def test_fan_out_writes_every_sink(self, tmp_path):
+        """모든 sink 기록, 실패한 sink가 있어도 나머지는 완료"""
+        a, b = str(tmp_path / "a.txt"), str(tmp_path / "b.txt")
+
+        result = fan_out([], {"a": (a, _write_text("A")), "b": (b, _write_text("B"))})
+        assert {name: r["path"] for name, r in result.items()} == {"a": a, "b": b}
+
+        with pytest.raises(RuntimeError):
+            fan_out([], {"ok": (a, _write_text("A2")), "bad": (str(tmp_path / "c.txt"), _fail)})
+        assert open(a, encoding="utf-8").read() == "A2"
+        assert not os.path.exists(tmp_path / "c.txt")
+
+    def test_save_all_matches_single_writers(self, tmp_path):
+        """save_all 결과가 형식별 저장 메소드 결과와 동일"""
+        generator = testcase_generator.TestCaseGenerator()
+        testcases = [
+            {"title": f"케이스 {i}", "test_steps": "1. 실행", "priority": "P2", "domain": "d"}
+            for i in range(5)
+        ]
+
+        generator.save_to_testrail_csv(testcases, str(tmp_path / "single.csv"))
+        generator.save_to_json(testcases, str(tmp_path / "single.json"))
+        generator.save_all(iter(testcases), {
+            "excel": str(tmp_path / "all.xlsx"),
+            "testrail": str(tmp_path / "all.csv"),
+            "json": str(tmp_path / "all.json"),
+        })
+
+        assert (tmp_path / "all.csv").read_bytes() == (tmp_path / "single.csv").read_bytes()
+        with open(tmp_path / "all.json", encoding="utf-8") as f_all, \
+                open(tmp_path / "single.json", encoding="utf-8") as f_single:
+            assert json.load(f_all)["testcases"] == json.load(f_single)["testcases"]
+        assert (tmp_path / "all.xlsx").exists()
+
+        with pytest.raises(ValueError):
+            generator.save_all(testcases, {"pdf": str(tmp_path / "x.pdf")})
@@ -95,6 +95,25 @@ class TestFigmaAnalyzer:
         assert result["success"] is False
         assert result["error"] == "Invalid token"
     
+    @patch('requests.get')
+    def test_fetch_figma_data_coalesces_concurrent_requests(self, mock_get):
+        """같은 파일 동시 요청은 API를 한 번만 호출하고 data를 공유"""
+        from concurrent.futures import ThreadPoolExecutor
+        import time
+        
+        def slow_get(*args, **kwargs):
+            time.sleep(0.1)
+            response = Mock()
+            response.json.return_value = {"document": {"children": []}}
+            return response
+        mock_get.side_effect = slow_get
+        
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(lambda _: self.analyzer.fetch_figma_data("shared_file", "1-2"), range(4)))
+        
+        assert mock_get.call_count == 1
+        assert all(result["data"] is results[0]["data"] for result in results)
+    
     def test_analyze_enhanced_keywords(self):
         """향상된 키워드 분석 테스트"""
         # 테스트용 Figma 데이터
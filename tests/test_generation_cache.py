@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+테스트케이스 생성 캐시 테스트
+"""
+
+import copy
+import os
+import sys
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.generators import testcase_generator
+from src.utils.generation_cache import GenerationCache, analysis_fingerprint
+from src.utils.rules_config import RulesConfig
+from tests.test_testcase_generator import make_analysis
+
+
+class TestGenerationCache:
+    """생성 캐시 테스트 클래스"""
+
+    def setup_method(self):
+        """테스트 설정"""
+        self.generator = testcase_generator.TestCaseGenerator()
+
+    def test_fingerprint_ignores_unrelated_sections(self):
+        """스크린샷/요약처럼 생성에 쓰이지 않는 값은 fingerprint에 영향 없음"""
+        analysis = make_analysis()
+        changed = copy.deepcopy(analysis)
+        changed["enhanced_analysis"]["screenshot"] = {"image_url": "https://signed/url?x=1"}
+        changed["summary"] = {"total_elements": 3}
+
+        assert analysis_fingerprint(analysis) == analysis_fingerprint(changed)
+
+        changed["enhanced_analysis"]["ui_structure"]["ui_complexity"] = "high"
+        assert analysis_fingerprint(analysis) != analysis_fingerprint(changed)
+
+    def test_generate_cached_hit(self, tmp_path):
+        """두 번째 실행은 캐시에서 동일한 결과 반환"""
+        cache = GenerationCache(str(tmp_path))
+        analysis = make_analysis()
+
+        first, key, hit = self.generator.generate_cached(analysis, cache)
+        assert not hit
+        second, key2, hit2 = self.generator.generate_cached(analysis, cache)
+        assert hit2 and key2 == key
+        assert second == first == self.generator.generate_from_analysis(analysis)
+
+        filtered, filtered_key, hit = self.generator.generate_cached(analysis, cache, "P1")
+        assert not hit and filtered_key != key
+        assert all(tc["priority"] == "P1" for tc in filtered)
+
+    def test_key_changes_with_rules_and_version(self, tmp_path):
+        """룰 설정이나 생성기 버전이 바뀌면 다른 키"""
+        cache = GenerationCache(str(tmp_path))
+        analysis = make_analysis()
+        rules = self.generator.rules
+        other_rules = RulesConfig(raw={**rules.raw, "version": "2.0.0"})
+
+        key = cache.key_for(analysis, rules, "1.0.0")
+        assert cache.key_for(analysis, other_rules, "1.0.0") != key
+        assert cache.key_for(analysis, rules, "1.0.1") != key
+
+    def test_output_stamp(self, tmp_path):
+        """출력 파일이 바뀌면 최신 상태가 아님"""
+        cache = GenerationCache(str(tmp_path / "cache"))
+        output = tmp_path / "out.json"
+        output.write_text("[]", encoding="utf-8")
+
+        assert not cache.output_is_current(str(output), "k", "json")
+        cache.mark_output(str(output), "k", "json")
+        assert cache.output_is_current(str(output), "k", "json")
+        assert not cache.output_is_current(str(output), "k", "excel")
+
+        output.write_text("[1]", encoding="utf-8")
+        assert not cache.output_is_current(str(output), "k", "json")
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+NDJSON / 컬럼형 JSON 저장 테스트
+"""
+
+import gzip
+import json
+import os
+import sys
+
+import pytest
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.generators import testcase_generator
+from src.utils.json_formats import iter_ndjson, read_columnar_json, write_columnar_json
+
+
+def _cases(count=20):
+    return [
+        {"title": f"케이스 {i}", "test_steps": "1. 실행", "priority": f"P{i % 2 + 1}",
+         "domain": "trading", "type": "Functional"}
+        for i in range(count)
+    ]
+
+
+class TestJsonFormats:
+    """JSON 계열 저장 형식 테스트 클래스"""
+
+    def setup_method(self):
+        """테스트 설정"""
+        self.generator = testcase_generator.TestCaseGenerator()
+
+    def _document_testcases(self, tmp_path):
+        filename = str(tmp_path / "doc.json")
+        self.generator.save_to_json(_cases(), filename)
+        with open(filename, encoding="utf-8") as f:
+            return json.load(f)["testcases"]
+
+    @pytest.mark.parametrize("compress", [False, True])
+    def test_ndjson_round_trip(self, tmp_path, compress):
+        """NDJSON은 한 줄에 케이스 하나, document 모드와 같은 내용"""
+        filename = str(tmp_path / ("cases.ndjson.gz" if compress else "cases.ndjson"))
+
+        self.generator.save_to_json(iter(_cases()), filename, mode="ndjson", compress=compress)
+
+        opener = gzip.open if compress else open
+        with opener(filename, "rt", encoding="utf-8") as f:
+            assert len(f.read().splitlines()) == 20
+        assert list(iter_ndjson(filename, compress)) == self._document_testcases(tmp_path)
+
+    @pytest.mark.parametrize("compress", [False, True])
+    def test_columnar_round_trip(self, tmp_path, compress):
+        """컬럼형 JSON은 반복 문자열을 한 번만 저장하고 같은 내용으로 복원"""
+        filename = str(tmp_path / "cases.columnar.json")
+
+        self.generator.save_to_json(_cases(), filename, mode="columnar", compress=compress)
+
+        opener = gzip.open if compress else open
+        with opener(filename, "rt", encoding="utf-8") as f:
+            document = json.load(f)
+        assert document["row_count"] == 20
+        assert document["columns"][:len(self.generator.rules.output_columns)] == self.generator.rules.output_columns
+        assert document["strings"].count("trading") == 1
+        assert document["metadata"]["total_testcases"] == 20
+
+        expected = [{k: v for k, v in tc.items() if v is not None} for tc in self._document_testcases(tmp_path)]
+        assert read_columnar_json(filename, compress) == expected
+
+    def test_columnar_non_string_values(self, tmp_path):
+        """문자열이 아닌 값과 뒤늦게 등장한 컬럼도 복원"""
+        filename = str(tmp_path / "mixed.json")
+        rows = [{"title": "A"}, {"title": "B", "steps": 3, "tags": ["x", "1"]}]
+
+        write_columnar_json(rows, filename, ["title"])
+
+        assert read_columnar_json(filename) == rows
+
+    def test_unknown_mode(self, tmp_path):
+        """지원하지 않는 모드"""
+        with pytest.raises(ValueError):
+            self.generator.save_to_json(_cases(), str(tmp_path / "x.json"), mode="xml")
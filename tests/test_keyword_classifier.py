@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+키워드 기반 우선순위/카테고리 분류기 테스트
+"""
+
+import os
+import sys
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.keyword_classifier import KeywordAutomaton, KeywordClassifier
+from src.utils.rules_config import load_rules_config
+
+
+class TestKeywordClassifier:
+    """키워드 분류기 테스트 클래스"""
+
+    def test_automaton_overlapping_patterns(self):
+        """겹치거나 접미사 관계인 패턴을 모두 찾는지 테스트"""
+        automaton = KeywordAutomaton({k: [k] for k in ["he", "she", "his", "hers"]})
+
+        assert automaton.search("ushers") == {"he", "she", "hers"}
+        assert automaton.search("HIS") == {"his"}
+        assert automaton.search("") == set()
+
+    def test_priority_precedence_and_default(self):
+        """여러 우선순위가 매칭되면 높은 우선순위, 매칭 없으면 기본값"""
+        classifier = KeywordClassifier(
+            priority_keywords={"P3": ["UI"], "P1": ["결제"]},
+            default_priority="P2",
+        )
+
+        assert classifier.classify("결제 화면 ui 레이아웃")[0] == "P1"
+        assert classifier.classify("버튼 UI 확인")[0] == "P3"
+        assert classifier.classify("기타")[0] == "P2"
+
+    def test_category_declaration_order(self):
+        """카테고리는 선언 순서가 먼저인 쪽이 우선"""
+        rules = load_rules_config()
+        classifier = KeywordClassifier.from_rules(rules)
+
+        assert classifier.classify("Login 후 프로필 확인")[1] == "사용자인증"
+        assert classifier.classify("VIP 등급 혜택")[1] == "VIP티어시스템"
+        assert classifier.classify("기타 화면")[1] == rules.category_default
+
+    def test_classify_many_uses_testcase_fields(self):
+        """테스트케이스 배치 분류"""
+        classifier = KeywordClassifier.from_rules(load_rules_config())
+        testcases = [
+            {"title": "송금 플로우", "section": "Wallet"},
+            {"title": "목록", "feature": "검색 필터"},
+            {"title": "툴팁 문구"},
+        ]
+
+        assert [p for p, _ in classifier.classify_many(testcases)] == ["P1", "P2", "P3"]
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+MCP 서버 도구 실행 경로 테스트 (mcp 라이브러리 없이 서버 모듈의 함수만 사용)
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import openpyxl
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# mcp를 가려서 MCP 서버 인스턴스 생성 없이 모듈만 불러옴 (불러온 뒤 mcp 모듈 항목만 되돌림)
+_MCP_MODULES = ("mcp", "mcp.server", "mcp.server.models", "mcp.types")
+_saved_modules = {name: sys.modules.get(name) for name in _MCP_MODULES}
+sys.modules.update(dict.fromkeys(_MCP_MODULES))
+try:
+    import mcp_figma_server
+finally:
+    for _name, _module in _saved_modules.items():
+        if _module is None:
+            del sys.modules[_name]
+        else:
+            sys.modules[_name] = _module
+
+from src.utils.rate_budget import RateBudget, rate_priority
+from src.utils.tool_executor import ToolExecutor
+
+FIGMA_URL = "https://www.figma.com/file/FILE/test"
+_TEXTS = ["로그인 버튼 클릭", "회원가입 입력 폼", "결제 완료 안내", "알림 설정 화면"]
+
+
+def _server(tmp_path, monkeypatch):
+    """네트워크 없이 캐시된 Figma 문서로 동작하는 서버 (Excel/핸들 파일은 tmp_path에 기록)"""
+    monkeypatch.setenv("FIGMA_TOKEN", "test_token")
+    monkeypatch.setenv("MCP_HANDLE_DIR", str(tmp_path / "handles"))
+    monkeypatch.setattr(mcp_figma_server, "TEMPLATE_PATH", os.path.abspath(mcp_figma_server.TEMPLATE_PATH))
+    monkeypatch.chdir(tmp_path)
+    server = mcp_figma_server.FigmaMCPServer(api_base="http://127.0.0.1:9")
+    frames = [
+        {"type": "FRAME", "name": f"Screen {f}", "children": [
+            {"type": "TEXT", "name": f"Text {t}", "characters": f"{text} {f}-{t}"} for t, text in enumerate(_TEXTS)
+        ]}
+        for f in range(2)
+    ]
+    data = {"name": "Test", "document": {"type": "DOCUMENT", "children": [{"type": "CANVAS", "children": frames}]}}
+    server.fetch_cache.put(server._fetch_key("FILE"), {"success": True, "data": data})
+    return server
+
+
+def _run_with_events(server, arguments, send_progress=None, send_partial=None):
+    """call_tool_with_progress 실행, 결과가 돌아온 시점도 이벤트 목록에 기록"""
+    executor = ToolExecutor(cpu_workers=0)
+    events = []
+
+    async def scenario():
+        result = await mcp_figma_server.call_tool_with_progress(
+            server, executor, "process_figma_link", arguments,
+            send_progress or (lambda *args: _record(events, "progress", args)),
+            send_partial or (lambda data: _record(events, "partial", data)),
+        )
+        events.append(("result", result))
+        return result
+
+    try:
+        return asyncio.run(scenario()), events
+    finally:
+        executor.shutdown()
+
+
+async def _record(events, kind, payload):
+    events.append((kind, payload))
+
+
+class _PrefetchRecorder:
+    """prefetch_figma_file 호출만 기록하는 서버 대역"""
+
+    def __init__(self):
+        self.calls = []
+
+    def prefetch_figma_file(self, figma_url, refresh=False):
+        self.calls.append((figma_url, refresh))
+        return {"success": True, "figma_url": figma_url}
+
+
+class TestMCPServer:
+    """MCP 서버 테스트 클래스"""
+
+    def test_worker_reimport_does_not_build_server(self):
+        """spawn/forkserver 워커처럼 __mp_main__으로 다시 불러와도 서버/실행기를 만들지 않음"""
+        env = {key: value for key, value in os.environ.items() if key != "FIGMA_TOKEN"}
+        script = ("import runpy; g = runpy.run_path('mcp_figma_server.py', run_name='__mp_main__'); "
+                  "print(sorted(name for name in ('server', 'figma_server', 'tool_executor') if name in g))")
+        done = subprocess.run([sys.executable, "-c", script], cwd=os.path.dirname(os.path.dirname(
+            os.path.abspath(__file__))), env=env, capture_output=True, text=True, timeout=60)
+        assert done.returncode == 0, done.stdout + done.stderr
+        assert done.stdout.strip().splitlines()[-1] == "[]"
+
+    def test_watch_list_refreshed_before_cache_expires(self):
+        """워치 리스트는 기동 시 가져오고 interval마다 refresh로 다시 가져옴 (interval 0이면 한 번만)"""
+        recorder = _PrefetchRecorder()
+        executor = ToolExecutor(cpu_workers=0)
+
+        async def scenario():
+            task = asyncio.ensure_future(mcp_figma_server.watch_prefetch(recorder, executor, ["A", "B"], 0.05))
+            await asyncio.sleep(0.13)
+            task.cancel()
+            once = _PrefetchRecorder()
+            await asyncio.wait_for(mcp_figma_server.watch_prefetch(once, executor, ["A"], 0), 1)
+            return once.calls
+
+        try:
+            once = asyncio.run(scenario())
+        finally:
+            executor.shutdown()
+        assert recorder.calls[:2] == [("A", False), ("B", False)]
+        assert sorted(recorder.calls[2:6]) == [("A", True), ("A", True), ("B", True), ("B", True)]
+        assert once == [("A", False)]
+
+    def test_process_figma_link_events_before_result(self, tmp_path, monkeypatch):
+        """진행률/부분 결과는 단계 순서대로 최종 결과보다 먼저 도착, 부분 결과를 합치면 전체 테스트케이스"""
+        server = _server(tmp_path, monkeypatch)
+        result, events = _run_with_events(server, {"figma_url": FIGMA_URL, "partial_batch_size": 3})
+
+        assert result["success"] is True and events[-1] == ("result", result)
+        progress = [payload for kind, payload in events if kind == "progress"]
+        partials = [payload for kind, payload in events if kind == "partial"]
+        assert [p for p, _, _ in progress] == sorted(p for p, _, _ in progress)
+        assert progress[0][2].startswith("URL 파싱 완료") and progress[-1][2].startswith("Excel 저장 완료")
+        assert {total for _, total, _ in progress} == {len(mcp_figma_server.PROCESS_PHASES)}
+        assert [p["count"] for p in partials][:-1] == [3] * (len(partials) - 1)
+        assert sum(p["count"] for p in partials) == result["testcases_count"]
+        assert os.path.exists(result["filename"])
+
+    def test_partial_batch_size_clamped(self, tmp_path, monkeypatch):
+        """1 미만의 배치 크기는 1로 처리"""
+        server = _server(tmp_path, monkeypatch)
+        result, events = _run_with_events(server, {"figma_url": FIGMA_URL, "partial_batch_size": -5})
+
+        assert result["success"] is True
+        assert [payload["count"] for kind, payload in events if kind == "partial"] == [1] * result["testcases_count"]
+
+    def test_failing_sender_does_not_stop_tool(self, tmp_path, monkeypatch):
+        """전송이 실패하면 이후 이벤트는 버리고 도구는 끝까지 실행"""
+        server = _server(tmp_path, monkeypatch)
+        sent = []
+
+        async def send_progress(progress, total, message):
+            sent.append(message)
+            if len(sent) == 2:
+                raise ConnectionError("client gone")
+
+        result, events = _run_with_events(server, {"figma_url": FIGMA_URL}, send_progress=send_progress)
+
+        assert result["success"] is True and os.path.exists(result["filename"])
+        assert len(sent) == 2
+        assert [kind for kind, _ in events] == ["result"]  # 실패 전에 보낸 이벤트에는 부분 결과 없음
+
+    def test_refresh_bypasses_fetch_cache(self, tmp_path, monkeypatch):
+        """process_figma_link/enhanced_figma_analysis는 캐시를 쓰고, refresh면 다시 가져옴"""
+        server = _server(tmp_path, monkeypatch)
+        cached = server.fetch_cache.get(server._fetch_key("FILE"))
+        fetched = []
+
+        def fetch(file_id, node_id=None):
+            fetched.append(file_id)
+            return cached
+
+        monkeypatch.setattr(server, "_fetch_figma_data", fetch)
+        executor = ToolExecutor(cpu_workers=0)
+
+        async def scenario():
+            results = []
+            for name in ("process_figma_link", "enhanced_figma_analysis"):
+                for refresh in (False, True):
+                    arguments = {"figma_url": FIGMA_URL, "refresh": refresh, "include_screenshot": False}
+                    results.append(await mcp_figma_server.call_tool(server, executor, name, arguments))
+            return results
+
+        try:
+            results = asyncio.run(scenario())
+        finally:
+            executor.shutdown()
+        assert all(result["success"] for result in results)
+        assert fetched == ["FILE", "FILE"]
+
+    def test_interactive_join_promotes_batch_fetch(self, tmp_path, monkeypatch):
+        """batch 요청에 interactive 호출이 합류하면 batch_reserve에 막히지 않고 interactive 예산으로 가져옴"""
+        server = _server(tmp_path, monkeypatch)
+        cached = server.fetch_cache.get(server._fetch_key("FILE"))
+        # 분당 6회, 버킷 3, batch 예약 2: 2개를 쓰고 나면 batch는 20초, interactive는 바로 가능
+        server.rate_budget = RateBudget(requests_per_minute=6, burst=3, batch_reserve=2, state_file=None)
+        for _ in range(2):
+            server.rate_budget.acquire(server.figma_token, "interactive")
+        fetched = []
+
+        def fetch(file_id, node_id=None):
+            fetched.append(file_id)
+            server.rate_budget.acquire(server.figma_token)
+            return cached
+
+        monkeypatch.setattr(server, "_fetch_figma_data", fetch)
+        results = {}
+
+        def call(name, priority):
+            with rate_priority(priority):
+                results[name] = server.fetch_figma_data("FILE", refresh=True)
+
+        leader = threading.Thread(target=call, args=("batch", "batch"), daemon=True)
+        leader.start()
+        while not fetched:
+            time.sleep(0.01)
+        started = time.perf_counter()
+        follower = threading.Thread(target=call, args=("interactive", "interactive"), daemon=True)
+        follower.start()
+        follower.join(5)
+        leader.join(5)
+
+        assert results["interactive"]["success"] and results["batch"]["success"]
+        assert time.perf_counter() - started < 2
+        assert fetched == ["FILE"]
+        assert server.rate_budget.acquired == {"interactive": 3, "batch": 0}
+
+    def test_save_failure_reported(self, tmp_path, monkeypatch):
+        """Excel 저장이 실패하면 성공으로 보고하지 않고 생성한 테스트케이스는 핸들로 보관"""
+        server = _server(tmp_path, monkeypatch)
+        monkeypatch.setattr(server, "save_to_excel",
+                            lambda test_cases, use_template=True: {"success": False, "error": "disk full"})
+        result, events = _run_with_events(server, {"figma_url": FIGMA_URL})
+
+        assert result["success"] is False and "disk full" in result["error"]
+        assert len(server.data_store.get(result["testcases_handle"], "testcases")) == result["testcases_count"]
+        assert not any(kind == "progress" and payload[2].startswith("Excel 저장") for kind, payload in events)
+
+    def test_dump_metrics_survives_write_errors(self, tmp_path, monkeypatch, capsys):
+        """기록 실패는 stderr에 남기고 계속 시도, 기록된 파일은 다른 사용자도 읽을 수 있음 (0644)"""
+        server = _server(tmp_path, monkeypatch)
+        executor = ToolExecutor(cpu_workers=0)
+        path = tmp_path / "mcp.prom"
+        path.mkdir()  # 같은 이름의 디렉토리가 있어 교체 실패
+
+        async def scenario():
+            task = asyncio.ensure_future(mcp_figma_server.dump_metrics(server, executor, str(path), 0.02))
+            await asyncio.sleep(0.1)
+            path.rmdir()
+            for _ in range(100):
+                if path.is_file():
+                    break
+                await asyncio.sleep(0.02)
+            task.cancel()
+
+        try:
+            asyncio.run(scenario())
+        finally:
+            executor.shutdown()
+        assert "계측 파일 기록 실패" in capsys.readouterr().err
+        assert "mcp_uptime_seconds" in path.read_text(encoding="utf-8")
+        assert os.stat(path).st_mode & 0o777 == 0o644
+
+    def test_save_to_excel_with_template(self, tmp_path, monkeypatch):
+        """템플릿 저장: 템플릿 헤더 행(값/스타일/열너비) 유지, 데이터는 헤더 이름으로 매핑 + 공유 NamedStyle"""
+        server = _server(tmp_path, monkeypatch)
+        cases = [
+            {"카테고리": "인증", "플로우 타입": "Internal", "제목": "Login 화면 표시", "사전조건": "앱 설치",
+             "테스트 절차": "1. 앱 실행", "기대 결과": "로그인 화면 표시", "우선순위": "P1"},
+            {"category": "랭킹", "title": "랭킹 목록 정렬", "test_step": "1. 랭킹 탭 선택", "priority": "P2",
+             "type": "UI"},
+        ]
+        result = server.save_to_excel(cases, filename=str(tmp_path / "out.xlsx"), use_template=True)
+        assert result["success"] is True and result["count"] == 2
+
+        template = openpyxl.load_workbook(mcp_figma_server.TEMPLATE_PATH)
+        output = openpyxl.load_workbook(result["filename"])
+        template_ws, ws = template.active, output[template.active.title]
+
+        assert [c.value for c in ws[1]] == [c.value for c in template_ws[1]]
+        for expected, cell in zip(template_ws[1], ws[1]):
+            assert cell.font.b == expected.font.b
+            assert cell.fill.fgColor.rgb == expected.fill.fgColor.rgb
+            assert cell.alignment.horizontal == expected.alignment.horizontal
+        for letter, dimension in template_ws.column_dimensions.items():
+            if dimension.customWidth:
+                assert ws.column_dimensions[letter].width == dimension.width
+
+        assert mcp_figma_server.TEMPLATE_DATA_STYLE.name in output.named_styles
+        assert ws.max_row == 3  # 템플릿 예시 행은 복사하지 않음
+        for row in ws.iter_rows(min_row=2):
+            assert {cell.style for cell in row} == {"qa_testcase_data"}
+            assert {cell.font.name for cell in row} == {"맑은 고딕"}
+
+        column = {cell.value: cell.column for cell in template_ws[1]}
+        first = {header: ws.cell(2, col).value for header, col in column.items()}
+        second = {header: ws.cell(3, col).value for header, col in column.items()}
+        assert first["section"] == "인증" and first["component"] == "Internal Flow"
+        assert first["feature"] == "Authentication" and first["title"] == "Login 화면 표시"
+        assert first["precondition"] == "앱 설치" and first["test_step"] == "1. 앱 실행"
+        assert first["expected_results"] == "로그인 화면 표시" and first["priority"] == "P1"
+        assert first["type"] == "Functional" and first["web_result"] is None and first["app_result"] is None
+        assert second["feature"] == "Ranking System" and second["test_step"] == "1. 랭킹 탭 선택"
+        assert second["priority"] == "P2" and second["type"] == "UI"
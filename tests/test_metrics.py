@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+서버 계측 테스트
+"""
+
+import os
+import sys
+
+import pytest
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.metrics import Histogram, MetricsRegistry
+
+
+class TestMetrics:
+    """히스토그램 / 계측 모음 테스트 클래스"""
+
+    def test_histogram_quantiles(self):
+        """분위수는 버킷 보간 추정값이며 관측 최솟값~최댓값 범위 안"""
+        histogram = Histogram(buckets=(0.1, 1.0))
+        for value in [0.05] * 90 + [0.5] * 9 + [2.0]:
+            histogram.observe(value)
+
+        assert histogram.counts == [90, 9, 1]
+        assert 0.05 <= histogram.quantile(0.5) <= 0.1  # 최솟값이 버킷 하한보다 크면 최솟값부터 보간
+        assert 0.1 <= histogram.quantile(0.95) <= 1.0  # 0.5 관측값이 들어간 버킷 범위 안
+        assert histogram.quantile(1.0) == 2.0  # +Inf 버킷은 최댓값
+        snapshot = histogram.snapshot()
+        assert snapshot["count"] == 100
+        assert snapshot["max_ms"] == 2000.0
+        assert Histogram().snapshot()["p95_ms"] is None
+
+    def test_time_records_even_on_error(self):
+        """time()은 with 블록과 데코레이터 모두 사용 가능하고, 예외로 끝나도 기록"""
+        metrics = MetricsRegistry()
+
+        @metrics.time("phase_seconds", phase="generate")
+        def generate(fail=False):
+            if fail:
+                raise RuntimeError("실패")
+            return 1
+
+        generate()
+        with pytest.raises(RuntimeError):
+            generate(fail=True)
+        with metrics.time("phase_seconds", phase="save"):
+            pass
+
+        histograms = metrics.snapshot()["histograms"]["phase_seconds"]
+        assert histograms["phase=generate"]["count"] == 2
+        assert histograms["phase=save"]["count"] == 1
+
+    def test_pop_state_and_merge(self):
+        """워커 집계를 꺼내 주 프로세스 집계에 합침 (꺼낸 쪽은 비워짐)"""
+        worker, main = MetricsRegistry(), MetricsRegistry()
+        worker.observe("phase_seconds", 0.2, phase="traverse")
+        worker.inc("bytes_total", 100)
+        main.observe("phase_seconds", 0.4, phase="traverse")
+        main.inc("bytes_total", 50)
+
+        main.merge(worker.pop_state())
+        main.merge(worker.pop_state())  # 두 번째는 빈 상태
+
+        snapshot = main.snapshot()
+        traverse = snapshot["histograms"]["phase_seconds"]["phase=traverse"]
+        assert traverse["count"] == 2
+        assert traverse["sum_ms"] == pytest.approx(600.0)
+        assert snapshot["counters"]["bytes_total"][""] == 150
+        assert worker.snapshot()["histograms"] == {}
+
+    def test_prometheus_text(self):
+        """Prometheus 텍스트: 누적 버킷 + _sum/_count, 카운터, 게이지(외부 값 포함)"""
+        metrics = MetricsRegistry(buckets=(0.1, 1.0))
+        metrics.describe("tool_seconds", "도구 호출 소요 시간")
+        metrics.observe("tool_seconds", 0.05, tool="fetch")
+        metrics.observe("tool_seconds", 0.5, tool="fetch")
+        metrics.inc("calls_total", tool="fetch", outcome="ok")
+        metrics.add_gauge("in_flight", 1, tool='a"b')
+
+        text = metrics.to_prometheus({"cache_hit_ratio": [({"cache": "fetch"}, 0.5), ({"cache": "none"}, None)]})
+        lines = text.splitlines()
+
+        assert "# HELP tool_seconds 도구 호출 소요 시간" in lines
+        assert "# TYPE tool_seconds histogram" in lines
+        assert 'tool_seconds_bucket{tool="fetch",le="0.1"} 1' in lines
+        assert 'tool_seconds_bucket{tool="fetch",le="1.0"} 2' in lines
+        assert 'tool_seconds_bucket{tool="fetch",le="+Inf"} 2' in lines
+        assert 'tool_seconds_count{tool="fetch"} 2' in lines
+        assert 'calls_total{outcome="ok",tool="fetch"} 1' in lines
+        assert 'in_flight{tool="a\\"b"} 1' in lines
+        assert 'cache_hit_ratio{cache="fetch"} 0.5' in lines
+        assert not any(line.startswith('cache_hit_ratio{cache="none"}') for line in lines)
+        assert text.endswith("\n")
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+MCP 응답 페이지 나누기/요약 테스트
+"""
+
+import os
+import sys
+
+import pytest
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils import pagination
+
+
+class TestPagination:
+    """페이지 나누기 테스트 클래스"""
+
+    def test_paginate_copies_and_cursor_walks_all_pages(self):
+        """첫 페이지 사본 생성(원본 유지) 후 커서로 끝까지 순회"""
+        texts = [{"text": f"텍스트 {i % 3}"} for i in range(7)]
+        stored = {"keywords": {"texts": texts, "names": [{"name": "a"}]}, "count": 7}
+        paths = [("keywords", "texts"), ("keywords", "names"), ("missing", "items")]
+
+        response = pagination.paginate(stored, "analysis:1", paths, limit=3)
+        keywords = response["keywords"]
+        assert keywords["texts"] == texts[:3] and keywords["texts_total"] == 7
+        assert "names_next_cursor" not in keywords  # limit 이하 목록은 그대로
+        assert stored["keywords"]["texts"] is texts and "texts_total" not in stored["keywords"]
+
+        collected, cursor = list(keywords["texts"]), keywords["texts_next_cursor"]
+        while cursor:
+            handle, path, offset = pagination.decode_cursor(cursor)
+            assert (handle, path) == ("analysis:1", ("keywords", "texts"))
+            result = pagination.page(pagination.get_path(stored, path), handle, path, offset, 3)
+            collected.extend(result["texts"])
+            cursor = result["texts_next_cursor"]
+        assert collected == texts
+
+        summary = pagination.top_values(texts, "text", 2)
+        assert summary["total"] == 7 and summary["distinct"] == 3
+        assert summary["top"][0] == {"value": "텍스트 0", "count": 3}
+
+    def test_limits_and_invalid_cursor(self):
+        assert pagination.page_limit(None) == pagination.DEFAULT_PAGE_LIMIT
+        assert pagination.page_limit(10 ** 9) == pagination.MAX_PAGE_LIMIT
+        assert pagination.page_limit(-1) == 0
+        first = pagination.page(["a", "b"], "requirements:1", (), 0, 1, key="requirements")
+        assert first["requirements"] == ["a"] and first["requirements_next_cursor"]
+        with pytest.raises(ValueError):
+            pagination.decode_cursor("not-a-cursor")
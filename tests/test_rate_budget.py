@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Figma 요청 예산 테스트
+"""
+
+import os
+import sys
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.rate_budget import DEFAULT_STATE_FILE, RateBudget, budgeted_get, current_priority, rate_priority
+from src.utils.rules_config import PROJECT_ROOT, RulesConfig
+
+
+class TestRateBudget:
+    """토큰별 요청 예산 테스트 클래스"""
+
+    def test_burst_then_refill_rate(self, tmp_path):
+        """버킷 크기만큼은 바로 보내고, 그 뒤로는 분당 요청 수 속도로 대기"""
+        budget = RateBudget(requests_per_minute=600, burst=2, batch_reserve=0, state_file=str(tmp_path / "b.json"))
+
+        assert budget.acquire("token-a") < 0.05
+        assert budget.acquire("token-a") < 0.05
+        waited = budget.acquire("token-a")
+        assert 0.05 < waited < 0.5  # 초당 10개 -> 약 0.1초
+        assert budget.acquire("token-b") < 0.05  # 토큰별로 버킷이 따로 있음
+        assert budget.stats()["acquired"]["interactive"] == 4
+
+    def test_batch_keeps_reserve_for_interactive(self):
+        """batch는 reserve를 남기고 대기, interactive는 남은 예산을 바로 사용"""
+        budget = RateBudget(requests_per_minute=60, burst=3, batch_reserve=2, state_file=None)
+        state = {}
+
+        assert budget._try_acquire(state, "k", "batch", "w1") == 0
+        assert budget._try_acquire(state, "k", "batch", "w1") > 0  # 남은 2개는 interactive 몫
+        assert budget._try_acquire(state, "k", "interactive", "w2") == 0
+        assert budget._try_acquire(state, "k", "interactive", "w2") == 0
+
+    def test_batch_yields_to_waiting_interactive(self):
+        """interactive 요청이 대기 중이면 예산이 있어도 batch는 양보"""
+        budget = RateBudget(requests_per_minute=60, burst=2, batch_reserve=0, state_file=None)
+        state = {}
+        assert budget._try_acquire(state, "k", "interactive", "w1") == 0
+        assert budget._try_acquire(state, "k", "interactive", "w1") == 0
+        assert budget._try_acquire(state, "k", "interactive", "w1") > 0  # 대기 표시
+        state["k"]["tokens"] = 2.0
+
+        assert budget._try_acquire(state, "k", "batch", "w2") > 0
+        assert budget._try_acquire(state, "k", "interactive", "w1") == 0  # 대기 표시 해제
+        assert budget._try_acquire(state, "k", "batch", "w2") == 0
+
+    def test_state_shared_through_file(self, tmp_path):
+        """같은 상태 파일을 쓰는 예산(다른 프로세스)끼리 버킷을 나눠 씀"""
+        path = str(tmp_path / "shared.json")
+        first = RateBudget(requests_per_minute=60, burst=2, batch_reserve=0, state_file=path)
+        second = RateBudget(requests_per_minute=60, burst=2, batch_reserve=0, state_file=path)
+        if first.state_file is None:
+            pytest.skip("파일 잠금(fcntl)을 지원하지 않는 환경")
+
+        first.acquire("figd_secret")
+        first.acquire("figd_secret")
+        with second._locked_state() as state:
+            (key, entry), = state.items()
+            assert entry["tokens"] < 1
+            assert second._try_acquire(state, key, "interactive", "w") > 0  # 두 번째 예산도 대기
+        assert "figd_secret" not in open(path, encoding="utf-8").read()  # 토큰 원문은 기록하지 않음
+
+    def test_429_blocks_and_retries(self):
+        """429 응답이면 Retry-After 동안 멈췄다가 재시도 (예산 대기 시간은 on_wait로 전달)"""
+        budget = RateBudget(requests_per_minute=600, burst=5, state_file=None, max_retries=1)
+        throttled = Mock(status_code=429, headers={"Retry-After": "0.2"})
+        ok = Mock(status_code=200, headers={})
+
+        with patch("requests.get", side_effect=[throttled, ok]) as mock_get:
+            started = time.monotonic()
+            waits = []
+            response = budgeted_get(budget, "token", "https://api.figma.com/v1/files/F", headers={},
+                                    on_wait=waits.append)
+
+        assert response is ok
+        assert len(waits) == 2 and sum(waits) >= 0.15
+        assert mock_get.call_count == 2
+        assert time.monotonic() - started >= 0.2
+        assert budget.stats()["throttled"] == 1
+        throttled.close.assert_called_once()
+
+    def test_priority_context_and_disabled_budget(self, monkeypatch):
+        """우선순위는 rate_priority > FIGMA_RATE_CLASS > interactive, 분당 요청 수 0이면 제한 없음"""
+        monkeypatch.delenv("FIGMA_RATE_CLASS", raising=False)
+        assert current_priority() == "interactive"
+        monkeypatch.setenv("FIGMA_RATE_CLASS", "batch")
+        assert current_priority() == "batch"
+        with rate_priority("interactive"):
+            assert current_priority() == "interactive"
+        with pytest.raises(ValueError):
+            with rate_priority("urgent"):
+                pass
+
+        budget = RateBudget(requests_per_minute=0, state_file=None)
+        assert all(budget.acquire("token") == 0 for _ in range(100))
+
+    def test_state_file_does_not_depend_on_cwd(self, tmp_path, monkeypatch):
+        """기본/설정 상태 파일은 작업 디렉토리와 관계없이 같은 절대 경로"""
+        monkeypatch.chdir(tmp_path)
+
+        assert os.path.isabs(DEFAULT_STATE_FILE)
+        assert RulesConfig(raw={}).rate_limit_state_file == DEFAULT_STATE_FILE
+        configured = RulesConfig(raw={"figma_rate_limit": {"state_file": ".cache/b.json"}})
+        assert configured.rate_limit_state_file == os.path.join(PROJECT_ROOT, ".cache/b.json")
+        assert RulesConfig(raw={"figma_rate_limit": {"state_file": None}}).rate_limit_state_file is None
+        budget = RateBudget(state_file="relative.json")
+        if budget.state_file is not None:
+            assert budget.state_file == str(tmp_path / "relative.json")
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Excel 분할 저장 테스트
+"""
+
+import os
+import sys
+
+import pytest
+from openpyxl import load_workbook
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.generators import testcase_generator
+from src.utils.sharding import INDEX_SHEET, plan_shards
+
+
+def _testcases():
+    domains = ["로그인", "결제", "로그인", "검색", "로그인"]
+    return [{"domain": domain, "title": f"케이스 {i}", "priority": "P2"} for i, domain in enumerate(domains)]
+
+
+def _titles(ws):
+    return [row[4] for row in ws.iter_rows(min_row=2, values_only=True)]
+
+
+class TestSharding:
+    """분할 저장 테스트 클래스"""
+
+    def test_plan_shards(self):
+        """domain별 분할(초과 시 추가 분할)과 행 수 분할"""
+        shards = plan_shards(_testcases(), by="domain", max_rows=2)
+        assert [(s.name, len(s.rows)) for s in shards] == [
+            ("로그인", 2), ("로그인 (2)", 1), ("결제", 1), ("검색", 1)
+        ]
+
+        shards = plan_shards(_testcases(), by="rows", max_rows=2)
+        assert [(s.name, len(s.rows)) for s in shards] == [("1-2", 2), ("3-4", 2), ("5-5", 1)]
+
+        assert plan_shards([], by="rows") == []
+        with pytest.raises(ValueError):
+            plan_shards(_testcases(), by="priority")
+        with pytest.raises(ValueError):
+            plan_shards(_testcases(), max_rows=2_000_000)
+
+    def test_sharded_files_with_index(self, tmp_path):
+        """분할 워크북(병렬 기록) + Index 워크북의 파일 링크"""
+        generator = testcase_generator.TestCaseGenerator()
+        index_path = str(tmp_path / "suite.xlsx")
+
+        shards = generator.save_to_excel_sharded(_testcases(), index_path, by="domain", jobs=2, use_template=False)
+
+        assert [s["name"] for s in shards] == ["로그인", "결제", "검색"]
+        login = load_workbook(shards[0]["path"], read_only=True)
+        assert _titles(login.active) == ["케이스 0", "케이스 2", "케이스 4"]
+        login.close()
+
+        index = load_workbook(index_path)
+        rows = list(index[INDEX_SHEET].iter_rows(min_row=2, values_only=True))
+        assert rows[0][:2] == ("로그인", 3)
+        assert os.path.basename(shards[0]["path"]) in rows[0][2]
+        assert sorted(os.listdir(tmp_path)) == sorted(
+            ["suite.xlsx"] + [os.path.basename(s["path"]) for s in shards]
+        )
+
+    def test_sharded_sheets_in_one_workbook(self, tmp_path):
+        """한 워크북에 Index 시트 + 분할 단위별 시트"""
+        generator = testcase_generator.TestCaseGenerator()
+        path = str(tmp_path / "suite.xlsx")
+
+        shards = generator.save_to_excel_sharded(_testcases(), path, by="rows", max_rows=2, mode="sheets")
+
+        wb = load_workbook(path)
+        assert wb.sheetnames == [INDEX_SHEET, "1-2", "3-4", "5-5"]
+        assert _titles(wb["5-5"]) == ["케이스 4"]
+        assert wb[INDEX_SHEET]["C2"].value == '=HYPERLINK("#\'1-2\'!A1","1-2")'
+        assert [s["rows"] for s in shards] == [2, 2, 1]
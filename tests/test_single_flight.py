@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+요청 병합(single-flight) 테스트
+"""
+
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.cancellation import CancelToken, ToolCancelled, checkpoint, reset_token, set_token
+from src.utils.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    """요청 병합 테스트 클래스"""
+
+    def test_concurrent_calls_share_one_execution(self):
+        """같은 키의 동시 호출은 한 번만 실행되고 같은 결과 객체를 공유, 끝난 뒤에는 다시 실행"""
+        flights = SingleFlight()
+        calls = []
+        started = threading.Event()
+
+        def fetch(file_id):
+            calls.append(file_id)
+            started.set()
+            time.sleep(0.1)
+            return {"file_id": file_id}
+
+        def call(_):
+            return flights.do("FILE", fetch, "FILE")
+
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            leader = pool.submit(call, 0)
+            started.wait()
+            results = [f.result() for f in [pool.submit(call, i) for i in range(4)]] + [leader.result()]
+
+        assert calls == ["FILE"]
+        assert all(value is results[0][0] for value, _ in results)
+        assert sorted(shared for _, shared in results) == [False, True, True, True, True]
+        assert flights.stats() == {"executed": 1, "shared": 4, "in_flight": 0}
+
+        flights.do("FILE", fetch, "FILE")
+        assert len(calls) == 2
+
+    def test_error_propagates_to_waiters(self):
+        flights = SingleFlight()
+        started = threading.Event()
+
+        def fail():
+            started.set()
+            time.sleep(0.05)
+            raise RuntimeError("timeout")
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            leader = pool.submit(flights.do, "FILE", fail)
+            started.wait()
+            waiter = pool.submit(flights.do, "FILE", fail)
+            for future in (leader, waiter):
+                with pytest.raises(RuntimeError):
+                    future.result()
+        assert flights.in_flight() == 0
+
+    def test_cancelled_waiter_stops_while_leader_runs(self):
+        """기다리던 호출이 취소되면 진행 중인 호출을 기다리지 않고 중단, 진행 중인 호출은 끝까지 실행"""
+        flights = SingleFlight(wait_check=checkpoint, wait_interval=0.01)
+        started, release = threading.Event(), threading.Event()
+        token = CancelToken()
+
+        def fetch():
+            started.set()
+            release.wait(5)
+            return {"file_id": "FILE"}
+
+        def follower():
+            reset = set_token(token)
+            try:
+                return flights.do("FILE", fetch)
+            finally:
+                reset_token(reset)
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            leader = pool.submit(flights.do, "FILE", fetch)
+            started.wait()
+            waiter = pool.submit(follower)
+            time.sleep(0.05)
+            token.cancel()
+            with pytest.raises(ToolCancelled):
+                waiter.result(timeout=1)
+            assert not leader.done()
+            release.set()
+            assert leader.result() == ({"file_id": "FILE"}, False)
+        assert flights.stats() == {"executed": 1, "shared": 1, "in_flight": 0}
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+스트리밍 유틸 테스트
+"""
+
+import os
+import sys
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.dedupe import Deduplicator, iter_deduplicated
+from src.utils.streaming import iter_by_priority
+
+
+class TestStreaming:
+    """스트리밍 유틸 테스트 클래스"""
+
+    def test_iter_by_priority_matches_stable_sort(self):
+        """버퍼를 넘겨 임시 파일로 내보내도 안정 정렬 결과와 동일"""
+        priorities = ["P3", "P1", "P2", "X", "P4", "P2", "P1", "P3"] * 25
+        testcases = [{"title": f"tc-{i}", "priority": p} for i, p in enumerate(priorities)]
+
+        rank = {"P1": 1, "P2": 2, "P3": 3, "P4": 4}
+        expected = sorted(testcases, key=lambda tc: rank.get(tc["priority"], 4))
+
+        assert list(iter_by_priority(iter(testcases), buffer_size=7)) == expected
+
+    def test_iter_by_priority_yields_top_priority_first(self):
+        """최상위 우선순위는 입력을 다 읽기 전에 바로 나옴"""
+        consumed = []
+
+        def source():
+            for i, p in enumerate(["P1", "P2", "P1"]):
+                consumed.append(i)
+                yield {"title": str(i), "priority": p}
+
+        stream = iter_by_priority(source())
+        assert next(stream)["title"] == "0"
+        assert consumed == [0]
+
+    def test_iter_deduplicated_reports_merges(self):
+        """스트리밍 중복 제거 + 병합 리포트"""
+        testcases = [
+            {"title": "A", "test_step": "1. 실행", "expected_results": "성공"},
+            {"title": "A ", "test_step": "실행", "expected_results": "성공"},
+            {"title": "B", "test_step": "1. 실행", "expected_results": "성공"},
+        ]
+        merged = []
+        unique = list(iter_deduplicated(testcases, Deduplicator(window=1), on_merge=merged.append))
+
+        assert [tc["title"] for tc in unique] == ["A", "B"]
+        assert merged[0]["kept_index"] == 0 and merged[0]["dropped_index"] == 1
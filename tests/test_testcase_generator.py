@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+TestCaseGenerator 테스트
+"""
+
+import json
+import os
+import sys
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# NOTE: 클래스명이 Test로 시작해 pytest가 수집하지 않도록 모듈 단위로 import
+from src.generators import testcase_generator
+
+
+def make_analysis(patterns=("authentication",), buttons=2, inputs=1, complexity="medium"):
+    """테스트용 enhanced_analysis() 형식의 분석 결과"""
+    return {
+        "success": True,
+        "enhanced_analysis": {
+            "keywords": {
+                "detected_patterns": {
+                    name: {"matches": 1, "flow_type": f"{name}_flow", "confidence": 20}
+                    for name in patterns
+                }
+            },
+            "ui_structure": {
+                "ui_elements": {
+                    "buttons": [{"name": f"Button {i}", "depth": 1} for i in range(buttons)],
+                    "inputs": [{"name": f"Input {i}", "depth": 1} for i in range(inputs)],
+                    "navigation": [],
+                    "containers": [],
+                },
+                "ui_complexity": complexity,
+            },
+            "user_flow": {
+                "flow_steps": ["사용자 인증", "정보 입력", "옵션 선택", "결과 확인"],
+                "primary_flow_type": "auth_flow",
+                "confidence": 20,
+            },
+        },
+        "recommendations": {"testing_priorities": ["인증 플로우 테스트 우선 실행"]},
+    }
+
+
+class TestTestCaseGenerator:
+    """TestCaseGenerator 테스트 클래스"""
+
+    def setup_method(self):
+        """테스트 설정"""
+        self.generator = testcase_generator.TestCaseGenerator()
+
+    def test_generate_from_analysis(self):
+        """분석 결과 기반 생성 테스트"""
+        testcases = self.generator.generate_from_analysis(make_analysis())
+
+        assert len(testcases) > 0
+        assert all("test_step" in tc for tc in testcases)
+        assert self.generator.last_dedupe_result is not None
+
+    def test_iter_from_analysis_matches_list(self):
+        """스트리밍 생성 결과가 리스트 생성 결과와 동일한지 테스트"""
+        analysis = make_analysis(patterns=("authentication", "transaction"), complexity="high")
+
+        streamed = self.generator.iter_from_analysis(analysis, buffer_size=2)
+
+        assert not isinstance(streamed, list)
+        assert list(streamed) == self.generator.generate_from_analysis(analysis)
+
+    def test_save_to_json_from_iterator(self, tmp_path):
+        """이터레이터를 그대로 JSON으로 저장"""
+        analysis = make_analysis()
+        filename = str(tmp_path / "testcases.json")
+
+        self.generator.save_to_json(self.generator.iter_from_analysis(analysis), filename)
+
+        with open(filename, encoding="utf-8") as f:
+            data = json.load(f)
+        assert data["testcases"] == self.generator.generate_from_analysis(analysis)
+        assert data["metadata"]["total_testcases"] == len(data["testcases"])
+
+    def test_generate_many_preserves_order(self):
+        """배치 생성 결과가 입력 순서를 유지하는지 테스트"""
+        analyses = [
+            make_analysis(patterns=("authentication",)),
+            {"success": False, "error": "fetch failed"},
+            make_analysis(patterns=("transaction", "social"), complexity="high"),
+        ]
+
+        sequential = self.generator.generate_many(analyses, jobs=1)
+        parallel = self.generator.generate_many(analyses, jobs=2)
+
+        for results in (sequential, parallel):
+            assert [r["success"] for r in results] == [True, False, True]
+            assert "fetch failed" in results[1]["error"]
+            assert all(r["elapsed_sec"] >= 0 for r in results)
+
+        assert sequential[0]["testcases"] == self.generator.generate_from_analysis(analyses[0])
+        assert [r.get("testcases") for r in sequential] == [r.get("testcases") for r in parallel]
+
+    def test_generate_many_empty(self):
+        """빈 입력 테스트"""
+        assert self.generator.generate_many([]) == []
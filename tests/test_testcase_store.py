@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+SQLite 테스트케이스 저장소 테스트
+"""
+
+import os
+import sys
+
+import pytest
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.generators import testcase_generator
+from src.utils import testcase_store
+from tests.test_testcase_generator import make_analysis
+
+
+def _case(i, priority="P2", domain="로그인", **extra):
+    return {"title": f"케이스 {i}", "test_step": f"1. 실행 {i}", "priority": priority,
+            "domain": domain, "type": "Functional", **extra}
+
+
+class TestTestCaseStore:
+    """저장소 테스트 클래스"""
+
+    def test_upsert_and_indexed_queries(self, tmp_path):
+        """fingerprint 기준 upsert(위치 유지), 인덱스 컬럼 필터/집계"""
+        path = str(tmp_path / "suite.db")
+        with testcase_store.TestCaseStore(path) as store:
+            assert store.add_many([_case(0, "P1"), _case(1), _case(2, domain="결제")],
+                                  node_id="1:2", batch_size=2) == 3
+            # 같은 케이스(제목/절차/기대 결과 동일) 재삽입 -> 갱신
+            store.add_many([_case(0, "P3", comment="갱신")])
+
+            assert len(store) == 3
+            first = next(store.iter_testcases())
+            assert (first["title"], first["priority"], first["comment"]) == ("케이스 0", "P3", "갱신")
+            assert [tc["title"] for tc in store.iter_testcases(domain="로그인", priorities=["P2", "P3"])] == [
+                "케이스 0", "케이스 1"
+            ]
+            assert store.counts_by("domain") == {"로그인": 2, "결제": 1}
+            assert store.existing_titles(["케이스 1", "없음"]) == {"케이스 1"}
+
+        # 파일 DB는 다시 열어도 유지
+        with testcase_store.TestCaseStore(path) as store:
+            assert [tc["title"] for tc in store.iter_testcases(node_id="1:2")] == ["케이스 0", "케이스 1", "케이스 2"]
+            with pytest.raises(ValueError):
+                store.counts_by("data")
+
+    def test_generator_helpers_use_store(self):
+        """generate_by_priority / identify_missing_tests 저장소 경로가 리스트 경로와 동일"""
+        generator = testcase_generator.TestCaseGenerator()
+        analysis = make_analysis()
+
+        with testcase_store.TestCaseStore() as store:
+            assert generator.generate_by_priority(analysis, "P2", store=store) == \
+                generator.generate_by_priority(analysis, "P2")
+
+            existing = generator.generate_from_analysis(analysis)[:3]
+            expected = generator.identify_missing_tests(existing, analysis)
+            with testcase_store.TestCaseStore() as existing_store:
+                existing_store.add_many(existing)
+                assert generator.identify_missing_tests(existing_store, analysis) == expected
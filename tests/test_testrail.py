@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+TestRail CSV 저장 테스트
+"""
+
+import csv
+import os
+import sys
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.testrail import TESTRAIL_COLUMNS, count_steps, format_estimate, write_testrail_csv
+
+
+def _read(path):
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        return list(csv.reader(f))
+
+
+class TestTestRail:
+    """TestRail CSV 테스트 클래스"""
+
+    def test_count_steps_and_estimate(self):
+        """스텝 수 계산과 Estimate 형식"""
+        assert count_steps("1. 실행\n\n2. 확인\n") == 2
+        assert count_steps(["a", "b", "c"]) == 3
+        assert count_steps("") == 0
+        assert format_estimate(0) == "1m"
+        assert format_estimate(5) == "5m"
+        assert format_estimate(60) == "1h"
+        assert format_estimate(90.5) == "1h 31m"
+
+    def test_sections_and_estimates(self, tmp_path):
+        """Section 필드/구분자 설정, 스텝 수 기반 Estimate"""
+        rows = [
+            {"domain": "로그인", "section": "인증", "component": "폼", "title": "a", "test_step": "1. x\n2. y"},
+            {"domain": "로그인", "title": "b", "test_step": ""},
+        ]
+        path = str(tmp_path / "out.csv")
+        count = write_testrail_csv(rows, path, section_fields=("domain", "section", "component"),
+                                   section_separator=" > ", base_minutes=2, minutes_per_step=1.5)
+
+        assert count == 2
+        header, first, second = _read(path)
+        assert header == TESTRAIL_COLUMNS
+        assert first[0] == "로그인 > 인증 > 폼" and first[4] == "5m"
+        assert second[0] == "로그인 >  > " and second[4] == "2m"
+
+    def test_chunked_output_is_identical(self, tmp_path):
+        """chunk 크기와 무관하게 동일한 파일"""
+        rows = [{"domain": "d", "section": f"s{i}", "title": f"t{i}", "test_step": "1. a"} for i in range(25)]
+        write_testrail_csv(iter(rows), str(tmp_path / "small.csv"), chunk_size=4)
+        write_testrail_csv(rows, str(tmp_path / "large.csv"))
+
+        assert (tmp_path / "small.csv").read_bytes() == (tmp_path / "large.csv").read_bytes()
+        assert len(_read(str(tmp_path / "small.csv"))) == 26
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+MCP 도구 실행기 테스트
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.cancellation import CancelToken, ToolInterrupted, checkpoint, remaining_time, reset_token, set_token
+from src.utils.tool_executor import ToolExecutor
+
+# 워커 초기화 함수가 잡는 잠금 (주 프로세스에서는 다른 스레드가 잡고 있음)
+_WORKER_LOCK = threading.Lock()
+
+
+def _init_locking_worker():
+    with _WORKER_LOCK:
+        pass
+
+
+def _wait_for_cancel(marker):
+    """취소/마감될 때까지 checkpoint() 반복 (시작과 중단 사유를 marker 파일에 기록)"""
+    with open(marker, "w", encoding="utf-8") as f:
+        f.write("started")
+    try:
+        for _ in range(1000):
+            checkpoint()
+            time.sleep(0.01)
+    except ToolInterrupted as e:
+        with open(marker, "w", encoding="utf-8") as f:
+            f.write(type(e).__name__)
+        raise
+    return "finished"
+
+
+class TestToolExecutor:
+    """도구 실행기 테스트 클래스"""
+
+    def test_io_calls_overlap_within_concurrency_limit(self):
+        """io 호출은 스레드 풀에서 겹쳐 실행되고 동시 실행 수는 max_concurrency를 넘지 않음"""
+        executor = ToolExecutor(max_concurrency=3, cpu_workers=0)
+        lock = threading.Lock()
+        active, peak = [0], [0]
+
+        def slow_call(i):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.05)
+            with lock:
+                active[0] -= 1
+            return i
+
+        async def scenario():
+            started = time.perf_counter()
+            results = await asyncio.gather(*(executor.run("io", slow_call, i) for i in range(9)))
+            return results, time.perf_counter() - started
+
+        try:
+            results, elapsed = asyncio.run(scenario())
+        finally:
+            executor.shutdown()
+        assert results == list(range(9))
+        assert peak[0] == 3
+        assert elapsed < 9 * 0.05  # 순차 실행보다 빠름
+        assert executor.stats()["in_flight"] == 0
+
+    def test_executor_reused_across_event_loops(self):
+        """루프 밖에서 만든 실행기를 여러 이벤트 루프에서 차례로 써도 동시 실행 제한이 동작"""
+        executor = ToolExecutor(max_concurrency=1, cpu_workers=0, background_concurrency=1)
+
+        async def scenario():
+            calls = [executor.run(profile, time.sleep, 0.01) for profile in ("io", "io", "background", "background")]
+            await asyncio.wait_for(asyncio.gather(*calls), 5)
+            return executor.stats()
+
+        try:
+            for _ in range(2):
+                stats = asyncio.run(scenario())
+                assert stats["in_flight"] == 0 and stats["background_in_flight"] == 0
+        finally:
+            executor.shutdown()
+
+    def test_inline_call_not_blocked_by_busy_pool(self):
+        """풀이 가득 찬 동안에도 inline 호출과 이벤트 루프는 막히지 않음 (cpu_workers=0이면 cpu도 스레드 풀)"""
+        executor = ToolExecutor(max_concurrency=1, cpu_workers=0)
+        release = threading.Event()
+
+        async def scenario():
+            busy = asyncio.ensure_future(executor.run("cpu", release.wait, 5))
+            await asyncio.sleep(0.01)
+            assert executor.stats()["in_flight"] == 1
+            started = time.perf_counter()
+            value = await executor.run("inline", lambda: "parsed")
+            waited = time.perf_counter() - started
+            release.set()
+            await busy
+            return value, waited
+
+        try:
+            value, waited = asyncio.run(scenario())
+        finally:
+            executor.shutdown()
+        assert value == "parsed"
+        assert waited < 0.05
+        assert executor._cpu_pool is None
+
+    def test_background_runs_outside_tool_slots(self):
+        """background 작업은 자체 한도 안에서 실행되고, 모두 대기 중이어도 도구 호출 슬롯은 비어 있음"""
+        executor = ToolExecutor(max_concurrency=1, cpu_workers=0, background_concurrency=2)
+        release = threading.Event()
+        lock = threading.Lock()
+        active, peak = [0], [0]
+
+        def prefetch():
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            release.wait(5)
+            with lock:
+                active[0] -= 1
+
+        async def scenario():
+            background = [asyncio.ensure_future(executor.run("background", prefetch)) for _ in range(4)]
+            await asyncio.sleep(0.05)
+            stats = executor.stats()
+            value = await asyncio.wait_for(executor.run("io", lambda: "fetched"), 1)
+            release.set()
+            await asyncio.gather(*background)
+            return stats, value
+
+        try:
+            stats, value = asyncio.run(scenario())
+        finally:
+            executor.shutdown()
+        assert value == "fetched"
+        assert stats["background_in_flight"] == 2 and stats["in_flight"] == 0
+        assert peak[0] == 2
+        assert executor.stats()["background_in_flight"] == 0
+
+    def test_cancel_reaches_cpu_worker(self, tmp_path):
+        """호출 작업이 취소되면 워커의 checkpoint()도 중단되고, 워커가 멈춘 뒤 슬롯을 돌려받음"""
+        executor = ToolExecutor(max_concurrency=1, cpu_workers=1)
+        marker = str(tmp_path / "marker")
+
+        async def scenario():
+            task = asyncio.ensure_future(executor.run("cpu", _wait_for_cancel, marker))
+            for _ in range(1000):
+                if os.path.exists(marker):
+                    break
+                await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            return await asyncio.wait_for(executor.run("cpu", remaining_time, 1.0), 10)
+
+        try:
+            after = asyncio.run(scenario())
+        finally:
+            executor.shutdown()
+        assert open(marker, encoding="utf-8").read() == "ToolCancelled"
+        assert after == 1.0  # 토큰이 없는 호출은 마감 없음
+        assert executor.stats()["in_flight"] == 0
+
+    def test_cpu_deadline_counts_slot_wait(self):
+        """cpu 호출의 마감은 실행 슬롯을 기다린 시간만큼 줄어든 채로 워커에 전달"""
+        executor = ToolExecutor(max_concurrency=1, cpu_workers=1)
+
+        async def scenario():
+            reset = set_token(CancelToken(2.0))
+            try:
+                busy = asyncio.ensure_future(executor.run("cpu", time.sleep, 0.5))
+                remaining = await executor.run("cpu", remaining_time)
+            finally:
+                reset_token(reset)
+            await busy
+            return remaining
+
+        try:
+            remaining = asyncio.run(scenario())
+        finally:
+            executor.shutdown()
+        assert remaining < 1.55
+
+    def test_cpu_pool_not_forked_while_threads_hold_locks(self):
+        """다른 스레드가 잠금을 잡고 있는 동안 만든 프로세스 풀의 워커도 멈추지 않음 (fork 대신 forkserver/spawn)"""
+        executor = ToolExecutor(max_concurrency=1, cpu_workers=1, cpu_initializer=_init_locking_worker)
+        held, release = threading.Event(), threading.Event()
+
+        def hold_lock():
+            with _WORKER_LOCK:
+                held.set()
+                release.wait(30)
+
+        holder = threading.Thread(target=hold_lock)
+        holder.start()
+        held.wait(5)
+        try:
+            pid = asyncio.run(asyncio.wait_for(executor.run("cpu", os.getpid), timeout=60))
+        finally:
+            release.set()
+            holder.join()
+            executor.shutdown()
+        assert pid != os.getpid()
+        assert executor.stats()["start_method"] in ("forkserver", "spawn")
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            ToolExecutor(max_concurrency=0)
+        with pytest.raises(ValueError):
+            ToolExecutor(background_concurrency=0)
+        with pytest.raises(ValueError):
+            asyncio.run(ToolExecutor().run("gpu", print))
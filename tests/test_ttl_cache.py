@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+TTL 캐시 테스트
+"""
+
+import os
+import sys
+import time
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.ttl_cache import TTLCache
+
+
+class TestTTLCache:
+    """TTL 캐시 테스트 클래스"""
+
+    def test_lru_eviction_and_stats(self):
+        cache = TTLCache(max_items=2, ttl=0)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        assert cache.get("a") == 1  # a를 최근 사용으로 갱신 -> b가 먼저 밀려남
+        cache.put("c", 3)
+
+        assert cache.get("b") is None
+        assert (cache.get("a"), cache.get("c")) == (1, 3)
+        assert cache.stats() == {"items": 2, "hits": 3, "misses": 1, "hit_rate": 0.75}
+        assert cache.invalidate("a") is True and cache.get("a") is None
+
+    def test_entries_expire_after_ttl(self):
+        cache = TTLCache(max_items=4, ttl=0.05)
+        cache.put("file", {"document": {}})
+        assert cache.get("file") == {"document": {}}
+        time.sleep(0.06)
+        assert cache.get("file") is None
+        assert len(cache) == 0